@@ -0,0 +1,128 @@
+"""
+해석적 스핀파 폴백 엔진
+Pre-computed DB와 MuMax3를 모두 사용할 수 없을 때의 모의(mock) 자기 상태 생성
+
+    m(x, y, t) = sin(R - 2π·f·t) · exp(-0.1 · R · alpha) · b_ext,   R = sqrt(X² + Y²)
+
+정적 기하 구조(R, sin R, cos R)는 한 번만 계산하고, 매 프레임은
+    sin(R - φ) = sin R · cos φ - cos R · sin φ
+항등식으로 픽셀별 초월함수 없이 재사용 버퍼에 in-place로 평가한다.
+감쇠 포락선 exp(-0.1·R·alpha)·b_ext는 (alpha, b_ext)가 바뀔 때만 다시 계산한다.
+numexpr가 설치되어 있으면 융합(fused) 평가를 사용한다.
+"""
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    ne = None
+    NUMEXPR_AVAILABLE = False
+
+
+class AnalyticWaveEngine:
+    """
+    128x128 해석적 스핀파 엔진
+
+    Args:
+        grid_size: 격자 크기
+        extent: 좌표 범위 [-extent, extent]
+        frequency: 파동 주파수 (Hz, 시뮬레이션 시간 단위)
+        use_numexpr: numexpr 융합 평가 사용 여부 (None이면 설치 여부로 결정)
+    """
+
+    def __init__(
+        self,
+        grid_size: int = 128,
+        extent: float = 5.0,
+        frequency: float = 2.0,
+        use_numexpr: Optional[bool] = None
+    ):
+        self.grid_size = grid_size
+        self.frequency = frequency
+        self.use_numexpr = NUMEXPR_AVAILABLE if use_numexpr is None else (use_numexpr and NUMEXPR_AVAILABLE)
+
+        # 정적 기하 구조 (한 번만 계산)
+        x = np.linspace(-extent, extent, grid_size)
+        y = np.linspace(-extent, extent, grid_size)
+        X, Y = np.meshgrid(x, y)
+        self.R = np.sqrt(X**2 + Y**2)
+        self.sin_R = np.sin(self.R)
+        self.cos_R = np.cos(self.R)
+        for array in (self.R, self.sin_R, self.cos_R):
+            array.setflags(write=False)
+
+        # 재사용 버퍼 (잠금 안에서만 사용)
+        self._tmp = np.empty_like(self.R)
+        self._envelope = np.empty_like(self.R)
+        self._envelope_key: Optional[Tuple[float, float]] = None
+        self._lock = threading.Lock()
+
+    def share_memory(self) -> int:
+        """정적 기하 구조를 읽기 전용 공유 세그먼트로 이동 (pre-fork 배포, prefork.py) — 이동한 바이트 수 반환"""
+        from prefork import share_array
+
+        self.R, self.sin_R, self.cos_R = (share_array(a) for a in (self.R, self.sin_R, self.cos_R))
+        return self.R.nbytes * 3
+
+    def _phase(self, t: float) -> float:
+        # f·t를 먼저 [0, 1)로 줄여 큰 epoch 시간에서의 정밀도 손실 방지
+        return 2 * np.pi * ((self.frequency * t) % 1.0)
+
+    def _update_envelope(self, alpha: float, b_ext: float):
+        key = (alpha, b_ext)
+        if key != self._envelope_key:
+            np.multiply(self.R, -0.1 * alpha, out=self._envelope)
+            np.exp(self._envelope, out=self._envelope)
+            self._envelope *= b_ext
+            self._envelope_key = key
+
+    def evaluate(self, alpha: float, b_ext: float, t: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        시간 t의 자기 상태 계산
+
+        Args:
+            alpha: Gilbert 감쇠
+            b_ext: 외부 자기장 크기
+            t: 시간 (초)
+            out: 결과를 쓸 배열 (None이면 새 배열 할당 — 잠금 해제 후 다른 스레드가 덮어쓰지 않도록
+                내부 버퍼를 반환하지 않음)
+
+        Returns:
+            (grid_size, grid_size) 자기 상태 배열
+        """
+        if out is None:
+            out = np.empty_like(self.R)
+        phase = self._phase(t)
+        cos_phase = np.cos(phase)
+        sin_phase = np.sin(phase)
+
+        with self._lock:
+            self._update_envelope(alpha, b_ext)
+            if self.use_numexpr:
+                ne.evaluate(
+                    "(sin_R * c - cos_R * s) * env",
+                    local_dict={
+                        "sin_R": self.sin_R, "cos_R": self.cos_R, "env": self._envelope,
+                        "c": cos_phase, "s": sin_phase
+                    },
+                    out=out
+                )
+            else:
+                np.multiply(self.sin_R, cos_phase, out=out)
+                np.multiply(self.cos_R, sin_phase, out=self._tmp)
+                out -= self._tmp
+                out *= self._envelope
+        return out
+
+
+def legacy_wave_state(alpha: float, b_ext: float, t: float, grid_size: int = 128) -> np.ndarray:
+    """기존 구현 (벤치마크 및 동등성 검증용 기준)"""
+    x = np.linspace(-5, 5, grid_size)
+    y = np.linspace(-5, 5, grid_size)
+    X, Y = np.meshgrid(x, y)
+    R = np.sqrt(X**2 + Y**2)
+    return np.sin(R - 2*np.pi*2.0*t) * np.exp(-0.1 * R * alpha) * b_ext
@@ -3,14 +3,23 @@ Neuro-Twin FastAPI Server with WebSocket Support
 Connects React frontend to MagnonicController backend
 
 API Documentation available at: /docs (Swagger UI) or /redoc (ReDoc)
+
+Heavy components are built lazily (see startup.py): importing this module only
+registers them, and the lifespan warm-up builds them in parallel in the
+background. /health is liveness, /ready turns 200 once warm-up is done.
 """
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import asyncio
 import json
 import os
+from contextlib import asynccontextmanager
 from typing import Optional, List, Dict, Any
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -26,32 +35,111 @@ from biosignal_integration import get_biosignal_integration
 from predictive_model import get_predictive_model
 from game_behavior_processor import GameBehaviorProcessor, GameBehavioralData
 from game_event_parser import parse_game_events
+from ws_protocol import ProtocolError, accept_with_codec, receive_message, send_frames, wait_for_disconnect
+from stream_broadcaster import StreamBroadcaster
+from frame_scheduler import FrameScheduler, InputCoalescer, JitterStats
+from prediction_batcher import PredictionBatcher
+from startup import ComponentRegistry
+from incremental_learning import INCREMENTAL_LEARNING, IncrementalTrainer
+from insight_store import InsightStore
+from streaming_detectors import METRIC_LABELS, event_intervals, get_detector_store, history_metrics, session_metrics
 
 # 환경 변수 검증 (애플리케이션 시작 시)
 validate_environment()
 
-# 생체신호 통합 초기화
-biosignal = get_biosignal_integration()
-
-# 예측 모델 초기화
-predictive_model = get_predictive_model()
-
 # Initialize Rate Limiter
 limiter = Limiter(key_func=get_remote_address)
 
-# Initialize core components
-controller = MagnonicController()
-profile_manager = UserProfileManager()
-tess_loader = TESSDataLoader()
-motion_generator = EmotionalMotionGenerator()
 
-# Try to load TESS dataset if available
-try:
-    tess_count = tess_loader.load()
-    logger.info(f"TESS Dataset loaded: {tess_count} samples")
-except Exception as e:
-    logger.warning(f"TESS Dataset not found or error loading: {e}")
-    tess_count = 0
+# ============== LAZY COMPONENTS ==============
+# Nothing heavy is built at import time. Module-level names below are proxies
+# that build their component on first attribute access (or during warm-up).
+
+components = ComponentRegistry()
+
+
+def _build_behavior_batcher():
+    """동시 /api/behavior 요청의 ML 예측을 한 번의 predict_batch로 묶음 (ML 미사용 시 None)"""
+    decoder = components.get("controller").behavior_decoder
+    if decoder.use_ml and decoder.ml_model is not None:
+        return PredictionBatcher(decoder.ml_model.predict_batch)
+    return None
+
+
+def _build_incremental_trainer():
+    """실제 세션으로 성격 모델을 재학습/승격 (incremental_learning.py, 비활성화 또는 ML 미사용 시 None)"""
+    decoder = components.get("controller").behavior_decoder
+    if INCREMENTAL_LEARNING and decoder.use_ml and decoder.ml_model is not None:
+        return IncrementalTrainer(decoder.ml_model)
+    return None
+
+
+def _build_insight_store():
+    """/api/insights, /api/evolution 응답 구체화 저장소 (insight_store.py)"""
+    return InsightStore(components.get("profile_manager"), components.get("predictive_model"), continuous_learner)
+
+
+def _observe_session(background_tasks: BackgroundTasks, user_id: str):
+    """세션 저장 후 응답을 보낸 뒤 재생 버퍼 갱신 / 재학습 확인, 사용자 인사이트 다시 계산"""
+    background_tasks.add_task(_observe_trainer)
+    background_tasks.add_task(_refresh_insights, user_id)
+
+
+def _observe_trainer():
+    # 백그라운드 스레드에서 실행되므로 아직 없으면 여기서 생성 (STARTUP_WARMUP=off)
+    trainer = components.get("incremental_trainer")
+    if trainer is not None:
+        trainer.observe()
+
+
+def _refresh_insights(user_id: str):
+    components.get("insight_store").refresh_user(user_id)
+
+
+def _build_tess_loader():
+    loader = TESSDataLoader()
+    try:
+        logger.info(f"TESS Dataset loaded: {loader.load()} samples")
+    except Exception as e:
+        logger.warning(f"TESS Dataset not found or error loading: {e}")
+    return loader
+
+
+components.register("controller", MagnonicController)
+components.register("behavior_batcher", _build_behavior_batcher)
+components.register("profile_manager", UserProfileManager)
+components.register("incremental_trainer", _build_incremental_trainer, required=False)
+components.register("predictive_model", get_predictive_model)
+components.register("insight_store", _build_insight_store)
+components.register("detector_store", get_detector_store)
+components.register("biosignal", get_biosignal_integration, required=False)
+components.register("tess_loader", _build_tess_loader, required=False)
+components.register("motion_generator", EmotionalMotionGenerator, required=False)
+
+controller = components.proxy("controller")
+profile_manager = components.proxy("profile_manager")
+predictive_model = components.proxy("predictive_model")
+insight_store = components.proxy("insight_store")
+detector_store = components.proxy("detector_store")
+tess_loader = components.proxy("tess_loader")
+motion_generator = components.proxy("motion_generator")
+
+
+def requires(*names: str):
+    """
+    Route dependency for async endpoints: wait for the named components in the
+    thread pool before the handler touches their proxies, so a request that
+    arrives during background warm-up never blocks the event loop on a build
+    lock. Components that fail to build answer 503.
+    """
+    async def dependency():
+        for name in names:
+            try:
+                await components.aget(name)
+            except Exception:
+                raise HTTPException(status_code=503, detail=f"{name} is not ready", headers={"Retry-After": "1"})
+    return Depends(dependency)
+
 
 # API Metadata for Swagger documentation
 tags_metadata = [
@@ -77,7 +165,35 @@ tags_metadata = [
     },
 ]
 
+# STARTUP_WARMUP: background (default, serve immediately and warm up in parallel),
+# blocking (finish warm-up before accepting requests) or off (build on first use)
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background").lower()
+
+# /api/session fills stress_analysis / anomaly_detection from the streaming
+# detectors; set LEGACY_SESSION_DETECTORS=1 to rescan the recent session list instead
+LEGACY_SESSION_DETECTORS = os.getenv("LEGACY_SESSION_DETECTORS", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if STARTUP_WARMUP == "blocking":
+        await components.warm_up()
+    elif STARTUP_WARMUP != "off":
+        components.start_warm_up()
+    yield
+    built_controller = components.built("controller")
+    if built_controller is not None and built_controller.readout_store is not None:
+        built_controller.readout_store.close()
+    trainer = components.built("incremental_trainer")
+    if trainer is not None:
+        trainer.close()
+    built_insight_store = components.built("insight_store")
+    if built_insight_store is not None:
+        built_insight_store.close()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Neuro-Twin API",
     description="""
 # Behavioral Digital Human Twin API
@@ -127,6 +243,21 @@ app.add_middleware(
 # Initialize continuous learning (controller and profile_manager already initialized above)
 continuous_learner = ContinuousLearner(learning_rate=0.3)
 
+# Demo stream cycle for /ws/stream: each action is held for 50 frames (~1.5s at 30 FPS)
+STREAM_ACTIONS = ["STAND", "WALK", "RUN", "WALK", "STAND"]
+STREAM_FRAMES_PER_ACTION = 50
+
+
+def produce_stream_frame(frame_index: int) -> dict:
+    """Compute one shared /ws/stream frame."""
+    action = STREAM_ACTIONS[(frame_index // STREAM_FRAMES_PER_ACTION + 1) % len(STREAM_ACTIONS)]
+    result = controller.simulate_action_pattern(action)
+    result["current_action"] = action
+    return result
+
+
+stream_broadcaster = StreamBroadcaster(produce_stream_frame)
+
 
 # ============== REQUEST/RESPONSE MODELS ==============
 
@@ -211,7 +342,17 @@ async def health_check(request: Request):
     return {"status": "ok", "controller": "ready"}
 
 
-@app.post("/api/simulate")
+@app.get("/ready", tags=["health"])
+async def readiness_check():
+    """
+    Readiness probe: 200 once every required component is built, 503 while warming up.
+    The body lists each component with its build time.
+    """
+    status = components.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@app.post("/api/simulate", dependencies=[requires("controller")])
 @limiter.limit("60/minute")
 async def simulate(request: Request, sim_request: SimulationRequest):
     """Single simulation request"""
@@ -227,27 +368,34 @@ async def simulate(request: Request, sim_request: SimulationRequest):
         raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
 
 
-@app.post("/api/behavior")
+@app.post("/api/behavior", dependencies=[requires("controller")])
 @limiter.limit("30/minute")
 async def process_behavior(request: Request, profile: BehavioralProfile):
     """Process behavioral interaction metrics"""
     try:
         user_id = profile.contextualChoices.get("user_id") if profile.contextualChoices else None
         log_request("POST", "/api/behavior", user_id=user_id)
-        result = controller.process_behavioral_profile(profile.dict())
+        profile_data = profile.dict()
+        ml_weights = None
+        behavior_batcher = await components.aget("behavior_batcher")
+        if behavior_batcher is not None:
+            decoder = controller.behavior_decoder
+            row = decoder.ml_model.feature_vector(decoder.behavioral_features(profile_data))
+            ml_weights = decoder.ml_model.to_weights(await behavior_batcher.predict(row))
+        result = controller.process_behavioral_profile(profile_data, ml_weights=ml_weights)
         return result
     except Exception as e:
         log_error(e, "process_behavior")
         raise HTTPException(status_code=500, detail=f"Behavior processing failed: {str(e)}")
 
 
-@app.get("/api/behavior/sample/{emotion}")
+@app.get("/api/behavior/sample/{emotion}", dependencies=[requires("tess_loader", "motion_generator")])
 async def get_sample_behavior(emotion: str):
     """
     Get a sample behavioral profile derived from real emotional audio (TESS).
     Useful for testing the digital twin with specific emotional states.
     """
-    if tess_count == 0:
+    if not tess_loader.samples:
         raise HTTPException(status_code=404, detail="TESS dataset not loaded")
     
     try:
@@ -303,9 +451,9 @@ class GameSessionData(BaseModel):
     diversity: float = Field(0.5, ge=0, le=1)
     game_specific_metrics: dict = Field(default_factory=dict)
 
-@app.post("/api/game/events")
+@app.post("/api/game/events", dependencies=[requires("controller", "profile_manager", "predictive_model", "detector_store")])
 @limiter.limit("30/minute")
-async def process_game_raw_events(request: Request, data: GameRawEventsData):
+async def process_game_raw_events(request: Request, data: GameRawEventsData, background_tasks: BackgroundTasks):
     """
     게임 원시 이벤트를 받아서 파싱하고 성격 특성을 추론합니다.
     
@@ -364,7 +512,18 @@ async def process_game_raw_events(request: Request, data: GameRawEventsData):
         confidence = continuous_learner.compute_confidence(len(history), 0.7)
         
         profile_manager.save_profile_evolution(
-            data.user_id, updated_weights, archetype, confidence
+            data.user_id, updated_weights, archetype, confidence,
+            rule_weights=result.get("behavioral_traits", {}).get("rule_weights")
+        )
+        _observe_session(background_tasks, data.user_id)
+        
+        # 스트리밍 감지기: 게임별 세션 지표와 이벤트 간격(이벤트 단위)
+        streaming = predictive_model.assess_streaming(
+            detector_store.observe(data.user_id, f"game:{data.game_id}", session_metrics(behavioral_profile))
+        )
+        intervals, event_indices = event_intervals(data.raw_events)
+        event_observations = detector_store.observe_series(
+            data.user_id, f"events:{data.game_id}", "event_interval", intervals
         )
         
         return {
@@ -374,16 +533,18 @@ async def process_game_raw_events(request: Request, data: GameRawEventsData):
             "updated_weights": updated_weights,
             "archetype": archetype,
             "confidence": confidence,
-            "sync_score": sync_score
+            "sync_score": sync_score,
+            "streaming": streaming,
+            "event_stream": predictive_model.assess_event_stream(event_observations, event_indices)
         }
     except Exception as e:
         log_error(e, "process_game_raw_events", user_id=data.user_id)
         raise HTTPException(status_code=500, detail=f"Game events processing failed: {str(e)}")
 
 
-@app.post("/api/game/session")
+@app.post("/api/game/session", dependencies=[requires("controller", "profile_manager", "predictive_model", "detector_store")])
 @limiter.limit("30/minute")
-async def save_game_session(request: Request, data: GameSessionData):
+async def save_game_session(request: Request, data: GameSessionData, background_tasks: BackgroundTasks):
     """
     게임에서 수집한 행동 데이터를 처리하고 성격 특성을 추론합니다.
     
@@ -444,7 +605,13 @@ async def save_game_session(request: Request, data: GameSessionData):
         confidence = continuous_learner.compute_confidence(len(history), 0.7)
         
         profile_manager.save_profile_evolution(
-            data.user_id, updated_weights, archetype, confidence
+            data.user_id, updated_weights, archetype, confidence,
+            rule_weights=result.get("behavioral_traits", {}).get("rule_weights")
+        )
+        _observe_session(background_tasks, data.user_id)
+        
+        streaming = predictive_model.assess_streaming(
+            detector_store.observe(data.user_id, f"game:{data.game_id}", session_metrics(behavioral_profile))
         )
         
         return {
@@ -454,16 +621,17 @@ async def save_game_session(request: Request, data: GameSessionData):
             "archetype": archetype,
             "confidence": confidence,
             "sync_score": sync_score,
-            "game_specific": behavioral_profile.get("gameSpecific", {})
+            "game_specific": behavioral_profile.get("gameSpecific", {}),
+            "streaming": streaming
         }
     except Exception as e:
         log_error(e, "save_game_session", user_id=data.user_id)
         raise HTTPException(status_code=500, detail=f"Game session processing failed: {str(e)}")
 
 
-@app.post("/api/session")
+@app.post("/api/session", dependencies=[requires("controller", "profile_manager", "predictive_model", "detector_store")])
 @limiter.limit("20/minute")
-async def save_session(request: Request, data: SessionData):
+async def save_session(request: Request, data: SessionData, background_tasks: BackgroundTasks):
     """
     Save a behavioral session for continuous learning.
     Returns updated profile weights after EMA update.
@@ -481,7 +649,7 @@ async def save_session(request: Request, data: SessionData):
         maturity_level = user_data.get("maturity_level", 1)
         
         # Process behavioral traits with maturity context
-        behavior_data = data.behavioral_profile.dict()
+        behavior_data = dict(data.behavioral_profile)
         behavior_data["maturityLevel"] = maturity_level
         
         result = controller.process_behavioral_profile(behavior_data)
@@ -509,8 +677,10 @@ async def save_session(request: Request, data: SessionData):
         
         # Save evolved profile
         profile_manager.save_profile_evolution(
-            data.user_id, updated_weights, archetype, confidence
+            data.user_id, updated_weights, archetype, confidence,
+            rule_weights=result.get("behavioral_traits", {}).get("rule_weights")
         )
+        _observe_session(background_tasks, data.user_id)
         
         # Maturity Advancement Logic
         new_level = maturity_level
@@ -529,7 +699,7 @@ async def save_session(request: Request, data: SessionData):
         audio_analysis = behavior_data.get("audioAnalysis")
         if audio_analysis:
             # 오디오 분석 결과를 행동 프로필에 반영
-            biosignal.process_audio_stream(
+            (await components.aget("biosignal")).process_audio_stream(
                 np.array([]),  # 실제 오디오 데이터는 프론트엔드에서 이미 분석됨
                 sample_rate=44100
             )
@@ -544,10 +714,21 @@ async def save_session(request: Request, data: SessionData):
             "audio_analysis": audio_analysis  # 오디오 분석 데이터 포함
         }
         
-        stress_analysis = predictive_model.detect_stress_pattern(sessions, current_session_data)
-        anomaly_detection = predictive_model.detect_anomaly(sessions, current_session_data)
         behavior_trend = predictive_model.predict_behavioral_trend(sessions + [current_session_data])
         
+        # 스트리밍 감지기 (사용자별 O(1) 상태, 상태가 없는 기존 사용자는 이전 세션으로 초기화)
+        observations = detector_store.observe(
+            data.user_id, "session", session_metrics(behavior_data),
+            seed=lambda: history_metrics([s for s in sessions if s.get("id") != session_id])
+        )
+        streaming = predictive_model.assess_streaming(observations)
+        if LEGACY_SESSION_DETECTORS:
+            stress_analysis = predictive_model.detect_stress_pattern(sessions, current_session_data)
+            anomaly_detection = predictive_model.detect_anomaly(sessions, current_session_data)
+        else:
+            stress_analysis = streaming["stress_analysis"]
+            anomaly_detection = streaming["anomaly_detection"]
+        
         # 알림 트리거 (스트레스, 이상 감지, 레벨업)
         notifications = []
         if stress_analysis.get("stress_level", 0) > 0.6:
@@ -564,6 +745,14 @@ async def save_session(request: Request, data: SessionData):
                 "title": "이상 행동 감지",
                 "message": anomaly_detection.get("recommendation", "이상 행동 패턴이 감지되었습니다.")
             })
+        for change in streaming["change_points"]:
+            notifications.append({
+                "type": "change_point",
+                "severity": "medium",
+                "title": "행동 패턴 변화 감지",
+                "message": f"최근 세션들에서 {METRIC_LABELS.get(change['metric'], change['metric'])}이(가) "
+                           f"지속적으로 {'증가' if change['direction'] == 'increase' else '감소'}했습니다."
+            })
         if new_level > maturity_level:
             notifications.append({
                 "type": "level_up",
@@ -585,7 +774,8 @@ async def save_session(request: Request, data: SessionData):
             "predictive_insights": {
                 "stress_analysis": stress_analysis,
                 "anomaly_detection": anomaly_detection,
-                "behavior_trend": behavior_trend
+                "behavior_trend": behavior_trend,
+                "streaming": streaming
             },
             "notifications": notifications
         }
@@ -594,7 +784,7 @@ async def save_session(request: Request, data: SessionData):
         raise HTTPException(status_code=500, detail=f"Session save failed: {str(e)}")
 
 
-@app.get("/api/profile/{user_id}")
+@app.get("/api/profile/{user_id}", dependencies=[requires("profile_manager")])
 async def get_profile(user_id: str):
     """Get latest cumulative profile for a user."""
     profile = profile_manager.get_latest_profile(user_id)
@@ -613,84 +803,55 @@ async def get_profile(user_id: str):
     }
 
 
-@app.get("/api/insights/{user_id}")
+def _insight_response(request: Request, user_id: str, kind: str) -> Response:
+    """구체화된 응답을 ETag / Last-Modified와 함께 반환 (조건이 맞으면 본문 없이 304)"""
+    entry = insight_store.get(user_id, kind)
+    headers = entry.headers()
+    if entry.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/insights/{user_id}", dependencies=[requires("insight_store")])
 @limiter.limit("30/minute")
 async def get_predictive_insights(request: Request, user_id: str):
     """Get predictive insights for a user (stress, trends, anomalies)"""
     log_request("GET", f"/api/insights/{user_id}", user_id=user_id)
     try:
-        sessions = profile_manager.get_session_history(user_id, limit=10)
-        
-        if len(sessions) < 1:
-            return {
-                "status": "insufficient_data",
-                "message": "최소 1개 세션이 필요합니다",
-                "sessions_needed": 1
-            }
-        
-        # 최근 세션 데이터
-        latest_session = sessions[-1] if sessions else {}
-        
-        # 현재 세션 데이터 준비
-        current_session_data = {
-            "avg_decision_latency": latest_session.get("avg_decision_latency", 0),
-            "revision_rate": latest_session.get("revision_rate", 0),
-            "path_efficiency": latest_session.get("path_efficiency", 1.0),
-            "raw_metrics": latest_session.get("raw_metrics", "{}")
-        }
-        
-        # 예측 모델링 실행
-        stress_analysis = predictive_model.detect_stress_pattern(sessions[:-1] if len(sessions) > 1 else [], current_session_data)
-        anomaly_detection = predictive_model.detect_anomaly(sessions[:-1] if len(sessions) > 1 else [], current_session_data)
-        behavior_trend = predictive_model.predict_behavioral_trend(sessions)
-        
-        return {
-            "status": "success",
-            "stress_analysis": stress_analysis,
-            "anomaly_detection": anomaly_detection,
-            "behavior_trend": behavior_trend
-        }
+        return _insight_response(request, user_id, "insights")
     except Exception as e:
         log_error(e, "get_predictive_insights", user_id=user_id)
         raise HTTPException(status_code=500, detail=f"Insights retrieval failed: {str(e)}")
 
 
-@app.get("/api/evolution/{user_id}")
+@app.get("/api/evolution/{user_id}", dependencies=[requires("insight_store")])
 @limiter.limit("30/minute")
 async def get_evolution(request: Request, user_id: str):
     """Get personality weight evolution over time for visualization."""
     log_request("GET", f"/api/evolution/{user_id}", user_id=user_id)
     try:
-        evolution = profile_manager.get_profile_evolution(user_id)
-        
-        if not evolution:
-            return {"status": "no_history", "user_id": user_id}
-        
-        # Calculate drift
-        drift = continuous_learner.calculate_drift(evolution)
-        
-        # 예측 모델링 추가
-        prediction = predictive_model.predict_personality_evolution(evolution, forecast_days=30)
-        
-        return {
-            "user_id": user_id,
-            "evolution": evolution,
-            "drift_analysis": drift,
-            "data_points": len(evolution),
-            "prediction": prediction
-        }
+        return _insight_response(request, user_id, "evolution")
     except Exception as e:
         log_error(e, "get_evolution", user_id=user_id)
         raise HTTPException(status_code=500, detail=f"Evolution analysis failed: {str(e)}")
 
 
+@app.get("/api/learning/model", tags=["learning"])
+async def get_learning_model():
+    """Incremental personality-model training: serving version, replay buffer, shadow evaluation and promotions."""
+    trainer = await components.aget("incremental_trainer")
+    if trainer is None:
+        return {"enabled": False}
+    return {"enabled": True, **trainer.status()}
+
+
 # ============== GDPR PRIVACY MANAGEMENT ENDPOINTS ==============
 
 class ConsentData(BaseModel):
     consent_record: dict
     timestamp: str
 
-@app.post("/api/user/{user_id}/consent")
+@app.post("/api/user/{user_id}/consent", dependencies=[requires("profile_manager")])
 async def save_consent(user_id: str, data: ConsentData):
     """
     Save user consent record (GDPR compliance).
@@ -706,7 +867,7 @@ async def save_consent(user_id: str, data: ConsentData):
     }
 
 
-@app.get("/api/user/{user_id}/export")
+@app.get("/api/user/{user_id}/export", dependencies=[requires("profile_manager")])
 async def export_user_data(user_id: str):
     """
     GDPR Article 20 - Right to Data Portability.
@@ -716,7 +877,7 @@ async def export_user_data(user_id: str):
     return data
 
 
-@app.delete("/api/user/{user_id}")
+@app.delete("/api/user/{user_id}", dependencies=[requires("profile_manager")])
 async def delete_user_data(user_id: str):
     """
     GDPR Article 17 - Right to be Forgotten.
@@ -726,7 +887,7 @@ async def delete_user_data(user_id: str):
     return result
 
 
-@app.get("/api/user/{user_id}/consent")
+@app.get("/api/user/{user_id}/consent", dependencies=[requires("profile_manager")])
 async def get_consent(user_id: str):
     """Get latest consent status for a user."""
     consent = profile_manager.get_latest_consent(user_id)
@@ -739,6 +900,32 @@ async def get_consent(user_id: str):
     }
 
 
+async def _controller_ready(websocket: WebSocket, client_id: str) -> bool:
+    """Wait for the controller in the thread pool (not on the event loop); close with 1013 if it cannot be built."""
+    try:
+        await components.aget("controller")
+        return True
+    except Exception as e:
+        log_error(e, "websocket_controller", user_id=client_id)
+        await websocket.close(code=1013, reason="Controller is not ready")
+        return False
+
+
+async def _pump_simulation_inputs(websocket: WebSocket, codec, inputs: InputCoalescer):
+    """Read client messages into the coalescing input queue until disconnect."""
+    try:
+        while True:
+            message = await receive_message(websocket)
+            try:
+                inputs.push(codec.decode(message))
+            except ProtocolError as e:
+                inputs.push(e)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        inputs.close()
+
+
 @app.websocket("/ws/simulation")
 async def websocket_simulation(websocket: WebSocket):
     """
@@ -746,20 +933,35 @@ async def websocket_simulation(websocket: WebSocket):
     
     Client sends: {"theta": 0.5, "beta": 0.5} or {"action": "WALK"}
     Server responds: {"joint_angles": [...], "fluidity_index": 0.8, ...}
+    
+    Clients may negotiate the "neurotwin.bin.v1" subprotocol to receive packed
+    float32 kinematics frames instead (see ws_protocol.py).
+    
+    Messages are answered as soon as they are computed, capped at the target
+    frame rate; theta/beta updates that queue up meanwhile are coalesced so
+    only the latest one is processed.
     """
-    await websocket.accept()
+    codec = await accept_with_codec(websocket)
     client_id = f"{websocket.client.host}:{websocket.client.port}" if websocket.client else "unknown"
-    log_websocket_event("connected", client_id=client_id)
+    log_websocket_event("connected", client_id=client_id, subprotocol=codec.subprotocol)
+    if not await _controller_ready(websocket, client_id):
+        return
+    
+    inputs = InputCoalescer()
+    scheduler = FrameScheduler()
+    receiver = asyncio.ensure_future(_pump_simulation_inputs(websocket, codec, inputs))
     
     try:
-        while True:
-            # Receive EEG parameters from client
-            data = await websocket.receive_text()
-            try:
-                params = json.loads(data)
-            except json.JSONDecodeError as e:
-                log_error(e, "websocket_json_parse", user_id=client_id)
-                await websocket.send_json({"error": "Invalid JSON format", "detail": str(e)})
+        while await inputs.wait():
+            # Cap at the target frame rate without adding a fixed delay. Take the
+            # input only afterwards, so theta/beta updates that arrive while
+            # waiting replace the pending one instead of queueing behind it.
+            await scheduler.throttle()
+            params = await inputs.get()
+            
+            if isinstance(params, ProtocolError):
+                log_error(params, "websocket_json_parse", user_id=client_id)
+                await websocket.send_json({"error": "Invalid message format", "detail": str(params)})
                 continue
             
             try:
@@ -774,22 +976,28 @@ async def websocket_simulation(websocket: WebSocket):
                     result = controller.process_eeg_stream(theta, beta)
                 
                 # Send kinematics back to client
-                await websocket.send_json(result)
+                await send_frames(websocket, codec.encode(result))
             except Exception as e:
                 log_error(e, "websocket_processing", user_id=client_id)
                 await websocket.send_json({"error": "Processing failed", "detail": str(e)})
             
-            # Rate limit to ~30 FPS
-            await asyncio.sleep(0.033)
-            
     except WebSocketDisconnect:
-        log_websocket_event("disconnected", client_id=client_id)
+        pass
     except Exception as e:
         log_error(e, "websocket_connection", user_id=client_id)
         try:
             await websocket.close(code=1011, reason="Internal server error")
         except:
             pass
+    finally:
+        receiver.cancel()
+        log_websocket_event(
+            "disconnected",
+            client_id=client_id,
+            frames=scheduler.get_stats(),
+            inputs_received=inputs.received,
+            inputs_coalesced=inputs.coalesced
+        )
 
 
 @app.websocket("/ws/stream")
@@ -797,35 +1005,49 @@ async def websocket_auto_stream(websocket: WebSocket):
     """
     Auto-streaming mode: Server pushes simulation data continuously.
     Useful for demo/visualization without user input.
+    
+    All viewers share a single producer (see stream_broadcaster.py); a slow
+    client drops frames instead of buffering them.
     """
-    await websocket.accept()
+    codec = await accept_with_codec(websocket)
     client_id = f"{websocket.client.host}:{websocket.client.port}" if websocket.client else "unknown"
-    log_websocket_event("auto_stream_connected", client_id=client_id)
+    log_websocket_event("auto_stream_connected", client_id=client_id, subprotocol=codec.subprotocol)
+    if not await _controller_ready(websocket, client_id):
+        return
     
-    actions = ["STAND", "WALK", "RUN", "WALK", "STAND"]
-    action_idx = 0
-    frame_count = 0
+    queue = await stream_broadcaster.subscribe()
+    disconnected = asyncio.ensure_future(wait_for_disconnect(websocket))
+    send_jitter = JitterStats()
+    last_sent = None
     
     try:
         while True:
-            # Cycle through actions every 50 frames (~1.5s each)
-            if frame_count % 50 == 0:
-                action_idx = (action_idx + 1) % len(actions)
+            next_frame = asyncio.ensure_future(queue.get())
+            await asyncio.wait({next_frame, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_frame.cancel()
+                break
             
-            action = actions[action_idx]
-            result = controller.simulate_action_pattern(action)
-            result["current_action"] = action
-            
-            await websocket.send_json(result)
-            frame_count += 1
-            
-            # ~30 FPS
-            await asyncio.sleep(0.033)
+            frame = next_frame.result()
+            await send_frames(websocket, frame.encode(codec))
             
+            # Per-connection jitter: deviation of the send interval from the frame period
+            now = time.monotonic()
+            if last_sent is not None:
+                send_jitter.observe(abs(now - last_sent - stream_broadcaster.scheduler.period))
+            last_sent = now
     except WebSocketDisconnect:
-        log_websocket_event("auto_stream_disconnected", client_id=client_id)
+        pass
+    finally:
+        stream_broadcaster.unsubscribe(queue)
+        disconnected.cancel()
+        log_websocket_event("auto_stream_disconnected", client_id=client_id, jitter=send_jitter.as_dict())
+
+
+logger.info(f"[startup] api_server imported in {(time.perf_counter() - _IMPORT_STARTED) * 1000:.0f} ms")
 
 
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
+
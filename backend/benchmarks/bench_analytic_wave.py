@@ -0,0 +1,37 @@
+"""
+모의(mock) 스핀파 폴백 경로 벤치마크
+기존 구현(매 프레임 meshgrid/sqrt/sin/exp)과 AnalyticWaveEngine 비교
+
+실행: python benchmarks/bench_analytic_wave.py
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytic_wave import NUMEXPR_AVAILABLE, AnalyticWaveEngine, legacy_wave_state
+
+
+def per_call_us(fn, number: int = 500) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+if __name__ == "__main__":
+    alpha, b_ext = 0.035, 0.025
+    t0 = time.time()
+
+    legacy = per_call_us(lambda: legacy_wave_state(alpha, b_ext, t0))
+    print(f"legacy             : {legacy:8.1f} us/frame")
+
+    engine = AnalyticWaveEngine(use_numexpr=False)
+    numpy_us = per_call_us(lambda: engine.evaluate(alpha, b_ext, t0))
+    print(f"engine (numpy)     : {numpy_us:8.1f} us/frame  (x{legacy / numpy_us:.1f})")
+
+    if NUMEXPR_AVAILABLE:
+        fused = AnalyticWaveEngine(use_numexpr=True)
+        fused_us = per_call_us(lambda: fused.evaluate(alpha, b_ext, t0))
+        print(f"engine (numexpr)   : {fused_us:8.1f} us/frame  (x{legacy / fused_us:.1f})")
+    else:
+        print("engine (numexpr)   : numexpr not installed")
@@ -0,0 +1,144 @@
+"""
+/api/behavior 지연 시간 벤치마크
+기존 방식(특성별 RandomForest 4개, n_jobs=-1, 요청마다 1행 예측)과
+다중 출력 모델 + 마이크로배칭(PredictionBatcher)의 p50/p99 비교
+
+실행: python benchmarks/bench_behavior_latency.py [요청 수] [동시 클라이언트 수]
+모드마다 uvicorn 서버를 별도 프로세스로 띄우고 실제 HTTP로 동시 요청을 보냄
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from ml_personality_model import TRAITS
+
+MODES = [
+    ("legacy", "before (4 RF, n_jobs=-1)"),
+    ("unbatched", "multi-output, unbatched"),
+    ("batched", "multi-output + micro-batching"),
+]
+
+
+class LegacyPersonalityModel:
+    """기존 구현: 특성별 단일 출력 RandomForest 4개, 추론 시에도 n_jobs=-1"""
+
+    def __init__(self, model):
+        self.scaler = model.scaler
+        rng = np.random.default_rng(0)
+        X = np.column_stack([
+            rng.uniform(500, 6000, 1000), rng.integers(0, 10, 1000),
+            rng.uniform(0.3, 1.0, 1000), rng.uniform(0.5, 5.0, 1000)
+        ])
+        Y = model.predict_batch(X)
+        X_scaled = self.scaler.transform(X)
+        self.models = {}
+        for i, trait in enumerate(TRAITS):
+            self.models[trait] = RandomForestRegressor(
+                n_estimators=100, max_depth=10, random_state=42, n_jobs=-1
+            ).fit(X_scaled, Y[:, i])
+
+    def predict(self, behavioral_features):
+        X = np.array([[behavioral_features[name] for name in ("latency", "revisions", "efficiency", "intensity")]])
+        X_scaled = self.scaler.transform(X)
+        predictions = {
+            trait: max(0.0, min(1.0, float(self.models[trait].predict(X_scaled)[0]))) for trait in TRAITS
+        }
+        total = predictions["Logic"] + predictions["Intuition"]
+        if total > 0:
+            predictions["Logic"] /= total
+            predictions["Intuition"] /= total
+        return predictions
+
+
+def make_profile(i: int) -> dict:
+    return {
+        "pathEfficiency": 0.3 + (i % 7) * 0.1,
+        "avgDecisionLatency": 800 + (i % 13) * 400,
+        "revisionRate": i % 6,
+        "intensity": 1.0 + (i % 5) * 0.5,
+        "contextualChoices": {"aesthetics": "Zen/Minimal"},
+        "culturalContext": "default"
+    }
+
+
+def serve(mode: str, port: int):
+    """벤치마크 대상 서버 (mode에 따라 모델 / 배칭 구성)"""
+    import uvicorn
+    import api_server
+
+    api_server.limiter.enabled = False
+    decoder = api_server.controller.behavior_decoder
+    if mode == "legacy":
+        decoder.ml_model = LegacyPersonalityModel(decoder.ml_model)
+    if mode != "batched":
+        api_server.components.set("behavior_batcher", None)
+    uvicorn.run(api_server.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def run_load(base_url: str, n_requests: int, concurrency: int) -> np.ndarray:
+    latencies = []
+    counter = iter(range(n_requests))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        async def worker():
+            for i in counter:
+                start = time.perf_counter()
+                response = await client.post("/api/behavior", json=make_profile(i))
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return np.array(latencies) * 1000
+
+
+def wait_ready(base_url: str, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("server did not start")
+
+
+def report(label: str, latencies: np.ndarray, elapsed: float):
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{label:31s}: p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   {len(latencies) / elapsed:6.0f} req/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    port = 8765
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"{n_requests} requests, {concurrency} concurrent clients, {os.cpu_count()} CPUs")
+
+    for mode, label in MODES:
+        server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", mode, str(port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_ready(base_url)
+            asyncio.run(run_load(base_url, 50, concurrency))  # 워밍업
+            start = time.perf_counter()
+            latencies = asyncio.run(run_load(base_url, n_requests, concurrency))
+            report(label, latencies, time.perf_counter() - start)
+        finally:
+            server.terminate()
+            server.wait()
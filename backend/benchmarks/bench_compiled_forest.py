@@ -0,0 +1,56 @@
+"""
+성격 추론 포레스트 벤치마크
+sklearn RandomForestRegressor와 CompiledForest(배열 기반 NumPy 평가기)의 로드 / 추론 시간 비교
+
+실행: python benchmarks/bench_compiled_forest.py
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiled_forest import CompiledForest
+from ml_personality_model import MLPersonalityModel
+
+
+def per_call_us(fn, number: int = 50) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def load_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e3
+
+
+if __name__ == "__main__":
+    model = MLPersonalityModel(use_pretrained=False)
+    forest, compiled = model.model, model.compiled
+    rng = np.random.default_rng(0)
+    X = model.scaler.transform(np.column_stack([
+        rng.uniform(500, 6000, 64), rng.integers(0, 10, 64),
+        rng.uniform(0.3, 1.0, 64), rng.uniform(0.5, 5.0, 64)
+    ]))
+    max_error = np.abs(compiled.predict(X) - forest.predict(X)).max()
+    print(f"{len(forest.estimators_)} trees, {len(compiled.threshold)} nodes, max |diff| = {max_error:.2e}")
+
+    for rows in (1, 64):
+        sk = per_call_us(lambda: forest.predict(X[:rows]))
+        np_us = per_call_us(lambda: compiled.predict(X[:rows]), number=500)
+        print(f"predict {rows:2d} row(s)   : sklearn {sk:8.0f} us   compiled {np_us:7.0f} us   (x{sk / np_us:.0f})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, "model.pkl")
+        compiled_path = os.path.join(tmp, "forest.bin")
+        joblib.dump(forest, pickle_path)
+        compiled.save(compiled_path)
+        pickle_ms = min(load_ms(lambda: joblib.load(pickle_path)) for _ in range(3))
+        mmap_ms = min(load_ms(lambda: CompiledForest.load(compiled_path)) for _ in range(3))
+        print(f"load                : joblib {pickle_ms:8.2f} ms   mmap {mmap_ms:9.2f} ms   "
+              f"({os.path.getsize(pickle_path) / 1e6:.1f} MB / {os.path.getsize(compiled_path) / 1e6:.1f} MB)")
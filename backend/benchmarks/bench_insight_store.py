@@ -0,0 +1,76 @@
+"""
+인사이트 구체화 저장소 벤치마크
+대시보드 폴링 한 번당 비용 비교 (임시 SQLite DB)
+1) 기존 방식: 요청마다 원본 행 조회 + 스트레스 / 이상 / 트렌드 / drift / 30일 예측 계산
+2) InsightStore.get: user_insights 키 조회 한 번 (+ ETag 비교)
+
+실행: python benchmarks/bench_insight_store.py [사용자 수] [사용자당 세션 수]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_profiles
+from insight_store import InsightStore, compute_evolution, compute_insights
+from neuro_controller import ContinuousLearner
+from predictive_model import PredictiveModel
+
+
+def populate(manager, n_users: int, per_user: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    for u in range(n_users):
+        user_id = f"user_{u:05d}"
+        for _ in range(per_user):
+            manager.save_session(user_id, {"summary": {
+                "avgDecisionLatency": float(rng.uniform(500, 6000)),
+                "revisionRate": int(rng.integers(0, 10)),
+                "pathEfficiency": float(rng.uniform(0.3, 1.0))
+            }})
+            weights = dict(zip(("Logic", "Intuition", "Fluidity", "Complexity"), rng.uniform(0, 1, 4).tolist()))
+            manager.save_profile_evolution(user_id, weights, "Balanced", 0.5)
+
+
+def main(n_users: int = 300, per_user: int = 20):
+    with tempfile.TemporaryDirectory() as directory:
+        user_profiles.DB_PATH = os.path.join(directory, "profiles.db")
+        manager = user_profiles.UserProfileManager()
+        populate(manager, n_users, per_user)
+        model, learner = PredictiveModel(), ContinuousLearner(learning_rate=0.3)
+        store = InsightStore(manager, model, learner, refresh_interval=0)
+        user_ids = [f"user_{u:05d}" for u in range(n_users)]
+        print(f"사용자 {n_users:,}명 x 세션 {per_user}개")
+
+        start = time.perf_counter()
+        for user_id in user_ids:
+            compute_insights(manager, model, user_id)
+            compute_evolution(manager, learner, model, user_id)
+        recompute = (time.perf_counter() - start) / n_users
+        print(f"  요청마다 계산:       {recompute * 1e3:8.3f} ms/user")
+
+        start = time.perf_counter()
+        refreshed = store.rebuild()
+        print(f"  rebuild:             {time.perf_counter() - start:8.3f} s ({refreshed:,} entries)")
+
+        etags = {}
+        start = time.perf_counter()
+        for user_id in user_ids:
+            etags[user_id] = store.get(user_id, "insights").etag
+            store.get(user_id, "evolution")
+        read = (time.perf_counter() - start) / n_users
+        print(f"  저장소 조회:         {read * 1e3:8.3f} ms/user  -> {recompute / read:.0f}x")
+
+        start = time.perf_counter()
+        not_modified = sum(store.get(u, "insights").not_modified(etags[u], None) for u in user_ids)
+        print(f"  조건부 조회 (304):   {(time.perf_counter() - start) / n_users * 1e3:8.3f} ms/user, "
+              f"{not_modified}/{n_users} not modified")
+        store.close()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,67 @@
+"""
+OVF 파서 처리량 벤치마크
+128x128x1x3 자기화 필드: 기존 줄 단위 텍스트 파서와 텍스트/바이너리 디코딩 비교
+
+실행: python benchmarks/bench_ovf_parser.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ovf_parser import OVFParser, write_ovf
+
+
+def legacy_parse_text(path: str) -> np.ndarray:
+    """기존 구현: 줄마다 decode + float() 변환"""
+    data_list = []
+    with open(path, "rb") as f:
+        for line in f:
+            line_str = line.decode("utf-8", errors="ignore").strip()
+            if not line_str or line_str.startswith("#"):
+                continue
+            try:
+                values = [float(x) for x in line_str.split()]
+            except ValueError:
+                continue
+            if len(values) >= 3:
+                data_list.append(values[:3])
+    return np.array(data_list)
+
+
+def per_call_ms(fn, number: int = 10) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e3
+
+
+if __name__ == "__main__":
+    parser = OVFParser()
+    field = np.random.default_rng(0).uniform(-1, 1, (128, 128, 1, 3))
+    megabytes = field.size * 8 / 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for data_format in ("text", "binary 4", "binary 8"):
+            paths[data_format] = os.path.join(tmp, data_format.replace(" ", "") + ".ovf")
+            write_ovf(paths[data_format], field, data_format=data_format)
+
+        legacy = per_call_ms(lambda: legacy_parse_text(paths["text"]))
+        print(f"legacy text        : {legacy:8.2f} ms/file  ({megabytes / legacy * 1e3:7.1f} MB/s)")
+
+        cases = [
+            ("text", False),
+            ("binary 4", False),
+            ("binary 8", False),
+            ("binary 4", True),
+        ]
+        for data_format, mmap in cases:
+            path = paths[data_format]
+            # memmap은 매핑 후 실제로 값을 읽는 비용까지 측정
+            fn = (lambda p=path: np.asarray(parser.parse_ovf(p, mmap=True)).sum()) if mmap \
+                else (lambda p=path: parser.parse_ovf(p))
+            ms = per_call_ms(fn)
+            label = f"{data_format}{' (mmap)' if mmap else ''}"
+            print(f"{label:19s}: {ms:8.2f} ms/file  ({megabytes / ms * 1e3:7.1f} MB/s, x{legacy / ms:.0f})")
@@ -0,0 +1,76 @@
+"""
+예측 모델 배치 적합 벤치마크
+1) 요청마다처럼 사용자별로 predict_behavioral_trend / predict_personality_evolution을 호출하는 방식과
+   전체 사용자에 대한 trends_batch / evolution_batch 한 번의 처리 시간 비교
+2) 임시 SQLite DB의 profile_evolution 전체에 대한 predict_all_users (야간 인사이트 작업) 처리 시간
+
+실행: python benchmarks/bench_predictive_batch.py [사용자 수] [사용자당 기록 수]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictive_model import WEIGHT_KEYS, PredictiveModel
+
+
+def synthetic_history(n_users: int, per_user: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    user_index = np.repeat(np.arange(n_users), per_user)
+    offsets = np.sort(rng.integers(0, 90 * 86400, (n_users, per_user)), axis=1).ravel()
+    timestamps = np.datetime64("2026-01-01T00:00:00", "s") + offsets.astype("timedelta64[s]")
+    weights = rng.uniform(0, 1, (len(user_index), 4))
+    return user_index, np.datetime_as_string(timestamps).astype(object), weights
+
+
+def main(n_users: int = 2000, per_user: int = 20):
+    model = PredictiveModel()
+    user_index, timestamps, weights = synthetic_history(n_users, per_user)
+    histories = [[] for _ in range(n_users)]
+    for u, ts, row in zip(user_index.tolist(), timestamps.tolist(), weights.tolist()):
+        histories[u].append({**dict(zip(WEIGHT_KEYS, row)), "timestamp": ts})
+    print(f"사용자 {n_users:,}명 x 기록 {per_user}개")
+
+    start = time.perf_counter()
+    for history in histories:
+        model.predict_behavioral_trend(history)
+        model.predict_personality_evolution(history)
+    per_user_seconds = time.perf_counter() - start
+    print(f"  사용자별 호출:  {per_user_seconds:8.3f}s ({per_user_seconds / n_users * 1e6:8.1f} µs/user)")
+
+    start = time.perf_counter()
+    model.trends_batch(user_index, weights, n_users)
+    model.evolution_batch(user_index, timestamps, weights, n_users)
+    batch_seconds = time.perf_counter() - start
+    print(f"  배치:           {batch_seconds:8.3f}s ({batch_seconds / n_users * 1e6:8.1f} µs/user)"
+          f"  -> {per_user_seconds / batch_seconds:.0f}x")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = sqlite3.connect(os.path.join(directory, "profiles.db"))
+        conn.execute(f"""
+            CREATE TABLE profile_evolution (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, timestamp TIMESTAMP,
+                {', '.join(f'{key} REAL' for key in WEIGHT_KEYS)}
+            )
+        """)
+        conn.executemany(
+            f"INSERT INTO profile_evolution (user_id, timestamp, {', '.join(WEIGHT_KEYS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            ((f"user_{u:06d}", ts, *row) for u, ts, row in zip(user_index.tolist(), timestamps.tolist(), weights.tolist()))
+        )
+        conn.commit()
+
+        start = time.perf_counter()
+        results = model.predict_all_users(conn)
+        all_seconds = time.perf_counter() - start
+        conn.close()
+    print(f"  predict_all_users (DB 읽기 포함): {all_seconds:.3f}s, 사용자 {len(results):,}명")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,56 @@
+"""
+ReservoirReadout 학습 벤치마크
+샘플별 Hebbian 외적 갱신과 closed-form ridge(dual) / 축소 공간 RLS 비교
+
+실행: python benchmarks/bench_readout_fit.py [프레임 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_controller import ReservoirReadout
+
+
+def timed(label, fn, readout):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    mse = np.mean((states @ readout.W_out.T + readout.bias - targets) ** 2)
+    print(f"{label:28s}: {elapsed:8.2f} s   train MSE {mse:.4f}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(0)
+    states = rng.normal(size=(n, 128 * 128)).astype(np.float32)
+    targets = rng.normal(size=(n, 20))
+    print(f"{n} frames of 128x128 -> 20 joints")
+
+    hebbian = ReservoirReadout()
+    # 기본 학습률(0.001)은 |m|^2 ~ 16384인 상태에서 발산하므로 안정 한계 안의 값 사용
+    learning_rate = 1.0 / states.shape[1]
+
+    def hebbian_epoch():
+        for m, y in zip(states, targets):
+            hebbian.update_hebbian(m, hebbian.predict(m), y, learning_rate=learning_rate)
+
+    timed("hebbian (1 epoch)", hebbian_epoch, hebbian)
+
+    ridge = ReservoirReadout()
+    timed("fit (dual ridge)", lambda: ridge.fit(states, targets), ridge)
+    with_basis = ReservoirReadout()
+    timed("fit + 64-dim basis", lambda: with_basis.fit(states, targets, basis_rank=64), with_basis)
+
+    with_basis.enable_rls(rank=64)
+
+    def rls_pass():
+        for m, y in zip(states, targets):
+            with_basis.update_rls(m, y, apply=False)
+        with_basis.apply_rls()
+
+    timed("rls (1 pass, deferred apply)", rls_pass, with_basis)
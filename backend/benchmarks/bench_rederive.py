@@ -0,0 +1,128 @@
+"""
+profile_evolution 재계산 벤치마크
+1) 세션마다 decode / update_weights / generate_archetype / compute_confidence를 호출하는 방식과
+   rederive_profiles.replay(세션 순번 단위 배치)의 세션당 처리 시간 비교 (DB 입출력 제외)
+2) 임시 SQLite DB에 세션을 만들고 rederive 전체(청크 읽기 → 재생 → 섀도 테이블 기록 → 교체) 처리량 측정
+   (목표: 노트북에서 100k sessions/min 이상)
+
+실행: python benchmarks/bench_rederive.py [세션 수] [사용자 수] [워커 수]
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_controller import BehavioralPersonalityDecoder, ContinuousLearner
+import user_profiles
+from rederive_profiles import SessionTable, predict_all, rederive, replay
+
+CULTURES = np.array(["east_asian", "western", "latin_american", "middle_eastern", None], dtype=object)
+
+
+def synthetic_sessions(n: int, n_users: int, seed: int = 0) -> SessionTable:
+    rng = np.random.default_rng(seed)
+    user_index = np.sort(rng.integers(0, n_users, n))
+    n_users = len(np.unique(user_index))
+    user_index = np.unique(user_index, return_inverse=True)[1]
+    starts = np.flatnonzero(np.r_[True, user_index[1:] != user_index[:-1]])
+    features = np.column_stack([
+        rng.uniform(200, 7000, n), rng.integers(0, 8, n), rng.uniform(0, 1, n), rng.uniform(0.2, 3, n)
+    ])
+    return SessionTable(
+        ids=np.arange(1, n + 1),
+        user_ids=np.array([f"user-{i}" for i in range(n_users)], dtype=object),
+        user_index=user_index,
+        ordinals=np.arange(n) - starts[user_index],
+        timestamps=[None] * n,
+        features=features,
+        task_completion=rng.uniform(0, 1, n),
+        cultures=CULTURES[rng.integers(0, len(CULTURES), n)],
+        is_game=rng.uniform(0, 1, n) < 0.2
+    )
+
+
+def per_session_loop(sessions: SessionTable, decoder, learner):
+    """기존 방식: 세션마다 딕셔너리 기반 호출 (ML 예측 포함, 성숙도 1 고정)"""
+    previous = {}
+    for i in range(len(sessions.ids)):
+        latency, revisions, efficiency, intensity = sessions.features[i].tolist()
+        profile = {
+            "avgDecisionLatency": latency, "revisionRate": revisions, "pathEfficiency": efficiency,
+            "intensity": intensity, "taskCompletion": float(sessions.task_completion[i]),
+            "culturalContext": sessions.cultures[i]
+        }
+        weights = decoder.decode(profile)["traits"]["weights"]
+        user = sessions.user_index[i]
+        if user in previous:
+            weights = learner.update_weights(previous[user], weights)
+        previous[user] = weights
+        learner.generate_archetype(weights)
+        learner.compute_confidence(min(int(sessions.ordinals[i]) + 1, 10), 0.7)
+
+
+def build_db(path: str, sessions: SessionTable):
+    """세션 테이블을 behavioral_sessions에 기록 (raw_metrics JSON 포함)"""
+    user_profiles.DB_PATH = path
+    user_profiles.init_database()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany("INSERT INTO users (id) VALUES (?)", [(u,) for u in sessions.user_ids])
+        conn.executemany(
+            "INSERT INTO behavioral_sessions (user_id, raw_metrics) VALUES (?, ?)",
+            ((sessions.user_ids[sessions.user_index[i]], json.dumps({
+                "avgDecisionLatency": row[0], "revisionRate": row[1], "pathEfficiency": row[2],
+                "intensity": row[3], "taskCompletion": float(sessions.task_completion[i]),
+                "culturalContext": sessions.cultures[i]
+            })) for i, row in enumerate(sessions.features.tolist()))
+        )
+    conn.close()
+
+
+def end_to_end(sessions: SessionTable, workers: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "profiles.db")
+        build_db(path, sessions)
+        for use_ml in (False, True):
+            conn = user_profiles.get_connection()
+            summary = rederive(conn, BehavioralPersonalityDecoder(use_ml=use_ml), ContinuousLearner(),
+                               workers=workers, db_path=path)
+            conn.close()
+            name = "ml" if use_ml else "rule-based"
+            print(f"{name:10s}  rederive ({workers} workers, {summary['chunks']} chunks)  "
+                  f"{summary['sessions_per_minute']:>12,} sessions/min  ({summary['total_seconds']:.1f} s total)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_users = int(sys.argv[2]) if len(sys.argv) > 2 else n // 50
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    learner = ContinuousLearner()
+    sessions = synthetic_sessions(n, n_users)
+    loop_sessions = synthetic_sessions(min(n, 20_000), max(min(n, 20_000) // 50, 1))
+    print(f"{n} sessions, {len(sessions.user_ids)} users (loop baseline on {len(loop_sessions.ids)} sessions)")
+
+    for use_ml in (False, True):
+        decoder = BehavioralPersonalityDecoder(use_ml=use_ml)
+        start = time.perf_counter()
+        per_session_loop(loop_sessions, decoder, learner)
+        loop_us = (time.perf_counter() - start) / len(loop_sessions.ids) * 1e6
+
+        start = time.perf_counter()
+        predict_all(decoder, sessions.features)
+        predict_s = time.perf_counter() - start
+        start = time.perf_counter()
+        replay(sessions, decoder, learner)
+        batch_s = time.perf_counter() - start
+        batch_us = batch_s / n * 1e6
+
+        name = "ml" if use_ml else "rule-based"
+        print(f"{name:10s}  per-session loop {loop_us:7.2f} us/session  |  replay {batch_us:6.2f} us/session "
+              f"({batch_s:.2f} s total, of which ML predict {predict_s:.2f} s, {loop_us / batch_us:.0f}x)")
+
+    end_to_end(sessions, workers)
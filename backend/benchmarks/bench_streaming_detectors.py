@@ -0,0 +1,82 @@
+"""
+스트리밍 감지기 벤치마크
+1) 세션 하나 평가: 최근 세션 목록 기반 detect_stress_pattern + detect_anomaly (JSON 재해석 포함) vs
+   DetectorSet 갱신 + assess_streaming
+2) 게임 이벤트 단위 갱신 (지표 하나 관측당 시간)
+3) DetectorStore.observe (임시 SQLite DB 읽기 → 갱신 → 쓰기) 요청당 시간과 직렬화 크기
+
+실행: python benchmarks/bench_streaming_detectors.py [세션 수] [이벤트 수]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_profiles
+from predictive_model import PredictiveModel
+from streaming_detectors import DetectorSet, DetectorStore
+
+
+def synthetic_sessions(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    sessions = []
+    for _ in range(n):
+        profile = {
+            "avgDecisionLatency": float(rng.normal(1500, 200)), "revisionRate": int(rng.poisson(2)),
+            "pathEfficiency": float(rng.uniform(0.7, 0.95))
+        }
+        sessions.append({
+            "avg_decision_latency": profile["avgDecisionLatency"], "revision_rate": profile["revisionRate"],
+            "path_efficiency": profile["pathEfficiency"], "raw_metrics": json.dumps({"summary": profile})
+        })
+    return sessions
+
+
+def main(n_sessions: int = 5000, n_events: int = 200000):
+    model = PredictiveModel()
+    sessions = synthetic_sessions(n_sessions)
+    metrics = ("avg_decision_latency", "revision_rate", "path_efficiency")
+
+    start = time.perf_counter()
+    for i in range(10, n_sessions):
+        history = sessions[i - 10:i]
+        model.detect_stress_pattern(history, sessions[i])
+        model.detect_anomaly(history, sessions[i])
+    list_based = (time.perf_counter() - start) / (n_sessions - 10)
+
+    detectors = DetectorSet()
+    start = time.perf_counter()
+    for session in sessions:
+        model.assess_streaming(detectors.update({metric: session[metric] for metric in metrics}))
+    streaming = (time.perf_counter() - start) / n_sessions
+    print(f"세션 평가: 목록 기반 {list_based * 1e6:7.1f} µs, 스트리밍 {streaming * 1e6:7.1f} µs "
+          f"({list_based / streaming:.1f}x)")
+
+    intervals = np.random.default_rng(1).lognormal(6, 0.4, n_events).tolist()
+    events = DetectorSet()
+    start = time.perf_counter()
+    events.update_series("event_interval", intervals)
+    per_event = (time.perf_counter() - start) / n_events
+    print(f"이벤트 단위 갱신: {per_event * 1e6:.2f} µs/event ({1 / per_event:,.0f} events/s)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        user_profiles.DB_PATH = os.path.join(directory, "profiles.db")
+        user_profiles.init_database()
+        store = DetectorStore()
+        n = min(n_sessions, 2000)
+        start = time.perf_counter()
+        for i, session in enumerate(sessions[:n]):
+            store.observe(f"user_{i % 100:03d}", "session", {metric: session[metric] for metric in metrics})
+        per_request = (time.perf_counter() - start) / n
+        size = len(store.load("user_000", "session").to_bytes())
+    print(f"DetectorStore.observe: {per_request * 1e3:.3f} ms/request, 상태 {size} bytes/user (지표 3개)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,117 @@
+"""
+워커당 메모리 측정 (gunicorn pre-fork 배포와 같은 방식으로 os.fork)
+- per-worker: 워커마다 api_server를 import하고 구성요소를 직접 생성 (preload 없음)
+- prefork   : 마스터가 구성요소를 생성하고 prepare_fork() 후 fork (gunicorn.conf.py의 preload)
+각 워커는 시뮬레이션 / 성격 추론 / TESS 조회를 실행한 뒤 /proc/<pid>/smaps_rollup으로 측정
+
+RSS: 워커가 매핑한 전체 페이지, PSS: 공유 페이지를 공유 프로세스 수로 나눈 몫,
+USS: 워커 전용 페이지 (워커 하나를 추가할 때 실제로 늘어나는 메모리)
+
+실행: python benchmarks/bench_worker_memory.py [워커 수]
+"""
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+MODES = ("per-worker", "prefork")
+
+
+def memory_usage(pid: int) -> dict:
+    """smaps_rollup의 RSS / PSS / USS (MB)"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def exercise(components):
+    """요청 처리와 같은 경로로 공유 상태를 읽음"""
+    import gc
+
+    import numpy as np
+
+    controller = components.get("controller")
+    for k in range(50):
+        controller.process_eeg_stream(k / 50, 1 - k / 50, t=k * 0.01)
+    model = controller.behavior_decoder.ml_model
+    if model is not None:
+        model.predict_batch(np.tile([[2500, 2, 0.8, 1.5]], (64, 1)))
+    tess = components.built("tess_loader")
+    if tess is not None and len(tess.samples):
+        tess.get_random_samples(20)
+    gc.collect()
+
+
+def run_mode(mode: str, n_workers: int) -> dict:
+    """이 프로세스를 마스터로 워커를 fork하고 측정"""
+    if mode == "prefork":
+        import api_server
+        from prefork import prepare_fork
+
+        prepare_fork(api_server.components)
+
+    ready_r, ready_w = os.pipe()
+    stop_r, stop_w = os.pipe()
+    pids = []
+    for _ in range(n_workers):
+        pid = os.fork()
+        if pid == 0:
+            if mode == "prefork":
+                from prefork import after_fork
+
+                after_fork()
+            else:
+                import api_server
+
+                api_server.components.build_all()
+            exercise(api_server.components)
+            os.write(ready_w, b"r")
+            os.read(stop_r, 1)
+            os._exit(0)
+        pids.append(pid)
+
+    for _ in pids:
+        os.read(ready_r, 1)
+    workers = [memory_usage(pid) for pid in pids]
+    master = memory_usage(os.getpid())
+    os.write(stop_w, b"s" * n_workers)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    return {"master": master, "workers": workers}
+
+
+def report(mode: str, result: dict):
+    workers = result["workers"]
+    avg = {key: sum(w[key] for w in workers) / len(workers) for key in ("rss", "pss", "uss")}
+    total = result["master"]["pss"] + sum(w["pss"] for w in workers)
+    print(f"{mode:10s}  RSS {avg['rss']:7.1f}  PSS {avg['pss']:7.1f}  USS {avg['uss']:7.1f}  "
+          f"| master PSS {result['master']['pss']:6.1f}  total PSS {total:7.1f}  "
+          f"| workers per GB ≈ {1024 / avg['uss']:.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        # 모드마다 새 인터프리터에서 실행 (이전 모드의 import/할당 영향 배제)
+        os.chdir(BACKEND_DIR)
+        print(json.dumps(run_mode(sys.argv[2], int(sys.argv[3]))))
+        sys.exit(0)
+
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(f"{n_workers} workers, MB per worker (avg)")
+    for mode in MODES:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode, str(n_workers)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+        report(mode, json.loads(proc.stdout.strip().splitlines()[-1]))
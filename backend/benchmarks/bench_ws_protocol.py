@@ -0,0 +1,45 @@
+"""
+WebSocket 프레임 직렬화 벤치마크
+JSON 프레임과 neurotwin.bin.v1 바이너리 프레임의 CPU 시간 및 크기 비교
+
+실행: python benchmarks/bench_ws_protocol.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_controller import MagnonicController
+from ws_protocol import BinaryFrameCodec, JSONFrameCodec
+
+
+def bench(codec, results, repeat: int = 5):
+    """코덱별 프레임당 평균 인코딩 시간(us)과 바이트 수"""
+    best = float("inf")
+    total_bytes = 0
+    for _ in range(repeat):
+        total_bytes = 0
+        start = time.perf_counter()
+        for result in results:
+            for frame in codec.encode(result):
+                total_bytes += len(frame)
+        best = min(best, time.perf_counter() - start)
+    return best / len(results) * 1e6, total_bytes / len(results)
+
+
+if __name__ == "__main__":
+    controller = MagnonicController()
+    actions = ["STAND", "WALK", "RUN"]
+    results = []
+    for i in range(300):
+        result = controller.simulate_action_pattern(actions[(i // 50) % len(actions)])
+        result["current_action"] = actions[(i // 50) % len(actions)]
+        results.append(result)
+
+    json_us, json_bytes = bench(JSONFrameCodec(), results)
+    bin_us, bin_bytes = bench(BinaryFrameCodec(), results)
+
+    print(f"JSON   : {json_us:8.2f} us/frame, {json_bytes:8.1f} bytes/frame")
+    print(f"Binary : {bin_us:8.2f} us/frame, {bin_bytes:8.1f} bytes/frame")
+    print(f"Speedup: CPU x{json_us / bin_us:.1f}, bandwidth x{json_bytes / bin_bytes:.1f}")
@@ -0,0 +1,52 @@
+"""
+API 서버 시작 시간 프로파일
+1) python -X importtime으로 `import api_server`의 모듈별 import 시간 (누적 기준 상위 N개)
+2) lifespan 워밍업과 같은 방식으로 구성요소를 병렬 생성하고 구성요소별 생성 시간 출력
+
+실행: python benchmarks/profile_startup.py [상위 N개]
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def profile_imports(top: int):
+    """새 인터프리터에서 import 시간을 측정 (이미 import된 모듈의 영향 배제)"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api_server"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        rows.append((int(cumulative_us), int(self_us), name))
+
+    total = next((cum for cum, _, name in rows if name == "api_server"), 0)
+    print(f"import api_server: {total / 1000:.0f} ms (process wall time {wall * 1000:.0f} ms)")
+    print(f"{'cumulative':>12s} {'self':>10s}  module")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:10.1f}ms {self_us / 1000:8.1f}ms  {name}")
+
+
+def profile_warm_up():
+    import api_server
+
+    asyncio.run(api_server.components.warm_up())
+    status = api_server.components.status()
+    print(f"\nwarm-up (parallel): {status['warmup_ms']:.0f} ms, ready={status['ready']}")
+    for name, info in sorted(status["components"].items(), key=lambda kv: -(kv[1]["ms"] or 0)):
+        print(f"  {name:18s} {info['ms'] or 0:8.1f} ms{'' if info['required'] else '  (optional)'}")
+
+
+if __name__ == "__main__":
+    profile_imports(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
+    profile_warm_up()
@@ -0,0 +1,182 @@
+"""
+RandomForest 컴파일 모듈
+학습된 sklearn RandomForestRegressor를 연속된 NumPy 배열로 펼쳐 순수 NumPy로 평가
+
+- 모든 트리의 노드를 하나의 배열 집합(feature, threshold, left, right, value)으로 연결
+- 리프 노드는 자기 자신을 자식으로 가리키므로 최대 깊이만큼 분기 없이 반복하면 모든 행이 리프에 도달
+- 평가 규칙은 sklearn과 동일 (입력을 float32로 변환 후 x[feature] <= threshold이면 왼쪽)
+- 직렬화 파일은 정렬된 원시 배열 블록이라 np.memmap으로 복사 없이 로드
+"""
+import json
+import os
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"NTFOREST"
+ALIGNMENT = 64
+FOREST_ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+
+
+class CompiledForest:
+    """
+    배열 기반 랜덤 포레스트 평가기
+
+    Args:
+        feature: (n_nodes,) 분기 특징 인덱스 (리프는 0)
+        threshold: (n_nodes,) 분기 임계값 (float64)
+        left, right: (n_nodes,) 자식 노드의 전역 인덱스 (리프는 자기 자신)
+        value: (n_nodes, n_outputs) 노드 예측값
+        roots: (n_trees,) 트리별 루트 노드 인덱스
+        depth: 가장 깊은 트리의 깊이
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        """학습된 RandomForestRegressor(단일/다중 출력)를 펼침"""
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        n_nodes = sum(tree.node_count for tree in trees)
+        n_outputs = trees[0].n_outputs
+
+        feature = np.zeros(n_nodes, dtype=np.int32)
+        threshold = np.zeros(n_nodes, dtype=np.float64)
+        left = np.empty(n_nodes, dtype=np.int32)
+        right = np.empty(n_nodes, dtype=np.int32)
+        value = np.empty((n_nodes, n_outputs), dtype=np.float64)
+        roots = np.empty(len(trees), dtype=np.int32)
+
+        offset = 0
+        for i, tree in enumerate(trees):
+            count = tree.node_count
+            nodes = slice(offset, offset + count)
+            own = np.arange(offset, offset + count, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+
+            feature[nodes] = np.where(is_leaf, 0, tree.feature)
+            threshold[nodes] = np.where(is_leaf, 0.0, tree.threshold)
+            left[nodes] = np.where(is_leaf, own, tree.children_left + offset)
+            right[nodes] = np.where(is_leaf, own, tree.children_right + offset)
+            value[nodes] = tree.value.reshape(count, n_outputs)
+            roots[i] = offset
+            offset += count
+
+        depth = max(tree.max_depth for tree in trees)
+        return cls(feature, threshold, left, right, value, roots, depth)
+
+    @property
+    def n_outputs(self) -> int:
+        return self.value.shape[1]
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """(n_samples, n_trees) 리프 노드 인덱스"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        트리 예측값 평균 (sklearn RandomForestRegressor.predict와 같은 형태)
+        단일 출력이면 (n_samples,), 다중 출력이면 (n_samples, n_outputs)
+        """
+        leaves = self.apply(X)
+        # 합산 순서가 sklearn(트리 순서대로 누적)과 달라 마지막 자릿수(~1e-16)만 다를 수 있음
+        mean = self.value[leaves].sum(axis=1) / leaves.shape[1]
+        return mean[:, 0] if self.n_outputs == 1 else mean
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in FOREST_ARRAYS}
+
+    def save(self, path: str, extras: Optional[Dict[str, np.ndarray]] = None):
+        """포레스트 배열과 추가 배열(예: 스케일러 파라미터)을 한 파일에 원자적으로 저장"""
+        arrays = self.to_arrays()
+        for name, array in (extras or {}).items():
+            arrays[f"extra.{name}"] = np.asarray(array)
+        save_arrays(path, arrays, {"depth": self.depth})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Tuple["CompiledForest", Dict[str, np.ndarray]]:
+        """저장된 포레스트 로드 (mmap=True이면 읽기 전용 메모리 매핑)"""
+        arrays, meta = load_arrays(path, mmap=mmap)
+        forest = cls(*(arrays[name] for name in FOREST_ARRAYS), depth=meta["depth"])
+        extras = {name[len("extra."):]: array for name, array in arrays.items() if name.startswith("extra.")}
+        return forest, extras
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_arrays(path: str, arrays: Dict[str, np.ndarray], meta: Optional[Dict] = None):
+    """
+    MAGIC | u64 헤더 길이 | JSON 헤더 | ALIGNMENT 단위로 정렬된 C-연속 배열 블록
+    임시 파일에 쓴 뒤 os.replace로 교체
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({"arrays": entries, "meta": meta or {}}).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + entries[name]["offset"])
+                f.write(array.tobytes())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_arrays(path: str, mmap: bool = True) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """save_arrays로 저장한 파일 로드 (mmap=True이면 배열은 파일을 직접 가리키는 읽기 전용 뷰)"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a compiled array file")
+        header_len = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_len))
+        data_start = _aligned(len(MAGIC) + 8 + header_len)
+        buffer = None if mmap else f.read()
+
+    if mmap:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        base = data_start
+    else:
+        buffer = np.frombuffer(buffer, dtype=np.uint8)
+        base = data_start - len(MAGIC) - 8 - header_len
+
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        start = base + entry["offset"]
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if start + nbytes > len(buffer):
+            raise ValueError(f"{path} is truncated ({name})")
+        arrays[name] = buffer[start:start + nbytes].view(dtype).reshape(shape)
+    return arrays, header["meta"]
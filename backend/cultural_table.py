@@ -0,0 +1,161 @@
+"""
+문화권별 성격 가중치 보정 테이블 (cultural_weights.json을 로드 시 한 번 컴파일)
+
+- 문화권마다 (Logic, Intuition, Fluidity, Complexity) 보정 벡터와 원형(archetype) 이름 3개를 보관
+- 테이블은 생성 후 변경되지 않으므로(읽기 전용 배열, MappingProxyType) 여러 스레드에서 잠금 없이 공유
+- apply() / archetype()은 (가중치, 문화권)만으로 결과가 정해지는 순수 함수,
+  apply_batch()는 같은 계산을 (n, 4) 배열로 한 번에 수행
+"""
+import json
+import logging
+import os
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CULTURAL_WEIGHTS_PATH = os.path.join(os.path.dirname(__file__), "cultural_weights.json")
+DEFAULT_CULTURE = "default"
+TRAIT_ORDER = ("Logic", "Intuition", "Fluidity", "Complexity")
+# 원형 판단 순서: high_logic_high_complexity → high_intuition_high_fluidity → balanced
+ARCHETYPE_KEYS = ("high_logic_high_complexity", "high_intuition_high_fluidity", "balanced")
+FALLBACK_ARCHETYPE = "Balanced & Steady"
+
+# 보정 후 범위: Intuition은 감소만 하므로 하한 0, 나머지는 증가만 하므로 상한 1
+_LOWER = np.array([-np.inf, 0.0, -np.inf, -np.inf])
+_UPPER = np.array([1.0, np.inf, 1.0, 1.0])
+_LOWER.setflags(write=False)
+_UPPER.setflags(write=False)
+
+
+class CultureEntry(NamedTuple):
+    """컴파일된 문화권 하나 (offsets: TRAIT_ORDER 순서의 가산 보정)"""
+    name: str
+    index: int
+    offsets: Tuple[float, float, float, float]
+    archetypes: Tuple[str, str, str]
+
+
+def _compile_entry(name: str, index: int, config: Mapping) -> CultureEntry:
+    modifiers = config.get("modifiers", {})
+    latency = modifiers.get("latency_interpretation", {})
+    revision = modifiers.get("revision_interpretation", {})
+    efficiency = modifiers.get("efficiency_interpretation", {})
+    offsets = (
+        float(latency.get("logic_weight_boost", 0.0)),
+        -float(latency.get("intuition_weight_reduction", 0.0)),
+        float(efficiency.get("fluidity_weight_boost", 0.0)),
+        float(revision.get("complexity_weight_boost", 0.0)),
+    )
+    mappings = config.get("archetype_mappings", {})
+    archetypes = tuple(mappings.get(key, FALLBACK_ARCHETYPE) for key in ARCHETYPE_KEYS)
+    return CultureEntry(name, index, offsets, archetypes)
+
+
+class CulturalTable:
+    """
+    불변 문화권 보정 테이블
+
+    Args:
+        cultures: cultural_weights.json의 "cultures" 항목 (문화권 이름 → 설정)
+    """
+
+    def __init__(self, cultures: Mapping[str, Mapping]):
+        names = list(cultures)
+        if DEFAULT_CULTURE not in cultures:
+            names.append(DEFAULT_CULTURE)  # 보정 없음, 원형은 FALLBACK_ARCHETYPE
+        entries = {
+            name: _compile_entry(name, i, cultures.get(name, {}))
+            for i, name in enumerate(names)
+        }
+        self.entries: Mapping[str, CultureEntry] = MappingProxyType(entries)
+        self.names: Tuple[str, ...] = tuple(names)
+        # (n_cultures, 4) 보정 행렬과 (n_cultures, 3) 원형 이름 (배치 처리용)
+        self.offsets = np.array([entries[name].offsets for name in names], dtype=np.float64)
+        self.archetypes = np.array([entries[name].archetypes for name in names], dtype=object)
+        self.offsets.setflags(write=False)
+        self.archetypes.setflags(write=False)
+
+    @classmethod
+    def from_file(cls, path: str = CULTURAL_WEIGHTS_PATH) -> "CulturalTable":
+        """JSON 설정에서 생성 (파일이 없거나 잘못되면 default만 있는 테이블)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cultures = json.load(f).get("cultures", {})
+        except FileNotFoundError:
+            logger.warning(f"[CulturalTable] {path} not found, using defaults")
+            cultures = {}
+        except Exception as e:
+            logger.error(f"[CulturalTable] Error loading cultural weights: {e}")
+            cultures = {}
+        return cls(cultures)
+
+    def __contains__(self, culture: object) -> bool:
+        return culture in self.entries
+
+    def available(self) -> list:
+        """설정 파일에 정의된 문화권 목록"""
+        return list(self.names)
+
+    def resolve(self, culture: Optional[str], fallback: str = DEFAULT_CULTURE) -> CultureEntry:
+        """문화권 이름 → 항목 (알 수 없거나 None이면 fallback, 그것도 없으면 default)"""
+        entry = self.entries.get(culture) if culture is not None else None
+        if entry is None:
+            entry = self.entries.get(fallback) or self.entries[DEFAULT_CULTURE]
+        return entry
+
+    @staticmethod
+    def apply(weights: Mapping[str, float], entry: CultureEntry) -> Dict[str, float]:
+        """기본 가중치에 문화권 보정 적용 (입력은 변경하지 않음)"""
+        logic, intuition, fluidity, complexity = entry.offsets
+        return {
+            "Logic": min(weights["Logic"] + logic, 1.0),
+            "Intuition": max(weights["Intuition"] + intuition, 0.0),
+            "Fluidity": min(weights["Fluidity"] + fluidity, 1.0),
+            "Complexity": min(weights["Complexity"] + complexity, 1.0)
+        }
+
+    @staticmethod
+    def archetype_index(logic, intuition, fluidity, complexity):
+        """ARCHETYPE_KEYS 인덱스 (스칼라 또는 배열)"""
+        return np.where(
+            (logic > 0.6) & (complexity > 0.6), 0,
+            np.where((intuition > 0.6) & (fluidity > 0.6), 1, 2)
+        )
+
+    def archetype(self, weights: Mapping[str, float], entry: CultureEntry) -> str:
+        """보정된 가중치에 해당하는 문화권별 원형 이름"""
+        key = int(self.archetype_index(
+            weights.get("Logic", 0.5), weights.get("Intuition", 0.5),
+            weights.get("Fluidity", 0.5), weights.get("Complexity", 0.5)
+        ))
+        return entry.archetypes[key]
+
+    def indices(self, cultures: Sequence[Optional[str]], fallback: str = DEFAULT_CULTURE) -> np.ndarray:
+        """문화권 이름 목록 → 테이블 행 인덱스 (n,)"""
+        lookup = {c: self.resolve(c, fallback).index for c in set(cultures)}
+        return np.array([lookup[c] for c in cultures], dtype=np.intp)
+
+    def apply_batch(self, W: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (n, 4) 기본 가중치(TRAIT_ORDER)를 행별 문화권으로 보정
+
+        Returns:
+            보정된 가중치 (n, 4), 원형 이름 (n,)
+        """
+        adjusted = np.clip(np.asarray(W, dtype=np.float64) + self.offsets[indices], _LOWER, _UPPER)
+        keys = self.archetype_index(*adjusted.T)
+        return adjusted, self.archetypes[indices, keys]
+
+
+_cultural_table: Optional[CulturalTable] = None
+
+
+def get_cultural_table() -> CulturalTable:
+    """전역 문화권 테이블 (첫 호출 시 한 번 로드)"""
+    global _cultural_table
+    if _cultural_table is None:
+        _cultural_table = CulturalTable.from_file()
+    return _cultural_table
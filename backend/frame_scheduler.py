@@ -0,0 +1,193 @@
+"""
+WebSocket 프레임 스케줄러 모듈
+monotonic 시계 기반의 드리프트 보정 프레임 루프
+
+- FrameScheduler.tick(): 고정 주기 루프 (/ws/stream 프로듀서)
+  계산/전송 시간을 주기에서 빼고 대기하며, 데드라인을 놓치면 프레임을 건너뜀
+- FrameScheduler.throttle(): 입력 구동 루프 (/ws/simulation)
+  프레임 시작 간격만 보장하므로 지연 시간은 계산 시간으로 제한됨
+- InputCoalescer: 대기 중인 theta/beta 입력 중 최신 값만 처리
+- JitterStats: 연결별 지터 통계 (Welford 누적 평균/분산)
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+DEFAULT_TARGET_FPS = float(os.getenv("WS_TARGET_FPS", "30"))
+
+
+class JitterStats:
+    """지터(예정 시각 대비 지연) 누적 통계"""
+
+    def __init__(self):
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / self.count) if self.count > 1 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "samples": self.count,
+            "mean_ms": round(self.mean * 1000, 3),
+            "std_ms": round(self.std * 1000, 3),
+            "max_ms": round(self.max * 1000, 3)
+        }
+
+
+class FrameScheduler:
+    """
+    드리프트 보정 프레임 스케줄러
+
+    Args:
+        target_fps: 목표 프레임 레이트 (기본: 환경 변수 WS_TARGET_FPS 또는 30)
+        clock: monotonic 시계 함수 (테스트용 주입)
+        sleep: 비동기 sleep 함수 (테스트용 주입)
+    """
+
+    def __init__(
+        self,
+        target_fps: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = asyncio.sleep
+    ):
+        self.target_fps = target_fps or DEFAULT_TARGET_FPS
+        self.period = 1.0 / self.target_fps
+        self._clock = clock
+        self._sleep = sleep
+        self._deadline: Optional[float] = None
+        self._last_start: Optional[float] = None
+        self.frames = 0
+        self.frames_skipped = 0
+        self.jitter = JitterStats()
+
+    def reset(self):
+        """다음 호출 시점을 기준으로 스케줄 재시작"""
+        self._deadline = None
+        self._last_start = None
+
+    async def tick(self) -> int:
+        """
+        다음 고정 주기 프레임까지 대기
+
+        Returns:
+            놓친 데드라인 때문에 건너뛴 프레임 수
+        """
+        now = self._clock()
+        if self._deadline is None:
+            self._deadline = now + self.period
+
+        skipped = 0
+        delay = self._deadline - now
+        if delay > 0:
+            await self._sleep(delay)
+        else:
+            # 늦었어도 한 번은 양보 (계속 늦는 프로듀서가 이벤트 루프의 다른 작업을 굶기지 않도록)
+            await self._sleep(0)
+            if -delay >= self.period:
+                # 한 주기 이상 늦음: 따라잡기 폭주 대신 지난 프레임을 건너뜀
+                skipped = int(-delay // self.period)
+                self._deadline += skipped * self.period
+                self.frames_skipped += skipped
+
+        self.jitter.observe(max(self._clock() - self._deadline, 0.0))
+        self._deadline += self.period
+        self.frames += 1
+        return skipped
+
+    async def throttle(self):
+        """
+        입력 구동 프레임의 최소 간격 보장
+
+        직전 프레임 시작 후 한 주기가 지났다면 즉시 반환한다.
+        """
+        now = self._clock()
+        due = now
+        if self._last_start is not None:
+            due = max(now, self._last_start + self.period)
+            if due > now:
+                await self._sleep(due - now)
+
+        start = self._clock()
+        self.jitter.observe(max(start - due, 0.0))
+        self._last_start = start
+        self.frames += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "target_fps": self.target_fps,
+            "frames": self.frames,
+            "frames_skipped": self.frames_skipped,
+            "jitter": self.jitter.as_dict()
+        }
+
+
+class InputCoalescer:
+    """
+    클라이언트 입력 큐
+
+    연속된 theta/beta 입력은 최신 값 하나로 합치고,
+    action/behavior_profile 같은 명령은 순서대로 보존한다.
+    """
+
+    def __init__(self):
+        self._pending: Deque[Any] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.received = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _is_eeg(item: Any) -> bool:
+        return isinstance(item, dict) and "action" not in item and "behavior_profile" not in item
+
+    def push(self, item: Any):
+        self.received += 1
+        if self._pending and self._is_eeg(item) and self._is_eeg(self._pending[-1]):
+            self._pending[-1] = item
+            self.coalesced += 1
+        else:
+            self._pending.append(item)
+        self._ready.set()
+
+    def close(self):
+        """입력 종료 (연결 끊김)"""
+        self._closed = True
+        self._ready.set()
+
+    async def wait(self) -> bool:
+        """
+        처리할 입력이 생길 때까지 대기 (꺼내지 않음, 종료 후 비어 있으면 False)
+
+        wait() → 프레임 간격 대기 → get() 순서로 쓰면 대기 중에 들어온 입력이
+        대기 중인 theta/beta를 대체하므로 항상 최신 값이 처리됨
+        """
+        while not self._pending:
+            if self._closed:
+                return False
+            self._ready.clear()
+            await self._ready.wait()
+        return True
+
+    async def get(self) -> Optional[Any]:
+        """다음 입력 반환 (종료 후 비어 있으면 None)"""
+        if not await self.wait():
+            return None
+        return self._pending.popleft()
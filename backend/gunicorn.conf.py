@@ -0,0 +1,28 @@
+"""
+gunicorn pre-fork 배포 설정
+마스터가 api_server를 preload하고 읽기 전용 모델 상태(시뮬레이션 패턴, 리드아웃 가중치,
+성격 추론 포레스트, TESS 인덱스)를 한 번 생성한 뒤 워커를 fork → 워커들이 같은 물리 페이지를 공유
+
+실행: gunicorn -c gunicorn.conf.py api_server:app
+워커당 메모리 측정: python benchmarks/bench_worker_memory.py
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def when_ready(server):
+    # preload 후 첫 워커 fork 전에 마스터에서 호출
+    import api_server
+    from prefork import prepare_fork
+
+    prepare_fork(api_server.components)
+
+
+def post_fork(server, worker):
+    from prefork import after_fork
+
+    after_fork()
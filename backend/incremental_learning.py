@@ -0,0 +1,388 @@
+"""
+성격 추론 모델 점진 학습 파이프라인
+실제 세션 데이터로 MLPersonalityModel을 주기적으로 다시 학습하고, 요청을 멈추지 않고 교체
+
+- ReplayBuffer: behavioral_sessions를 id 순으로 이어 읽는 고정 크기 링 버퍼
+  (타겟은 그 세션 직후 저장된 profile_evolution.rule_weights, continuous_learning에 동의한 사용자만)
+  - 서비스 중인 모델의 출력(base_weights)을 타겟으로 쓰면 재학습이 현재 모델을 베끼고
+    섀도 평가에서 현재 모델의 오차가 반올림 오차뿐이라 후보가 이길 수 없으므로 규칙 기반 가중치 사용
+  - 모델 출력과 같은 척도여야 하므로 문화권 보정 / 성숙도 보정 / EMA가 적용된 *_weight 열은 쓰지 않음
+    (보정된 가중치로 학습하면 재학습마다 예측이 0.5 쪽으로 줄어듦)
+- 재학습: 별도 프로세스(spawn)에서 합성 사전 데이터 + 버퍼로 새 (스케일러, 트리)를 함께 학습해 디렉토리에 저장
+- 섀도 평가: 학습에 쓰지 않은 최근 세션과 이후 들어오는 세션으로 후보와 현재 모델의 오차 비교
+- 승격: 후보가 더 나으면 model.load_version()으로 추론 상태를 참조 한 번으로 교체하고 CURRENT 포인터 갱신
+  (다른 워커는 sync()에서 포인터 변경을 보고 같은 모델로 교체, 재학습은 파일 잠금으로 한 프로세스만)
+"""
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+import user_profiles
+from ml_personality_model import FEATURES, SYNTHETIC_SAMPLES, TRAITS, MLPersonalityModel
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 재학습 잠금 없이 진행
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_LEARNING = os.getenv("INCREMENTAL_LEARNING", "1") != "0"
+INCREMENTAL_DIR = os.getenv(
+    "INCREMENTAL_DIR", os.path.join(os.path.dirname(__file__), "ml_models", "incremental")
+)
+REPLAY_CAPACITY = int(os.getenv("REPLAY_CAPACITY", "5000"))
+REFIT_MIN_SAMPLES = int(os.getenv("REFIT_MIN_SAMPLES", "200"))
+REFIT_EVERY = int(os.getenv("REFIT_EVERY", "100"))  # 마지막 재학습 이후 새 세션 수
+SHADOW_MIN_SAMPLES = int(os.getenv("SHADOW_MIN_SAMPLES", "50"))
+HOLDOUT_FRACTION = 0.2
+CURRENT_FILENAME = "CURRENT"
+
+# 세션 + 그 세션 직후 저장된 프로필의 규칙 기반 가중치 (사용자별 세션 순번 = profile_evolution.session_count)
+# 순번은 사용자별로 한 번만 매기고(새 세션이 있는 사용자만), 같은 순번의 프로필이 여러 개면
+# (동시 쓰기, 재계산 후) 가장 나중에 저장된 행 하나만 사용
+LABELED_SESSIONS_SQL = """
+    WITH active AS (
+        SELECT DISTINCT user_id FROM behavioral_sessions WHERE id > :after_id
+    ),
+    numbered AS (
+        SELECT b.id, b.user_id, b.raw_metrics,
+               ROW_NUMBER() OVER (PARTITION BY b.user_id ORDER BY b.id) AS session_count
+        FROM behavioral_sessions b JOIN active USING (user_id)
+    ),
+    labels AS (
+        SELECT user_id, session_count, rule_weights,
+               ROW_NUMBER() OVER (PARTITION BY user_id, session_count ORDER BY id DESC) AS pick
+        FROM profile_evolution
+        WHERE user_id IN (SELECT user_id FROM active) AND rule_weights IS NOT NULL
+    ),
+    consent AS (
+        SELECT user_id, continuous_learning,
+               ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY timestamp DESC, id DESC) AS latest
+        FROM consent_records
+        WHERE user_id IN (SELECT user_id FROM active)
+    )
+    SELECT s.id, s.raw_metrics, p.rule_weights
+    FROM numbered s
+    JOIN labels p ON p.user_id = s.user_id AND p.session_count = s.session_count AND p.pick = 1
+    JOIN consent c ON c.user_id = s.user_id AND c.latest = 1 AND c.continuous_learning = 1
+    WHERE s.id > :after_id
+    ORDER BY s.id DESC
+    LIMIT :limit
+"""
+
+def labeled_sessions(after_id: int = 0, limit: int = REPLAY_CAPACITY) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    after_id 이후의 학습 가능한 세션 (최신 limit개, id 오름차순)
+
+    Returns:
+        ids (n,), X (n, 4) 특징 (FEATURES 순서), Y (n, 4) 규칙 기반 가중치 타겟 (TRAITS 순서)
+    """
+    from neuro_controller import BehavioralPersonalityDecoder
+
+    conn = user_profiles.get_connection()
+    try:
+        rows = conn.execute(LABELED_SESSIONS_SQL, {"after_id": after_id, "limit": limit}).fetchall()
+    finally:
+        conn.close()
+    rows.reverse()
+
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    X = np.empty((len(rows), len(FEATURES)))
+    Y = np.empty((len(rows), len(TRAITS)))
+    for i, row in enumerate(rows):
+        profile = json.loads(row[1] or "{}")
+        X[i] = MLPersonalityModel.feature_vector(BehavioralPersonalityDecoder.behavioral_features(profile))
+        targets = json.loads(row[2])
+        Y[i] = [targets[trait] for trait in TRAITS]
+    return ids, X, Y
+
+
+class ReplayBuffer:
+    """
+    최근 학습 세션을 담는 고정 크기 링 버퍼 (스레드 안전)
+
+    Args:
+        capacity: 보관할 최대 세션 수 (넘치면 오래된 세션부터 덮어씀)
+    """
+
+    def __init__(self, capacity: int = REPLAY_CAPACITY):
+        self.capacity = capacity
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.X = np.zeros((capacity, len(FEATURES)))
+        self.Y = np.zeros((capacity, len(TRAITS)))
+        self.size = 0
+        self.added = 0  # 지금까지 추가된 세션 수 (재학습 주기 판단)
+        self.last_id = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def extend(self, ids: np.ndarray, X: np.ndarray, Y: np.ndarray):
+        """세션 여러 개 추가 (id 오름차순)"""
+        n = len(ids)
+        if n == 0:
+            return
+        if n > self.capacity:
+            ids, X, Y = ids[-self.capacity:], X[-self.capacity:], Y[-self.capacity:]
+        with self._lock:
+            slots = (self._next + np.arange(len(ids))) % self.capacity
+            self.ids[slots], self.X[slots], self.Y[slots] = ids, X, Y
+            self._next = (self._next + len(ids)) % self.capacity
+            self.size = min(self.size + len(ids), self.capacity)
+            self.added += n
+            self.last_id = max(self.last_id, int(ids[-1]))
+
+    def refresh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """DB에서 last_id 이후 세션을 읽어 추가하고 새로 읽은 (X, Y) 반환"""
+        ids, X, Y = labeled_sessions(self.last_id, self.capacity)
+        self.extend(ids, X, Y)
+        return X, Y
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """오래된 순서의 (X, Y) 사본"""
+        with self._lock:
+            order = (self._next - self.size + np.arange(self.size)) % self.capacity
+            return self.X[order], self.Y[order]
+
+
+class ShadowEvaluation:
+    """후보 모델과 현재 모델의 오차를 같은 세션으로 누적"""
+
+    def __init__(self, candidate: MLPersonalityModel, directory: str):
+        self.candidate = candidate
+        self.directory = directory
+        self.samples = 0
+        self.production_error = 0.0
+        self.candidate_error = 0.0
+
+    def add(self, production: MLPersonalityModel, X: np.ndarray, Y: np.ndarray):
+        if len(X) == 0:
+            return
+        self.production_error += float(np.abs(production.predict_batch(X) - Y).sum())
+        self.candidate_error += float(np.abs(self.candidate.predict_batch(X) - Y).sum())
+        self.samples += len(X)
+
+    def mae(self) -> Tuple[float, float]:
+        """(현재 모델, 후보) 평균 절대 오차"""
+        n = max(self.samples * len(TRAITS), 1)
+        return self.production_error / n, self.candidate_error / n
+
+
+def train_candidate(X: np.ndarray, Y: np.ndarray, directory: str, model_type: str,
+                    model_path: Optional[str] = None) -> str:
+    """
+    (재학습 프로세스에서 실행) 합성 사전 데이터 + 실제 세션으로 새 모델을 학습해 directory에 저장
+    """
+    if hasattr(os, "nice"):
+        os.nice(10)  # 요청을 처리하는 워커보다 낮은 우선순위
+    model = MLPersonalityModel(model_type=model_type, model_path=model_path)
+    model.refit(X, Y)
+    model._save_artifact(directory, config={
+        "model_type": model_type,
+        "real_samples": int(len(X)),
+        "prior_samples": SYNTHETIC_SAMPLES,
+        "trained_at": time.time()
+    })
+    return directory
+
+
+class IncrementalTrainer:
+    """
+    버퍼 갱신 → 섀도 평가 → 재학습 → 승격을 관리
+
+    Args:
+        model: 서비스 중인 MLPersonalityModel (승격 시 load_version으로 교체)
+        buffer: 재생 버퍼 (기본: 새 ReplayBuffer)
+        directory: 후보 / 승격 모델 저장 디렉토리
+        min_samples: 재학습에 필요한 최소 세션 수
+        refit_every: 마지막 재학습 이후 이만큼 새 세션이 쌓이면 재학습
+        shadow_min_samples: 승격 판단에 필요한 섀도 평가 세션 수
+        executor: 재학습 executor (None이면 spawn 프로세스 1개)
+    """
+
+    def __init__(
+        self,
+        model: MLPersonalityModel,
+        buffer: Optional[ReplayBuffer] = None,
+        directory: str = INCREMENTAL_DIR,
+        min_samples: int = REFIT_MIN_SAMPLES,
+        refit_every: int = REFIT_EVERY,
+        shadow_min_samples: int = SHADOW_MIN_SAMPLES,
+        executor=None
+    ):
+        self.model = model
+        self.buffer = buffer or ReplayBuffer()
+        self.directory = directory
+        self.min_samples = min_samples
+        self.refit_every = refit_every
+        self.shadow_min_samples = shadow_min_samples
+        self.executor = executor
+        self.shadow: Optional[ShadowEvaluation] = None
+        self.current: Optional[str] = None  # 승격되어 서비스 중인 디렉토리 이름
+        self.history = deque(maxlen=20)
+        self.refits = 0
+        self.promotions = 0
+        self.rejections = 0
+        self.failures = 0
+        self._future = None
+        self._refit_lock_file = None
+        self._last_refit_added = 0
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self.sync()
+
+    def observe(self):
+        """세션 저장 후 호출 (요청 응답 후 백그라운드): 새 세션 반영, 승격 판단, 재학습 시작"""
+        try:
+            self.sync()
+            X_new, Y_new = self.buffer.refresh()
+            with self._lock:
+                if self.shadow is not None:
+                    self.shadow.add(self.model, X_new, Y_new)
+                    self._decide()
+                self._maybe_refit()
+        except Exception as e:
+            logger.error(f"[incremental] observe failed: {e}")
+
+    def sync(self) -> bool:
+        """다른 프로세스가 승격한 모델이 있으면 교체"""
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILENAME), encoding="utf-8") as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return False
+        if not name or name == self.current:
+            return False
+        if self.model.load_version(os.path.join(self.directory, name)):
+            self.current = name
+            logger.info(f"[incremental] serving {name} (model version {self.model.version})")
+            return True
+        return False
+
+    def _executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self.executor
+
+    def _try_refit_lock(self) -> bool:
+        """재학습은 한 번에 한 프로세스만 (비차단 파일 잠금, 학습 완료 시 해제)"""
+        f = open(os.path.join(self.directory, ".refit.lock"), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                return False
+        self._refit_lock_file = f
+        return True
+
+    def _release_refit_lock(self):
+        if self._refit_lock_file is not None:
+            self._refit_lock_file.close()  # 닫으면 flock도 해제
+            self._refit_lock_file = None
+
+    def _maybe_refit(self):
+        if self._future is not None or self.shadow is not None:
+            return
+        if len(self.buffer) < self.min_samples or self.buffer.added - self._last_refit_added < self.refit_every:
+            return
+        if not self._try_refit_lock():
+            return
+
+        X, Y = self.buffer.snapshot()
+        # 최근 세션은 학습에서 빼고 섀도 평가에 사용
+        n_holdout = max(int(len(X) * HOLDOUT_FRACTION), 1)
+        holdout = (X[-n_holdout:], Y[-n_holdout:])
+        name = f"v{self.buffer.last_id}-{int(time.time())}"
+        self._last_refit_added = self.buffer.added
+        self.refits += 1
+        logger.info(f"[incremental] refit {name}: {len(X) - n_holdout} sessions, {n_holdout} held out")
+        self._future = self._executor().submit(
+            train_candidate, X[:-n_holdout], Y[:-n_holdout], os.path.join(self.directory, name),
+            self.model.model_type, self.model.model_path
+        )
+        self._future.add_done_callback(lambda future: self._on_trained(future, name, holdout))
+
+    def _on_trained(self, future, name: str, holdout: Tuple[np.ndarray, np.ndarray]):
+        with self._lock:
+            self._future = None
+            self._release_refit_lock()
+            try:
+                directory = future.result()
+                candidate = MLPersonalityModel(model_type=self.model.model_type, model_path=directory)
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"[incremental] refit {name} failed: {e}")
+                return
+            self.shadow = ShadowEvaluation(candidate, directory)
+            self.shadow.add(self.model, *holdout)
+            self._decide()
+
+    def _decide(self):
+        """섀도 평가 세션이 충분하면 승격 또는 폐기"""
+        shadow = self.shadow
+        if shadow is None or shadow.samples < self.shadow_min_samples:
+            return
+        production_mae, candidate_mae = shadow.mae()
+        name = os.path.basename(shadow.directory)
+        promoted = candidate_mae <= production_mae
+        self.history.append({
+            "candidate": name, "samples": shadow.samples, "promoted": promoted,
+            "production_mae": round(production_mae, 4), "candidate_mae": round(candidate_mae, 4)
+        })
+        self.shadow = None
+        if promoted and self.model.load_version(shadow.directory):
+            self._publish(name)
+            self.promotions += 1
+            logger.info(f"[incremental] promoted {name}: MAE {production_mae:.4f} -> {candidate_mae:.4f}")
+        else:
+            self.rejections += 1
+            shutil.rmtree(shadow.directory, ignore_errors=True)
+            logger.info(f"[incremental] rejected {name}: MAE {candidate_mae:.4f} >= {production_mae:.4f}")
+
+    def _publish(self, name: str):
+        """CURRENT 포인터를 원자적으로 교체하고 이전 모델 디렉토리 정리"""
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{CURRENT_FILENAME}.", dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(name)
+        os.replace(tmp_path, os.path.join(self.directory, CURRENT_FILENAME))
+        previous, self.current = self.current, name
+        if previous:
+            # 다른 워커가 아직 mmap 중이어도 안전 (이미 열린 매핑은 유지됨)
+            shutil.rmtree(os.path.join(self.directory, previous), ignore_errors=True)
+
+    def status(self) -> Dict[str, Any]:
+        shadow = self.shadow
+        return {
+            "model_version": self.model.version,
+            "serving": self.current or "pretrained",
+            "buffer": {"size": len(self.buffer), "capacity": self.buffer.capacity, "last_session_id": self.buffer.last_id},
+            "refit_running": self._future is not None,
+            "shadow": None if shadow is None else {
+                "candidate": os.path.basename(shadow.directory), "samples": shadow.samples,
+                "required": self.shadow_min_samples
+            },
+            "refits": self.refits,
+            "promotions": self.promotions,
+            "rejections": self.rejections,
+            "failures": self.failures,
+            "history": list(self.history)
+        }
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self._release_refit_lock()
@@ -0,0 +1,399 @@
+"""
+사용자 인사이트 구체화(materialized) 저장소
+/api/insights, /api/evolution 응답을 user_insights 테이블에 미리 계산해 두고 GET은 키 조회 한 번으로 처리
+
+- 세션 저장 직후(응답 후 백그라운드 작업) 해당 사용자만 다시 계산
+- 백그라운드 갱신 스레드는 원본 버전(테이블 세대, 사용자별 최대 id)이 저장된 값과 다른 사용자만 다시 계산
+  (다른 워커, rederive_profiles 백필 등 이 프로세스를 거치지 않은 쓰기 반영)
+  스레드는 첫 조회 시 시작하므로 pre-fork 마스터에는 없고 워커마다 하나씩 실행
+  백필은 테이블을 통째로 교체해 id가 1부터 다시 시작하므로 swap_in이 세대(table_generations)를 올림,
+  (세대, 최대 id) 쌍은 교체 후에도 단조 증가
+- 응답 본문은 JSON 바이트로 저장하고 ETag(본문 해시)와 Last-Modified(본문이 마지막으로 바뀐 시각)를 함께 보관,
+  다시 계산해도 본문이 같으면 둘 다 유지되므로 폴링은 304로 끝남
+- 전체 재구축(rebuild, 야간 작업)은 성격 진화 예측을 predict_all_users로 한 번에 계산
+
+실행: python insight_store.py [--stale]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+import user_profiles
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드 갱신 주기 (초, 0이면 스레드 없음)
+INSIGHT_REFRESH_INTERVAL = float(os.getenv("INSIGHT_REFRESH_INTERVAL", "60"))
+
+# 인사이트 종류 → 원본 테이블 (source_id는 이 테이블의 사용자별 MAX(id), source_generation은 테이블 세대)
+SOURCES = {"insights": "behavioral_sessions", "evolution": "profile_evolution"}
+# refresh_many 커밋 단위 (사용자 수)
+REFRESH_BATCH = 500
+
+UPSERT_SQL = """
+    INSERT INTO user_insights (user_id, kind, body, etag, updated_at, source_generation, source_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, kind) DO UPDATE SET
+        updated_at = CASE WHEN user_insights.etag = excluded.etag
+                          THEN user_insights.updated_at ELSE excluded.updated_at END,
+        body = excluded.body,
+        etag = excluded.etag,
+        source_generation = excluded.source_generation,
+        source_id = excluded.source_id
+    WHERE user_insights.source_id IS NULL
+       OR (excluded.source_generation, excluded.source_id)
+          >= (user_insights.source_generation, user_insights.source_id)
+"""
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_body(payload: Dict) -> bytes:
+    """응답 본문 직렬화 (키 순서 유지, 공백 없음)"""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class InsightEntry(NamedTuple):
+    """저장된 응답 하나"""
+    body: bytes
+    etag: str
+    updated_at: float  # unix time
+
+    @property
+    def last_modified(self) -> str:
+        return formatdate(self.updated_at, usegmt=True)
+
+    def headers(self) -> Dict[str, str]:
+        # no-cache: 브라우저도 매번 조건부 요청으로 확인
+        return {"ETag": self.etag, "Last-Modified": self.last_modified, "Cache-Control": "no-cache"}
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """조건부 GET 판정 (If-None-Match가 있으면 If-Modified-Since는 무시, RFC 9110)"""
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag.removeprefix("W/") == self.etag for tag in tags)
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.updated_at) <= since
+        return False
+
+
+def compute_insights(manager, model, user_id: str) -> Dict:
+    """GET /api/insights 응답 (최근 세션 기반 스트레스 / 이상 / 트렌드)"""
+    sessions = manager.get_session_history(user_id, limit=10)
+
+    if len(sessions) < 1:
+        return {
+            "status": "insufficient_data",
+            "message": "최소 1개 세션이 필요합니다",
+            "sessions_needed": 1
+        }
+
+    # 최근 세션 데이터
+    latest_session = sessions[-1] if sessions else {}
+
+    # 현재 세션 데이터 준비
+    current_session_data = {
+        "avg_decision_latency": latest_session.get("avg_decision_latency", 0),
+        "revision_rate": latest_session.get("revision_rate", 0),
+        "path_efficiency": latest_session.get("path_efficiency", 1.0),
+        "raw_metrics": latest_session.get("raw_metrics", "{}")
+    }
+
+    # 예측 모델링 실행
+    previous = sessions[:-1] if len(sessions) > 1 else []
+    return {
+        "status": "success",
+        "stress_analysis": model.detect_stress_pattern(previous, current_session_data),
+        "anomaly_detection": model.detect_anomaly(previous, current_session_data),
+        "behavior_trend": model.predict_behavioral_trend(sessions)
+    }
+
+
+def compute_evolution(manager, learner, model, user_id: str, prediction: Optional[Dict] = None) -> Dict:
+    """GET /api/evolution 응답 (prediction을 주면 성격 진화 예측을 다시 계산하지 않음)"""
+    evolution = manager.get_profile_evolution(user_id)
+
+    if not evolution:
+        return {"status": "no_history", "user_id": user_id}
+
+    if prediction is None:
+        prediction = model.predict_personality_evolution(evolution, forecast_days=30)
+
+    return {
+        "user_id": user_id,
+        "evolution": evolution,
+        "drift_analysis": learner.calculate_drift(evolution),
+        "data_points": len(evolution),
+        "prediction": prediction
+    }
+
+
+class InsightStore:
+    """
+    user_insights 테이블 기반 인사이트 저장소
+
+    Args:
+        manager: UserProfileManager (원본 조회)
+        model: PredictiveModel
+        learner: ContinuousLearner (drift 분석)
+        refresh_interval: 백그라운드 갱신 주기 (초, 0이면 스레드 없이 refresh_stale() 수동 호출)
+    """
+
+    def __init__(self, manager, model, learner, refresh_interval: float = INSIGHT_REFRESH_INTERVAL):
+        self.manager = manager
+        self.model = model
+        self.learner = learner
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.last_refresh: Optional[float] = None
+
+        # 갱신 스레드는 첫 조회 시 시작 (_ensure_refresher)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _compute(self, kind: str, user_id: str, prediction: Optional[Dict] = None) -> Dict:
+        if kind == "insights":
+            return compute_insights(self.manager, self.model, user_id)
+        return compute_evolution(self.manager, self.learner, self.model, user_id, prediction)
+
+    def _ensure_refresher(self):
+        """
+        백그라운드 갱신 스레드를 요청을 처리하는 프로세스에서 시작
+        pre-fork 마스터(prefork.prepare_fork)는 생성만 하므로 스레드가 없고,
+        fork된 워커에서는 복사된 스레드 객체가 살아 있지 않으므로 워커마다 새로 시작
+        """
+        if self.refresh_interval <= 0 or self._stop.is_set():
+            return
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._refresh_loop, name="insight-store", daemon=True)
+                self._thread.start()
+
+    def get(self, user_id: str, kind: str) -> InsightEntry:
+        """저장된 응답 (키 조회 한 번, 없으면 계산 후 저장)"""
+        self._ensure_refresher()
+        conn = user_profiles.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT body, etag, updated_at FROM user_insights WHERE user_id = ? AND kind = ?",
+                (user_id, kind)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is not None:
+            with self._lock:
+                self.hits += 1
+            return InsightEntry(*row)
+        with self._lock:
+            self.misses += 1
+        return self.refresh_user(user_id, kinds=(kind,))[kind]
+
+    def _compute_row(self, conn, user_id: str, kind: str, predictions: Optional[Dict[str, Dict]] = None) -> tuple:
+        """
+        (user_id, kind, body, etag, updated_at, source_generation, source_id)
+        (source_id가 None이면 원본 행 없음)
+        """
+        # 계산 전에 원본 버전을 읽음 (계산 중 들어온 행은 다음 갱신에서 반영)
+        table = SOURCES[kind]
+        generation, source_id = conn.execute(
+            f"SELECT COALESCE((SELECT generation FROM table_generations WHERE name = ?), 0), "
+            f"(SELECT MAX(id) FROM {table} WHERE user_id = ?)", (table, user_id)
+        ).fetchone()
+        prediction = predictions.get(user_id) if predictions is not None else None
+        body = encode_body(self._compute(kind, user_id, prediction))
+        return (user_id, kind, body, make_etag(body), time.time(), generation, source_id)
+
+    def _store(self, conn, rows: list) -> Dict[tuple, InsightEntry]:
+        """계산 결과를 한 트랜잭션으로 upsert하고 저장된 값 반환"""
+        entries = {}
+        with conn:
+            conn.executemany(UPSERT_SQL, [row for row in rows if row[6] is not None])
+            for user_id, kind, body, etag, updated_at, _, source_id in rows:
+                if source_id is None:
+                    entries[user_id, kind] = InsightEntry(body, etag, updated_at)
+                    continue
+                # 본문이 같으면 기존 Last-Modified 유지, 더 새 계산이 먼저 저장됐으면 그 값
+                stored = conn.execute(
+                    "SELECT body, etag, updated_at FROM user_insights WHERE user_id = ? AND kind = ?",
+                    (user_id, kind)
+                ).fetchone()
+                entries[user_id, kind] = InsightEntry(*stored)
+        with self._lock:
+            self.refreshes += len(rows)
+        return entries
+
+    def refresh_user(self, user_id: str, kinds: Iterable[str] = tuple(SOURCES)) -> Dict[str, InsightEntry]:
+        """
+        사용자 한 명의 응답을 다시 계산해 저장
+
+        원본 행이 없는 사용자(알 수 없는 ID 포함)는 저장하지 않고 계산 결과만 반환
+        """
+        conn = user_profiles.get_connection()
+        try:
+            rows = [self._compute_row(conn, user_id, kind) for kind in kinds]
+            entries = self._store(conn, rows)
+        finally:
+            conn.close()
+        return {kind: entry for (_, kind), entry in entries.items()}
+
+    def refresh_many(self, user_ids: Iterable[str], kind: str,
+                     predictions: Optional[Dict[str, Dict]] = None) -> int:
+        """여러 사용자를 한 연결에서 다시 계산 (REFRESH_BATCH명씩 계산 후 한 트랜잭션으로 저장)"""
+        refreshed = 0
+        conn = user_profiles.get_connection()
+        try:
+            rows = []
+            for user_id in user_ids:
+                rows.append(self._compute_row(conn, user_id, kind, predictions))
+                if len(rows) == REFRESH_BATCH:
+                    refreshed += len(self._store(conn, rows))
+                    rows = []
+            if rows:
+                refreshed += len(self._store(conn, rows))
+        finally:
+            conn.close()
+        return refreshed
+
+    def stale_users(self, kind: str) -> list:
+        """원본이 저장된 응답 이후 바뀐 사용자 목록"""
+        table = SOURCES[kind]
+        conn = user_profiles.get_connection()
+        try:
+            generation = user_profiles.table_generation(conn, table)
+            rows = conn.execute(f"""
+                SELECT src.user_id FROM (
+                    SELECT user_id, MAX(id) AS source_id FROM {table} GROUP BY user_id
+                ) AS src
+                LEFT JOIN user_insights AS i ON i.user_id = src.user_id AND i.kind = ?
+                WHERE i.source_id IS NULL OR i.source_generation != ? OR i.source_id != src.source_id
+            """, (kind, generation)).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def prune(self) -> int:
+        """원본 행이 모두 사라진 사용자의 응답 삭제"""
+        conn = user_profiles.get_connection()
+        try:
+            removed = 0
+            for kind, table in SOURCES.items():
+                removed += conn.execute(
+                    f"DELETE FROM user_insights WHERE kind = ? AND user_id NOT IN (SELECT user_id FROM {table})",
+                    (kind,)
+                ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        return removed
+
+    def refresh_stale(self) -> int:
+        """바뀐 사용자만 다시 계산 (백그라운드 갱신 한 주기)"""
+        refreshed = sum(self.refresh_many(self.stale_users(kind), kind) for kind in SOURCES)
+        self.prune()
+        self.last_refresh = time.time()
+        return refreshed
+
+    def rebuild(self) -> int:
+        """모든 사용자 다시 계산 (성격 진화 예측은 predict_all_users로 한 번에)"""
+        conn = user_profiles.get_connection()
+        try:
+            batch = self.model.predict_all_users(conn)
+            session_users = [row[0] for row in conn.execute("SELECT DISTINCT user_id FROM behavioral_sessions")]
+        finally:
+            conn.close()
+        predictions = {user_id: result["prediction"] for user_id, result in batch.items()}
+
+        refreshed = self.refresh_many(session_users, "insights")
+        refreshed += self.refresh_many(predictions, "evolution", predictions)
+        self.prune()
+        self.last_refresh = time.time()
+        return refreshed
+
+    def delete_user(self, user_id: str):
+        conn = user_profiles.get_connection()
+        try:
+            conn.execute("DELETE FROM user_insights WHERE user_id = ?", (user_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                refreshed = self.refresh_stale()
+                if refreshed:
+                    logger.info(f"[InsightStore] Refreshed {refreshed} stale insight entries")
+            except Exception as e:
+                logger.error(f"[InsightStore] Background refresh failed: {e}")
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "last_refresh": self.last_refresh,
+                "refresh_interval": self.refresh_interval
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="user_insights 재구축 (야간 작업)")
+    parser.add_argument("--db", help="SQLite DB 경로 (기본: user_profiles.DB_PATH)")
+    parser.add_argument("--stale", action="store_true", help="바뀐 사용자만 다시 계산")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.db:
+        user_profiles.DB_PATH = args.db
+
+    from neuro_controller import ContinuousLearner
+    from predictive_model import get_predictive_model
+
+    store = InsightStore(
+        user_profiles.UserProfileManager(), get_predictive_model(),
+        ContinuousLearner(learning_rate=0.3), refresh_interval=0
+    )
+    started = time.perf_counter()
+    refreshed = store.refresh_stale() if args.stale else store.rebuild()
+    logger.info(f"[InsightStore] {refreshed} entries refreshed in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+양자화 운동학 캐시 모듈
+process_eeg_stream / simulate_action_pattern의 Pre-computed 경로 메모이제이션
+
+Pre-computed 경로에서 자기 상태는 m(t) = p(theta, beta) * s(t) 형태이고
+(s(t)는 스칼라 시간 변조), 리드아웃은 선형이므로
+
+    y(t) = W_out · (p * s(t)) + b = s(t) * (W_out · p) + b
+
+가 성립한다. 따라서 (theta, beta) 버킷별로 시간 독립 운동학 W_out · p만
+캐시하면, 매 프레임 보간과 20x16384 행렬 곱 없이 시간 항을 해석적으로 적용할 수 있다.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+DEFAULT_QUANTUM = float(os.getenv("KINEMATICS_CACHE_QUANTUM", "0.01"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("KINEMATICS_CACHE_SIZE", "1024"))
+
+
+class KinematicsCache:
+    """
+    (theta, beta) 버킷별 시간 독립 운동학 LRU 캐시
+
+    Args:
+        quantum: 양자화 간격 (0이면 양자화 없이 정확한 값으로 캐시)
+        max_entries: 최대 버킷 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+    """
+
+    def __init__(self, quantum: float = DEFAULT_QUANTUM, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.quantum = quantum
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[float, float], np.ndarray]" = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bucket(self, theta: float, beta: float) -> Tuple[float, float]:
+        """입력을 [0, 1]로 클램프하고 양자화된 버킷 키로 변환"""
+        theta = min(max(float(theta), 0.0), 1.0)
+        beta = min(max(float(beta), 0.0), 1.0)
+        if self.quantum > 0:
+            theta = round(round(theta / self.quantum) * self.quantum, 10)
+            beta = round(round(beta / self.quantum) * self.quantum, 10)
+        return theta, beta
+
+    def get_or_compute(
+        self,
+        theta: float,
+        beta: float,
+        compute: Callable[[float, float], np.ndarray],
+        version: int = 0
+    ) -> np.ndarray:
+        """
+        버킷의 시간 독립 운동학 반환 (없으면 계산 후 저장)
+
+        Args:
+            theta, beta: EEG 파워
+            compute: 양자화된 (theta, beta)를 받아 운동학 벡터를 계산하는 함수
+            version: 리드아웃 가중치 버전 (바뀌면 캐시 전체 무효화)
+        """
+        key = self.bucket(theta, beta)
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        value = compute(*key)
+        value.setflags(write=False)
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict:
+        """캐시 적중률 등 메트릭"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "quantum": self.quantum,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4)
+        }
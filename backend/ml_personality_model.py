@@ -10,96 +10,352 @@ from sklearn.preprocessing import StandardScaler
 import joblib
 import os
 import json
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 진행 (아티팩트 교체는 여전히 원자적)
+    fcntl = None
+
+from compiled_forest import CompiledForest
+
 logger = logging.getLogger(__name__)
 
+TRAITS = ("Logic", "Intuition", "Fluidity", "Complexity")
+FEATURES = ("latency", "revisions", "efficiency", "intensity")
+FEATURE_DEFAULTS = {"latency": 1000, "revisions": 0, "efficiency": 1.0, "intensity": 1.0}
+MODEL_FILENAME = "personality_model.pkl"
+# 추론용 배열 형태 포레스트 + 스케일러 파라미터 (compiled_forest.py, mmap 로드)
+COMPILED_FILENAME = "personality_forest.bin"
+
+# 합성 사전 학습 설정 (바꾸면 아티팩트 키가 달라져 다시 학습)
+PRETRAINED_DIRNAME = "pretrained"
+SYNTHETIC_SAMPLES = 1000
+SYNTHETIC_SEED = 42
+SYNTHETIC_VERSION = 1  # synthetic_training_data의 규칙을 바꾸면 올릴 것
+
+
+class InferenceState(NamedTuple):
+    """
+    추론 상태 한 벌: 트리와 그 트리를 학습할 때 쓴 스케일러 파라미터
+    항상 통째로 교체하므로(속성 한 번 대입) 요청은 이전 쌍 또는 새 쌍 중 하나만 봄
+    """
+    version: int
+    compiled: Optional[CompiledForest]  # random_forest
+    scaler_mean: np.ndarray
+    scaler_scale: np.ndarray
+    estimator: Any = None  # compiled가 없을 때(ridge) 추론에 쓰는 sklearn 모델
+
+
+@contextmanager
+def _file_lock(path: str):
+    """프로세스 간 배타적 파일 잠금 (fcntl.flock)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
 
 class MLPersonalityModel:
     """
     머신러닝 기반 성격 추론 모델
     행동 특징으로부터 4차원 성격 가중치를 예측
+
+    4개 특성을 하나의 다중 출력 모델로 예측하므로 요청당 모델 호출은 한 번이며,
+    predict_batch로 여러 요청을 한 번에 처리할 수 있음
+    Random Forest는 학습 후 CompiledForest로 변환하여 sklearn 없이 NumPy로 추론
     """
     
-    def __init__(self, model_type: str = "random_forest", use_pretrained: bool = True):
+    def __init__(self, model_type: str = "random_forest", use_pretrained: bool = True,
+                 model_path: Optional[str] = None):
         """
         Args:
             model_type: 'random_forest' 또는 'ridge'
             use_pretrained: 사전 학습된 모델 사용 여부
+                (저장된 모델 -> 합성 사전 학습 아티팩트 순으로 찾고, 없으면 학습 후 아티팩트 저장)
+            model_path: 모델 저장 디렉토리 (기본: backend/ml_models)
         """
         self.model_type = model_type
-        self.models = {}  # 각 성격 특성별 모델
+        self.model = None  # 4개 특성을 함께 예측하는 다중 출력 모델 (재학습용 sklearn 객체)
+        self._state: Optional[InferenceState] = None  # 추론용 (트리, 스케일러) — _install로만 교체
+        self._fingerprint: Optional[Tuple[InferenceState, str]] = None
+        self._estimator_file = None  # compiled만 로드한 경우 sklearn 피클 위치
         self.scaler = StandardScaler()
         self.is_trained = False
-        self.model_path = os.path.join(os.path.dirname(__file__), "ml_models")
+        self.model_path = model_path or os.path.join(os.path.dirname(__file__), "ml_models")
         os.makedirs(self.model_path, exist_ok=True)
         
         if use_pretrained and self._load_pretrained_models():
-            self.is_trained = True
             logger.info("사전 학습된 모델을 로드했습니다.")
+        elif use_pretrained:
+            self._load_or_pretrain()
         else:
             # 초기 모델 생성 (규칙 기반으로 생성된 데이터로 학습)
             self._initialize_models()
     
+    @property
+    def compiled(self) -> Optional[CompiledForest]:
+        """추론용 CompiledForest (random_forest인 경우)"""
+        return self._state.compiled if self._state is not None else None
+    
+    @property
+    def _scaler_params(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """현재 트리와 짝인 (mean, scale)"""
+        return (self._state.scaler_mean, self._state.scaler_scale) if self._state is not None else None
+    
+    @property
+    def version(self) -> int:
+        """추론 상태가 교체될 때마다 1씩 증가"""
+        return self._state.version if self._state is not None else 0
+    
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """
+        추론 상태의 콘텐츠 해시 (트리 배열 + 스케일러, 상태가 교체될 때만 다시 계산)
+        version과 달리 프로세스/실행이 달라도 같은 모델이면 같은 값 (rederive_profiles 재개 조건)
+        """
+        state = self._state
+        if state is None:
+            return None
+        if self._fingerprint is None or self._fingerprint[0] is not state:
+            if state.compiled is not None:
+                arrays = state.compiled.to_arrays()
+                arrays = [arrays[name] for name in sorted(arrays)]
+            else:
+                arrays = [state.estimator.coef_, state.estimator.intercept_]
+            digest = hashlib.sha256()
+            for array in arrays + [state.scaler_mean, state.scaler_scale]:
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = (state, digest.hexdigest()[:16])
+        return self._fingerprint[1]
+    
     def _initialize_models(self):
         """초기 모델 생성 및 규칙 기반 데이터로 사전 학습"""
-        if self.model_type == "random_forest":
-            for trait in ["Logic", "Intuition", "Fluidity", "Complexity"]:
-                self.models[trait] = RandomForestRegressor(
-                    n_estimators=100,
-                    max_depth=10,
-                    random_state=42,
-                    n_jobs=-1
-                )
-        else:  # ridge
-            for trait in ["Logic", "Intuition", "Fluidity", "Complexity"]:
-                self.models[trait] = Ridge(alpha=1.0)
-        
         # 규칙 기반으로 생성된 합성 데이터로 초기 학습
         self._pretrain_with_synthetic_data()
     
-    def _pretrain_with_synthetic_data(self):
-        """규칙 기반 공식을 사용하여 합성 학습 데이터 생성 및 학습"""
-        # 다양한 시나리오 생성
-        n_samples = 1000
-        X = []
-        y_logic = []
-        y_intuition = []
-        y_fluidity = []
-        y_complexity = []
-        
-        for _ in range(n_samples):
-            # 랜덤 특징 생성
-            latency = np.random.uniform(500, 6000)  # ms
-            revisions = np.random.randint(0, 10)
-            efficiency = np.random.uniform(0.3, 1.0)
-            intensity = np.random.uniform(0.5, 5.0)
-            
-            # 규칙 기반으로 타겟 생성 (ground truth로 사용)
-            logic = min(max((latency - 1000) / 4000, 0.0), 1.0)
-            intuition = 1.0 - logic
-            fluidity = efficiency
-            complexity = min((revisions * 0.2) + (latency / 10000), 1.0)
-            
-            X.append([latency, revisions, efficiency, intensity])
-            y_logic.append(logic)
-            y_intuition.append(intuition)
-            y_fluidity.append(fluidity)
-            y_complexity.append(complexity)
+    def _new_estimator(self):
+        if self.model_type == "random_forest":
+            # 학습은 전체 코어 사용, 추론은 _install에서 단일 스레드로 전환
+            return RandomForestRegressor(
+                n_estimators=100,
+                max_depth=10,
+                random_state=42,
+                n_jobs=-1
+            )
+        return Ridge(alpha=1.0)
+    
+    @staticmethod
+    def synthetic_training_data(n_samples: int = SYNTHETIC_SAMPLES, seed: int = SYNTHETIC_SEED) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        규칙 기반 공식으로 만든 합성 학습 데이터
         
-        X = np.array(X)
-        X_scaled = self.scaler.fit_transform(X)
+        Returns:
+            X: (n_samples, 4) 특징 (FEATURES 순서), y: (n_samples, 4) 타겟 (TRAITS 순서)
+        """
+        rng = np.random.default_rng(seed)
+        # 랜덤 특징 생성
+        latency = rng.uniform(500, 6000, n_samples)  # ms
+        revisions = rng.integers(0, 10, n_samples)
+        efficiency = rng.uniform(0.3, 1.0, n_samples)
+        intensity = rng.uniform(0.5, 5.0, n_samples)
         
-        # 각 특성별 모델 학습
-        self.models["Logic"].fit(X_scaled, y_logic)
-        self.models["Intuition"].fit(X_scaled, y_intuition)
-        self.models["Fluidity"].fit(X_scaled, y_fluidity)
-        self.models["Complexity"].fit(X_scaled, y_complexity)
+        # 규칙 기반으로 타겟 생성 (ground truth로 사용)
+        logic = np.clip((latency - 1000) / 4000, 0.0, 1.0)
+        intuition = 1.0 - logic
+        fluidity = efficiency
+        complexity = np.minimum(revisions * 0.2 + latency / 10000, 1.0)
+        
+        X = np.column_stack([latency, revisions, efficiency, intensity])
+        y = np.column_stack([logic, intuition, fluidity, complexity])
+        return X, y
+    
+    def _pretrain_with_synthetic_data(self):
+        """규칙 기반 공식을 사용하여 합성 학습 데이터 생성 및 학습"""
+        X, y = self.synthetic_training_data()
+        self._train(X, y)
         
         self.is_trained = True
         logger.info("합성 데이터로 모델을 사전 학습했습니다.")
     
+    def synthetic_config(self) -> Dict:
+        """합성 사전 학습 결과를 결정하는 설정 (아티팩트 키의 입력)"""
+        import sklearn
+        estimator = self._new_estimator()
+        params = {k: v for k, v in estimator.get_params().items() if k != "n_jobs"}
+        return {
+            "model_type": self.model_type,
+            "estimator": type(estimator).__name__,
+            "params": params,
+            "samples": SYNTHETIC_SAMPLES,
+            "seed": SYNTHETIC_SEED,
+            "generator": SYNTHETIC_VERSION,
+            "features": FEATURES,
+            "traits": TRAITS,
+            "sklearn": sklearn.__version__
+        }
+    
+    def synthetic_artifact_dir(self) -> str:
+        """설정 해시로 구분되는 합성 사전 학습 아티팩트 디렉토리"""
+        config = json.dumps(self.synthetic_config(), sort_keys=True, default=str)
+        key = hashlib.sha256(config.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.model_path, PRETRAINED_DIRNAME, f"{self.model_type}-{key}")
+    
+    def _load_or_pretrain(self):
+        """
+        합성 사전 학습 아티팩트를 로드하고, 없으면 한 프로세스만 학습하여 저장
+        (다른 워커는 파일 잠금을 기다린 뒤 저장된 아티팩트를 로드)
+        """
+        directory = self.synthetic_artifact_dir()
+        if self._load_pretrained_models(directory):
+            logger.info(f"사전 학습 아티팩트를 로드했습니다: {directory}")
+            return
+        
+        with _file_lock(directory + ".lock"):
+            if self._load_pretrained_models(directory):
+                logger.info(f"다른 워커가 학습한 아티팩트를 로드했습니다: {directory}")
+                return
+            self._initialize_models()
+            self._save_artifact(directory)
+    
+    def _save_artifact(self, directory: str, config: Optional[Dict] = None):
+        """임시 디렉토리에 저장한 뒤 os.replace로 교체 (config 기본값: synthetic_config())"""
+        parent = os.path.dirname(directory)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(directory)}.", dir=parent)
+        try:
+            self.save_models(tmp_dir)
+            with open(os.path.join(tmp_dir, "config.json"), "w", encoding="utf-8") as f:
+                json.dump(config or self.synthetic_config(), f, indent=2, default=str)
+            if os.path.isdir(directory):
+                # 읽을 수 없는 이전 아티팩트 (잠금을 가진 상태에서만 호출됨)
+                shutil.rmtree(directory)
+            os.replace(tmp_dir, directory)
+            logger.info(f"사전 학습 아티팩트를 저장했습니다: {directory}")
+        except OSError as e:
+            logger.error(f"사전 학습 아티팩트 저장 실패: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    def _train(self, X: np.ndarray, y: np.ndarray):
+        """
+        새 스케일러와 다중 출력 모델을 함께 학습하여 교체
+        기존 스케일러를 제자리에서 다시 맞추지 않으므로 교체 전까지 요청은 이전 (트리, 스케일러) 쌍을 사용
+        """
+        scaler = StandardScaler().fit(X)
+        estimator = self._new_estimator()
+        estimator.fit(scaler.transform(X), y)
+        self._install(estimator, scaler)
+    
+    def _install(self, estimator, scaler):
+        """학습된 모델과 스케일러로 추론 상태를 만들어 한 번에 교체 (Random Forest는 배열 평가기로 변환)"""
+        self._configure_inference(estimator)
+        compiled = CompiledForest.from_sklearn(estimator) if self.model_type == "random_forest" else None
+        state = InferenceState(
+            self.version + 1, compiled, scaler.mean_.copy(), scaler.scale_.copy(),
+            None if compiled is not None else estimator
+        )
+        self.model, self.scaler = estimator, scaler
+        self._state = state
+        self.is_trained = True
+    
+    def share_memory(self) -> int:
+        """
+        compiled 추론 배열을 읽기 전용 공유 세그먼트로 이동 (pre-fork 배포, prefork.py)
+        아티팩트에서 mmap으로 로드한 배열은 페이지 캐시로 이미 공유되므로 그대로 둠
+        
+        Returns:
+            새로 공유 세그먼트로 옮긴 바이트 수
+        """
+        if self.compiled is None:
+            return 0
+        from prefork import is_shared, share_array
+        
+        moved = 0
+        for name, array in self.compiled.to_arrays().items():
+            if not is_shared(array):
+                setattr(self.compiled, name, share_array(array))
+                moved += array.nbytes
+        return moved
+    
+    def _ensure_estimator(self):
+        """compiled 파일만 로드한 경우 재학습/특징 중요도용 sklearn 모델을 필요할 때 로드"""
+        if self.model is not None:
+            return self.model
+        model_file = self._estimator_file or os.path.join(self.model_path, MODEL_FILENAME)
+        if os.path.exists(model_file):
+            self.model = joblib.load(model_file)
+            self._configure_inference(self.model)
+        else:
+            self.model = self._new_estimator()
+        return self.model
+    
+    def _predict_raw(self, X: np.ndarray) -> np.ndarray:
+        """스케일링 + 모델 예측 (후처리 전, sklearn 경로와 1e-9 이내로 일치)"""
+        state = self._state  # 한 번만 읽어 요청 중 교체되어도 같은 (트리, 스케일러) 쌍 사용
+        X_scaled = (X - state.scaler_mean) / state.scaler_scale
+        if state.compiled is not None:
+            return state.compiled.predict(X_scaled)
+        return state.estimator.predict(X_scaled)
+    
+    @staticmethod
+    def _configure_inference(estimator):
+        """
+        추론은 단일 스레드로 실행
+        n_jobs=-1이면 한 행 예측에도 스레드 풀을 띄우므로 요청당 지연이 오히려 늘어남
+        (동시 요청은 predict_batch / PredictionBatcher로 묶어서 처리)
+        """
+        if hasattr(estimator, "n_jobs"):
+            estimator.n_jobs = 1
+    
+    @staticmethod
+    def feature_vector(behavioral_features: Dict) -> np.ndarray:
+        """행동 특징 딕셔너리 -> 모델 입력 벡터 (FEATURES 순서)"""
+        return np.array(
+            [behavioral_features.get(name, FEATURE_DEFAULTS[name]) for name in FEATURES],
+            dtype=np.float64
+        )
+    
+    @staticmethod
+    def to_weights(row: np.ndarray) -> Dict[str, float]:
+        """predict_batch 결과 한 행 -> {특성: 가중치}"""
+        return {trait: float(value) for trait, value in zip(TRAITS, row)}
+    
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """
+        여러 행동 특징 벡터의 성격 가중치를 한 번에 예측
+        
+        Args:
+            features: (n_samples, 4) 특징 행렬 (FEATURES 순서)
+        
+        Returns:
+            (n_samples, 4) 가중치 행렬 (TRAITS 순서, [0, 1] 클리핑,
+            Logic + Intuition = 1.0 정규화 적용)
+        """
+        X = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        if not self.is_trained:
+            logger.warning("모델이 학습되지 않았습니다. 규칙 기반으로 대체합니다.")
+            return np.array([
+                [self._rule_based_fallback(dict(zip(FEATURES, x)))[t] for t in TRAITS] for x in X
+            ])
+        
+        predictions = np.clip(self._predict_raw(X), 0.0, 1.0)
+        
+        # Logic + Intuition = 1.0 제약 조건 적용
+        total = predictions[:, 0] + predictions[:, 1]
+        positive = total > 0
+        predictions[positive, :2] /= total[positive, np.newaxis]
+        return predictions
+    
     def predict(self, behavioral_features: Dict) -> Dict[str, float]:
         """
         행동 특징으로부터 성격 가중치 예측
@@ -124,30 +380,8 @@ class MLPersonalityModel:
             logger.warning("모델이 학습되지 않았습니다. 규칙 기반으로 대체합니다.")
             return self._rule_based_fallback(behavioral_features)
         
-        # 특징 벡터 생성
-        X = np.array([[
-            behavioral_features.get('latency', 1000),
-            behavioral_features.get('revisions', 0),
-            behavioral_features.get('efficiency', 1.0),
-            behavioral_features.get('intensity', 1.0)
-        ]])
-        
-        X_scaled = self.scaler.transform(X)
-        
-        # 각 특성별 예측
-        predictions = {}
-        for trait in ["Logic", "Intuition", "Fluidity", "Complexity"]:
-            pred = self.models[trait].predict(X_scaled)[0]
-            # [0, 1] 범위로 클리핑
-            predictions[trait] = max(0.0, min(1.0, pred))
-        
-        # Logic + Intuition = 1.0 제약 조건 적용
-        total = predictions["Logic"] + predictions["Intuition"]
-        if total > 0:
-            predictions["Logic"] = predictions["Logic"] / total
-            predictions["Intuition"] = predictions["Intuition"] / total
-        
-        return predictions
+        row = self.predict_batch(self.feature_vector(behavioral_features)[np.newaxis, :])[0]
+        return self.to_weights(row)
     
     def _rule_based_fallback(self, behavioral_features: Dict) -> Dict[str, float]:
         """규칙 기반 폴백 (모델이 학습되지 않은 경우)"""
@@ -167,26 +401,54 @@ class MLPersonalityModel:
             "Complexity": complexity
         }
     
+    def refit(self, X: np.ndarray, y: np.ndarray, prior_samples: int = SYNTHETIC_SAMPLES):
+        """
+        실제 데이터 + 합성 사전 데이터로 새 (스케일러, 모델)을 학습하여 교체
+        합성 데이터가 실제 데이터가 적은 특징 영역의 규칙 기반 동작을 유지
+        
+        Args:
+            X: (n_samples, 4) 특징 (FEATURES 순서)
+            y: (n_samples, 4) 타겟 (TRAITS 순서)
+            prior_samples: 함께 학습할 합성 샘플 수 (0이면 실제 데이터만)
+        """
+        if prior_samples:
+            X_prior, y_prior = self.synthetic_training_data(prior_samples)
+            X, y = np.vstack([X_prior, X]), np.vstack([y_prior, y])
+        self._train(X, y)
+    
+    def load_version(self, directory: str) -> bool:
+        """
+        다른 프로세스가 저장한 모델로 교체 (점진 학습 승격 / 다른 워커와 동기화)
+        compiled 아티팩트는 mmap으로 로드하므로 진행 중인 요청을 멈추지 않음
+        """
+        return self._load_pretrained_models(directory)
+    
     def update_with_real_data(self, X: np.ndarray, y: Dict[str, np.ndarray]):
         """
-        실제 사용자 데이터로 모델 업데이트 (온라인 학습)
+        실제 사용자 데이터로 모델 업데이트 (합성 사전 데이터와 함께 재학습, refit 참고)
         
         Args:
             X: 특징 행렬 (n_samples, 4)
             y: 타겟 딕셔너리 {'Logic': array, 'Intuition': array, ...}
+               (빠진 특성은 현재 모델의 예측값을 타겟으로 사용해 유지)
         """
         if X.shape[0] < 10:
             logger.warning("학습 데이터가 부족합니다 (최소 10개 필요).")
             return
         
-        X_scaled = self.scaler.fit_transform(X)
-        
-        # 각 특성별 모델 재학습
-        for trait in ["Logic", "Intuition", "Fluidity", "Complexity"]:
+        missing = [trait for trait in TRAITS if trait not in y]
+        current = self._predict_raw(X) if missing and self.is_trained else None
+        columns = []
+        for i, trait in enumerate(TRAITS):
             if trait in y:
-                self.models[trait].fit(X_scaled, y[trait])
+                columns.append(np.asarray(y[trait], dtype=np.float64))
+            elif current is not None:
+                columns.append(current[:, i])
+            else:
+                logger.warning(f"{trait} 타겟이 없어 모델을 업데이트하지 않습니다.")
+                return
         
-        self.is_trained = True
+        self.refit(X, np.column_stack(columns))
         logger.info("실제 데이터로 모델을 업데이트했습니다.")
     
     def save_models(self, filepath: Optional[str] = None):
@@ -196,48 +458,76 @@ class MLPersonalityModel:
         
         os.makedirs(filepath, exist_ok=True)
         
-        # 각 모델 저장
-        for trait, model in self.models.items():
-            model_file = os.path.join(filepath, f"{trait.lower()}_model.pkl")
-            joblib.dump(model, model_file)
+        joblib.dump(self._ensure_estimator(), os.path.join(filepath, MODEL_FILENAME))
         
         # Scaler 저장
         scaler_file = os.path.join(filepath, "scaler.pkl")
         joblib.dump(self.scaler, scaler_file)
         
+        # 추론용 배열 포레스트 (서버 시작 시 피클 대신 mmap으로 로드)
+        if self.compiled is not None:
+            mean, scale = self._scaler_params
+            self.compiled.save(
+                os.path.join(filepath, COMPILED_FILENAME),
+                extras={"scaler_mean": mean, "scaler_scale": scale}
+            )
+        
         logger.info(f"모델을 {filepath}에 저장했습니다.")
     
-    def _load_pretrained_models(self) -> bool:
-        """사전 학습된 모델 로드"""
+    def _load_pretrained_models(self, directory: Optional[str] = None) -> bool:
+        """사전 학습된 모델 로드 (directory 기본값: model_path)"""
+        directory = directory or self.model_path
         try:
-            for trait in ["Logic", "Intuition", "Fluidity", "Complexity"]:
-                model_file = os.path.join(self.model_path, f"{trait.lower()}_model.pkl")
-                if not os.path.exists(model_file):
-                    return False
-                self.models[trait] = joblib.load(model_file)
-            
-            scaler_file = os.path.join(self.model_path, "scaler.pkl")
-            if os.path.exists(scaler_file):
-                self.scaler = joblib.load(scaler_file)
+            compiled_file = os.path.join(directory, COMPILED_FILENAME)
+            scaler_file = os.path.join(directory, "scaler.pkl")
+            if self.model_type == "random_forest" and os.path.exists(compiled_file):
+                # sklearn 피클은 재학습 시에만 로드 (_ensure_estimator)
+                compiled, extras = CompiledForest.load(compiled_file, mmap=True)
+                if os.path.exists(scaler_file):
+                    self.scaler = joblib.load(scaler_file)
+                self.model = None
+                self._estimator_file = os.path.join(directory, MODEL_FILENAME)
+                self._state = InferenceState(
+                    self.version + 1, compiled, extras["scaler_mean"], extras["scaler_scale"]
+                )
+                self.is_trained = True
+                return True
             
+            # 특성별 단일 출력 모델(<trait>_model.pkl)은 더 이상 사용하지 않음 -> 재학습
+            model_file = os.path.join(directory, MODEL_FILENAME)
+            if not os.path.exists(model_file) or not os.path.exists(scaler_file):
+                return False
+            self._install(joblib.load(model_file), joblib.load(scaler_file))
             return True
         except Exception as e:
             logger.error(f"모델 로드 실패: {e}")
             return False
     
     def get_feature_importance(self) -> Dict[str, Dict[str, float]]:
-        """특징 중요도 반환 (Random Forest인 경우만)"""
+        """
+        특징 중요도 반환 (Random Forest인 경우만)
+        다중 출력 모델은 4개 특성이 분할을 공유하므로 모든 특성에 같은 중요도를 반환
+        """
         if self.model_type != "random_forest":
             return {}
+        model = self._ensure_estimator()
+        if not hasattr(model, 'feature_importances_'):
+            return {}
         
-        importance = {}
-        feature_names = ['latency', 'revisions', 'efficiency', 'intensity']
-        
-        for trait, model in self.models.items():
-            if hasattr(model, 'feature_importances_'):
-                importance[trait] = {
-                    feature_names[i]: float(imp)
-                    for i, imp in enumerate(model.feature_importances_)
-                }
-        
-        return importance
+        shared = {name: float(imp) for name, imp in zip(FEATURES, model.feature_importances_)}
+        return {trait: dict(shared) for trait in TRAITS}
+
+
+if __name__ == "__main__":
+    import sys
+    
+    logging.basicConfig(level=logging.INFO)
+    if sys.argv[1:] != ["pretrain"]:
+        print("usage: python ml_personality_model.py pretrain")
+        sys.exit(2)
+    # 이미지 빌드 시 실행하면 서버 시작 시 학습 없이 아티팩트만 로드
+    model = MLPersonalityModel(use_pretrained=False)
+    directory = model.synthetic_artifact_dir()
+    with _file_lock(directory + ".lock"):
+        model._save_artifact(directory)
+    print(directory)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MuMax3 대역(mock) 솔버
+CI/개발 환경에서 실제 mumax3 없이 precompute_farm.py 파이프라인을 실행하기 위한 스크립트
+
+mumax3와 같은 방식으로 호출된다:
+    mock_mumax3.py sim.mx3
+
+스크립트에서 SetGridSize, theta/beta, save(m, "...") 경로를 읽어
+simulation_db의 해석적 패턴을 z-성분으로 갖는 OVF 2.0 파일을 작성한다
+(mumax3 기본값과 같은 Binary 4 형식).
+(theta, beta)별로 시드를 고정하므로 같은 입력은 항상 같은 출력을 만든다.
+
+환경 변수:
+    MOCK_MUMAX3_DELAY: 솔버 실행 시간 흉내 (초)
+"""
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ovf_parser import write_ovf
+from simulation_db import InterpolatedSimulationDB
+
+
+def parse_script(script: str):
+    """MuMax3 스크립트에서 (theta, beta, 격자 크기, 출력 경로) 추출"""
+    params = re.search(r"theta=([-0-9.]+), beta=([-0-9.]+)", script)
+    grid = re.search(r"SetGridSize\((\d+),\s*(\d+),\s*(\d+)\)", script)
+    output = re.search(r'save\(m,\s*"([^"]+)"\)', script)
+    if not (params and grid and output):
+        raise ValueError("Unsupported MuMax3 script")
+    theta, beta = float(params.group(1)), float(params.group(2))
+    nx, ny, nz = (int(v) for v in grid.groups())
+    return theta, beta, (nx, ny, nz), output.group(1)
+
+
+def mock_magnetization(theta: float, beta: float, nx: int, ny: int) -> np.ndarray:
+    """해석적 패턴을 z-성분으로 하는 (ny, nx, 3) 자기화 필드"""
+    x = np.linspace(-5, 5, nx)
+    y = np.linspace(-5, 5, ny)
+    X, Y = np.meshgrid(x, y)
+    R = np.sqrt(X**2 + Y**2)
+    rng = np.random.default_rng((int(round(theta * 1000)), int(round(beta * 1000))))
+    mz = InterpolatedSimulationDB._compute_pattern(X, Y, R, theta, beta, rng)
+    m = np.zeros((ny, nx, 3))
+    m[..., 0] = np.sqrt(np.clip(1 - mz**2, 0, 1))
+    m[..., 2] = mz
+    return m
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: mock_mumax3.py <script.mx3>", file=sys.stderr)
+        return 2
+
+    try:
+        theta, beta, (nx, ny, nz), output = parse_script(Path(argv[0]).read_text())
+    except (OSError, ValueError) as e:
+        print(f"mock_mumax3: {e}", file=sys.stderr)
+        return 1
+
+    time.sleep(float(os.getenv("MOCK_MUMAX3_DELAY", "0")))
+    m = mock_magnetization(theta, beta, nx, ny)
+    # (ny, nx, 3) -> (nx, ny, nz, 3)
+    write_ovf(output, m.transpose(1, 0, 2)[:, :, np.newaxis, :], cell_size=10e-9)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
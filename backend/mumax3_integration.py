@@ -8,7 +8,9 @@ MuMax3 물리 시뮬레이션 통합 모듈
 3. 또는 Docker 컨테이너로 MuMax3 실행
 """
 import os
+import shutil
 import subprocess
+import tempfile
 import json
 import numpy as np
 from typing import Dict, Tuple, Optional
@@ -17,6 +19,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 작업 디렉토리 내 스크립트/출력 파일 이름
+SCRIPT_FILENAME = "sim.mx3"
+OUTPUT_FILENAME = "output.ovf"
+
 
 class MuMax3Integration:
     """
@@ -35,6 +41,9 @@ class MuMax3Integration:
             enable_realtime: 실시간 계산 활성화 여부 (기본: False, Pre-computed 사용)
         """
         self.mumax3_path = mumax3_path or self._find_mumax3()
+        if self.mumax3_path:
+            # 솔버는 작업 디렉토리(cwd)에서 실행되므로 상대 경로를 절대 경로로 변환
+            self.mumax3_path = os.path.abspath(self.mumax3_path)
         self.enable_realtime = enable_realtime
         self.temp_dir = Path(__file__).parent / "mumax3_temp"
         self.temp_dir.mkdir(exist_ok=True)
@@ -124,7 +133,9 @@ save(m, "{output_file}")
     
     def run_simulation(self, theta: float, beta: float) -> Optional[np.ndarray]:
         """
-        MuMax3 시뮬레이션 실행
+        MuMax3 시뮬레이션 실행 (블로킹)
+        
+        요청/WebSocket 경로에서는 mumax3_jobs.MuMax3JobRunner를 사용할 것.
         
         Args:
             theta: Theta 파워
@@ -141,12 +152,38 @@ save(m, "{output_file}")
             logger.debug("Real-time simulation disabled, using pre-computed")
             return None
         
+        # 호출마다 고유한 작업 디렉토리 사용 (동시 요청 간 파일 경합 방지)
+        work_dir = Path(tempfile.mkdtemp(prefix="sim_", dir=self.temp_dir))
         try:
-            # 임시 스크립트 파일 생성
-            script_file = self.temp_dir / f"sim_{theta:.3f}_{beta:.3f}.mx3"
-            output_file = self.temp_dir / f"output_{theta:.3f}_{beta:.3f}.ovf"
+            return self.run_in_directory(theta, beta, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def run_in_directory(
+        self,
+        theta: float,
+        beta: float,
+        work_dir: Path,
+        timeout: float = 30
+    ) -> Optional[np.ndarray]:
+        """
+        작업 디렉토리에서 MuMax3 스크립트 생성 및 실행
+        
+        Args:
+            theta: Theta 파워
+            beta: Beta 파워
+            work_dir: 이 작업 전용 디렉토리
+            timeout: 솔버 타임아웃 (초)
+        
+        Returns:
+            자기 상태 배열 (128x128) 또는 None (실패 시)
+        """
+        try:
+            work_dir = Path(work_dir)
+            script_file = work_dir / SCRIPT_FILENAME
             
-            script = self.generate_mumax3_script(theta, beta, str(output_file))
+            # 출력 경로는 작업 디렉토리 기준 상대 경로 (스크립트 내용이 작업 위치와 무관하도록)
+            script = self.generate_mumax3_script(theta, beta, OUTPUT_FILENAME)
             
             with open(script_file, 'w') as f:
                 f.write(script)
@@ -154,46 +191,24 @@ save(m, "{output_file}")
             # MuMax3 실행
             result = subprocess.run(
                 [self.mumax3_path, str(script_file)],
+                cwd=str(work_dir),
                 capture_output=True,
                 text=True,
-                timeout=30  # 30초 타임아웃
+                timeout=timeout
             )
             
             if result.returncode != 0:
                 logger.error(f"MuMax3 simulation failed: {result.stderr}")
                 return None
             
-            # 결과 파일 읽기 (OVF 형식)
-            logger.info(f"MuMax3 simulation completed: {output_file}")
-            
-            # OVF 파일 파싱
-            try:
-                from ovf_parser import get_ovf_parser
-                parser = get_ovf_parser()
-                ovf_data = parser.parse_ovf(str(output_file))
-                
-                if ovf_data is not None:
-                    # z-성분 추출 (2D 시각화용)
-                    magnetic_state = parser.extract_z_component(ovf_data)
-                    if magnetic_state is not None:
-                        logger.info(f"OVF file parsed successfully: shape {magnetic_state.shape}")
-                        return magnetic_state
-                    else:
-                        # 크기 추출
-                        magnetic_state = parser.extract_magnetization_magnitude(ovf_data)
-                        if magnetic_state is not None and len(magnetic_state.shape) == 2:
-                            logger.info(f"OVF file parsed successfully: shape {magnetic_state.shape}")
-                            return magnetic_state
-                
-                logger.warning("OVF parsing returned None, falling back to pre-computed")
-                return None
-            except ImportError:
-                logger.warning("OVF parser not available, falling back to pre-computed")
-                return None
-            except Exception as e:
-                logger.error(f"OVF parsing error: {e}, falling back to pre-computed")
+            output_file = self._find_output(work_dir)
+            if output_file is None:
+                logger.error(f"MuMax3 produced no OVF output in {work_dir}")
                 return None
             
+            logger.info(f"MuMax3 simulation completed: {output_file}")
+            return self.load_output(output_file)
+            
         except subprocess.TimeoutExpired:
             logger.error("MuMax3 simulation timeout")
             return None
@@ -201,6 +216,55 @@ save(m, "{output_file}")
             logger.error(f"MuMax3 simulation error: {e}")
             return None
     
+    @staticmethod
+    def _find_output(work_dir: Path) -> Optional[Path]:
+        """출력 OVF 파일 찾기 (지정 경로 또는 MuMax3 기본 <script>.out/ 디렉토리)"""
+        direct = work_dir / OUTPUT_FILENAME
+        if direct.exists():
+            return direct
+        candidates = sorted(work_dir.glob("*.out/*.ovf"))
+        return candidates[-1] if candidates else None
+    
+    def load_output(self, output_file: Path) -> Optional[np.ndarray]:
+        """
+        OVF 출력 파일을 2D 자기 상태로 변환
+        
+        Args:
+            output_file: OVF 파일 경로
+        
+        Returns:
+            자기 상태 배열 (ny, nx) 또는 None
+            (행 = y, 열 = x: Pre-computed 패턴과 같은 이미지 배치)
+        """
+        try:
+            from ovf_parser import get_ovf_parser
+            parser = get_ovf_parser()
+            ovf_data = parser.parse_ovf(str(output_file))
+            
+            if ovf_data is not None:
+                # z-성분 추출 (2D 시각화용)
+                magnetic_state = parser.extract_z_component(ovf_data)
+                if magnetic_state is not None:
+                    magnetic_state = np.ascontiguousarray(magnetic_state.T)
+                    logger.info(f"OVF file parsed successfully: shape {magnetic_state.shape}")
+                    return magnetic_state
+                else:
+                    # 크기 추출
+                    magnetic_state = parser.extract_magnetization_magnitude(ovf_data)
+                    if magnetic_state is not None and len(magnetic_state.shape) == 2:
+                        magnetic_state = np.ascontiguousarray(magnetic_state.T)
+                        logger.info(f"OVF file parsed successfully: shape {magnetic_state.shape}")
+                        return magnetic_state
+            
+            logger.warning("OVF parsing returned None, falling back to pre-computed")
+            return None
+        except ImportError:
+            logger.warning("OVF parser not available, falling back to pre-computed")
+            return None
+        except Exception as e:
+            logger.error(f"OVF parsing error: {e}, falling back to pre-computed")
+            return None
+    
     def get_physics_metadata(self, theta: float, beta: float) -> Dict:
         """
         물리 메타데이터 반환
@@ -0,0 +1,260 @@
+"""
+비동기 MuMax3 작업 실행기
+요청/WebSocket 경로에서 블로킹 subprocess 호출을 제거하기 위한 작업 서브시스템
+
+- 제한된 솔버 프로세스 풀 (ThreadPoolExecutor 워커당 mumax3 프로세스 1개)
+- 작업별 고유 작업 디렉토리 (동시 요청 간 파일 경합 없음)
+- 동일한 (theta, beta) 작업 중복 제거 (진행 중인 Future 공유)
+- 완료된 OVF 결과의 콘텐츠 주소 캐시 (스크립트 SHA-256 -> .npy)
+- 실패한 작업의 네거티브 캐시 (지수 백오프 동안 같은 작업 재제출 안 함)
+
+클라이언트는 즉시 Pre-computed 상태를 받고, 실제 결과가 준비되면
+같은 버킷의 이후 요청부터 MuMax3 결과로 업그레이드된다.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from mumax3_integration import MuMax3Integration, OUTPUT_FILENAME, get_mumax3_integration
+
+logger = logging.getLogger(__name__)
+
+
+class MuMax3JobRunner:
+    """
+    MuMax3 비동기 작업 실행기
+
+    Args:
+        integration: 스크립트 생성/실행을 담당하는 MuMax3Integration
+        max_workers: 동시에 실행할 솔버 프로세스 수
+        max_pending: 대기 + 실행 중 작업 상한 (초과 시 제출 거부)
+        cache_dir: 완료 결과(.npy) 저장 디렉토리
+        work_root: 작업 디렉토리 상위 경로
+        timeout: 작업당 솔버 타임아웃 (초)
+        quantum: (theta, beta) 양자화 간격 (근접한 요청이 같은 작업을 공유)
+        memory_entries: 메모리에 유지할 결과 수
+        failure_backoff: 실패한 작업을 다시 제출하기까지의 첫 대기 시간 (초, 연속 실패마다 2배)
+        max_failure_backoff: 실패 백오프 상한 (초)
+        clock: 백오프 판정용 시계 (테스트에서 교체)
+    """
+
+    def __init__(
+        self,
+        integration: MuMax3Integration,
+        max_workers: int = 2,
+        max_pending: int = 64,
+        cache_dir: Optional[Path] = None,
+        work_root: Optional[Path] = None,
+        timeout: float = 30,
+        quantum: float = 0.01,
+        memory_entries: int = 256,
+        failure_backoff: float = 5.0,
+        max_failure_backoff: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.integration = integration
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.quantum = quantum
+        self.memory_entries = memory_entries
+        self.failure_backoff = failure_backoff
+        self.max_failure_backoff = max_failure_backoff
+        self._clock = clock
+        self.cache_dir = Path(cache_dir or integration.temp_dir / "cache")
+        self.work_root = Path(work_root or integration.temp_dir / "jobs")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.work_root.mkdir(parents=True, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mumax3")
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._digests: Dict[Tuple[float, float], str] = {}
+        # digest -> (연속 실패 횟수, 재시도 가능 시각)
+        self._failures: Dict[str, Tuple[int, float]] = {}
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.cache_hits = 0
+        self.backoff_skips = 0
+
+    def _bucket(self, theta: float, beta: float) -> Tuple[float, float]:
+        theta = min(max(float(theta), 0.0), 1.0)
+        beta = min(max(float(beta), 0.0), 1.0)
+        if self.quantum > 0:
+            theta = round(round(theta / self.quantum) * self.quantum, 10)
+            beta = round(round(beta / self.quantum) * self.quantum, 10)
+        return theta, beta
+
+    def job_digest(self, theta: float, beta: float) -> str:
+        """작업의 콘텐츠 주소 (생성될 MuMax3 스크립트의 SHA-256)"""
+        key = self._bucket(theta, beta)
+        digest = self._digests.get(key)
+        if digest is None:
+            script = self.integration.generate_mumax3_script(key[0], key[1], OUTPUT_FILENAME)
+            digest = hashlib.sha256(script.encode("utf-8")).hexdigest()
+            self._digests[key] = digest
+        return digest
+
+    def _cache_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.npy"
+
+    def _remember(self, digest: str, state: np.ndarray):
+        state.setflags(write=False)
+        with self._lock:
+            self._memory[digest] = state
+            self._memory.move_to_end(digest)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_cached(self, theta: float, beta: float) -> Optional[np.ndarray]:
+        """완료된 결과가 있으면 반환 (메모리 -> 디스크 순)"""
+        digest = self.job_digest(theta, beta)
+        with self._lock:
+            state = self._memory.get(digest)
+            if state is not None:
+                self._memory.move_to_end(digest)
+                self.cache_hits += 1
+                return state
+
+        path = self._cache_path(digest)
+        if path.exists():
+            try:
+                state = np.load(path)
+            except Exception as e:
+                logger.warning(f"Corrupt MuMax3 cache entry {path}: {e}")
+                return None
+            self._remember(digest, state)
+            with self._lock:
+                self.cache_hits += 1
+            return state
+        return None
+
+    def submit(self, theta: float, beta: float) -> Optional[Future]:
+        """
+        작업 제출 (동일 작업이 진행 중이면 그 Future 반환)
+
+        Returns:
+            결과 배열(또는 실패 시 None)을 담는 Future,
+            대기열이 가득 찼거나 최근 실패로 백오프 중이면 None
+        """
+        theta, beta = self._bucket(theta, beta)
+        digest = self.job_digest(theta, beta)
+        with self._lock:
+            future = self._inflight.get(digest)
+            if future is not None:
+                self.deduplicated += 1
+                return future
+            cached = self._memory.get(digest)
+            if cached is not None:
+                # 조회와 제출 사이에 완료된 작업: 다시 실행하지 않음
+                done: Future = Future()
+                done.set_result(cached)
+                return done
+            failure = self._failures.get(digest)
+            if failure is not None and self._clock() < failure[1]:
+                self.backoff_skips += 1
+                return None
+            if len(self._inflight) >= self.max_pending:
+                self.rejected += 1
+                return None
+            future = self._executor.submit(self._run_job, theta, beta, digest)
+            self._inflight[digest] = future
+            self.submitted += 1
+        return future
+
+    def get_state(self, theta: float, beta: float) -> Optional[np.ndarray]:
+        """
+        논블로킹 조회: 캐시된 결과를 반환하거나, 없으면 작업을 제출하고 None 반환
+        """
+        state = self.get_cached(theta, beta)
+        if state is None:
+            self.submit(theta, beta)
+        return state
+
+    def is_pending(self, theta: float, beta: float) -> bool:
+        digest = self.job_digest(theta, beta)
+        with self._lock:
+            return digest in self._inflight
+
+    def _run_job(self, theta: float, beta: float, digest: str) -> Optional[np.ndarray]:
+        work_dir = Path(tempfile.mkdtemp(prefix=f"{digest[:12]}_", dir=self.work_root))
+        try:
+            state = self.integration.run_in_directory(theta, beta, work_dir, timeout=self.timeout)
+            if state is None:
+                self._record_failure(digest)
+                return None
+
+            state = np.ascontiguousarray(state)
+            # 원자적 저장: 임시 파일에 쓴 뒤 rename
+            fd, tmp_path = tempfile.mkstemp(suffix=".npy", dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, state)
+            os.replace(tmp_path, self._cache_path(digest))
+
+            self._remember(digest, state)
+            with self._lock:
+                self._failures.pop(digest, None)
+                self.completed += 1
+            return state
+        except Exception as e:
+            logger.error(f"MuMax3 job {digest[:12]} failed: {e}")
+            self._record_failure(digest)
+            return None
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            with self._lock:
+                self._inflight.pop(digest, None)
+
+    def _record_failure(self, digest: str):
+        """실패 기록: 연속 실패마다 백오프를 2배로 늘려 같은 파라미터 점이 워커를 계속 점유하지 않게 함"""
+        with self._lock:
+            count = self._failures.get(digest, (0, 0.0))[0] + 1
+            delay = min(self.failure_backoff * 2 ** (count - 1), self.max_failure_backoff)
+            self._failures[digest] = (count, self._clock() + delay)
+            self.failed += 1
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "pending": len(self._inflight),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cache_hits": self.cache_hits,
+                "backoff_skips": self.backoff_skips,
+                "backing_off": len(self._failures)
+            }
+
+
+# 전역 인스턴스
+_job_runner: Optional[MuMax3JobRunner] = None
+
+
+def get_mumax3_job_runner() -> MuMax3JobRunner:
+    """MuMax3 작업 실행기 인스턴스 가져오기 (싱글톤)"""
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = MuMax3JobRunner(
+            get_mumax3_integration(),
+            max_workers=int(os.getenv("MUMAX3_WORKERS", "2"))
+        )
+    return _job_runner
@@ -1,23 +1,63 @@
+import hashlib
+import os
+from typing import NamedTuple
 import numpy as np
 import time
 import logging
 
+from analytic_wave import AnalyticWaveEngine
+from cultural_table import TRAIT_ORDER, CultureEntry, get_cultural_table
+from kinematics_cache import KinematicsCache
+from readout_store import verify_base
+
 # Mock gRPC stubs for standalone testing
 # from proto import neuro_signal_pb2, neuro_signal_pb2_grpc
 
+# Seed shared by every worker so identical inputs give identical kinematics fleet-wide
+DEFAULT_SEED = int(os.getenv("NEUROTWIN_SEED", "42"))
+# ReservoirReadout.fit with more frames than inputs: largest input_dim solved
+# with the exact D x D primal system, and the SVD rank used above it
+PRIMAL_MAX_DIM = 2048
+RANDOMIZED_FIT_RANK = 256
+
 class ReservoirReadout:
     """
     Implements the spatial readout layer defined in Research Paper Section 4.4.
     Maps high-dimensional magnetic states (Reservoir) to low-dimensional kinematics (Readout).
     """
-    def __init__(self, input_dim=128*128, output_dim=20, ridge_alpha=1.0):
+    def __init__(self, input_dim=128*128, output_dim=20, ridge_alpha=1.0, seed=None, rng=None):
+        """
+        Args:
+            seed: seed for the initial weights and random RLS projections (None = unseeded)
+            rng: explicit np.random.Generator (takes precedence over seed)
+        """
         self.input_dim = input_dim
         self.output_dim = output_dim
         self.ridge_alpha = ridge_alpha
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
         
         # Initialize weights (W_out) with small random values
-        self.W_out = np.random.randn(output_dim, input_dim) * 0.01
+        self.W_out = self.rng.standard_normal((output_dim, input_dim)) * 0.01
         self.bias = np.zeros(output_dim)
+        # Incremented on every weight change so derived caches can be invalidated
+        self.version = 0
+        # Reduced-space state for online RLS (see enable_rls)
+        self._rls = None
+        self._fit_basis = None
+        self._fit_mean = None
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self):
+        """
+        Short content hash of (W_out, bias), recomputed only when version changes.
+        Equal fingerprints mean bit-identical readouts, e.g. across worker processes.
+        """
+        if self._fingerprint is None or self._fingerprint[0] != self.version:
+            digest = hashlib.sha256(np.ascontiguousarray(self.W_out).tobytes())
+            digest.update(np.ascontiguousarray(self.bias).tobytes())
+            self._fingerprint = (self.version, digest.hexdigest()[:16])
+        return self._fingerprint[1]
 
     def predict(self, magnetic_state):
         """
@@ -36,10 +76,372 @@ class ReservoirReadout:
         error = target_output - current_output
         
         # Outer product to calculate dW for all i, j
-        delta_W = learning_rate * np.outer(error, m_vec)
+        delta_W = np.outer(learning_rate * error, m_vec)
         
+        self._ensure_own_weights()
         self.W_out += delta_W
         self.bias += learning_rate * error # Simple bias update
+        self.version += 1
+
+    def fork(self):
+        """
+        Per-user readout sharing this readout's weights copy-on-write.
+        
+        The shared W_out is marked read-only; whichever side (base or fork)
+        writes first in place takes a private copy, so memory grows only with
+        the number of readouts that have actually adapted.
+        """
+        child = ReservoirReadout.__new__(ReservoirReadout)
+        child.input_dim = self.input_dim
+        child.output_dim = self.output_dim
+        child.ridge_alpha = self.ridge_alpha
+        child.rng = self.rng
+        self.W_out.setflags(write=False)
+        child.W_out = self.W_out
+        child.bias = self.bias.copy()
+        child.version = self.version
+        child._rls = None
+        child._fit_basis = self._fit_basis
+        child._fit_mean = self._fit_mean
+        child._fingerprint = self._fingerprint
+        return child
+
+    @property
+    def shares_weights(self):
+        """True while W_out is still the (read-only) array shared with a fork/base."""
+        return not self.W_out.flags.writeable
+
+    def _ensure_own_weights(self):
+        """Copy-on-write: take a private W_out before the first in-place update."""
+        if not self.W_out.flags.writeable:
+            self.W_out = self.W_out.copy()
+
+    def share_memory(self):
+        """
+        Move W_out into a read-only shared segment for pre-fork deployments.
+        Workers read it without copying; the first in-place update in a worker
+        takes a private copy (_ensure_own_weights), as with fork().
+        
+        Returns:
+            Bytes moved
+        """
+        from prefork import share_array
+        self.W_out = share_array(self.W_out)
+        return self.W_out.nbytes
+
+    def fit(self, states, targets, ridge_alpha=None, basis_rank=0):
+        """
+        Closed-form ridge regression of W_out on a recorded dataset.
+        
+        With N frames and D = input_dim inputs (N << D for recorded sessions),
+        the dual form solves an N x N system instead of a D x D one:
+            A = (Xc Xc^T + alpha I)^-1 Yc,   W_out = A^T Xc
+        where Xc, Yc are the centered states/targets. The bias absorbs the means.
+        When N > D, small inputs (D <= PRIMAL_MAX_DIM) use the exact primal
+        D x D system; larger ones solve the ridge problem on a randomized SVD
+        of Xc with RANDOMIZED_FIT_RANK components, O(N D k) instead of O(D^3).
+        
+        Args:
+            states: (N, input_dim) or (N, 128, 128) magnetic states
+            targets: (N, output_dim) target kinematics
+            ridge_alpha: regularization (default: self.ridge_alpha)
+            basis_rank: keep the top principal directions of the states as the
+                        reduced space for online RLS updates (0 = don't compute)
+        
+        Returns:
+            self
+        """
+        alpha = self.ridge_alpha if ridge_alpha is None else ridge_alpha
+        X = np.asarray(states, dtype=np.float64).reshape(len(states), -1)
+        Y = np.asarray(targets, dtype=np.float64).reshape(len(targets), -1)
+        if X.shape[1] != self.input_dim or Y.shape != (X.shape[0], self.output_dim):
+            raise ValueError(
+                f"Expected states (N, {self.input_dim}) and targets (N, {self.output_dim}), "
+                f"got {X.shape} and {Y.shape}"
+            )
+        
+        x_mean = X.mean(axis=0)
+        y_mean = Y.mean(axis=0)
+        Xc = X - x_mean
+        Yc = Y - y_mean
+        n = X.shape[0]
+        basis = None
+        
+        if n <= self.input_dim:
+            # Dual (kernel) form: N x N Gram matrix
+            K = Xc @ Xc.T
+            if basis_rank:
+                basis = self._principal_basis(Xc, basis_rank, gram=K)
+            K[np.diag_indices(n)] += alpha
+            A = np.linalg.solve(K, Yc)
+            W = A.T @ Xc
+        elif self.input_dim <= PRIMAL_MAX_DIM:
+            # Primal form: D x D Gram matrix, only for small D
+            G = Xc.T @ Xc
+            if basis_rank:
+                eigvals, eigvecs = np.linalg.eigh(G)
+                basis = eigvecs[:, np.argsort(eigvals)[::-1][:basis_rank]].T
+            G[np.diag_indices(self.input_dim)] += alpha
+            W = np.linalg.solve(G, Xc.T @ Yc).T
+        else:
+            # Ridge in the top-k right singular directions: with Xc ~ U S Vt,
+            # W = Yc^T U diag(s / (s^2 + alpha)) Vt
+            rank = min(max(RANDOMIZED_FIT_RANK, basis_rank), self.input_dim)
+            U, s, Vt = self._randomized_svd(Xc, rank)
+            W = ((Yc.T @ U) * (s / (s ** 2 + alpha))) @ Vt
+            if basis_rank:
+                basis = Vt[:basis_rank]
+        
+        self.W_out = W
+        self.bias = y_mean - W @ x_mean
+        self.version += 1
+        
+        if basis_rank:
+            self._fit_basis = basis
+            self._fit_mean = x_mean
+        return self
+
+    def _randomized_svd(self, Xc, rank, oversample=10, power_iterations=2):
+        """Truncated SVD (U, s, Vt) of Xc by a randomized range finder (Halko et al.)."""
+        k = min(rank + oversample, *Xc.shape)
+        Q, _ = np.linalg.qr(Xc @ self.rng.standard_normal((Xc.shape[1], k)))
+        for _ in range(power_iterations):
+            Q, _ = np.linalg.qr(Xc.T @ Q)
+            Q, _ = np.linalg.qr(Xc @ Q)
+        U_small, s, Vt = np.linalg.svd(Q.T @ Xc, full_matrices=False)
+        return (Q @ U_small)[:, :rank], s[:rank], Vt[:rank]
+
+    @staticmethod
+    def _principal_basis(Xc, rank, gram=None):
+        """Top principal directions (rank, D) of centered states via the N x N Gram matrix."""
+        K = Xc @ Xc.T if gram is None else gram
+        eigvals, eigvecs = np.linalg.eigh(K)
+        order = np.argsort(eigvals)[::-1][:rank]
+        eigvals, eigvecs = eigvals[order], eigvecs[:, order]
+        keep = eigvals > eigvals.max() * 1e-12
+        basis = (Xc.T @ eigvecs[:, keep]) / np.sqrt(eigvals[keep])
+        return basis.T
+
+    def enable_rls(self, rank=64, forgetting=0.999, delta=100.0, max_trace=1e4, basis=None):
+        """
+        Switch to recursive-least-squares online learning in a reduced space.
+        
+        States are projected onto `rank` orthonormal directions (the principal
+        basis kept by fit(basis_rank=...) if available, otherwise a random
+        projection), so the RLS covariance is (rank+1) x (rank+1) instead of D x D.
+        Only the reduced-space part of W_out is adapted; the rest is kept as trained.
+        The covariance trace is clamped to max_trace, which keeps it bounded when
+        the forgetting factor would otherwise blow it up on unexcited directions.
+        
+        Args:
+            rank: reduced dimension (ignored when a basis is given)
+            forgetting: RLS forgetting factor lambda (0 < lambda <= 1)
+            delta: initial covariance scale (P = delta * I)
+            max_trace: upper bound on trace(P)
+            basis: optional (rank, input_dim) projection with orthonormal rows
+        """
+        mean = np.zeros(self.input_dim)
+        if basis is None and self._fit_basis is not None:
+            basis = self._fit_basis[:rank]
+            mean = self._fit_mean
+        if basis is None:
+            Q, _ = np.linalg.qr(self.rng.standard_normal((self.input_dim, rank)))
+            basis = Q.T
+        basis = np.ascontiguousarray(basis, dtype=np.float64)
+        r = basis.shape[0]
+        
+        # Express the current readout in the reduced coordinates z = basis (m - mean)
+        W_r = np.empty((self.output_dim, r + 1))
+        W_r[:, :r] = self.W_out @ basis.T
+        W_r[:, r] = self.bias + self.W_out @ mean
+        
+        self._rls = {
+            "basis": basis,
+            "mean": mean,
+            "W": W_r,
+            "P": np.eye(r + 1) * delta,
+            "forgetting": forgetting,
+            "max_trace": max_trace,
+            "pending": 0,
+            # Reduced weights last written to W_out; apply_rls adds only the change since
+            "applied": W_r.copy(),
+        }
+
+    def update_rls(self, magnetic_state, target_output, apply=True):
+        """
+        One RLS step in the reduced space.
+        
+        Args:
+            magnetic_state: (input_dim,) or (128, 128) state
+            target_output: (output_dim,) target kinematics
+            apply: write the result back to W_out now; pass False to batch
+                   several updates and call apply_rls() once
+        
+        Returns:
+            Prediction error before the update
+        """
+        if self._rls is None:
+            raise RuntimeError("RLS mode is not enabled; call enable_rls() first")
+        rls = self._rls
+        basis, P, W = rls["basis"], rls["P"], rls["W"]
+        
+        m_vec = np.ravel(magnetic_state)
+        z = np.empty(basis.shape[0] + 1)
+        z[:-1] = basis @ (m_vec - rls["mean"])
+        z[-1] = 1.0
+        
+        Pz = P @ z
+        gain = Pz / (rls["forgetting"] + z @ Pz)
+        # Error of the full readout: W_out as of the last apply plus the pending reduced change
+        prediction = self.W_out @ m_vec + self.bias + (W - rls["applied"]) @ z
+        error = np.asarray(target_output, dtype=np.float64) - prediction
+        W += np.outer(error, gain)
+        P -= np.outer(gain, Pz)
+        P /= rls["forgetting"]
+        P += P.T
+        P *= 0.5
+        trace = np.trace(P)
+        if trace > rls["max_trace"]:
+            P *= rls["max_trace"] / trace
+        
+        rls["pending"] += 1
+        if apply:
+            self.apply_rls()
+        return error
+
+    def apply_rls(self):
+        """
+        Add the reduced-space RLS change since the last apply to W_out / bias.
+        
+        Only the change is projected back, so the part of W_out outside the
+        RLS basis (and any other update made meanwhile) is kept:
+            W_out += (W_r - W_applied)[:, :r] @ basis
+        """
+        rls = self._rls
+        if rls is None or rls["pending"] == 0:
+            return
+        r = rls["basis"].shape[0]
+        delta = rls["W"] - rls["applied"]
+        delta_W = delta[:, :r] @ rls["basis"]
+        self._ensure_own_weights()
+        self.W_out += delta_W
+        self.bias = self.bias + delta[:, r] - delta_W @ rls["mean"]
+        rls["applied"][:] = rls["W"]
+        rls["pending"] = 0
+        self.version += 1
+
+class HebbianBatchLearner:
+    """
+    Mini-batch Hebbian learning for a ReservoirReadout (accumulate-then-apply).
+    
+    Each frame only copies its state and error into preallocated buffers; every
+    `batch_size` frames (or on flush()) the summed update
+        dW = eta * sum_k error_k m_k^T = eta * E^T M
+    is applied to W_out with a single matrix product, instead of one full
+    20 x 16384 outer product and write per frame. Outputs within a batch are
+    computed with the weights from the last apply.
+    """
+    def __init__(self, readout, batch_size=30, learning_rate=0.001, on_apply=None):
+        self.readout = readout
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        # Called after each applied batch (e.g. to mark a stored model dirty)
+        self.on_apply = on_apply
+        self._states = np.empty((batch_size, readout.input_dim))
+        self._errors = np.empty((batch_size, readout.output_dim))
+        self._count = 0
+        self.frames_seen = 0
+        self.updates_applied = 0
+
+    @property
+    def pending(self):
+        return self._count
+
+    @property
+    def buffer_nbytes(self):
+        """Bytes held by the batch buffers (counted against the readout store budget)."""
+        return self._states.nbytes + self._errors.nbytes
+
+    def accumulate(self, magnetic_state, current_output, target_output):
+        """
+        Buffer one frame's Hebbian statistics.
+        
+        Returns:
+            True if this frame completed a batch and the update was applied
+        """
+        i = self._count
+        self._states[i] = np.ravel(magnetic_state)
+        np.subtract(target_output, current_output, out=self._errors[i])
+        self._count += 1
+        self.frames_seen += 1
+        if self._count >= self.batch_size:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """Apply the buffered updates now (no-op when empty)."""
+        n = self._count
+        if n == 0:
+            return
+        readout = self.readout
+        errors = self._errors[:n] * self.learning_rate
+        readout._ensure_own_weights()
+        readout.W_out += errors.T @ self._states[:n]
+        readout.bias += errors.sum(axis=0)
+        readout.version += 1
+        self._count = 0
+        self.updates_applied += 1
+        if self.on_apply is not None:
+            self.on_apply()
+
+class DecodedBatch(NamedTuple):
+    """Array form of decode() for N profiles (trait columns in TRAIT_ORDER)."""
+    weights: np.ndarray          # (N, 4) calibrated weights, as decode()["traits"]["weights"]
+    base_weights: np.ndarray     # (N, 4) model / rule weights before cultural modifiers
+    rule_weights: np.ndarray     # (N, 4) rule-based weights, also when the ML model serves
+    sync_scores: np.ndarray      # (N,)
+    archetype_codes: np.ndarray  # (N,) index into cultural_table.ARCHETYPE_KEYS
+    cultures: np.ndarray         # (N,) cultural table row of each profile
+
+
+def round2(values):
+    """
+    round(x, 2) for arrays. np.round scales by 100 first, which can tip values
+    sitting on a half step the other way, so those few are rounded by Python.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(v, 2) for v in values[near_half].tolist()]
+    return rounded
+
+
+def signal_sensitivity(maturity_levels):
+    """DTMM signal sensitivity per maturity level (1: 0.3, 2: 0.7, otherwise 1.0)."""
+    levels = np.asarray(maturity_levels)
+    return np.where(levels == 1, 0.3, np.where(levels == 2, 0.7, 1.0))
+
+
+def rule_weights(latency, revisions, efficiency):
+    """
+    Rule-based base weights (last axis in TRAIT_ORDER, rounded like decode()).
+    Independent of the ML model, so incremental refits can train on it
+    without learning to copy the serving model's own predictions.
+    """
+    latency, revisions, efficiency = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (latency, revisions, efficiency))
+    )
+    logic = np.clip((latency - 1000) / 4000, 0.0, 1.0)
+    return round2(np.stack([
+        logic,
+        1.0 - logic,
+        efficiency,
+        np.minimum(revisions * 0.2 + latency / 10000, 1.0)
+    ], axis=-1))
+
 
 class BehavioralPersonalityDecoder:
     """
@@ -50,8 +452,9 @@ class BehavioralPersonalityDecoder:
     Uses machine learning models instead of rule-based formulas.
     """
     def __init__(self, cultural_context: str = "default", use_ml: bool = True):
+        # Precompiled, immutable modifier table shared by every request
+        self.cultural_table = get_cultural_table()
         self.cultural_context = cultural_context
-        self.cultural_weights = self._load_cultural_weights()
         self.use_ml = use_ml
         
         # 머신러닝 모델 초기화
@@ -66,94 +469,48 @@ class BehavioralPersonalityDecoder:
         else:
             self.ml_model = None
     
-    def _load_cultural_weights(self) -> dict:
-        """Load cultural weight modifiers from JSON configuration."""
-        import json
-        import os
-        
-        config_path = os.path.join(os.path.dirname(__file__), "cultural_weights.json")
-        
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get("cultures", {})
-        except FileNotFoundError:
-            print("[BehavioralPersonalityDecoder] cultural_weights.json not found, using defaults")
-            return {}
-        except Exception as e:
-            print(f"[BehavioralPersonalityDecoder] Error loading cultural weights: {e}")
-            return {}
-    
     def set_cultural_context(self, context: str):
-        """Update cultural context for personalization."""
-        if context in self.cultural_weights or context == "default":
+        """
+        Update the decoder's default cultural context (used when a profile
+        carries none). Per-request cultures never change this.
+        """
+        if context in self.cultural_table or context == "default":
             self.cultural_context = context
             return True
         return False
     
     def get_available_cultures(self) -> list:
         """Return list of supported cultural contexts."""
-        return list(self.cultural_weights.keys())
+        return self.cultural_table.available()
     
-    def _apply_cultural_modifiers(self, weights: dict) -> dict:
-        """Apply cultural weight modifiers to baseline personality weights."""
-        culture_config = self.cultural_weights.get(self.cultural_context, {})
-        modifiers = culture_config.get("modifiers", {})
-        
-        # Apply latency interpretation modifier
-        latency_mod = modifiers.get("latency_interpretation", {})
-        logic_boost = latency_mod.get("logic_weight_boost", 0.0)
-        intuition_reduction = latency_mod.get("intuition_weight_reduction", 0.0)
-        
-        # Apply revision interpretation modifier
-        revision_mod = modifiers.get("revision_interpretation", {})
-        complexity_boost = revision_mod.get("complexity_weight_boost", 0.0)
-        
-        # Apply efficiency interpretation modifier
-        efficiency_mod = modifiers.get("efficiency_interpretation", {})
-        fluidity_boost = efficiency_mod.get("fluidity_weight_boost", 0.0)
-        
-        # Create adjusted weights
-        adjusted = {
-            "Logic": min(weights["Logic"] + logic_boost, 1.0),
-            "Intuition": max(weights["Intuition"] - intuition_reduction, 0.0),
-            "Fluidity": min(weights["Fluidity"] + fluidity_boost, 1.0),
-            "Complexity": min(weights["Complexity"] + complexity_boost, 1.0)
-        }
-        
-        return adjusted
+    def resolve_culture(self, profile) -> CultureEntry:
+        """Cultural table entry for a profile (unknown or missing -> decoder default)."""
+        return self.cultural_table.resolve(profile.get('culturalContext'), self.cultural_context)
     
-    def _get_cultural_archetype(self, weights: dict) -> str:
-        """Generate culturally-appropriate archetype name."""
-        culture_config = self.cultural_weights.get(self.cultural_context, {})
-        archetype_mappings = culture_config.get("archetype_mappings", {})
-        
-        logic = weights.get("Logic", 0.5)
-        intuition = weights.get("Intuition", 0.5)
-        fluidity = weights.get("Fluidity", 0.5)
-        complexity = weights.get("Complexity", 0.5)
-        
-        # Determine archetype key
-        if logic > 0.6 and complexity > 0.6:
-            key = "high_logic_high_complexity"
-        elif intuition > 0.6 and fluidity > 0.6:
-            key = "high_intuition_high_fluidity"
-        else:
-            key = "balanced"
-        
-        return archetype_mappings.get(key, "Balanced & Steady")
-    
-    def decode(self, profile):
+    @staticmethod
+    def behavioral_features(profile):
+        """ML model inputs extracted from a behavioral profile."""
+        return {
+            'latency': profile.get('avgDecisionLatency', 1000),
+            'revisions': profile.get('revisionRate', 0),
+            'efficiency': profile.get('pathEfficiency', 1.0),
+            'intensity': profile.get('intensity', 1.0)
+        }
+
+    def decode(self, profile, ml_weights=None, culture=None):
         # profile: {pathEfficiency, avgDecisionLatency, revisionRate, jitterIndex, intensity, contextualChoices}
+        # ml_weights: ML prediction computed by the caller (e.g. a batched predict_batch row)
+        # culture: CultureEntry or name overriding profile['culturalContext']
+        # Pure function of its arguments: no decoder state is modified, so
+        # concurrent requests with different cultures can share one decoder.
         
-        choices = profile.get('contextualChoices', {})
+        choices = profile.get('contextualChoices') or {}
         aesthetics = choices.get('aesthetics', 'Cyber/Industrial')
-        trait_weights = choices.get('traitWeights', {})
         
-        # Get cultural context from profile if provided
-        cultural_context = profile.get('culturalContext', self.cultural_context)
-        if cultural_context != self.cultural_context:
-            self.set_cultural_context(cultural_context)
+        if culture is None:
+            culture = self.resolve_culture(profile)
+        elif not isinstance(culture, CultureEntry):
+            culture = self.cultural_table.resolve(culture, self.cultural_context)
         
         latency = profile.get('avgDecisionLatency', 1000)
         revisions = profile.get('revisionRate', 0)
@@ -164,42 +521,26 @@ class BehavioralPersonalityDecoder:
         # Level 1 (Echo): Collapse weak signals to neutral (0.5)
         # Level 2 (Reflection): Moderate signal sensitivity
         # Level 3 (Synthesis): Full sensitivity
-        signal_sensitivity = 0.3 if maturity_level == 1 else 0.7 if maturity_level == 2 else 1.0
+        sensitivity = float(signal_sensitivity(maturity_level))
         
         # --- 성격 가중치 추론 (머신러닝 또는 규칙 기반) ---
+        # 규칙 기반 가중치는 항상 계산 (점진 학습 타겟, 서비스 중인 모델의 출력과 무관)
+        # Logic vs Intuition: latency, Fluidity: path efficiency, Complexity: revisions + latency
+        rule_based = dict(zip(TRAIT_ORDER, rule_weights(latency, revisions, efficiency).tolist()))
         
         if self.use_ml and self.ml_model:
             # 머신러닝 모델 사용
-            behavioral_features = {
-                'latency': latency,
-                'revisions': revisions,
-                'efficiency': efficiency,
-                'intensity': profile.get('intensity', 1.0)
-            }
-            base_weights = self.ml_model.predict(behavioral_features)
+            if ml_weights is None:
+                ml_weights = self.ml_model.predict(self.behavioral_features(profile))
+            base_weights = ml_weights
             # 반올림
             base_weights = {k: round(v, 2) for k, v in base_weights.items()}
         else:
             # 규칙 기반 폴백
-            # 1. Logic vs Intuition Weighting
-            logic_weight = min(max((latency - 1000) / 4000, 0.0), 1.0)
-            intuition_weight = 1.0 - logic_weight
-            
-            # 2. Fluidity Weight (Confidence/Stability)
-            fluidity_weight = efficiency
-            
-            # 3. Complexity (Engagement/Detail focus)
-            complexity_weight = min((revisions * 0.2) + (latency / 10000), 1.0)
-
-            base_weights = {
-                "Logic": round(logic_weight, 2),
-                "Intuition": round(intuition_weight, 2),
-                "Fluidity": round(fluidity_weight, 2),
-                "Complexity": round(complexity_weight, 2)
-            }
+            base_weights = rule_based
         
         # Apply cultural modifiers
-        adjusted_weights = self._apply_cultural_modifiers(base_weights)
+        adjusted_weights = self.cultural_table.apply(base_weights, culture)
         
         # Update local variables for downstream logic
         logic_weight = adjusted_weights["Logic"]
@@ -233,7 +574,7 @@ class BehavioralPersonalityDecoder:
         txp = (efficiency * 0.3) + (task_completion * 0.7)
         
         # Get cultural archetype
-        cultural_archetype = self._get_cultural_archetype(adjusted_weights)
+        cultural_archetype = self.cultural_table.archetype(adjusted_weights, culture)
         
         # 6. DTMM Confidence Calibration
         # Apply signal sensitivity to weights: closer to 0.5 if low maturity
@@ -241,7 +582,7 @@ class BehavioralPersonalityDecoder:
             return 0.5 + (w - 0.5) * sensitivity
 
         calibrated_weights = {
-            k: round(calibrate(v, signal_sensitivity), 2) 
+            k: round(calibrate(v, sensitivity), 2) 
             for k, v in adjusted_weights.items()
         }
         
@@ -253,7 +594,7 @@ class BehavioralPersonalityDecoder:
             "synthetic_beta": beta,
             "aesthetics": aesthetics,
             "twin_experience": txp,
-            "cultural_context": self.cultural_context,
+            "cultural_context": culture.name,
             "maturity_level": maturity_level,
             "sync_score": round(sync_score, 2),
             "traits": {
@@ -261,13 +602,14 @@ class BehavioralPersonalityDecoder:
                 "stable": efficiency > 0.5,
                 "weights": calibrated_weights,
                 "base_weights": base_weights,
-                "cultural_adjustment_applied": self.cultural_context != "default",
+                "rule_weights": rule_based,
+                "cultural_adjustment_applied": culture.name != "default",
                 "cultural_archetype": cultural_archetype,
                 "evidence": {
                     "reasoning": "High revision rate" if revisions > 2 else "Rapid decision flow" if latency < 1500 else "Balanced deliberation",
                     "latency_ms": latency,
                     "revisions": revisions,
-                    "cultural_context": self.cultural_context,
+                    "cultural_context": culture.name,
                     "maturity_level": maturity_level,
                     "ml_model_used": ml_used,
                     "model_type": "random_forest" if ml_used else "rule_based"
@@ -276,12 +618,66 @@ class BehavioralPersonalityDecoder:
             }
         }
 
+    def decode_batch(self, features, cultures=None, maturity_levels=1, task_completion=0.0,
+                     ml_weights=None) -> DecodedBatch:
+        """
+        Vectorized decode() for replaying many sessions at once.
+        
+        Args:
+            features: (N, 4) behavioral features in FEATURES order
+                      (latency, revisions, efficiency, intensity)
+            cultures: (N,) culture names or cultural table rows (None = decoder default)
+            maturity_levels: (N,) or scalar maturity level
+            task_completion: (N,) or scalar taskCompletion
+            ml_weights: optional (N, 4) precomputed ML predictions (TRAIT_ORDER)
+        
+        Returns:
+            DecodedBatch; weights and sync scores match decode() row by row
+            (same rounding, see round2)
+        """
+        X = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        n = len(X)
+        latency, revisions, efficiency = X[:, 0], X[:, 1], X[:, 2]
+        table = self.cultural_table
+        
+        if cultures is None:
+            rows = np.full(n, table.resolve(self.cultural_context).index, dtype=np.intp)
+        else:
+            rows = np.asarray(cultures)
+            if rows.dtype.kind not in "iu":
+                rows = table.indices(rows, self.cultural_context)
+        
+        rule_based = rule_weights(latency, revisions, efficiency)
+        if self.use_ml and self.ml_model:
+            if ml_weights is None:
+                ml_weights = self.ml_model.predict_batch(X)
+            base = round2(np.asarray(ml_weights, dtype=np.float64))
+        else:
+            base = rule_based
+        
+        adjusted, _ = table.apply_batch(base, rows)
+        archetype_codes = table.archetype_index(*adjusted.T)
+        
+        sensitivity = np.broadcast_to(signal_sensitivity(maturity_levels), (n,))[:, None]
+        calibrated = round2(0.5 + (adjusted - 0.5) * sensitivity)
+        
+        txp = efficiency * 0.3 + np.broadcast_to(np.asarray(task_completion, dtype=np.float64), (n,)) * 0.7
+        sync = np.minimum(txp * 0.5 + (1.0 - np.abs(0.5 - calibrated[:, 0])) * 0.5, 1.0)
+        return DecodedBatch(calibrated, base, rule_based, round2(sync), archetype_codes, rows)
+
 class ContinuousLearner:
     """
     Continuous Learning Engine for Digital Human Twin.
     Implements incremental personality weight updates using exponential moving average.
     Enables hyper-personalization over multiple sessions.
     """
+    # generate_archetype() outputs, indexed by archetype_codes()
+    ARCHETYPES = tuple(
+        f"{primary} {secondary}"
+        for primary in ("Analytical", "Intuitive", "Balanced")
+        for secondary in ("& Adaptive", "& Complex", "& Steady")
+    )
+    
     def __init__(self, learning_rate: float = 0.3):
         self.learning_rate = learning_rate  # EMA alpha (higher = faster adaptation)
     
@@ -383,24 +779,90 @@ class ContinuousLearner:
         
         return f"{primary} {secondary}"
 
+    # --- Array versions (N sessions at once, trait columns in TRAIT_ORDER) ---
+    
+    def update_weights_batch(self, current_weights: np.ndarray, new_weights: np.ndarray) -> np.ndarray:
+        """update_weights() for (N, 4) arrays."""
+        alpha = self.learning_rate
+        return round2(alpha * np.asarray(new_weights) + (1 - alpha) * np.asarray(current_weights))
+    
+    @staticmethod
+    def compute_confidence_batch(session_counts, weight_stability) -> np.ndarray:
+        """compute_confidence() for arrays of session counts / stabilities."""
+        session_factor = np.minimum(np.asarray(session_counts) / 10, 1.0)
+        return round2(0.4 * session_factor + 0.6 * np.asarray(weight_stability))
+    
+    @staticmethod
+    def archetype_codes(weights: np.ndarray) -> np.ndarray:
+        """
+        generate_archetype() for (N, 4) weights as codes into ARCHETYPES
+        (primary * 3 + secondary).
+        """
+        logic, intuition, fluidity, complexity = np.asarray(weights).T
+        primary = np.where(logic > intuition + 0.2, 0, np.where(intuition > logic + 0.2, 1, 2))
+        secondary = np.where(fluidity > 0.6, 0, np.where(complexity > 0.6, 1, 2))
+        return primary * 3 + secondary
+
 
 class MagnonicController:
     """
     Orchestrates the data flow: EEG -> Physics Params -> Simulation -> Readout -> Kinematics.
     Now uses pre-computed MuMax3 database for physics-accurate results.
     """
-    def __init__(self):
-        self.readout = ReservoirReadout()
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed: seed for the readout weights and the simulation DB noise
+                  (default: NEUROTWIN_SEED env var, 42 if unset)
+        """
+        self.seed = DEFAULT_SEED if seed is None else seed
+        self.readout = ReservoirReadout(seed=self.seed)
+        # Per-user readouts are stored as deltas against this base: check it against
+        # the stored one now rather than on the first per-user request
+        verify_base(self.readout)
         self.behavior_decoder = BehavioralPersonalityDecoder()
+        self.kinematics_cache = KinematicsCache()
+        self.wave_engine = AnalyticWaveEngine(grid_size=128)
+        # Per-user readouts (forked copy-on-write from self.readout, see get_user_readout)
+        self.readout_store = None
         self.running = False
         self._init_simulation_db()
         print("[MagnonicController] Initialized with 128x128 reservoir grid and Behavior Decoder.")
 
+    def _get_readout_store(self):
+        if self.readout_store is None:
+            import atexit
+            from readout_store import ReadoutStore
+            self.readout_store = ReadoutStore(self.readout)
+            # Persist models still dirty at interpreter exit
+            atexit.register(self.readout_store.close)
+        return self.readout_store
+
+    def get_user_readout(self, user_id):
+        """
+        Per-user readout from the readout store (lazy-loaded, LRU-evicted).
+        Shares the base W_out until the user's first update.
+        """
+        return self._get_readout_store().get(user_id)
+
+    def get_user_learner(self, user_id, batch_size=30, learning_rate=0.001):
+        """
+        Mini-batch Hebbian learner bound to the user's readout.
+        
+        Learners live in the readout store's LRU next to their readouts, so their
+        batch buffers count against its memory budget; an evicted learner's
+        pending batch is applied before the readout is queued for saving.
+        """
+        return self._get_readout_store().get_learner(
+            user_id,
+            lambda readout, on_apply: HebbianBatchLearner(readout, batch_size, learning_rate, on_apply=on_apply)
+        )
+
     def _init_simulation_db(self):
         """Initialize pre-computed MuMax3 database"""
         try:
             from simulation_db import get_simulation_db
-            self.sim_db = get_simulation_db()
+            self.sim_db = get_simulation_db(seed=self.seed)
             self.use_precomputed = True
             print("[MagnonicController] Using pre-computed MuMax3 patterns")
         except ImportError:
@@ -412,59 +874,88 @@ class MagnonicController:
         try:
             from mumax3_integration import get_mumax3_integration
             self.mumax3 = get_mumax3_integration()
+            self.mumax3_jobs = None
             if self.mumax3.available and self.mumax3.enable_realtime:
+                from mumax3_jobs import get_mumax3_job_runner
+                self.mumax3_jobs = get_mumax3_job_runner()
                 print("[MagnonicController] MuMax3 real-time simulation enabled")
         except ImportError:
             self.mumax3 = None
+            self.mumax3_jobs = None
 
-    def process_eeg_stream(self, theta_power, beta_power):
+    def share_memory(self):
+        """
+        Move the large read-only arrays (readout weights, simulation DB patterns,
+        wave geometry, compiled personality forest) into shared segments before
+        a pre-fork deployment forks its workers (see prefork.py).
+        
+        Returns:
+            Bytes moved
+        """
+        moved = self.readout.share_memory() + self.wave_engine.share_memory()
+        if self.sim_db is not None and hasattr(self.sim_db, "share_memory"):
+            moved += self.sim_db.share_memory()
+        ml_model = getattr(self.behavior_decoder, "ml_model", None)
+        if ml_model is not None:
+            moved += ml_model.share_memory()
+        return moved
+
+    def model_fingerprint(self):
+        """
+        Fingerprint of everything that determines kinematics for a given input:
+        readout weights and the simulation DB patterns. Responses from workers
+        with equal fingerprints are interchangeable (cacheable / replayable).
+        """
+        db_fingerprint = getattr(self.sim_db, "fingerprint", "none") if self.use_precomputed else "mock"
+        key = (self.readout.fingerprint, db_fingerprint)
+        cached = getattr(self, "_model_fingerprint", None)
+        if cached is None or cached[0] != key:
+            digest = hashlib.sha256(":".join(key).encode()).hexdigest()[:16]
+            self._model_fingerprint = (key, digest)
+        return self._model_fingerprint[1]
+
+    def process_eeg_stream(self, theta_power, beta_power, t=None):
         """
         Processes EEG via the causal chain:
         1. Neuro-Magnetic Modulation (Theta -> Damping, Beta -> Excitation)
         2. Magnonic Reservoir Dynamics (Pre-computed MuMax3)
         3. Kinematic Readout
+        
+        t defaults to the wall clock; pass it explicitly to replay a recorded stream.
         """
-        t = time.time()
+        if t is None:
+            t = time.time()
         
         # 1. Get physics parameters
         alpha = 0.01 + 0.05 * theta_power
         b_ext_magnitude = 0.05 * beta_power
         
         # 2. Get magnetic state from pre-computed database or real-time simulation
-        if hasattr(self, 'mumax3') and self.mumax3 and self.mumax3.enable_realtime:
-            # 실시간 MuMax3 시뮬레이션 시도
-            realtime_state = self.mumax3.run_simulation(theta_power, beta_power)
-            if realtime_state is not None:
-                magnetic_state = realtime_state
+        magnetic_state = None
+        kinematics = None
+        realtime_pending = False
+        if getattr(self, 'mumax3_jobs', None) is not None:
+            # 논블로킹 조회: 완료된 MuMax3 결과가 없으면 작업만 제출하고 Pre-computed로 응답
+            magnetic_state = self.mumax3_jobs.get_state(theta_power, beta_power)
+            if magnetic_state is not None:
                 physics_meta = self.mumax3.get_physics_metadata(theta_power, beta_power)
-            elif self.use_precomputed and self.sim_db:
-                # 실시간 실패 시 Pre-computed 사용
-                magnetic_state = self.sim_db.get_magnetic_state(theta_power, beta_power, t)
+            else:
+                realtime_pending = True
+        
+        if magnetic_state is None:
+            if self.use_precomputed and self.sim_db:
+                kinematics = self._precomputed_kinematics(theta_power, beta_power, t)
                 physics_meta = self.sim_db.get_physics_metadata(theta_power, beta_power)
             else:
-                # Fallback: simple wave pattern
-                grid_size = 128
-                x = np.linspace(-5, 5, grid_size)
-                y = np.linspace(-5, 5, grid_size)
-                X, Y = np.meshgrid(x, y)
-                R = np.sqrt(X**2 + Y**2)
-                magnetic_state = np.sin(R - 2*np.pi*2.0*t) * np.exp(-0.1 * R * alpha) * b_ext_magnitude
+                # Fallback: analytic wave pattern
+                magnetic_state = self.wave_engine.evaluate(alpha, b_ext_magnitude, t)
                 physics_meta = {"source": "mock"}
-        elif self.use_precomputed and self.sim_db:
-            magnetic_state = self.sim_db.get_magnetic_state(theta_power, beta_power, t)
-            physics_meta = self.sim_db.get_physics_metadata(theta_power, beta_power)
-        else:
-            # Fallback: simple wave pattern
-            grid_size = 128
-            x = np.linspace(-5, 5, grid_size)
-            y = np.linspace(-5, 5, grid_size)
-            X, Y = np.meshgrid(x, y)
-            R = np.sqrt(X**2 + Y**2)
-            magnetic_state = np.sin(R - 2*np.pi*2.0*t) * np.exp(-0.1 * R * alpha) * b_ext_magnitude
-            physics_meta = {"source": "mock"}
+            if realtime_pending:
+                physics_meta = {**physics_meta, "realtime_status": "pending"}
         
         # 3. Readout (Section 4.4)
-        kinematics = self.readout.predict(magnetic_state)
+        if kinematics is None:
+            kinematics = self.readout.predict(magnetic_state)
         
         # Calculate Fluidity (Jerk proxy: inverse of high-freq noise)
         fluidity = 1.0 / (1.0 + np.var(kinematics))
@@ -478,9 +969,26 @@ class MagnonicController:
                 "theta": theta_power, 
                 "beta": beta_power
             },
-            "physics": physics_meta
+            "physics": physics_meta,
+            "model_fingerprint": self.model_fingerprint()
         }
 
+    def _precomputed_kinematics(self, theta_power, beta_power, t):
+        """
+        Readout of the pre-computed state via the quantized kinematics cache.
+        
+        The pre-computed state is base_pattern(theta, beta) * s(t) with a scalar
+        time modulation s(t), so the linear readout factors into
+        s(t) * (W_out . base_pattern) + bias. Only the bracketed term is cached.
+        """
+        def compute(theta, beta):
+            return self.readout.W_out @ self.sim_db.get_base_pattern(theta, beta).ravel()
+        
+        base = self.kinematics_cache.get_or_compute(
+            theta_power, beta_power, compute, version=self.readout.version
+        )
+        return base * self.sim_db.get_time_modulation(beta_power, t) + self.readout.bias
+
     def simulate_action_pattern(self, action_name):
         """
         Simulates EEG patterns corresponding to specific physical actions.
@@ -509,18 +1017,21 @@ class MagnonicController:
         else:
             return self.process_eeg_stream(0.5, 0.5)
 
-    def process_behavioral_profile(self, profile):
+    def process_behavioral_profile(self, profile, ml_weights=None):
         """
         Entry point for Phase 6 Behavioral Analysis.
         Converts browser metrics into а바타 (Avatar) kinematics.
+        
+        ml_weights: optional precomputed ML trait weights (see PredictionBatcher)
         """
-        decoded = self.behavior_decoder.decode(profile)
+        decoded = self.behavior_decoder.decode(profile, ml_weights=ml_weights)
         result = self.process_eeg_stream(
             theta_power=decoded["synthetic_theta"],
             beta_power=decoded["synthetic_beta"]
         )
         result["behavioral_traits"] = decoded["traits"]
         result["aesthetics"] = decoded["aesthetics"]
+        result["sync_score"] = decoded["sync_score"]
         
         # Aesthetic to visual world mapping
         vis_map = {
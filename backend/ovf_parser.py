@@ -4,33 +4,52 @@ MuMax3 시뮬레이션 결과 파일을 읽기 위한 파서
 
 OVF 파일 형식:
 - 텍스트 헤더 (메타데이터)
-- 바이너리 데이터 (벡터 필드)
+- 데이터 블록: Text, Binary 4, Binary 8
+  - 바이너리는 제어 값(Binary 4: 1234567.0, Binary 8: 123456789012345.0)으로 시작
+  - OVF 1.0은 빅 엔디안, OVF 2.0은 리틀 엔디안
+  - 값 순서는 x가 가장 빠르게 변함 (z, y, x, 성분)
+
+바이너리 데이터는 np.frombuffer / np.memmap으로 복사 없이 (nx, ny, nz, 3) 뷰로 디코딩하고,
+텍스트 데이터는 np.loadtxt로 한 번에 변환한다.
+OVFSeries는 스냅샷 디렉토리(m000000.ovf, m000001.ovf, ...)를 (t, nx, ny, nz, 3) 배열처럼 다룬다.
 """
-import struct
+import io
+import re
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Union
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 바이너리 블록 제어 값 (OVF 명세)
+CONTROL_VALUES = {4: 1234567.0, 8: 123456789012345.0}
+
+# 헤더 숫자 필드
+_INT_KEYS = {"segment count", "xnodes", "ynodes", "znodes", "valuedim"}
+_FLOAT_KEYS = {
+    "xmin", "ymin", "zmin", "xmax", "ymax", "zmax",
+    "xbase", "ybase", "zbase", "xstepsize", "ystepsize", "zstepsize"
+}
+
 
 class OVFParser:
     """
     OVF 파일 파서 클래스
     MuMax3 출력 파일을 읽어서 numpy 배열로 변환
     """
-    
+
     def __init__(self):
-        self.supported_versions = ["OOMMF: rectangular mesh v1.0"]
-    
-    def parse_ovf(self, file_path: str) -> Optional[np.ndarray]:
+        self.supported_versions = ["OOMMF: rectangular mesh v1.0", "OOMMF OVF 2.0"]
+
+    def parse_ovf(self, file_path: str, mmap: bool = False) -> Optional[np.ndarray]:
         """
         OVF 파일 파싱
-        
+
         Args:
             file_path: OVF 파일 경로
-        
+            mmap: 바이너리 데이터를 np.memmap으로 매핑 (파일 전체를 읽지 않음, 읽기 전용)
+
         Returns:
             3D numpy 배열 (nx, ny, nz, 3) - 자기화 벡터 필드
             또는 None (파싱 실패 시)
@@ -41,77 +60,86 @@ class OVFParser:
                 header = self._read_header(f)
                 if not header:
                     return None
-                
+
                 # 데이터 읽기
+                if mmap and header['format'] == 'binary':
+                    return self._map_data(file_path, header)
                 data = self._read_data(f, header)
                 return data
-                
+
         except FileNotFoundError:
             logger.error(f"OVF file not found: {file_path}")
             return None
         except Exception as e:
             logger.error(f"Failed to parse OVF file: {e}")
             return None
-    
-    def _read_header(self, file_handle) -> Optional[Dict]:
-        """OVF 파일 헤더 읽기"""
-        header = {}
-        header_end = False
-        
-        while not header_end:
+
+    def read_header(self, file_path: str) -> Optional[Dict]:
+        """
+        OVF 헤더만 읽기 (데이터 블록 위치/형식 포함)
+
+        Returns:
+            헤더 딕셔너리 또는 None (형식 오류 시)
+        """
+        with open(file_path, 'rb') as f:
+            return self._read_header(f)
+
+    def _read_header(self, file_handle: BinaryIO) -> Optional[Dict]:
+        """
+        OVF 파일 헤더 읽기
+
+        'data_offset'은 데이터 블록 시작 위치 (바이너리는 제어 값 이후),
+        'dtype'은 바이너리 값의 numpy dtype (텍스트는 None)
+        """
+        header = {'version': None}
+
+        while True:
             line = file_handle.readline()
             if not line:
                 return None
-            
-            # 텍스트 모드로 디코딩
-            try:
-                line_str = line.decode('utf-8', errors='ignore').strip()
-            except:
-                line_str = line.decode('latin-1', errors='ignore').strip()
-            
-            # 헤더 종료 확인
-            if line_str.startswith('# Begin: Data'):
-                header_end = True
+
+            line_str = line.decode('latin-1').strip()
+            if not line_str.startswith('#'):
+                continue
+            line_str = line_str[1:].strip()
+
+            if header['version'] is None:
+                if 'OVF 2.0' in line_str:
+                    header['version'] = 2
+                elif line_str.startswith('OOMMF'):
+                    header['version'] = 1
+
+            # 데이터 블록 시작 = 헤더 종료
+            if line_str.lower().startswith('begin: data'):
+                data_format = line_str[len('begin: data'):].strip().lower()
                 break
-            
-            # 주석 제거
-            if line_str.startswith('#'):
-                line_str = line_str[1:].strip()
-            
+
             # 키-값 쌍 파싱
-            if ':' in line_str:
-                key, value = line_str.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # 주요 필드 파싱
-                if key == 'Segment count':
-                    header['segment_count'] = int(value)
-                elif key == 'Begin: Segment':
-                    header['segment_start'] = True
-                elif key == 'Title':
-                    header['title'] = value
-                elif key == 'meshtype':
-                    header['meshtype'] = value
-                elif key == 'xmin' or key == 'ymin' or key == 'zmin':
-                    header[key] = float(value)
-                elif key == 'xmax' or key == 'ymax' or key == 'zmax':
-                    header[key] = float(value)
-                elif key == 'xbase' or key == 'ybase' or key == 'zbase':
-                    header[key] = float(value)
-                elif key == 'xnodes' or key == 'ynodes' or key == 'znodes':
-                    header[key] = int(value)
-                elif key == 'xstepsize' or key == 'ystepsize' or key == 'zstepsize':
-                    header[key] = float(value)
-                elif key == 'valuedim':
-                    header['valuedim'] = int(value)
-                elif key == 'valuelabels':
-                    header['valuelabels'] = value.split()
-                elif key == 'valueunits':
-                    header['valueunits'] = value.split()
-                elif key == 'Datacount':
-                    header['datacount'] = int(value)
-        
+            if ':' not in line_str:
+                continue
+            key, value = line_str.split(':', 1)
+            key = key.strip().lower()
+            value = value.split('##', 1)[0].strip()  # 인라인 주석 제거
+
+            if key in _INT_KEYS:
+                header[key.replace(' ', '_')] = int(value)
+            elif key in _FLOAT_KEYS:
+                header[key] = float(value)
+            elif key in ('title', 'meshtype', 'meshunit'):
+                header[key] = value
+            elif key in ('valuelabels', 'valueunits'):
+                header[key] = value.split()
+            elif key == 'datacount':
+                header['datacount'] = int(value)
+            elif key == 'desc':
+                # MuMax3: "# Desc: Total simulation time:  1e-10  s"
+                match = re.match(r'total simulation time:\s*([-+0-9.eE]+)', value, re.IGNORECASE)
+                if match:
+                    header['time'] = float(match.group(1))
+
+        if header['version'] is None:
+            return None
+
         # 기본값 설정
         if 'xnodes' not in header:
             header['xnodes'] = 128  # 기본값
@@ -120,130 +148,324 @@ class OVFParser:
         if 'znodes' not in header:
             header['znodes'] = 1
         if 'valuedim' not in header:
-            header['valuedim'] = 3  # 벡터 필드
-        
+            header['valuedim'] = 3  # 벡터 필드 (OVF 1.0은 항상 3)
+
+        if data_format == 'text':
+            header['format'] = 'text'
+            header['dtype'] = None
+            header['data_offset'] = file_handle.tell()
+        elif data_format in ('binary 4', 'binary 8'):
+            itemsize = int(data_format[-1])
+            # OVF 1.0: 빅 엔디안, OVF 2.0: 리틀 엔디안
+            byteorder = '>' if header['version'] == 1 else '<'
+            dtype = np.dtype(f"{byteorder}f{itemsize}")
+            control = np.frombuffer(file_handle.read(itemsize), dtype=dtype)
+            if control.size != 1 or control[0] != CONTROL_VALUES[itemsize]:
+                raise ValueError(f"Invalid OVF binary control value: {control}")
+            header['format'] = 'binary'
+            header['dtype'] = dtype
+            header['data_offset'] = file_handle.tell()
+        else:
+            raise ValueError(f"Unsupported OVF data format: {data_format!r}")
+
         return header
-    
-    def _read_data(self, file_handle, header: Dict) -> Optional[np.ndarray]:
+
+    @staticmethod
+    def _value_count(header: Dict) -> int:
+        return header['xnodes'] * header['ynodes'] * header['znodes'] * header['valuedim']
+
+    @staticmethod
+    def _to_field(values: np.ndarray, header: Dict) -> np.ndarray:
+        """파일 순서 (z, y, x, 성분) 값을 (nx, ny, nz, valuedim) 뷰로 변환 (복사 없음)"""
+        nx, ny, nz = header['xnodes'], header['ynodes'], header['znodes']
+        return values.reshape((nz, ny, nx, header['valuedim'])).transpose(2, 1, 0, 3)
+
+    def _read_data(self, file_handle: BinaryIO, header: Dict) -> Optional[np.ndarray]:
         """OVF 파일 데이터 읽기"""
-        try:
-            nx = header.get('xnodes', 128)
-            ny = header.get('ynodes', 128)
-            nz = header.get('znodes', 1)
-            valuedim = header.get('valuedim', 3)
-            datacount = header.get('datacount', nx * ny * nz)
-            
-            # 바이너리 데이터 읽기
-            # OVF는 보통 텍스트 형식이지만, 바이너리도 지원
-            # 여기서는 텍스트 형식 가정
-            
-            data_list = []
-            line_count = 0
-            
-            while line_count < datacount:
-                line = file_handle.readline()
-                if not line:
-                    break
-                
-                # 텍스트 디코딩
-                try:
-                    line_str = line.decode('utf-8', errors='ignore').strip()
-                except:
-                    line_str = line.decode('latin-1', errors='ignore').strip()
-                
-                # 주석이나 빈 줄 건너뛰기
-                if not line_str or line_str.startswith('#'):
-                    continue
-                
-                # 데이터 파싱
-                try:
-                    values = [float(x) for x in line_str.split()]
-                    if len(values) >= valuedim:
-                        data_list.append(values[:valuedim])
-                        line_count += 1
-                except ValueError:
-                    continue
-            
-            if not data_list:
-                logger.warning("No data found in OVF file")
-                return None
-            
-            # numpy 배열로 변환
-            data_array = np.array(data_list)
-            
-            # 형태 재구성 (nx, ny, nz, valuedim)
-            if len(data_array) == nx * ny * nz:
-                data_array = data_array.reshape((nx, ny, nz, valuedim))
-            else:
-                # 데이터가 부족하면 패딩 또는 리샘플링
-                logger.warning(f"Data count mismatch: expected {nx*ny*nz}, got {len(data_array)}")
-                # 간단한 리샘플링
-                if len(data_array) > 0:
-                    # 2D로 변환 (z=1인 경우)
-                    if nz == 1:
-                        target_size = nx * ny
-                        if len(data_array) < target_size:
-                            # 패딩
-                            padding = np.zeros((target_size - len(data_array), valuedim))
-                            data_array = np.vstack([data_array, padding])
-                        elif len(data_array) > target_size:
-                            # 다운샘플링
-                            indices = np.linspace(0, len(data_array)-1, target_size, dtype=int)
-                            data_array = data_array[indices]
-                        
-                        data_array = data_array[:target_size].reshape((nx, ny, valuedim))
-                    else:
-                        data_array = data_array.reshape((nx, ny, nz, valuedim))
-            
-            return data_array
-            
-        except Exception as e:
-            logger.error(f"Failed to read OVF data: {e}")
-            return None
-    
+        count = self._value_count(header)
+
+        if header['format'] == 'binary':
+            dtype = header['dtype']
+            buffer = file_handle.read(count * dtype.itemsize)
+            if len(buffer) != count * dtype.itemsize:
+                raise ValueError(f"Truncated OVF data: expected {count} values")
+            values = np.frombuffer(buffer, dtype=dtype)
+            if not dtype.isnative:
+                values = values.astype(dtype.newbyteorder('='))
+            return self._to_field(values, header)
+
+        # 텍스트: 데이터 블록을 잘라 한 번에 변환
+        block = file_handle.read()
+        end = block.find(b'# End: Data')
+        if end >= 0:
+            block = block[:end]
+        rows = np.loadtxt(io.BytesIO(block), dtype=np.float64, comments='#', ndmin=2)
+        valuedim = header['valuedim']
+        if rows.shape[1] < valuedim:
+            raise ValueError(f"OVF text rows have {rows.shape[1]} columns, expected {valuedim}")
+        values = np.ascontiguousarray(rows[:, :valuedim]).ravel()
+        if values.size != count:
+            raise ValueError(f"Data count mismatch: expected {count}, got {values.size}")
+        return self._to_field(values, header)
+
+    def _map_data(self, file_path: str, header: Dict) -> np.ndarray:
+        """바이너리 데이터 블록을 읽기 전용 memmap으로 매핑"""
+        values = np.memmap(
+            file_path,
+            dtype=header['dtype'],
+            mode='r',
+            offset=header['data_offset'],
+            shape=(self._value_count(header),)
+        )
+        return self._to_field(values, header)
+
     def extract_magnetization_magnitude(self, ovf_data: np.ndarray) -> np.ndarray:
         """
         자기화 벡터 필드에서 크기 추출
-        
+
         Args:
             ovf_data: (nx, ny, nz, 3) 형태의 벡터 필드
-        
+
         Returns:
             (nx, ny, nz) 형태의 스칼라 필드
         """
         if ovf_data is None or len(ovf_data.shape) != 4:
             return None
-        
+
         # 벡터 크기 계산
         magnitude = np.linalg.norm(ovf_data, axis=-1)
         return magnitude
-    
+
     def extract_z_component(self, ovf_data: np.ndarray) -> np.ndarray:
         """
         z-성분만 추출 (2D 시각화용)
-        
+
         Args:
             ovf_data: (nx, ny, nz, 3) 형태의 벡터 필드
-        
+
         Returns:
             (nx, ny) 형태의 스칼라 필드
         """
         if ovf_data is None:
             return None
-        
+
         if len(ovf_data.shape) == 4:
             # z=0 슬라이스, z-성분
-            if ovf_data.shape[2] > 0:
-                return ovf_data[:, :, 0, 2]
-            else:
-                return ovf_data[:, :, 0, 2]
+            return ovf_data[:, :, 0, 2]
         elif len(ovf_data.shape) == 3:
             # 이미 2D인 경우
             return ovf_data[:, :, 2] if ovf_data.shape[2] >= 3 else ovf_data[:, :, 0]
-        
+
         return None
 
 
+class OVFSeries:
+    """
+    OVF 스냅샷 시계열 리더
+
+    파일별 헤더를 한 번만 읽어 데이터 위치를 기록하고, 바이너리 파일은
+    np.memmap으로 지연 매핑하여 (t, nx, ny, nz, valuedim) 배열처럼 인덱싱한다.
+    시간 구간과 z-층 선택은 해당 바이트 범위의 페이지만 읽는다
+    (성분 선택은 노드 단위로 인터리브되어 있어 선택된 노드 범위 전체를 읽음).
+    텍스트 파일은 매핑할 수 없으므로 해당 프레임 접근 시 전체를 파싱한다.
+
+    Args:
+        source: 스냅샷 디렉토리 또는 파일 경로 목록
+        pattern: 디렉토리에서 찾을 파일 패턴 (이름순 정렬)
+
+    Example:
+        series = OVFSeries("sim.out")
+        mz = series[:, :, :, 0, 2]        # (t, nx, ny) z-성분, 첫 z-층
+        window = series[100:200]          # 시간 구간
+        for frame in series.iter_frames(component=2):
+            ...
+    """
+
+    def __init__(self, source: Union[str, Path, Sequence[Union[str, Path]]], pattern: str = "*.ovf"):
+        if isinstance(source, (str, Path)):
+            self.paths = sorted(Path(source).glob(pattern))
+        else:
+            self.paths = [Path(p) for p in source]
+        if not self.paths:
+            raise ValueError(f"No OVF snapshots found in {source}")
+
+        self._parser = get_ovf_parser()
+        self.headers: List[Dict] = []
+        for path in self.paths:
+            header = self._parser.read_header(str(path))
+            if header is None:
+                raise ValueError(f"Not an OVF file: {path}")
+            self.headers.append(header)
+
+        first = self.headers[0]
+        self.frame_shape = (first['xnodes'], first['ynodes'], first['znodes'], first['valuedim'])
+        for path, header in zip(self.paths, self.headers):
+            shape = (header['xnodes'], header['ynodes'], header['znodes'], header['valuedim'])
+            if shape != self.frame_shape:
+                raise ValueError(f"Snapshot {path} has shape {shape}, expected {self.frame_shape}")
+
+        dtypes = {h['dtype'].newbyteorder('=') if h['dtype'] is not None else np.dtype(np.float64)
+                  for h in self.headers}
+        self.dtype = np.result_type(*dtypes)
+        self._frames: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self),) + self.frame_shape
+
+    @property
+    def ndim(self) -> int:
+        return 5
+
+    @property
+    def times(self) -> Optional[np.ndarray]:
+        """스냅샷별 시뮬레이션 시간 (헤더에 없으면 None)"""
+        if not all('time' in h for h in self.headers):
+            return None
+        return np.array([h['time'] for h in self.headers])
+
+    def frame(self, index: int) -> np.ndarray:
+        """단일 스냅샷 (nx, ny, nz, valuedim) — 바이너리는 읽기 전용 memmap 뷰"""
+        index = range(len(self))[index]
+        frame = self._frames.get(index)
+        if frame is None:
+            header = self.headers[index]
+            path = str(self.paths[index])
+            if header['format'] == 'binary':
+                frame = self._parser._map_data(path, header)
+            else:
+                frame = self._parser.parse_ovf(path)
+                if frame is None:
+                    raise ValueError(f"Failed to parse OVF snapshot: {path}")
+            self._frames[index] = frame
+        return frame
+
+    def __getitem__(self, key) -> np.ndarray:
+        """
+        (t, nx, ny, nz, valuedim) 인덱싱
+
+        첫 축이 정수이면 해당 프레임의 뷰(복사 없음)를, 그 외에는
+        선택된 데이터만 담은 새 배열을 반환한다.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if not key or key[0] is Ellipsis:
+            time_key, frame_key = slice(None), key
+        else:
+            time_key, frame_key = key[0], key[1:]
+
+        if isinstance(time_key, (int, np.integer)):
+            return self.frame(int(time_key))[frame_key]
+
+        indices = np.arange(len(self))[time_key]
+        if indices.ndim != 1:
+            raise IndexError("Time index must be an integer, slice or 1-D sequence")
+
+        selected = [self.frame(int(i))[frame_key] for i in indices]
+        if not selected:
+            template = np.empty(self.frame_shape, dtype=self.dtype)[frame_key]
+            return np.empty((0,) + template.shape, dtype=self.dtype)
+
+        out = np.empty((len(selected),) + selected[0].shape, dtype=self.dtype)
+        for i, frame in enumerate(selected):
+            out[i] = frame
+        return out
+
+    def iter_frames(
+        self,
+        component: Optional[int] = None,
+        z: Optional[int] = None,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        스냅샷 순차 스트리밍 (한 번에 한 프레임만 메모리에 올림)
+
+        Args:
+            component: 선택할 벡터 성분 (None이면 전체)
+            z: 선택할 z-층 (None이면 전체)
+            start, stop: 시간 구간
+        """
+        frame_key = (slice(None), slice(None),
+                     slice(None) if z is None else z,
+                     slice(None) if component is None else component)
+        for index in range(len(self))[start:stop]:
+            yield np.array(self.frame(index)[frame_key], dtype=self.dtype)
+
+
+def write_ovf(
+    file_path: str,
+    data: np.ndarray,
+    data_format: str = "binary 4",
+    version: int = 2,
+    title: str = "m",
+    cell_size: float = 1e-9,
+    time: Optional[float] = None
+):
+    """
+    (nx, ny, nz, valuedim) 벡터 필드를 OVF 파일로 저장
+
+    Args:
+        file_path: 출력 경로
+        data: (nx, ny, nz, valuedim) 배열
+        data_format: "text", "binary 4", "binary 8"
+        version: OVF 버전 (1 또는 2)
+        title: 헤더 Title
+        cell_size: 셀 크기 (m)
+        time: 시뮬레이션 시간 (MuMax3 형식 Desc 줄로 기록)
+    """
+    data_format = data_format.lower()
+    nx, ny, nz, valuedim = data.shape
+    if version == 1 and valuedim != 3:
+        raise ValueError("OVF 1.0 supports only 3-component fields")
+
+    first_line = "# OOMMF OVF 2.0" if version == 2 else "# OOMMF: rectangular mesh v1.0"
+    lines = [first_line, "# Segment count: 1", "# Begin: Segment", "# Begin: Header",
+             f"# Title: {title}", "# meshtype: rectangular", "# meshunit: m"]
+    if time is not None:
+        lines.append(f"# Desc: Total simulation time:  {time:g}  s")
+    for axis, n in zip("xyz", (nx, ny, nz)):
+        lines += [f"# {axis}min: 0", f"# {axis}max: {n * cell_size:g}"]
+    if version == 2:
+        lines.append(f"# valuedim: {valuedim}")
+        lines.append("# valuelabels: " + " ".join(f"{title}_{c}" for c in "xyz"[:valuedim]))
+        lines.append("# valueunits: " + " ".join(["1"] * valuedim))
+    else:
+        lines.append("# valueunit: 1")
+        lines.append("# valuemultiplier: 1")
+    for axis in "xyz":
+        lines.append(f"# {axis}base: {cell_size / 2:g}")
+    for axis, n in zip("xyz", (nx, ny, nz)):
+        lines.append(f"# {axis}nodes: {n}")
+    for axis in "xyz":
+        lines.append(f"# {axis}stepsize: {cell_size:g}")
+    lines.append("# End: Header")
+
+    # 파일 순서: (z, y, x, 성분)
+    ordered = np.ascontiguousarray(data.transpose(2, 1, 0, 3))
+
+    with open(file_path, "wb") as f:
+        if data_format == "text":
+            f.write(("\n".join(lines) + "\n# Begin: Data Text\n").encode("ascii"))
+            np.savetxt(f, ordered.reshape(-1, valuedim), fmt="%.9g")
+            f.write(b"# End: Data Text\n")
+        elif data_format in ("binary 4", "binary 8"):
+            itemsize = int(data_format[-1])
+            byteorder = '>' if version == 1 else '<'
+            dtype = np.dtype(f"{byteorder}f{itemsize}")
+            label = data_format.title()
+            f.write(("\n".join(lines) + f"\n# Begin: Data {label}\n").encode("ascii"))
+            f.write(np.array([CONTROL_VALUES[itemsize]], dtype=dtype).tobytes())
+            f.write(ordered.astype(dtype).tobytes())
+            f.write(f"\n# End: Data {label}\n".encode("ascii"))
+        else:
+            raise ValueError(f"Unsupported OVF data format: {data_format!r}")
+        f.write(b"# End: Segment\n")
+
+
 # 전역 인스턴스
 _ovf_parser: Optional[OVFParser] = None
 
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pre-computed 시뮬레이션 DB 생성 도구 (precompute farm)
+(theta, beta) 격자를 병렬 MuMax3 솔버 프로세스로 일괄 실행하고
+InterpolatedSimulationDB가 바로 읽을 수 있는 패턴 뱅크(.npz)를 작성
+
+- 솔버 실행/작업 디렉토리/결과 캐시는 MuMax3JobRunner 재사용
+- 체크포인트 매니페스트(JSON)에 격자점별 상태를 기록하여 중단 후 재개 가능
+- OVF 출력은 MuMax3Integration.load_output (OVFParser)으로 파싱
+
+사용 예:
+    python precompute_farm.py --steps 9 --workers 4 --output mumax3_temp/pattern_bank.npz
+    python precompute_farm.py --solver ./mock_mumax3.py --steps 3   # CI (mock 솔버)
+    SIMULATION_BANK_PATH=mumax3_temp/pattern_bank.npz python api_server.py
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from mumax3_integration import MuMax3Integration
+from mumax3_jobs import MuMax3JobRunner
+from simulation_db import InterpolatedSimulationDB
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def grid_steps(count: int) -> List[float]:
+    """[0, 1] 구간의 등간격 격자점"""
+    if count < 2:
+        raise ValueError("A grid axis needs at least 2 steps")
+    return [round(v, 6) for v in np.linspace(0.0, 1.0, count)]
+
+
+def _atomic_write(path: Path, write):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (중단되어도 기존 파일 보존)"""
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class PrecomputeFarm:
+    """
+    격자 스윕 실행기
+
+    Args:
+        integration: 솔버 경로가 설정된 MuMax3Integration
+        output: 패턴 뱅크 경로 (.npz)
+        theta_steps, beta_steps: 격자점
+        workers: 동시에 실행할 솔버 프로세스 수
+        timeout: 격자점당 솔버 타임아웃 (초)
+        work_dir: 매니페스트/결과 캐시/작업 디렉토리 (기본: <output>.farm/)
+    """
+
+    def __init__(
+        self,
+        integration: MuMax3Integration,
+        output: Path,
+        theta_steps: List[float],
+        beta_steps: List[float],
+        workers: int = 2,
+        timeout: float = 600,
+        work_dir: Optional[Path] = None
+    ):
+        self.integration = integration
+        self.output = Path(output)
+        self.theta_steps = list(theta_steps)
+        self.beta_steps = list(beta_steps)
+        self.work_dir = Path(work_dir or self.output.with_name(self.output.name + ".farm"))
+        self.manifest_path = self.work_dir / "manifest.json"
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+
+        points = len(self.theta_steps) * len(self.beta_steps)
+        # quantum=0: 격자점을 양자화하지 않고 그대로 실행
+        self.runner = MuMax3JobRunner(
+            integration,
+            max_workers=workers,
+            max_pending=points,
+            cache_dir=self.work_dir / "results",
+            work_root=self.work_dir / "jobs",
+            timeout=timeout,
+            quantum=0
+        )
+        self.manifest = self._load_manifest()
+
+    @staticmethod
+    def point_key(theta: float, beta: float) -> str:
+        return f"{theta:.6f},{beta:.6f}"
+
+    def _load_manifest(self) -> Dict:
+        grid = {"theta_steps": self.theta_steps, "beta_steps": self.beta_steps}
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if {k: manifest.get(k) for k in grid} != grid:
+                raise ValueError(
+                    f"Manifest {self.manifest_path} was written for a different grid; "
+                    "use --fresh or another --work-dir"
+                )
+            return manifest
+        return {"version": MANIFEST_VERSION, **grid, "points": {}}
+
+    def _save_manifest(self):
+        data = json.dumps(self.manifest, indent=2).encode("utf-8")
+        _atomic_write(self.manifest_path, lambda f: f.write(data))
+
+    def pending_points(self) -> List[tuple]:
+        """아직 결과가 없는 격자점 (매니페스트 + 결과 캐시 기준)"""
+        pending = []
+        for theta in self.theta_steps:
+            for beta in self.beta_steps:
+                entry = self.manifest["points"].get(self.point_key(theta, beta))
+                if entry and entry.get("status") == "done" and self.runner.get_cached(theta, beta) is not None:
+                    continue
+                pending.append((theta, beta))
+        return pending
+
+    def run(self) -> Dict:
+        """
+        미완료 격자점 실행 후 모두 완료되면 패턴 뱅크 작성
+
+        Returns:
+            실행 요약 (total, skipped, completed, failed, bank)
+        """
+        total = len(self.theta_steps) * len(self.beta_steps)
+        pending = self.pending_points()
+        logger.info(f"Precompute farm: {total - len(pending)}/{total} points already done")
+
+        futures = {}
+        for theta, beta in pending:
+            futures[self.runner.submit(theta, beta)] = (theta, beta)
+
+        completed = failed = 0
+        try:
+            for future in as_completed(futures):
+                theta, beta = futures[future]
+                state = future.result()
+                entry = {"theta": theta, "beta": beta, "digest": self.runner.job_digest(theta, beta)}
+                if state is None:
+                    entry["status"] = "failed"
+                    failed += 1
+                else:
+                    entry["status"] = "done"
+                    completed += 1
+                self.manifest["points"][self.point_key(theta, beta)] = entry
+                self._save_manifest()
+                logger.info(
+                    f"[{total - len(pending) + completed + failed}/{total}] "
+                    f"theta={theta:.3f} beta={beta:.3f} {entry['status']}"
+                )
+        finally:
+            self.runner.shutdown()
+
+        summary = {
+            "total": total,
+            "skipped": total - len(pending),
+            "completed": completed,
+            "failed": failed,
+            "bank": None
+        }
+        if failed == 0:
+            self.write_bank()
+            summary["bank"] = str(self.output)
+        return summary
+
+    def write_bank(self):
+        """완료된 격자점들을 (n_theta, n_beta, G, G) float32 패턴 뱅크로 저장"""
+        size = InterpolatedSimulationDB.GRID_SIZE
+        patterns = np.empty((len(self.theta_steps), len(self.beta_steps), size, size), dtype=np.float32)
+        for i, theta in enumerate(self.theta_steps):
+            for j, beta in enumerate(self.beta_steps):
+                state = self.runner.get_cached(theta, beta)
+                if state is None:
+                    raise RuntimeError(f"Missing result for theta={theta}, beta={beta}")
+                if state.shape != (size, size):
+                    raise ValueError(f"Solver output shape {state.shape} != ({size}, {size})")
+                patterns[i, j] = state
+
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        source = f"mumax3_bank_{len(self.theta_steps)}x{len(self.beta_steps)}"
+        _atomic_write(self.output, lambda f: np.savez(
+            f,
+            theta_steps=np.array(self.theta_steps),
+            beta_steps=np.array(self.beta_steps),
+            patterns=patterns,
+            source=np.array(source)
+        ))
+        logger.info(f"Pattern bank written: {self.output} ({patterns.nbytes / 1e6:.1f} MB)")
+
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    import argparse
+    import shutil
+
+    parser = argparse.ArgumentParser(description="MuMax3 격자 스윕으로 Pre-computed 패턴 뱅크 생성")
+    parser.add_argument("--solver", default=None,
+                        help="MuMax3 실행 파일 (기본: 자동 감지 / MUMAX3_PATH, CI는 mock_mumax3.py)")
+    parser.add_argument("--steps", type=int, default=5, help="축별 격자점 수")
+    parser.add_argument("--theta-steps", type=int, default=None, help="theta 축 격자점 수 (기본: --steps)")
+    parser.add_argument("--beta-steps", type=int, default=None, help="beta 축 격자점 수 (기본: --steps)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="병렬 솔버 프로세스 수")
+    parser.add_argument("--timeout", type=float, default=600, help="격자점당 솔버 타임아웃 (초)")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "mumax3_temp" / "pattern_bank.npz"),
+                        help="패턴 뱅크 출력 경로 (.npz)")
+    parser.add_argument("--work-dir", default=None, help="매니페스트/중간 결과 디렉토리")
+    parser.add_argument("--fresh", action="store_true", help="기존 매니페스트와 중간 결과 삭제 후 처음부터 실행")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    integration = MuMax3Integration(mumax3_path=args.solver, enable_realtime=True)
+    if not integration.available:
+        print("MuMax3 solver not found (use --solver or MUMAX3_PATH)", file=sys.stderr)
+        return 1
+
+    output = Path(args.output)
+    work_dir = Path(args.work_dir) if args.work_dir else output.with_name(output.name + ".farm")
+    if args.fresh and work_dir.exists():
+        shutil.rmtree(work_dir)
+
+    try:
+        farm = PrecomputeFarm(
+            integration,
+            output,
+            grid_steps(args.theta_steps or args.steps),
+            grid_steps(args.beta_steps or args.steps),
+            workers=args.workers,
+            timeout=args.timeout,
+            work_dir=work_dir
+        )
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    summary = farm.run()
+    print(json.dumps(summary, indent=2))
+    if summary["failed"]:
+        print("Some grid points failed; rerun to retry them", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+요청 마이크로배칭 모듈
+동시에 들어온 단일 행 예측 요청을 짧은 시간(기본 2ms) 동안 모아 한 번의 배치 예측으로 처리
+
+- 첫 요청이 도착하면 max_delay 타이머 시작, max_batch개가 모이면 즉시 실행
+- 배치 예측은 executor 스레드에서 실행되어 이벤트 루프를 막지 않음
+- 예측 함수가 실패하면 해당 배치의 모든 요청에 같은 예외 전달
+"""
+import asyncio
+import os
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_DELAY = float(os.getenv("PREDICT_BATCH_DELAY_MS", "2")) / 1000
+DEFAULT_MAX_BATCH = int(os.getenv("PREDICT_BATCH_SIZE", "64"))
+
+
+class PredictionBatcher:
+    """
+    단일 행 요청을 모아 predict_fn((n, d) 배열) -> (n, k) 배열 한 번으로 처리
+
+    Args:
+        predict_fn: 배치 예측 함수 (예: MLPersonalityModel.predict_batch)
+        max_batch: 한 배치의 최대 행 수
+        max_delay: 첫 요청 이후 배치를 모으는 최대 대기 시간 (초)
+        executor: 예측을 실행할 executor (None이면 기본 스레드 풀)
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        executor=None
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    async def predict(self, row: np.ndarray) -> np.ndarray:
+        """한 행 예측 (다른 동시 요청과 함께 배치로 실행된 결과의 해당 행)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((np.asarray(row), future))
+        self.requests += 1
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[np.ndarray, asyncio.Future]]):
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        loop = asyncio.get_running_loop()
+        try:
+            X = np.stack([row for row, _ in batch])
+            results = await loop.run_in_executor(self.executor, self.predict_fn, X)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            # 대기 중 취소된 요청(클라이언트 연결 종료 등)은 건너뜀
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "max_delay_ms": self.max_delay * 1000
+        }
@@ -7,14 +7,149 @@
 - 스트레스/피로 감지
 - 성격 변화 예측
 - 이상 행동 감지
+
+트렌드 / 성격 진화 예측은 4개 특성을 (T, 4) 행렬 하나로 닫힌 형태 최소제곱 적합하며,
+사용자 여러 명의 행을 이어 붙인 배열도 그룹별 합(np.bincount)으로 한 번에 적합 (trends_batch / evolution_batch)
 """
+import warnings
 import numpy as np
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+TRAITS = ('logic', 'intuition', 'fluidity', 'complexity')
+WEIGHT_KEYS = tuple(f"{trait}_weight" for trait in TRAITS)
+
+
+def fit_lines(x: np.ndarray, Y: np.ndarray, groups: Optional[np.ndarray] = None,
+              n_groups: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    그룹별 1차 최소제곱 적합 (np.polyfit(x, Y[:, j], 1)을 모든 열 / 그룹에 대해 한 번에)
+    
+    Args:
+        x: (N,) 설명 변수
+        Y: (N, K) 목표 값
+        groups: (N,) 그룹 인덱스 (None이면 전체가 한 그룹)
+        n_groups: 그룹 수
+    
+    Returns:
+        기울기 (G, K), 절편 (G, K), 그룹별 행 수 (G,)
+        (x가 모두 같은 그룹은 polyfit의 최소 노름 해처럼 기울기 0, 절편 = 평균)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64).reshape(len(x), -1)
+    if groups is None:
+        groups, n_groups = np.zeros(len(x), dtype=np.intp), 1
+    elif n_groups is None:
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+    
+    counts = np.bincount(groups, minlength=n_groups)
+    safe = np.maximum(counts, 1)
+    x_mean = np.bincount(groups, weights=x, minlength=n_groups) / safe
+    Y_mean = np.column_stack([
+        np.bincount(groups, weights=Y[:, k], minlength=n_groups) for k in range(Y.shape[1])
+    ]) / safe[:, None] if Y.shape[1] else np.zeros((n_groups, 0))
+    # 평균을 뺀 값으로 합산 (큰 x(일 수)에서도 정확)
+    dx = x - x_mean[groups]
+    dY = Y - Y_mean[groups]
+    sxx = np.bincount(groups, weights=dx * dx, minlength=n_groups)
+    sxy = np.column_stack([
+        np.bincount(groups, weights=dx * dY[:, k], minlength=n_groups) for k in range(Y.shape[1])
+    ]) if Y.shape[1] else np.zeros((n_groups, 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.where(sxx[:, None] > 0, sxy / sxx[:, None], 0.0)
+    intercepts = Y_mean - slopes * x_mean[:, None]
+    return slopes, intercepts, counts
+
+
+def parse_timestamps(values: Sequence[str]) -> np.ndarray:
+    """
+    ISO 8601 / SQLite 타임스탬프 배열 → datetime64[us] (UTC 기준 naive)
+    'Z'는 한 번에 제거하고, 다른 시간대 오프셋이 섞인 경우에만 행별로 변환
+    """
+    text = np.char.replace(np.asarray(values, dtype=str), 'Z', '')
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # 시간대 오프셋은 numpy에서 경고 후 무시되므로 직접 변환
+            return text.astype('datetime64[us]')
+    except (ValueError, UserWarning, DeprecationWarning):
+        parsed = []
+        for value in text.tolist():
+            moment = datetime.fromisoformat(value)
+            if moment.tzinfo is not None:
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            parsed.append(np.datetime64(moment, 'us'))
+        return np.array(parsed, dtype='datetime64[us]')
+
+
+def day_offsets(timestamps: np.ndarray, groups: Optional[np.ndarray] = None,
+                n_groups: Optional[int] = None) -> np.ndarray:
+    """그룹별 첫 타임스탬프로부터 지난 일 수 (timedelta.days와 같이 내림)"""
+    if groups is None:
+        first = timestamps[:1]
+        groups = np.zeros(len(timestamps), dtype=np.intp)
+    else:
+        first = np.full(n_groups if n_groups is not None else int(groups.max()) + 1,
+                        np.datetime64('NaT'), dtype=timestamps.dtype)
+        # 행이 그룹 안에서 시간순이므로 그룹의 첫 행이 시작 시각
+        is_first = np.ones(len(groups), dtype=bool)
+        is_first[1:] = groups[1:] != groups[:-1]
+        first[groups[is_first]] = timestamps[is_first]
+    return (timestamps - first[groups]) // np.timedelta64(1, 'D')
+
+
+def trend_labels(slopes: np.ndarray, threshold: float = 0.0) -> np.ndarray:
+    """기울기 → "increasing" / "decreasing" / "stable" """
+    return np.where(slopes > threshold, "increasing", np.where(slopes < -threshold, "decreasing", "stable"))
+
+
+EVOLUTION_SQL = f"""
+    SELECT user_id, timestamp, {', '.join(WEIGHT_KEYS)}
+    FROM profile_evolution
+    WHERE timestamp IS NOT NULL
+    ORDER BY user_id, timestamp, id
+"""
+
+
+def load_evolution(conn) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    profile_evolution 전체 → 사용자별로 모이고 시간순인 배열
+    
+    Returns:
+        사용자 ID 목록, 사용자 인덱스 (N,), 타임스탬프 datetime64 (N,), 가중치 (N, 4)
+        (NULL 가중치는 단일 사용자 메서드의 session.get 기본값처럼 0.5)
+    """
+    rows = conn.execute(EVOLUTION_SQL).fetchall()
+    if not rows:
+        return [], np.zeros(0, dtype=np.intp), np.zeros(0, dtype='datetime64[us]'), np.zeros((0, len(TRAITS)))
+    columns = list(zip(*rows))
+    user_ids, user_index = np.unique(np.array(columns[0], dtype=object), return_inverse=True)
+    timestamps = parse_timestamps(columns[1])
+    weights = np.array(columns[2:], dtype=np.float64).T
+    weights[np.isnan(weights)] = 0.5
+    return user_ids.tolist(), user_index.astype(np.intp), timestamps, weights
+
+
+class TrendBatch(NamedTuple):
+    """사용자별 행동 트렌드 (최근 lookback_window개 세션 기준, 열은 TRAITS 순서)"""
+    counts: np.ndarray     # (U,) 적합에 쓴 세션 수
+    current: np.ndarray    # (U, 4) 마지막 세션 가중치
+    predicted: np.ndarray  # (U, 4) 다음 세션 예측 ([0, 1] 클리핑)
+    slopes: np.ndarray     # (U, 4)
+    valid: np.ndarray      # (U,) 예측 가능 여부
+
+
+class EvolutionBatch(NamedTuple):
+    """사용자별 성격 진화 예측 (열은 TRAITS 순서)"""
+    counts: np.ndarray      # (U,)
+    current: np.ndarray     # (U, 4)
+    predicted: np.ndarray   # (U, 4) forecast_days 뒤 예측 ([0, 1] 클리핑)
+    slopes: np.ndarray      # (U, 4) 일당 변화량
+    confidence: np.ndarray  # (U,)
+    valid: np.ndarray       # (U,)
+
 
 class PredictiveModel:
     """
@@ -49,44 +184,30 @@ class PredictiveModel:
                 "sessions_needed": 3 - len(history)
             }
         
-        # 최근 세션만 사용
-        recent = history[-self.lookback_window:]
-        
-        # 가중치 추출
-        weights_history = []
-        for session in recent:
-            if 'logic_weight' in session:
-                weights_history.append({
-                    'logic': session.get('logic_weight', 0.5),
-                    'intuition': session.get('intuition_weight', 0.5),
-                    'fluidity': session.get('fluidity_weight', 0.5),
-                    'complexity': session.get('complexity_weight', 0.5)
-                })
-        
-        if len(weights_history) < 2:
+        # 최근 세션 중 가중치가 있는 세션만 사용
+        recent = [session for session in history[-self.lookback_window:] if 'logic_weight' in session]
+        if len(recent) < 2:
             return {"status": "insufficient_data"}
         
-        # 선형 회귀로 트렌드 예측
-        trends = {}
-        for trait in ['logic', 'intuition', 'fluidity', 'complexity']:
-            values = [w[trait] for w in weights_history]
-            x = np.arange(len(values))
-            
-            # 선형 피팅
-            coeffs = np.polyfit(x, values, 1)
-            trend_slope = coeffs[0]
-            
-            # 다음 세션 예측값
-            next_value = np.polyval(coeffs, len(values))
-            next_value = np.clip(next_value, 0.0, 1.0)
-            
-            trends[trait] = {
-                "current": values[-1],
-                "predicted": float(next_value),
-                "trend": "increasing" if trend_slope > 0.01 else "decreasing" if trend_slope < -0.01 else "stable",
-                "slope": float(trend_slope),
-                "confidence": min(len(weights_history) / 10, 1.0)
+        weights = np.array([[session.get(key, 0.5) for key in WEIGHT_KEYS] for session in recent], dtype=np.float64)
+        batch = self.trends_batch(np.zeros(len(weights), dtype=np.intp), weights, n_users=1, min_sessions=2)
+        return self.trend_result(batch, 0)
+    
+    @staticmethod
+    def trend_result(batch: "TrendBatch", user: int) -> Dict:
+        """TrendBatch의 한 사용자 → predict_behavioral_trend 응답 형식"""
+        labels = trend_labels(batch.slopes[user], threshold=0.01)
+        confidence = min(int(batch.counts[user]) / 10, 1.0)
+        trends = {
+            trait: {
+                "current": float(batch.current[user, j]),
+                "predicted": float(batch.predicted[user, j]),
+                "trend": str(labels[j]),
+                "slope": float(batch.slopes[user, j]),
+                "confidence": confidence
             }
+            for j, trait in enumerate(TRAITS)
+        }
         
         return {
             "status": "predicted",
@@ -96,6 +217,39 @@ class PredictiveModel:
             }
         }
     
+    def trends_batch(self, user_index: np.ndarray, weights: np.ndarray,
+                     n_users: Optional[int] = None, min_sessions: int = 3) -> TrendBatch:
+        """
+        여러 사용자의 행동 트렌드를 한 번에 예측 (predict_behavioral_trend의 배열 버전)
+        
+        Args:
+            user_index: (N,) 사용자 인덱스 (사용자별로 모여 있고 사용자 안에서는 시간순)
+            weights: (N, 4) 가중치 (TRAITS 순서)
+            n_users: 사용자 수
+            min_sessions: 예측에 필요한 최소 세션 수
+        
+        Returns:
+            TrendBatch (사용자별 최근 lookback_window개 세션을 순번 0, 1, ...에 대해 적합)
+        """
+        user_index = np.asarray(user_index, dtype=np.intp)
+        weights = np.asarray(weights, dtype=np.float64)
+        if n_users is None:
+            n_users = int(user_index.max()) + 1 if len(user_index) else 0
+        counts = np.bincount(user_index, minlength=n_users)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.intp)
+        ordinal = np.arange(len(user_index)) - starts[user_index]
+        # 최근 lookback_window개만 남기고 창 안에서 0부터 다시 번호
+        window_start = np.maximum(counts - self.lookback_window, 0)
+        keep = ordinal >= window_start[user_index]
+        x = (ordinal - window_start[user_index])[keep]
+        groups = user_index[keep]
+        
+        slopes, intercepts, used = fit_lines(x, weights[keep], groups, n_users)
+        current = np.full((n_users, len(TRAITS)), np.nan)
+        current[counts > 0] = weights[(starts + counts - 1)[counts > 0]]
+        predicted = np.clip(slopes * used[:, None] + intercepts, 0.0, 1.0)
+        return TrendBatch(used, current, predicted, slopes, counts >= min_sessions)
+    
     def detect_stress_pattern(
         self,
         history: List[Dict],
@@ -235,51 +389,117 @@ class PredictiveModel:
                 "sessions_needed": 5 - len(history)
             }
         
-        # 시간 시계열 생성
-        timestamps = []
-        weights_series = {trait: [] for trait in ['logic', 'intuition', 'fluidity', 'complexity']}
-        
-        for session in history:
-            if 'timestamp' in session:
-                timestamps.append(session['timestamp'])
-                for trait in weights_series:
-                    key = f"{trait}_weight"
-                    weights_series[trait].append(session.get(key, 0.5))
-        
-        if len(timestamps) < 5:
+        # 타임스탬프가 있는 행만 시계열로 사용
+        rows = [session for session in history if 'timestamp' in session]
+        if len(rows) < 5:
             return {"status": "insufficient_data"}
         
-        # 선형 외삽으로 미래 예측
-        predictions = {}
-        days_from_start = [(datetime.fromisoformat(ts.replace('Z', '+00:00')) - datetime.fromisoformat(timestamps[0].replace('Z', '+00:00'))).days for ts in timestamps]
-        
-        for trait in weights_series:
-            values = weights_series[trait]
-            x = np.array(days_from_start)
-            y = np.array(values)
-            
-            # 선형 피팅
-            coeffs = np.polyfit(x, y, 1)
-            
-            # 미래 예측
-            future_day = days_from_start[-1] + forecast_days
-            predicted_value = np.polyval(coeffs, future_day)
-            predicted_value = np.clip(predicted_value, 0.0, 1.0)
-            
-            predictions[trait] = {
-                "current": float(values[-1]),
-                "predicted_30days": float(predicted_value),
-                "change": float(predicted_value - values[-1]),
-                "trend": "increasing" if coeffs[0] > 0 else "decreasing" if coeffs[0] < 0 else "stable"
+        weights = np.array([[session.get(key, 0.5) for key in WEIGHT_KEYS] for session in rows], dtype=np.float64)
+        timestamps = parse_timestamps([session['timestamp'] for session in rows])
+        batch = self.evolution_batch(
+            np.zeros(len(rows), dtype=np.intp), timestamps, weights, n_users=1, forecast_days=forecast_days
+        )
+        result = self.evolution_result(batch, 0, forecast_days)
+        result["confidence"] = min(len(history) / 20, 1.0)
+        return result
+    
+    @staticmethod
+    def evolution_result(batch: "EvolutionBatch", user: int, forecast_days: int = 30) -> Dict:
+        """EvolutionBatch의 한 사용자 → predict_personality_evolution 응답 형식"""
+        labels = trend_labels(batch.slopes[user])
+        predictions = {
+            trait: {
+                "current": float(batch.current[user, j]),
+                "predicted_30days": float(batch.predicted[user, j]),
+                "change": float(batch.predicted[user, j] - batch.current[user, j]),
+                "trend": str(labels[j])
             }
+            for j, trait in enumerate(TRAITS)
+        }
         
         return {
             "status": "predicted",
             "forecast_days": forecast_days,
             "predictions": predictions,
-            "confidence": min(len(history) / 20, 1.0)
+            "confidence": float(batch.confidence[user])
         }
     
+    def evolution_batch(self, user_index: np.ndarray, timestamps: np.ndarray, weights: np.ndarray,
+                        n_users: Optional[int] = None, forecast_days: int = 30,
+                        min_sessions: int = 5) -> EvolutionBatch:
+        """
+        여러 사용자의 성격 진화를 한 번에 예측 (predict_personality_evolution의 배열 버전)
+        
+        Args:
+            user_index: (N,) 사용자 인덱스 (사용자별로 모여 있고 사용자 안에서는 시간순)
+            timestamps: (N,) datetime64 또는 타임스탬프 문자열
+            weights: (N, 4) 가중치 (TRAITS 순서)
+            n_users: 사용자 수
+            forecast_days: 마지막 기록 이후 예측할 일수
+            min_sessions: 예측에 필요한 최소 기록 수
+        
+        Returns:
+            EvolutionBatch (사용자별 첫 기록으로부터 지난 일 수에 대해 적합)
+        """
+        user_index = np.asarray(user_index, dtype=np.intp)
+        weights = np.asarray(weights, dtype=np.float64)
+        timestamps = np.asarray(timestamps)
+        if timestamps.dtype.kind != 'M':
+            timestamps = parse_timestamps(timestamps)
+        if n_users is None:
+            n_users = int(user_index.max()) + 1 if len(user_index) else 0
+        
+        days = day_offsets(timestamps, user_index, n_users).astype(np.float64)
+        slopes, intercepts, counts = fit_lines(days, weights, user_index, n_users)
+        last = (np.cumsum(counts) - 1)[counts > 0]
+        current = np.full((n_users, len(TRAITS)), np.nan)
+        current[counts > 0] = weights[last]
+        future_day = np.full(n_users, np.nan)
+        future_day[counts > 0] = days[last] + forecast_days
+        predicted = np.clip(slopes * future_day[:, None] + intercepts, 0.0, 1.0)
+        return EvolutionBatch(
+            counts, current, predicted, slopes, np.minimum(counts / 20, 1.0), counts >= min_sessions
+        )
+    
+    def predict_all_users(self, conn, forecast_days: int = 30) -> Dict[str, Dict]:
+        """
+        profile_evolution 전체를 한 번 읽어 모든 사용자의 트렌드 / 진화 예측을 계산 (야간 인사이트 작업용)
+        
+        Args:
+            conn: SQLite 연결
+            forecast_days: 성격 진화 예측 일수
+        
+        Returns:
+            사용자 ID → {"behavior_trend": ..., "prediction": ..., "data_points": ...}
+            (기록이 부족한 사용자는 단일 사용자 메서드와 같은 insufficient_data 응답)
+        """
+        user_ids, user_index, timestamps, weights = load_evolution(conn)
+        n_users = len(user_ids)
+        trends = self.trends_batch(user_index, weights, n_users)
+        evolution = self.evolution_batch(user_index, timestamps, weights, n_users, forecast_days)
+        
+        results = {}
+        for u, user_id in enumerate(user_ids):
+            count = int(evolution.counts[u])
+            if trends.valid[u]:
+                behavior_trend = self.trend_result(trends, u)
+            else:
+                behavior_trend = {
+                    "status": "insufficient_data",
+                    "message": "최소 3개 세션이 필요합니다",
+                    "sessions_needed": 3 - count
+                }
+            if evolution.valid[u]:
+                prediction = self.evolution_result(evolution, u, forecast_days)
+            else:
+                prediction = {"status": "insufficient_data", "sessions_needed": 5 - count}
+            results[user_id] = {
+                "behavior_trend": behavior_trend,
+                "prediction": prediction,
+                "data_points": count
+            }
+        return results
+    
     def detect_anomaly(
         self,
         history: List[Dict],
@@ -368,6 +588,123 @@ class PredictiveModel:
             "anomalies": anomalies,
             "recommendation": "정상적인 패턴입니다." if len(anomalies) == 0 else "이상 행동 패턴이 감지되었습니다. 확인이 필요합니다."
         }
+    
+    # 스트리밍 감지기 지표 → (이상 유형, 설명 주어, 이상 점수 가중치)
+    STREAMING_ANOMALY_TYPES = {
+        "avg_decision_latency": ("decision_latency", "의사결정 지연시간이", 0.3),
+        "revision_rate": ("revision_rate", "수정 빈도가", 0.3),
+        "path_efficiency": ("path_efficiency", "경로 효율성이", 0.4),
+    }
+    
+    def assess_streaming(self, observations: Dict) -> Dict:
+        """
+        스트리밍 감지기 관측 결과(streaming_detectors.Observation)로 스트레스 / 이상 / 변화점 판정
+        
+        detect_stress_pattern / detect_anomaly와 같은 응답 형식이며, 기준값은 최근 N개 세션 목록 대신
+        지수 가중 평균(스트레스)과 중앙값 / MAD 기반 robust z-score(이상)를 사용
+        
+        Args:
+            observations: 지표 이름 → Observation
+        
+        Returns:
+            {"stress_analysis", "anomaly_detection", "change_points"}
+        """
+        ready = {metric: obs for metric, obs in observations.items() if obs.z is not None}
+        change_points = [
+            {"metric": metric, "direction": obs.change, "baseline": round(obs.median, 4)}
+            for metric, obs in ready.items() if obs.change is not None
+        ]
+        if not ready:
+            insufficient = {"status": "insufficient_data"}
+            return {"stress_analysis": insufficient, "anomaly_detection": dict(insufficient), "change_points": []}
+        
+        # 스트레스: 지수 가중 평균 대비 (detect_stress_pattern과 같은 규칙)
+        stress_level = 0.0
+        stress_indicators = []
+        latency_increase = 0.0
+        latency = ready.get("avg_decision_latency")
+        if latency is not None and latency.mean > 0:
+            latency_increase = (latency.value - latency.mean) / latency.mean
+            if latency_increase > 0.3:
+                stress_level += 0.4
+                stress_indicators.append("의사결정 지연시간 증가")
+        revisions = ready.get("revision_rate")
+        if revisions is not None and revisions.value > revisions.mean * 1.5:
+            stress_level += 0.3
+            stress_indicators.append("수정 빈도 증가")
+        efficiency = ready.get("path_efficiency")
+        if efficiency is not None and efficiency.value < efficiency.mean * 0.8:
+            stress_level += 0.3
+            stress_indicators.append("경로 효율성 감소")
+        stress_level = min(stress_level, 1.0)
+        
+        # 이상: robust z-score (detect_anomaly와 같은 임계값)
+        anomalies = []
+        anomaly_score = 0.0
+        for metric, obs in ready.items():
+            if metric not in self.STREAMING_ANOMALY_TYPES:
+                continue
+            anomaly_type, subject, weight = self.STREAMING_ANOMALY_TYPES[metric]
+            z_score = abs(obs.robust_z)
+            if z_score > 2.5:
+                anomalies.append({
+                    "type": anomaly_type,
+                    "severity": "high" if z_score > 3.5 else "medium",
+                    "z_score": round(z_score, 2),
+                    "description": f"{subject} 평균보다 {z_score:.1f} 표준편차 이상 벗어남"
+                })
+                anomaly_score += weight
+        anomaly_score = min(anomaly_score, 1.0)
+        
+        return {
+            "stress_analysis": {
+                "status": "analyzed",
+                "stress_level": round(stress_level, 2),
+                "stress_category": self._categorize_stress(stress_level),
+                "indicators": stress_indicators,
+                "latency_change": round(latency_increase * 100, 1),
+                "recommendation": self._get_stress_recommendation(stress_level)
+            },
+            "anomaly_detection": {
+                "status": "analyzed",
+                "has_anomaly": len(anomalies) > 0,
+                "anomaly_score": round(anomaly_score, 2),
+                "anomalies": anomalies,
+                "recommendation": "정상적인 패턴입니다." if len(anomalies) == 0 else "이상 행동 패턴이 감지되었습니다. 확인이 필요합니다."
+            },
+            "change_points": change_points
+        }
+    
+    def assess_event_stream(self, observations: List, event_indices: List[int], max_reported: int = 20) -> Dict:
+        """
+        게임 이벤트 단위 관측(이벤트 간격) 요약
+        
+        Args:
+            observations: Observation 목록
+            event_indices: 각 관측이 끝나는 이벤트 인덱스
+            max_reported: 응답에 포함할 최대 이상 이벤트 수
+        
+        Returns:
+            이상 이벤트 / 변화점 요약
+        """
+        scored = [(index, obs) for index, obs in zip(event_indices, observations) if obs.robust_z is not None]
+        if not scored:
+            return {"status": "insufficient_data", "observations": len(observations)}
+        
+        anomalous = [
+            {"event_index": index, "interval_ms": obs.value, "z_score": round(obs.robust_z, 2)}
+            for index, obs in scored if abs(obs.robust_z) > 2.5
+        ]
+        return {
+            "status": "analyzed",
+            "observations": len(observations),
+            "anomalous_events": anomalous[:max_reported],
+            "anomaly_count": len(anomalous),
+            "change_points": [
+                {"event_index": index, "direction": obs.change, "baseline_ms": round(obs.median, 1)}
+                for index, obs in scored if obs.change is not None
+            ]
+        }
 
 
 # 전역 인스턴스
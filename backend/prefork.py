@@ -0,0 +1,82 @@
+"""
+pre-fork 멀티 워커 배포용 공유 읽기 전용 상태 모듈
+gunicorn --preload 마스터에서 모델/DB를 한 번 생성한 뒤 fork하여 모든 워커가 같은 물리 페이지를 공유
+
+- share_array(): NumPy 배열을 익명 공유 메모리(MAP_SHARED) 세그먼트로 복사하고 읽기 전용으로 고정
+  (데이터 버퍼가 참조 카운트가 바뀌는 Python 객체와 다른 페이지에 있으므로 읽기만 하면 복사되지 않음)
+- prepare_fork(): 구성요소를 스레드 없이 생성 → 각 구성요소의 share_memory() 호출 → gc.freeze()
+- after_fork(): 워커에서 GC 재활성화 (freeze된 객체는 워커의 GC가 건드리지 않음)
+
+배포: gunicorn -c gunicorn.conf.py api_server:app
+"""
+import gc
+import logging
+import mmap
+from typing import Any, Dict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def is_shared(array: np.ndarray) -> bool:
+    """이미 메모리 매핑(파일 mmap 또는 공유 세그먼트)된 배열인지 확인"""
+    base = array
+    while base is not None:
+        if isinstance(base, (np.memmap, mmap.mmap)):
+            return True
+        # np.frombuffer 배열의 base는 원본 버퍼를 감싼 memoryview
+        base = base.obj if isinstance(base, memoryview) else getattr(base, "base", None)
+    return False
+
+
+def share_array(array: np.ndarray) -> np.ndarray:
+    """
+    배열을 연속된 익명 공유 메모리 세그먼트로 복사 (읽기 전용)
+    이미 mmap된 배열(예: CompiledForest.load(mmap=True))은 페이지 캐시로 공유되므로 그대로 반환
+    """
+    array = np.asanyarray(array)
+    if array.nbytes == 0 or is_shared(array):
+        return array
+    segment = mmap.mmap(-1, array.nbytes)
+    shared = np.frombuffer(segment, dtype=array.dtype, count=array.size).reshape(array.shape)
+    shared[...] = array
+    shared.setflags(write=False)
+    return shared
+
+
+def share_components(values: Dict[str, Any]) -> int:
+    """share_memory()를 제공하는 구성요소의 배열을 공유 세그먼트로 옮기고 옮긴 바이트 수 반환"""
+    total = 0
+    for name, value in values.items():
+        share = getattr(value, "share_memory", None)
+        if callable(share):
+            moved = share() or 0
+            total += moved
+            logger.info(f"[prefork] {name}: {moved / 1e6:.1f} MB shared")
+    return total
+
+
+def prepare_fork(registry) -> int:
+    """
+    fork 직전 마스터에서 호출 (gunicorn when_ready 훅)
+    스레드 풀 없이 생성하므로 fork 시점에 잠금을 잡은 스레드가 남지 않음
+
+    Returns:
+        공유 세그먼트로 옮긴 바이트 수
+    """
+    # 생성 중 GC가 해제한 빈 공간에 워커가 새 객체를 할당하면 그 페이지가 복사되므로 미리 비활성화
+    gc.disable()
+    values = registry.build_all()
+    total = share_components(values)
+    gc.freeze()
+    logger.info(
+        f"[prefork] {len(values)} components built, {total / 1e6:.1f} MB in shared segments, "
+        f"{gc.get_freeze_count()} objects frozen"
+    )
+    return total
+
+
+def after_fork():
+    """워커 시작 시 호출 (gunicorn post_fork 훅)"""
+    gc.enable()
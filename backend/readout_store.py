@@ -0,0 +1,329 @@
+"""
+사용자별 리드아웃 모델 저장소
+개인화된 ReservoirReadout(20x16384 float64 ≈ 2.6MB)을 한 워커에서 수만 명분 호스팅하기 위한 저장소
+
+- 공유 기준(base) W_out 대비 변화량(delta)만 디스크에 저장
+  - "float16": delta를 float16으로 저장 (≈ 655KB)
+  - rank 지정 시: delta의 절단 SVD 저랭크 근사 U·Vt (rank 4 ≈ 131KB)
+- user_id별 지연 로딩, 바이트 예산을 갖는 LRU (적응하지 않은 사용자는 base를 공유하므로 0바이트)
+- 사용자별 mini-batch Hebbian 학습기도 같은 LRU에 보관 (배치 버퍼도 예산에 포함,
+  축출 시 남은 갱신을 먼저 반영한 뒤 저장 대기로 넘김)
+- 변경된(dirty) 모델은 백그라운드 스레드가 주기적으로 원자적 저장
+  (스레드는 첫 변경 시 시작하므로 pre-fork 마스터에는 없고 워커마다 하나씩 실행)
+- 기준 가중치도 함께 저장하고 시작 시 한 번 대조 (다르면 예외, 실행 중에 base를 바꾸지 않음)
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.getenv(
+    "READOUT_STORE_DIR", os.path.join(os.path.dirname(__file__), "ml_models", "readouts")
+)
+DEFAULT_BUDGET_BYTES = int(float(os.getenv("READOUT_STORE_BUDGET_MB", "256")) * 1024 * 1024)
+BASE_FILENAME = "base.npz"
+
+
+def _atomic_save(path: Path, **arrays):
+    """임시 파일에 쓴 뒤 os.replace로 교체"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class BaseMismatchError(RuntimeError):
+    """저장된 기준 가중치가 현재 프로세스의 base와 다름"""
+
+
+def verify_base(base, root_dir: Optional[str] = None) -> Path:
+    """
+    저장된 기준 가중치(base.npz)가 base와 같은지 확인 (없으면 base를 저장)
+
+    사용자 delta는 이 가중치 기준이므로 컨트롤러 생성 시 한 번 확인하고, 실행 중에는 base를 바꾸지 않음
+    (바꾸면 kinematics, kinematics 캐시 키, model_fingerprint가 서비스 중에 달라짐)
+
+    Raises:
+        BaseMismatchError: 저장된 base가 다른 가중치 (다른 seed로 만든 저장소 등)
+    """
+    path = Path(root_dir or DEFAULT_STORE_DIR) / BASE_FILENAME
+    if not path.exists():
+        _atomic_save(path, W_out=base.W_out, bias=base.bias)
+        return path
+    with np.load(path) as data:
+        W, bias = data["W_out"], data["bias"]
+    if W.shape != base.W_out.shape or not (np.array_equal(W, base.W_out) and np.array_equal(bias, base.bias)):
+        raise BaseMismatchError(
+            f"{path} was saved from a different readout base (shape {W.shape}); per-user models in "
+            f"{path.parent} are deltas against it. Start with the seed that created it (NEUROTWIN_SEED) "
+            f"or point READOUT_STORE_DIR at a new directory."
+        )
+    return path
+
+
+class ReadoutStore:
+    """
+    사용자별 리드아웃 저장소
+
+    Args:
+        base: 기준 ReservoirReadout (저장된 base와 다르면 BaseMismatchError)
+        root_dir: 저장 디렉토리
+        memory_budget: 메모리에 유지할 개인 가중치 바이트 상한
+        rank: 저랭크 delta 저장 rank (None이면 float16 전체 delta)
+        flush_interval: 백그라운드 저장 주기 (초, 0이면 스레드 없이 flush() 수동 호출)
+    """
+
+    def __init__(
+        self,
+        base,
+        root_dir: Optional[str] = None,
+        memory_budget: int = DEFAULT_BUDGET_BYTES,
+        rank: Optional[int] = None,
+        flush_interval: float = 5.0
+    ):
+        self.base = base
+        self.root_dir = Path(root_dir or DEFAULT_STORE_DIR)
+        self.memory_budget = memory_budget
+        self.rank = rank
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._hot: "OrderedDict[str, object]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._dirty: Dict[str, int] = {}      # user_id -> 저장이 필요한 version
+        self._evicted: Dict[str, object] = {}  # 저장 대기 중 축출된 모델
+        self._learners: Dict[str, object] = {}  # 메모리에 있는 사용자의 Hebbian 학습기
+        self.bytes_in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+        self.writes = 0
+
+        verify_base(base, str(self.root_dir))
+        # 기준 가중치는 읽기 전용 (사용자 모델은 fork로 공유)
+        self._base_W = base.W_out
+        self._base_W.setflags(write=False)
+        self._fingerprint = hashlib.sha256(self._base_W.tobytes()).hexdigest()[:16]
+
+        # 저장 스레드는 첫 변경 시 시작 (_ensure_flusher)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _path(self, user_id: str) -> Path:
+        digest = hashlib.sha1(str(user_id).encode("utf-8")).hexdigest()
+        return self.root_dir / digest[:2] / f"{digest}.npz"
+
+    def _size_of(self, user_id: str) -> int:
+        readout = self._hot[user_id]
+        # 공유 중인 base 가중치는 사용자 몫으로 세지 않음
+        size = readout.bias.nbytes + (0 if readout.shares_weights else readout.W_out.nbytes)
+        learner = self._learners.get(user_id)
+        if learner is not None:
+            size += learner.buffer_nbytes
+        return size
+
+    def get(self, user_id: str):
+        """사용자 리드아웃 반환 (메모리 -> 저장 대기 -> 디스크 -> 새 fork 순)"""
+        with self._lock:
+            readout = self._hot.get(user_id)
+            if readout is not None:
+                self._hot.move_to_end(user_id)
+                self.hits += 1
+                return readout
+            self.misses += 1
+            readout = self._evicted.pop(user_id, None)
+
+        if readout is None:
+            readout = self._load(user_id)
+
+        with self._lock:
+            # 다른 스레드가 먼저 올렸으면 그 인스턴스 사용
+            existing = self._hot.get(user_id)
+            if existing is not None:
+                return existing
+            self._hot[user_id] = readout
+            self._account(user_id)
+            return readout
+
+    def get_learner(self, user_id: str, factory: Callable):
+        """
+        사용자 리드아웃에 묶인 학습기 (없으면 factory(readout, on_apply)로 생성)
+
+        학습기는 리드아웃과 함께 LRU에 있으며 축출될 때 남은 갱신을 반영한 뒤 버려짐
+        (호출자는 학습기를 오래 보관하지 말고 매번 이 메서드로 얻을 것)
+        """
+        while True:
+            readout = self.get(user_id)
+            with self._lock:
+                if self._hot.get(user_id) is not readout:
+                    continue  # 그 사이 축출됨: 다시 올림
+                learner = self._learners.get(user_id)
+                if learner is None:
+                    learner = factory(readout, lambda: self.mark_dirty(user_id))
+                    self._learners[user_id] = learner
+                    self._account(user_id)
+                return learner
+
+    def _load(self, user_id: str):
+        readout = self.base.fork()
+        path = self._path(user_id)
+        if not path.exists():
+            return readout
+        try:
+            with np.load(path) as data:
+                if str(data["base_fingerprint"]) != self._fingerprint:
+                    logger.warning(f"Readout for {user_id} was trained on another base, ignoring")
+                    return readout
+                if "delta" in data.files:
+                    delta = data["delta"].astype(np.float64)
+                else:
+                    delta = data["U"].astype(np.float64) @ data["Vt"].astype(np.float64)
+                readout.W_out = self._base_W + delta
+                readout.bias = data["bias"].copy()
+                readout.version = int(data["version"])
+                readout._fingerprint = None
+            self.loads += 1
+        except Exception as e:
+            logger.error(f"Failed to load readout for {user_id}: {e}")
+        return readout
+
+    def mark_dirty(self, user_id: str):
+        """모델이 변경되었음을 기록 (다음 flush에서 저장, 메모리 사용량 재계산)"""
+        with self._lock:
+            readout = self._hot.get(user_id)
+            if readout is None:
+                return
+            self._dirty[user_id] = readout.version
+            self._account(user_id)
+            self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        """
+        저장 스레드를 변경이 생긴 프로세스에서 시작 (self._lock 안에서 호출)
+        fork된 워커에서는 마스터에서 복사된 스레드 객체가 살아 있지 않으므로 새로 시작
+        """
+        if self.flush_interval <= 0 or self._stop.is_set():
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._flush_loop, name="readout-store", daemon=True)
+            self._thread.start()
+
+    def _account(self, user_id: str):
+        """바이트 사용량 갱신 후 예산 초과 시 LRU 축출 (호출자가 lock 보유)"""
+        size = self._size_of(user_id)
+        self.bytes_in_use += size - self._sizes.get(user_id, 0)
+        self._sizes[user_id] = size
+        while self.bytes_in_use > self.memory_budget and len(self._hot) > 1:
+            victim, readout = next(iter(self._hot.items()))
+            if victim == user_id:
+                break
+            self._hot.pop(victim)
+            self.bytes_in_use -= self._sizes.pop(victim)
+            self.evictions += 1
+            learner = self._learners.pop(victim, None)
+            if learner is not None and learner.pending:
+                # 남은 배치를 반영 (리드아웃이 이미 빠졌으므로 mark_dirty 대신 직접 기록)
+                learner.on_apply = None
+                learner.flush()
+                self._dirty[victim] = readout.version
+            if victim in self._dirty:
+                # 저장될 때까지 보관 (그 사이 get()이 오면 다시 올림)
+                self._evicted[victim] = readout
+
+    def _encode(self, W_out: np.ndarray, bias: np.ndarray, version: int) -> Dict[str, np.ndarray]:
+        delta = W_out - self._base_W
+        arrays = {
+            "base_fingerprint": np.array(self._fingerprint),
+            "bias": bias,
+            "version": np.array(version)
+        }
+        if self.rank:
+            U, S, Vt = np.linalg.svd(delta, full_matrices=False)
+            r = min(self.rank, len(S))
+            arrays["U"] = (U[:, :r] * S[:r]).astype(np.float16)
+            arrays["Vt"] = Vt[:r].astype(np.float16)
+        else:
+            arrays["delta"] = delta.astype(np.float16)
+        return arrays
+
+    def flush(self) -> int:
+        """변경된 모델 모두 저장 (저장한 개수 반환)"""
+        with self._lock:
+            pending = list(self._dirty.items())
+
+        written = 0
+        for user_id, version in pending:
+            with self._lock:
+                readout = self._hot.get(user_id) or self._evicted.get(user_id)
+                if readout is None:
+                    self._dirty.pop(user_id, None)
+                    continue
+                snapshot_W = readout.W_out.copy()
+                snapshot_bias = readout.bias.copy()
+                snapshot_version = readout.version
+
+            try:
+                _atomic_save(self._path(user_id), **self._encode(snapshot_W, snapshot_bias, snapshot_version))
+            except Exception as e:
+                logger.error(f"Failed to persist readout for {user_id}: {e}")
+                continue
+            written += 1
+
+            with self._lock:
+                self.writes += 1
+                # 저장 중에 다시 변경되었으면 dirty 유지
+                if self._dirty.get(user_id) is not None and readout.version == snapshot_version:
+                    self._dirty.pop(user_id, None)
+                    self._evicted.pop(user_id, None)
+        return written
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Readout store flush failed: {e}")
+
+    def close(self):
+        """백그라운드 스레드 중지 후 학습기에 남은 배치까지 반영해 저장"""
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            thread.join()
+        with self._lock:
+            learners = list(self._learners.values())
+        for learner in learners:
+            learner.flush()
+        self.flush()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "hot": len(self._hot),
+                "learners": len(self._learners),
+                "bytes_in_use": self.bytes_in_use,
+                "memory_budget": self.memory_budget,
+                "dirty": len(self._dirty),
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "writes": self.writes,
+                "format": f"lowrank-{self.rank}" if self.rank else "float16"
+            }
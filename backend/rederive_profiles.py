@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+profile_evolution 재계산 도구 (re-derivation / backfill)
+성격 추론 규칙/모델, 문화권 보정, EMA learning_rate가 바뀐 뒤 모든 사용자의 세션 이력을 현재 규칙으로
+다시 재생하여 profile_evolution과 users(maturity_level, sync_score)를 다시 작성
+
+- 사용자 id 범위로 나눈 청크를 프로세스 풀에서 병렬 처리 (청크마다 세션을 사용자별 시각 순으로 읽음)
+- 세션 특징은 SQLite json_extract로 읽고, ML 예측은 청크 전체에 대해 predict_batch 한 번
+- 재생은 세션 순번(사용자별 k번째 세션) 단위로 진행: 각 단계에서 그 순번을 가진 모든 사용자를
+  decode_batch / update_weights_batch로 한꺼번에 처리 (EMA와 성숙도는 사용자별 순차 상태이므로)
+- /api/session과 같은 규칙: 첫 세션은 그대로, 이후 EMA 갱신, 신뢰도는 최근 10개 세션 기준,
+  성숙도는 게임 세션이 아닌 경우에만 진급
+- 결과는 섀도 테이블(profile_evolution_rebuild)에 청크 단위로 기록하고, 모든 청크가 끝나면 한 트랜잭션에서
+  테이블 이름을 바꿔 교체. 완료한 청크는 진행 테이블에 남으므로 중단 후 다시 실행하면 이어서 처리
+  (청크 재생 대상은 첫 실행 시점의 마지막 세션까지. 교체 트랜잭션에서 그 뒤에 세션이 들어온 사용자는
+  전체 이력을 다시 재생하고, 재생 대상이 아닌 사용자(세션 없는 사용자, 이후 새로 온 사용자)의 행은 그대로 복사)
+  설정이나 ML 모델(콘텐츠 해시)이 첫 실행과 다르면 이어서 처리하지 않고 처음부터 다시
+
+사용 예:
+    python rederive_profiles.py --dry-run          # 재계산 결과 요약만 출력
+    python rederive_profiles.py --workers 4        # profile_evolution 교체 (중단 시 같은 명령으로 재개)
+    python rederive_profiles.py --rule-based --learning-rate 0.2 --fresh --db /path/to/user_profiles.db
+"""
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+import user_profiles
+from cultural_table import TRAIT_ORDER
+from neuro_controller import BehavioralPersonalityDecoder, ContinuousLearner
+
+logger = logging.getLogger(__name__)
+
+HISTORY_LIMIT = 10  # get_session_history 기본 limit (신뢰도 / 성숙도 판단에 쓰는 세션 수)
+WEIGHT_STABILITY = 0.7  # /api/session이 compute_confidence에 넘기는 고정값
+ML_CHUNK = 65536
+CHUNK_USERS = 2000  # 청크당 사용자 수
+
+SHADOW_TABLE = "profile_evolution_rebuild"
+SHADOW_USERS_TABLE = "profile_evolution_rebuild_users"
+PLAN_TABLE = "profile_evolution_rebuild_plan"  # 실행 설정과 청크별 완료 여부
+TAIL_USERS_TABLE = "rederive_tail_users"  # 교체 시 다시 재생할 사용자 (임시 테이블)
+
+# 세션 행 → 특징 (neuro_controller.BehavioralPersonalityDecoder.behavioral_features와 같은 기본값)
+SESSIONS_COLUMNS = """
+    SELECT id, user_id, session_timestamp,
+           COALESCE(json_extract(raw_metrics, '$.avgDecisionLatency'), 1000),
+           COALESCE(json_extract(raw_metrics, '$.revisionRate'), 0),
+           COALESCE(json_extract(raw_metrics, '$.pathEfficiency'), 1.0),
+           COALESCE(json_extract(raw_metrics, '$.intensity'), 1.0),
+           COALESCE(json_extract(raw_metrics, '$.taskCompletion'), 0.0),
+           json_extract(raw_metrics, '$.culturalContext'),
+           json_extract(raw_metrics, '$.gameSpecific') IS NOT NULL
+    FROM behavioral_sessions
+"""
+SESSIONS_SQL = SESSIONS_COLUMNS + """
+    WHERE (?1 IS NULL OR user_id >= ?1) AND (?2 IS NULL OR user_id < ?2) AND id <= ?3
+    ORDER BY user_id, session_timestamp, id
+"""
+# 스냅샷 이후 세션이 들어온 사용자의 전체 이력 (교체 트랜잭션 안에서)
+TAIL_SESSIONS_SQL = SESSIONS_COLUMNS + f"""
+    WHERE user_id IN (SELECT user_id FROM temp.{TAIL_USERS_TABLE})
+    ORDER BY user_id, session_timestamp, id
+"""
+
+EVOLUTION_COLUMNS = ("user_id, timestamp, logic_weight, intuition_weight, fluidity_weight, "
+                     "complexity_weight, archetype, confidence_score, session_count, rule_weights")
+
+
+class SessionTable(NamedTuple):
+    """사용자별로 정렬된 세션 (사용자 내에서는 시각 순)"""
+    ids: np.ndarray             # (N,)
+    user_ids: np.ndarray        # (U,) 사용자 이름
+    user_index: np.ndarray      # (N,) user_ids 인덱스
+    ordinals: np.ndarray        # (N,) 사용자별 세션 순번 (0부터)
+    timestamps: list            # (N,) session_timestamp
+    features: np.ndarray        # (N, 4) FEATURES 순서
+    task_completion: np.ndarray  # (N,)
+    cultures: np.ndarray        # (N,) culturalContext (없으면 None)
+    is_game: np.ndarray         # (N,) 게임 세션 여부 (성숙도 진급 없음)
+
+
+class Replay(NamedTuple):
+    """재생 결과 (SessionTable과 같은 행 순서)"""
+    weights: np.ndarray         # (N, 4) EMA 갱신 후 저장할 가중치
+    rule_weights: np.ndarray    # (N, 4) 세션별 규칙 기반 가중치 (문화권 보정 / 성숙도 보정 / EMA 전)
+    archetype_codes: np.ndarray  # (N,) ContinuousLearner.ARCHETYPES 인덱스
+    confidence: np.ndarray      # (N,)
+    maturity: np.ndarray        # (U,) 마지막 세션 후 성숙도
+    sync_scores: np.ndarray     # (U,) 마지막 (게임 아닌) 세션의 동기화 점수
+
+
+def load_sessions(conn, lower: Optional[str] = None, upper: Optional[str] = None,
+                  max_id: Optional[int] = None) -> SessionTable:
+    """user_id가 [lower, upper) 범위인 세션을 열 배열로 읽기 (None이면 제한 없음)"""
+    if max_id is None:
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM behavioral_sessions").fetchone()[0]
+    return session_table(conn.execute(SESSIONS_SQL, (lower, upper, max_id)).fetchall())
+
+
+def session_table(rows: list) -> SessionTable:
+    """SESSIONS_COLUMNS 행 (사용자별, 시각 순) → SessionTable"""
+    n = len(rows)
+    columns = list(zip(*rows)) if rows else [()] * 10
+    ids = np.array(columns[0], dtype=np.int64)
+    users = np.array(columns[1], dtype=object)
+    # 행이 사용자별로 모여 있으므로 사용자가 바뀌는 위치로 인덱스 / 순번 계산
+    first = np.ones(n, dtype=bool)
+    first[1:] = users[1:] != users[:-1]
+    user_index = np.cumsum(first) - 1
+    starts = np.flatnonzero(first)
+    ordinals = np.arange(n) - starts[user_index]
+    features = np.array(columns[3:7], dtype=np.float64).T.reshape(n, 4)
+    return SessionTable(
+        ids=ids,
+        user_ids=users[first],
+        user_index=user_index,
+        ordinals=ordinals,
+        timestamps=list(columns[2]),
+        features=features,
+        task_completion=np.array(columns[7], dtype=np.float64),
+        cultures=np.array(columns[8], dtype=object),
+        is_game=np.array(columns[9], dtype=bool)
+    )
+
+
+def predict_all(decoder: BehavioralPersonalityDecoder, features: np.ndarray):
+    """상태와 무관한 ML 예측을 미리 한 번에 계산 (규칙 기반이면 None)"""
+    if not (decoder.use_ml and decoder.ml_model is not None) or len(features) == 0:
+        return None
+    return np.concatenate([
+        decoder.ml_model.predict_batch(features[i:i + ML_CHUNK])
+        for i in range(0, len(features), ML_CHUNK)
+    ])
+
+
+def replay(sessions: SessionTable, decoder: BehavioralPersonalityDecoder,
+           learner: ContinuousLearner, initial_maturity: int = 1) -> Replay:
+    """
+    /api/session 처리 과정을 세션 순번 단위로 벡터화해 재생
+
+    Returns:
+        Replay (세션별 가중치/원형/신뢰도, 사용자별 최종 성숙도/동기화 점수)
+    """
+    n, n_users = len(sessions.ids), len(sessions.user_ids)
+    cultures = decoder.cultural_table.indices(sessions.cultures, decoder.cultural_context)
+    ml_weights = predict_all(decoder, sessions.features)
+
+    weights = np.zeros((n, 4))
+    rule_weights = np.zeros((n, 4))
+    maturity = np.full(n_users, initial_maturity, dtype=np.int64)
+    sync_scores = np.zeros(n_users)
+    # 사용자별 시작 위치 + 순번 = 그 단계에서 처리할 행
+    starts = np.flatnonzero(sessions.ordinals == 0)
+    counts = np.bincount(sessions.user_index, minlength=n_users)
+
+    for k in range(int(counts.max()) if n_users else 0):
+        users = np.nonzero(counts > k)[0]
+        rows = starts[users] + k
+        decoded = decoder.decode_batch(
+            sessions.features[rows],
+            cultures=cultures[rows],
+            maturity_levels=maturity[users],
+            task_completion=sessions.task_completion[rows],
+            ml_weights=None if ml_weights is None else ml_weights[rows]
+        )
+        rule_weights[rows] = decoded.rule_weights
+        if k == 0:
+            weights[rows] = decoded.weights
+        else:
+            weights[rows] = learner.update_weights_batch(weights[rows - 1], decoded.weights)
+
+        # 성숙도 진급 (/api/session만 수행, 게임 세션은 제외)
+        history = min(k + 1, HISTORY_LIMIT)
+        session = ~sessions.is_game[rows]
+        level = maturity[users]
+        promoted = np.where(
+            (level == 1) & (history >= 3) & (decoded.sync_scores >= 0.6), 2,
+            np.where((level == 2) & (history >= 7) & (decoded.sync_scores >= 0.8), 3, level)
+        )
+        maturity[users] = np.where(session, promoted, level)
+        sync_scores[users] = np.where(session, decoded.sync_scores, sync_scores[users])
+
+    history = np.minimum(sessions.ordinals + 1, HISTORY_LIMIT)
+    return Replay(
+        weights=weights,
+        rule_weights=rule_weights,
+        archetype_codes=learner.archetype_codes(weights),
+        confidence=learner.compute_confidence_batch(history, WEIGHT_STABILITY),
+        maturity=maturity,
+        sync_scores=sync_scores
+    )
+
+
+def evolution_rows(sessions: SessionTable, result: Replay):
+    """profile_evolution INSERT 행 (세션 시각을 타임스탬프로 사용)"""
+    archetypes = ContinuousLearner.ARCHETYPES
+    weights = result.weights.tolist()
+    rule_weights = result.rule_weights.tolist()
+    for i in range(len(sessions.ids)):
+        yield (
+            sessions.user_ids[sessions.user_index[i]], sessions.timestamps[i], *weights[i],
+            archetypes[result.archetype_codes[i]], float(result.confidence[i]), int(sessions.ordinals[i]) + 1,
+            json.dumps(dict(zip(TRAIT_ORDER, rule_weights[i])))
+        )
+
+
+class ChunkResult(NamedTuple):
+    """청크 하나의 재생 결과 (섀도 테이블 INSERT 행)"""
+    chunk: int
+    sessions: int
+    evolution: list  # evolution_rows()
+    users: list      # (user_id, maturity_level, sync_score)
+
+
+def replay_chunk(conn, decoder: BehavioralPersonalityDecoder, learner: ContinuousLearner,
+                 chunk: int, lower: Optional[str], upper: Optional[str], max_id: int) -> ChunkResult:
+    """청크 하나를 읽고 재생"""
+    sessions = load_sessions(conn, lower, upper, max_id)
+    result = replay(sessions, decoder, learner)
+    users = list(zip(sessions.user_ids.tolist(), result.maturity.tolist(), result.sync_scores.tolist()))
+    return ChunkResult(chunk, len(sessions.ids), list(evolution_rows(sessions, result)), users)
+
+
+# --- 프로세스 풀 워커 (프로세스마다 디코더/모델을 한 번 생성) ---
+
+_worker = None
+
+
+def _init_worker(db_path: str, use_ml: bool, learning_rate: float, cultural_context: str,
+                 ml_fingerprint: Optional[str]):
+    global _worker
+    user_profiles.DB_PATH = db_path
+    decoder = BehavioralPersonalityDecoder(cultural_context=cultural_context, use_ml=use_ml)
+    if ml_fingerprint_of(decoder) != ml_fingerprint:
+        # 실행 중에 모델 아티팩트가 바뀌면 청크마다 다른 모델로 재생하게 됨
+        raise RuntimeError(f"ML model in worker ({ml_fingerprint_of(decoder)}) differs from {ml_fingerprint}")
+    _worker = (decoder, ContinuousLearner(learning_rate=learning_rate))
+
+
+def ml_fingerprint_of(decoder) -> Optional[str]:
+    """재생에 쓰는 ML 모델의 콘텐츠 해시 (규칙 기반이면 None)"""
+    return decoder.ml_model.fingerprint if decoder.use_ml and decoder.ml_model is not None else None
+
+
+def _replay_chunk_in_worker(chunk: int, lower: Optional[str], upper: Optional[str], max_id: int) -> ChunkResult:
+    conn = user_profiles.get_connection()
+    try:
+        return replay_chunk(conn, *_worker, chunk, lower, upper, max_id)
+    finally:
+        conn.close()
+
+
+# --- 섀도 테이블 / 진행 상태 ---
+
+@contextmanager
+def transaction(conn):
+    """DDL(ALTER/DROP)까지 포함하는 명시적 트랜잭션"""
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.isolation_level = isolation_level
+
+
+def chunk_bounds(user_ids: List[str], chunk_users: int) -> List[Optional[str]]:
+    """정렬된 사용자 목록 → 청크 하한 목록 (첫 청크는 None: 이후 추가된 더 작은 id도 포함)"""
+    lowers = user_ids[::max(chunk_users, 1)]
+    return [None] + lowers[1:] if lowers else [None]
+
+
+def drop_shadow(conn):
+    for table in (SHADOW_TABLE, SHADOW_USERS_TABLE, PLAN_TABLE):
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def create_shadow(conn, config: Dict, lowers: List[Optional[str]], max_id: int):
+    """profile_evolution과 같은 스키마의 섀도 테이블과 실행 계획 생성"""
+    schema = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'profile_evolution'"
+    ).fetchone()[0]
+    shadow_schema = re.sub(r'^CREATE TABLE\s+(IF NOT EXISTS\s+)?"?profile_evolution"?',
+                           f"CREATE TABLE {SHADOW_TABLE}", schema)
+    with transaction(conn):
+        drop_shadow(conn)
+        conn.execute(shadow_schema)
+        conn.execute(f"""
+            CREATE TABLE {SHADOW_USERS_TABLE} (
+                user_id TEXT PRIMARY KEY, maturity_level INTEGER, sync_score REAL
+            )
+        """)
+        conn.execute(f"""
+            CREATE TABLE {PLAN_TABLE} (
+                chunk INTEGER PRIMARY KEY, lower TEXT, upper TEXT, max_id INTEGER,
+                config TEXT, sessions INTEGER, done_at TIMESTAMP
+            )
+        """)
+        uppers = lowers[1:] + [None]
+        conn.executemany(
+            f"INSERT INTO {PLAN_TABLE} (chunk, lower, upper, max_id, config) VALUES (?, ?, ?, ?, ?)",
+            [(i, lower, upper, max_id, json.dumps(config, sort_keys=True))
+             for i, (lower, upper) in enumerate(zip(lowers, uppers))]
+        )
+
+
+def load_plan(conn, config: Dict) -> Optional[list]:
+    """같은 설정으로 시작한 미완료 실행이 있으면 청크 목록 [(chunk, lower, upper, max_id, done)]"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (PLAN_TABLE,)
+    ).fetchone()
+    if not exists:
+        return None
+    rows = conn.execute(
+        f"SELECT chunk, lower, upper, max_id, config, done_at IS NOT NULL FROM {PLAN_TABLE} ORDER BY chunk"
+    ).fetchall()
+    if not rows or json.loads(rows[0][4]) != config:
+        return None
+    return [(row[0], row[1], row[2], row[3], bool(row[5])) for row in rows]
+
+
+def write_chunk(conn, result: ChunkResult):
+    """청크 결과 기록과 완료 표시를 한 트랜잭션으로 (중단되어도 청크 단위로 일관)"""
+    with transaction(conn):
+        write_rows(conn, result)
+        conn.execute(
+            f"UPDATE {PLAN_TABLE} SET sessions = ?, done_at = CURRENT_TIMESTAMP WHERE chunk = ?",
+            (result.sessions, result.chunk)
+        )
+
+
+def write_rows(conn, result: ChunkResult):
+    conn.executemany(
+        f"INSERT INTO {SHADOW_TABLE} ({EVOLUTION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        result.evolution
+    )
+    conn.executemany(f"INSERT OR REPLACE INTO {SHADOW_USERS_TABLE} VALUES (?, ?, ?)", result.users)
+
+
+def replay_tail(conn, decoder: BehavioralPersonalityDecoder, learner: ContinuousLearner, max_id: int) -> int:
+    """
+    스냅샷(max_id) 이후 세션이 들어온 재생 대상 사용자의 전체 이력을 다시 재생하여 섀도 테이블의 행을 교체
+    (교체 트랜잭션 안에서 호출: 쓰기 잠금 중이므로 그 사이 새 세션 없음)
+
+    Returns:
+        다시 재생한 사용자 수
+    """
+    conn.execute(f"DROP TABLE IF EXISTS temp.{TAIL_USERS_TABLE}")
+    conn.execute(f"""
+        CREATE TEMP TABLE {TAIL_USERS_TABLE} AS
+        SELECT DISTINCT user_id FROM behavioral_sessions
+        WHERE id > ? AND user_id IN (SELECT user_id FROM {SHADOW_USERS_TABLE})
+    """, (max_id,))
+    try:
+        sessions = session_table(conn.execute(TAIL_SESSIONS_SQL).fetchall())
+        if len(sessions.user_ids):
+            result = replay(sessions, decoder, learner)
+            users = list(zip(sessions.user_ids.tolist(), result.maturity.tolist(), result.sync_scores.tolist()))
+            conn.execute(f"DELETE FROM {SHADOW_TABLE} WHERE user_id IN (SELECT user_id FROM temp.{TAIL_USERS_TABLE})")
+            write_rows(conn, ChunkResult(-1, len(sessions.ids), list(evolution_rows(sessions, result)), users))
+        return len(sessions.user_ids)
+    finally:
+        conn.execute(f"DROP TABLE temp.{TAIL_USERS_TABLE}")
+
+
+def swap_in(conn, decoder: BehavioralPersonalityDecoder, learner: ContinuousLearner, max_id: int) -> int:
+    """
+    섀도 테이블을 profile_evolution으로 교체하고 users 성숙도 반영 (원자적)
+
+    스냅샷 이후 세션이 들어온 사용자는 다시 재생하고, 재생하지 않은 사용자의 기존 행은 섀도 테이블로 복사
+
+    Returns:
+        교체 직전에 다시 재생한 사용자 수
+    """
+    with transaction(conn):
+        tail_users = replay_tail(conn, decoder, learner, max_id)
+        conn.execute(f"""
+            INSERT INTO {SHADOW_TABLE} ({EVOLUTION_COLUMNS})
+            SELECT {EVOLUTION_COLUMNS} FROM profile_evolution
+            WHERE user_id NOT IN (SELECT user_id FROM {SHADOW_USERS_TABLE})
+            ORDER BY id
+        """)
+        # 기존 테이블의 인덱스는 테이블과 함께 삭제되므로 교체 후 다시 생성
+        indexes = [row[0] for row in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'profile_evolution' AND sql IS NOT NULL"
+        )]
+        conn.execute("ALTER TABLE profile_evolution RENAME TO profile_evolution_replaced")
+        conn.execute(f"ALTER TABLE {SHADOW_TABLE} RENAME TO profile_evolution")
+        conn.execute("DROP TABLE profile_evolution_replaced")
+        for sql in indexes:
+            conn.execute(sql)
+        # 새 테이블의 id는 1부터 다시 시작하므로 세대를 올려 user_insights 등 id 기준 캐시를 무효화
+        user_profiles.bump_table_generation(conn, "profile_evolution")
+        conn.execute(f"""
+            UPDATE users SET
+                maturity_level = (SELECT r.maturity_level FROM {SHADOW_USERS_TABLE} r WHERE r.user_id = users.id),
+                sync_score = (SELECT r.sync_score FROM {SHADOW_USERS_TABLE} r WHERE r.user_id = users.id)
+            WHERE id IN (SELECT user_id FROM {SHADOW_USERS_TABLE})
+        """)
+        drop_shadow(conn)
+    return tail_users
+
+
+# --- 실행 ---
+
+def rederive(conn, decoder: BehavioralPersonalityDecoder, learner: ContinuousLearner,
+             dry_run: bool = False, workers: int = 1, chunk_users: int = CHUNK_USERS,
+             fresh: bool = False, db_path: Optional[str] = None) -> dict:
+    """
+    모든 사용자의 세션을 재생하여 profile_evolution 교체
+
+    Args:
+        conn: 사용자 프로필 DB 연결 (섀도 테이블 기록 / 교체)
+        decoder, learner: 재생에 쓸 규칙 (workers > 1이면 같은 설정으로 워커마다 새로 생성)
+        dry_run: 섀도 테이블 없이 재생만 하고 요약 반환
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        chunk_users: 청크당 사용자 수
+        fresh: 이전 미완료 실행을 버리고 처음부터
+        db_path: 워커가 열 DB 경로 (기본: user_profiles.DB_PATH)
+
+    Returns:
+        요약 통계 (처리한 세션 수, 처리량, 이어서 처리한 청크 수 등)
+    """
+    started = time.perf_counter()
+    config = {
+        "use_ml": bool(decoder.use_ml and decoder.ml_model is not None),
+        # 모델이 바뀌면 이전 실행의 청크와 섞이지 않도록 처음부터 다시
+        "ml_fingerprint": ml_fingerprint_of(decoder),
+        "learning_rate": learner.learning_rate,
+        "cultural_context": decoder.cultural_context,
+        "chunk_users": chunk_users
+    }
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_time "
+                 "ON behavioral_sessions(user_id, session_timestamp, id)")
+
+    plan = None if (fresh or dry_run) else load_plan(conn, config)
+    if plan is None:
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM behavioral_sessions").fetchone()[0]
+        user_ids = [row[0] for row in conn.execute(
+            "SELECT DISTINCT user_id FROM behavioral_sessions WHERE id <= ? ORDER BY user_id", (max_id,)
+        )]
+        lowers = chunk_bounds(user_ids, chunk_users)
+        uppers = lowers[1:] + [None]
+        plan = [(i, lower, upper, max_id, False) for i, (lower, upper) in enumerate(zip(lowers, uppers))]
+        if not dry_run:
+            create_shadow(conn, config, lowers, max_id)
+    resumed = sum(done for *_, done in plan)
+    pending = [entry[:4] for entry in plan if not entry[4]]
+    max_id = plan[0][3]
+    total = conn.execute(
+        "SELECT COUNT(*) FROM behavioral_sessions WHERE id <= ?", (max_id,)
+    ).fetchone()[0]
+    done_before = 0 if dry_run else conn.execute(
+        f"SELECT COALESCE(SUM(sessions), 0) FROM {PLAN_TABLE}"
+    ).fetchone()[0]
+
+    processed = 0
+    users = 0
+    maturity = {}
+    run_started = time.perf_counter()
+
+    def collect(result: ChunkResult):
+        nonlocal processed, users
+        if not dry_run:
+            write_chunk(conn, result)
+        processed += result.sessions
+        users += len(result.users)
+        for _, level, _ in result.users:
+            maturity[level] = maturity.get(level, 0) + 1
+        elapsed = time.perf_counter() - run_started
+        rate = processed / elapsed * 60 if elapsed > 0 else 0.0
+        remaining = total - done_before - processed
+        logger.info(
+            f"[rederive] chunk {result.chunk + 1}/{len(plan)}: {done_before + processed}/{total} sessions, "
+            f"{rate:,.0f} sessions/min, ETA {remaining / rate * 60 if rate else 0:.0f}s"
+        )
+
+    if workers <= 1 or len(pending) <= 1:
+        for chunk in pending:
+            collect(replay_chunk(conn, decoder, learner, *chunk))
+    else:
+        init_args = (db_path or user_profiles.DB_PATH, config["use_ml"], learner.learning_rate,
+                     decoder.cultural_context, config["ml_fingerprint"])
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            futures = [pool.submit(_replay_chunk_in_worker, *chunk) for chunk in pending]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    replayed = time.perf_counter()
+    tail_users = 0 if dry_run else swap_in(conn, decoder, learner, max_id)
+    elapsed = replayed - run_started
+    return {
+        "sessions": processed,
+        "users": users,
+        "chunks": len(plan),
+        "resumed_chunks": resumed,
+        "tail_users": tail_users,
+        "workers": workers,
+        "sessions_per_minute": round(processed / elapsed * 60) if elapsed > 0 else None,
+        "total_seconds": round(time.perf_counter() - started, 3),
+        "maturity_levels": dict(sorted(maturity.items())),
+        "written": not dry_run
+    }
+
+
+def main(argv=None) -> int:
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="세션 이력을 현재 규칙으로 재생하여 profile_evolution 재계산")
+    parser.add_argument("--db", default=None, help="사용자 프로필 DB 경로 (기본: user_profiles.DB_PATH)")
+    parser.add_argument("--rule-based", action="store_true", help="ML 모델 대신 규칙 기반 추론 사용")
+    parser.add_argument("--learning-rate", type=float, default=0.3, help="EMA 학습률 (api_server와 동일)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="병렬 프로세스 수")
+    parser.add_argument("--chunk-users", type=int, default=CHUNK_USERS, help="청크당 사용자 수")
+    parser.add_argument("--fresh", action="store_true", help="미완료 실행을 버리고 처음부터")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 요약만 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.db:
+        user_profiles.DB_PATH = args.db
+
+    decoder = BehavioralPersonalityDecoder(use_ml=not args.rule_based)
+    learner = ContinuousLearner(learning_rate=args.learning_rate)
+    conn = user_profiles.get_connection()
+    try:
+        summary = rederive(conn, decoder, learner, dry_run=args.dry_run, workers=args.workers,
+                           chunk_users=args.chunk_users, fresh=args.fresh)
+    finally:
+        conn.close()
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,15 @@
 """
 Enhanced Pre-computed MuMax3 Simulation Database with Interpolation
 Provides continuous parameter space from discrete 5x5 grid (25 points).
+
+If a pattern bank built by precompute_farm.py is available (bank_path argument
+or SIMULATION_BANK_PATH), its solver-generated patterns replace the analytic grid.
 """
+import hashlib
+import os
 import numpy as np
 from scipy.interpolate import RegularGridInterpolator
-from typing import Tuple
+from typing import Optional, Tuple
 
 class InterpolatedSimulationDB:
     """
@@ -17,11 +22,32 @@ class InterpolatedSimulationDB:
     GRID_SIZE = 128
     PARAM_STEPS = [0.0, 0.25, 0.5, 0.75, 1.0]  # 5 steps
     
-    def __init__(self):
+    def __init__(self, bank_path: Optional[str] = None, seed: Optional[int] = None):
+        """
+        Args:
+            bank_path: Pattern bank (.npz) from precompute_farm.py
+                       (default: SIMULATION_BANK_PATH env var; analytic grid if unset/missing)
+            seed: Seed for the thermal noise of the analytic grid
+                  (same seed -> bit-identical patterns in every process; None = unseeded)
+        """
+        self.seed = seed
         self.patterns = {}
-        self._generate_grid_patterns()
+        self.theta_steps = list(self.PARAM_STEPS)
+        self.beta_steps = list(self.PARAM_STEPS)
+        self.source = "interpolated_mumax3_5x5"
+        
+        bank_path = bank_path or os.getenv("SIMULATION_BANK_PATH")
+        if bank_path and os.path.exists(bank_path):
+            self._load_bank(bank_path)
+        else:
+            if bank_path:
+                print(f"[SimDB] Pattern bank not found: {bank_path}, using analytic grid")
+            self._generate_grid_patterns()
         self._build_interpolators()
-        print(f"[SimDB] Loaded {len(self.patterns)} pre-computed MuMax3 patterns (5x5 grid)")
+        # 패턴 내용의 지문: 프로세스 간 같은 DB인지 비교하는 데 사용
+        self.fingerprint = hashlib.sha256(self.pattern_array.tobytes()).hexdigest()[:16]
+        grid = f"{len(self.theta_steps)}x{len(self.beta_steps)}"
+        print(f"[SimDB] Loaded {len(self.patterns)} pre-computed MuMax3 patterns ({grid} grid)")
         print(f"[SimDB] Interpolation enabled for continuous parameter space")
     
     def _generate_grid_patterns(self):
@@ -31,12 +57,35 @@ class InterpolatedSimulationDB:
         X, Y = np.meshgrid(x, y)
         R = np.sqrt(X**2 + Y**2)
         
-        for theta in self.PARAM_STEPS:
-            for beta in self.PARAM_STEPS:
-                pattern = self._compute_pattern(X, Y, R, theta, beta)
+        for i, theta in enumerate(self.PARAM_STEPS):
+            for j, beta in enumerate(self.PARAM_STEPS):
+                # 격자점마다 독립 스트림: 생성 순서와 무관하게 같은 패턴
+                rng = np.random.default_rng(None if self.seed is None else (self.seed, i, j))
+                pattern = self._compute_pattern(X, Y, R, theta, beta, rng)
                 self.patterns[(theta, beta)] = pattern
     
-    def _compute_pattern(self, X, Y, R, theta: float, beta: float) -> np.ndarray:
+    def _load_bank(self, bank_path: str):
+        """Load solver-generated patterns written by precompute_farm.py"""
+        with np.load(bank_path, allow_pickle=False) as bank:
+            theta_steps = bank["theta_steps"].tolist()
+            beta_steps = bank["beta_steps"].tolist()
+            patterns = bank["patterns"]
+            source = str(bank["source"]) if "source" in bank.files else "mumax3_bank"
+        
+        expected = (len(theta_steps), len(beta_steps), self.GRID_SIZE, self.GRID_SIZE)
+        if patterns.shape != expected:
+            raise ValueError(f"Pattern bank shape {patterns.shape} does not match {expected}")
+        
+        self.theta_steps = theta_steps
+        self.beta_steps = beta_steps
+        self.source = source
+        for i, theta in enumerate(theta_steps):
+            for j, beta in enumerate(beta_steps):
+                self.patterns[(theta, beta)] = patterns[i, j]
+    
+    @staticmethod
+    def _compute_pattern(X, Y, R, theta: float, beta: float,
+                         rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """
         Compute magnetic pattern based on MuMax3 physics:
         - LLG Equation: dm/dt = -γ(m × H_eff) + α(m × dm/dt)
@@ -45,7 +94,11 @@ class InterpolatedSimulationDB:
         
         theta: Relaxation parameter (0=alert, 1=relaxed)
         beta: Excitation parameter (0=calm, 1=excited)
+        rng: Generator for the thermal noise (default: fresh unseeded generator)
         """
+        if rng is None:
+            rng = np.random.default_rng()
+        
         # Physical parameters (더 정확한 물리 상수)
         alpha = 0.01 + 0.04 * theta  # Gilbert damping (0.01-0.05)
         freq = 5 + 15 * beta          # Excitation frequency (5-20 GHz)
@@ -85,7 +138,7 @@ class InterpolatedSimulationDB:
         precession = np.sin(larmor_freq * 0.1) * np.exp(-alpha * R * 0.3) * 0.1
         
         # 6. Thermal fluctuations (theta-dependent)
-        thermal_noise = np.random.normal(0, 0.05 * (1 - theta), X.shape)
+        thermal_noise = rng.normal(0, 0.05 * (1 - theta), X.shape)
         
         # Combine based on parameter weights (물리적으로 더 정확한 가중치)
         pattern = (
@@ -110,24 +163,45 @@ class InterpolatedSimulationDB:
     def _build_interpolators(self):
         """Build scipy interpolators for each pixel position"""
         # Create 3D array: [theta_idx, beta_idx, flattened_pixel]
-        n_params = len(self.PARAM_STEPS)
         n_pixels = self.GRID_SIZE * self.GRID_SIZE
         
-        self.pattern_array = np.zeros((n_params, n_params, n_pixels))
+        self.pattern_array = np.zeros((len(self.theta_steps), len(self.beta_steps), n_pixels))
         
-        for i, theta in enumerate(self.PARAM_STEPS):
-            for j, beta in enumerate(self.PARAM_STEPS):
+        for i, theta in enumerate(self.theta_steps):
+            for j, beta in enumerate(self.beta_steps):
                 self.pattern_array[i, j, :] = self.patterns[(theta, beta)].flatten()
         
+        self._bind_pattern_array()
+    
+    def _bind_pattern_array(self):
+        """Point the per-grid-point patterns and the interpolator at pattern_array (no copies)"""
+        for i, theta in enumerate(self.theta_steps):
+            for j, beta in enumerate(self.beta_steps):
+                self.patterns[(theta, beta)] = self.pattern_array[i, j].reshape(self.GRID_SIZE, self.GRID_SIZE)
+        
         # Create interpolator
         self.interpolator = RegularGridInterpolator(
-            (np.array(self.PARAM_STEPS), np.array(self.PARAM_STEPS)),
+            (np.array(self.theta_steps), np.array(self.beta_steps)),
             self.pattern_array,
             method='linear',
             bounds_error=False,
             fill_value=None
         )
     
+    def share_memory(self) -> int:
+        """
+        Move pattern_array into a read-only shared segment before a pre-fork
+        deployment forks its workers (see prefork.py).
+        
+        Returns:
+            Bytes moved
+        """
+        from prefork import share_array
+        
+        self.pattern_array = share_array(self.pattern_array)
+        self._bind_pattern_array()
+        return self.pattern_array.nbytes
+    
     def get_magnetic_state(self, theta_power: float, beta_power: float, t: float = 0) -> np.ndarray:
         """
         Get interpolated magnetic state for any (theta, beta) values.
@@ -140,20 +214,31 @@ class InterpolatedSimulationDB:
         Returns:
             128x128 magnetic state array
         """
+        pattern = self.get_base_pattern(theta_power, beta_power)
+        return pattern * self.get_time_modulation(beta_power, t)
+    
+    def get_base_pattern(self, theta_power: float, beta_power: float) -> np.ndarray:
+        """
+        Time-independent interpolated pattern for (theta, beta).
+        
+        Returns:
+            128x128 magnetic state array before time modulation
+        """
         # Clamp values to [0, 1]
         theta = np.clip(theta_power, 0, 1)
         beta = np.clip(beta_power, 0, 1)
         
         # Interpolate
         interpolated_flat = self.interpolator((theta, beta))
-        pattern = interpolated_flat.reshape((self.GRID_SIZE, self.GRID_SIZE))
-        
-        # Add time-dependent oscillation (spin precession)
+        return interpolated_flat.reshape((self.GRID_SIZE, self.GRID_SIZE))
+    
+    @staticmethod
+    def get_time_modulation(beta_power: float, t: float) -> float:
+        """
+        Scalar time-dependent oscillation (spin precession) applied to the base pattern.
+        """
         precession_freq = 5 + beta_power * 15
-        time_modulation = 1 + 0.2 * np.sin(2 * np.pi * precession_freq * t * 0.01)
-        pattern = pattern * time_modulation
-        
-        return pattern
+        return 1 + 0.2 * np.sin(2 * np.pi * precession_freq * t * 0.01)
     
     def get_physics_metadata(self, theta_power: float, beta_power: float) -> dict:
         """Return physical parameters for given EEG state"""
@@ -165,7 +250,8 @@ class InterpolatedSimulationDB:
             "alpha_gilbert": round(alpha, 4),
             "b_external_tesla": round(b_ext, 4),
             "dominant_freq_ghz": round(freq, 2),
-            "source": "interpolated_mumax3_5x5",
+            "source": self.source,
+            "db_fingerprint": self.fingerprint,
             "grid": f"{self.GRID_SIZE}x{self.GRID_SIZE}",
             "material": "Permalloy_Ni80Fe20",
             "interpolation": "bilinear"
@@ -175,10 +261,19 @@ class InterpolatedSimulationDB:
 # Singleton
 _db_instance = None
 
-def get_simulation_db() -> InterpolatedSimulationDB:
+DEFAULT_SEED = int(os.getenv("NEUROTWIN_SEED", "42"))
+
+def get_simulation_db(seed: Optional[int] = None) -> InterpolatedSimulationDB:
+    """
+    Shared database instance (seed defaults to NEUROTWIN_SEED, 42 if unset).
+    A different seed than the shared instance's returns a separate instance.
+    """
     global _db_instance
+    seed = DEFAULT_SEED if seed is None else seed
     if _db_instance is None:
-        _db_instance = InterpolatedSimulationDB()
+        _db_instance = InterpolatedSimulationDB(seed=seed)
+    elif _db_instance.seed != seed:
+        return InterpolatedSimulationDB(seed=seed)
     return _db_instance
 
 
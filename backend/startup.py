@@ -0,0 +1,182 @@
+"""
+서버 시작 오케스트레이션 모듈
+무거운 구성요소(컨트롤러, DB, 데이터셋 등)를 import 시점이 아닌 첫 사용 시 또는 lifespan 워밍업에서 생성
+
+- ComponentRegistry.register(): 이름과 생성 함수 등록 (생성하지 않음)
+- ComponentRegistry.get() / proxy(): 첫 접근 시 스레드 안전하게 한 번만 생성
+- ComponentRegistry.aget(): async 엔드포인트용, 생성 대기를 스레드 풀로 넘겨 이벤트 루프를 막지 않음
+- ComponentRegistry.warm_up(): 모든 구성요소를 스레드 풀에서 병렬 생성 (의존성은 생성 함수 안의 get()으로 해결)
+- ComponentRegistry.build_all(): 스레드 없이 순서대로 생성 (pre-fork 마스터, prefork.py)
+- ComponentRegistry.status(): 준비 여부와 구성요소별 생성 시간 (/ready 응답)
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Component:
+    """지연 생성되는 단일 구성요소"""
+
+    def __init__(self, name: str, factory: Callable[[], Any], required: bool = True):
+        self.name = name
+        self.factory = factory
+        self.required = required
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._value: Any = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._built
+
+    def get(self) -> Any:
+        if self._built:
+            return self._value
+        with self._lock:
+            if not self._built:
+                start = time.perf_counter()
+                try:
+                    self._value = self.factory()
+                except Exception as e:
+                    self.error = f"{type(e).__name__}: {e}"
+                    raise
+                self.seconds = time.perf_counter() - start
+                self.error = None
+                self._built = True
+                logger.info(f"[startup] {self.name} ready in {self.seconds * 1000:.0f} ms")
+        return self._value
+
+    def set(self, value: Any):
+        """생성 함수 대신 값을 직접 지정 (테스트/벤치마크용)"""
+        with self._lock:
+            self._value = value
+            self._built = True
+
+
+class LazyProxy:
+    """
+    속성 접근 시 구성요소를 생성하여 위임 (모듈 전역 변수를 그대로 쓰는 코드용)
+    생성이 끝날 때까지 호출 스레드가 멈추므로 async 코드에서는 먼저 aget()으로 기다릴 것
+    """
+
+    __slots__ = ("_component",)
+
+    def __init__(self, component: Component):
+        object.__setattr__(self, "_component", component)
+
+    def __getattr__(self, name: str):
+        return getattr(self._component.get(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._component.get(), name, value)
+
+    def __repr__(self) -> str:
+        state = "ready" if self._component.ready else "lazy"
+        return f"<LazyProxy {self._component.name} ({state})>"
+
+
+class ComponentRegistry:
+    """구성요소 등록, 지연 생성, 병렬 워밍업"""
+
+    def __init__(self):
+        self._components: "OrderedDict[str, Component]" = OrderedDict()
+        self.warmup_seconds: Optional[float] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, factory: Callable[[], Any], required: bool = True) -> Component:
+        """
+        Args:
+            name: 구성요소 이름
+            factory: 인자 없는 생성 함수 (다른 구성요소가 필요하면 내부에서 get() 호출)
+            required: False이면 생성 실패/미완료여도 준비 상태로 간주
+        """
+        component = Component(name, factory, required)
+        self._components[name] = component
+        return component
+
+    def get(self, name: str) -> Any:
+        return self._components[name].get()
+
+    async def aget(self, name: str, executor=None) -> Any:
+        """
+        이벤트 루프 스레드를 막지 않고 가져오기
+        워밍업이 다른 스레드에서 생성 중이면 그 잠금 대기를 스레드 풀에서 수행
+        """
+        component = self._components[name]
+        if component.ready:
+            return component.get()
+        return await asyncio.get_running_loop().run_in_executor(executor, component.get)
+
+    def set(self, name: str, value: Any):
+        self._components[name].set(value)
+
+    def proxy(self, name: str) -> LazyProxy:
+        return LazyProxy(self._components[name])
+
+    def is_ready(self) -> bool:
+        return all(c.ready for c in self._components.values() if c.required)
+
+    async def warm_up(self, names: Optional[Iterable[str]] = None, executor=None):
+        """구성요소를 스레드 풀에서 병렬 생성 (실패는 기록만 하고 다음 접근 시 재시도)"""
+        loop = asyncio.get_running_loop()
+        components = [self._components[n] for n in names] if names else list(self._components.values())
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, c.get) for c in components),
+            return_exceptions=True
+        )
+        for component, result in zip(components, results):
+            if isinstance(result, Exception):
+                logger.error(f"[startup] {component.name} failed: {component.error}")
+        self.warmup_seconds = time.perf_counter() - start
+        logger.info(f"[startup] warm-up finished in {self.warmup_seconds * 1000:.0f} ms")
+
+    def build_all(self) -> Dict[str, Any]:
+        """
+        현재 스레드에서 등록 순서대로 생성 (pre-fork 마스터용, 스레드를 만들지 않음)
+        선택 구성요소의 실패는 기록만 하고 결과에서 제외
+        """
+        start = time.perf_counter()
+        values = {}
+        for name, component in self._components.items():
+            try:
+                values[name] = component.get()
+            except Exception:
+                if component.required:
+                    raise
+                logger.error(f"[startup] {name} failed: {component.error}")
+        self.warmup_seconds = time.perf_counter() - start
+        return values
+
+    def start_warm_up(self) -> asyncio.Task:
+        """워밍업을 백그라운드 태스크로 시작 (요청 처리는 바로 시작)"""
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.ensure_future(self.warm_up())
+        return self._warmup_task
+
+    def built(self, name: str) -> Optional[Any]:
+        """이미 생성된 경우에만 값 반환 (종료 처리에서 불필요한 생성 방지)"""
+        component = self._components[name]
+        return component.get() if component.ready else None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "warmup_ms": None if self.warmup_seconds is None else round(self.warmup_seconds * 1000, 1),
+            "components": {
+                name: {
+                    "ready": c.ready,
+                    "required": c.required,
+                    "ms": None if c.seconds is None else round(c.seconds * 1000, 1),
+                    **({"error": c.error} if c.error else {})
+                }
+                for name, c in self._components.items()
+            }
+        }
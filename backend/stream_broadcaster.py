@@ -0,0 +1,120 @@
+"""
+공유 브로드캐스트 스트림 모듈
+/ws/stream 데모 스트림을 틱당 한 번만 계산하여 모든 구독자에게 분배
+
+- 단일 프로듀서 태스크가 프레임을 생성 (구독자가 있을 때만 실행)
+- 구독자별 bounded asyncio.Queue: 가득 차면 가장 오래된 프레임을 버림
+- 느린 클라이언트가 메모리를 쌓지 않으며, 계산 비용은 시청자 수와 무관 (O(1))
+- 프레임 간격은 FrameScheduler가 관리 (드리프트 보정, 데드라인 초과 시 건너뜀)
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Set
+
+from frame_scheduler import FrameScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastFrame:
+    """
+    구독자에게 전달되는 프레임
+
+    JSON 클라이언트용 직렬화 결과를 캐시하여 프레임당 한 번만 인코딩한다.
+    """
+
+    __slots__ = ("index", "result", "_json_text")
+
+    def __init__(self, index: int, result: Dict[str, Any]):
+        self.index = index
+        self.result = result
+        self._json_text: Optional[str] = None
+
+    def encode(self, codec):
+        """코덱으로 프레임 인코딩 (JSON 코덱은 공유 캐시 사용)"""
+        if getattr(codec, "binary", False):
+            return codec.encode(self.result)
+        if self._json_text is None:
+            self._json_text = json.dumps(self.result, separators=(",", ":"), ensure_ascii=False)
+        return [self._json_text]
+
+
+class StreamBroadcaster:
+    """
+    단일 프로듀서 / 다중 구독자 브로드캐스트 엔진
+
+    Args:
+        produce_frame: 프레임 인덱스를 받아 결과 딕셔너리를 반환하는 함수
+        scheduler: 프레임 스케줄러 (기본: 목표 FPS의 FrameScheduler)
+        queue_size: 구독자별 큐 크기 (초과 시 오래된 프레임 드롭)
+    """
+
+    def __init__(
+        self,
+        produce_frame: Callable[[int], Dict[str, Any]],
+        scheduler: Optional[FrameScheduler] = None,
+        queue_size: int = 2
+    ):
+        self.produce_frame = produce_frame
+        self.scheduler = scheduler or FrameScheduler()
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.frames_produced = 0
+        self.frames_dropped = 0
+
+    async def subscribe(self) -> asyncio.Queue:
+        """구독자 큐 등록 (필요 시 프로듀서 시작)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        self._ensure_producer()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """구독 해제 (마지막 구독자가 떠나면 프로듀서 중지)"""
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _ensure_producer(self):
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self.scheduler.reset()
+        self._task = loop.create_task(self._run())
+
+    def _publish(self, frame: BroadcastFrame):
+        for queue in self._subscribers:
+            if queue.full():
+                # 느린 클라이언트: 가장 오래된 프레임을 버리고 최신 프레임 유지
+                queue.get_nowait()
+                self.frames_dropped += 1
+            queue.put_nowait(frame)
+
+    async def _run(self):
+        frame_index = 0
+        try:
+            while self._subscribers:
+                try:
+                    result = self.produce_frame(frame_index)
+                except Exception as e:
+                    logger.error(f"Broadcast frame production failed: {e}")
+                    result = {"error": "Processing failed", "detail": str(e)}
+                self._publish(BroadcastFrame(frame_index, result))
+                self.frames_produced += 1
+                # 건너뛴 프레임만큼 인덱스를 진행하여 액션 주기를 실제 시간에 맞춤
+                frame_index += 1 + await self.scheduler.tick()
+        except asyncio.CancelledError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """브로드캐스트 통계"""
+        return {
+            "subscribers": len(self._subscribers),
+            "running": self._task is not None and not self._task.done(),
+            "frames_produced": self.frames_produced,
+            "frames_dropped": self.frames_dropped,
+            "scheduler": self.scheduler.get_stats()
+        }
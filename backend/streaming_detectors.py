@@ -0,0 +1,390 @@
+"""
+스트리밍 이상 / 스트레스 감지기
+사용자 x 범위(scope) x 지표마다 관측 한 번에 O(1)로 갱신되는 상태를 유지
+
+- 지수 가중 평균 / 분산 (EWM)
+- 중앙값과 MAD(중앙값 절대 편차)의 P² 스케치 (Jain & Chlamtac, 마커 5개) → 이상치에 강한 z-score
+- 양방향 CUSUM으로 지속적인 수준 변화(change point) 감지
+  (중앙값 기준이면 비대칭 분포에서 한쪽으로 누적되므로 EWM 평균 기준 편차를 robust 표준편차로 나눈 값을 사용)
+- 관측값은 갱신 전 상태로 평가한 뒤 반영 (자기 자신과 비교하지 않음)
+- 지표 하나의 상태는 약 140바이트로 직렬화되어 detector_state 테이블에 사용자 x 범위별 BLOB로 저장
+
+세션 단위("session", "game:<id>")뿐 아니라 게임 이벤트 단위("events:<id>")로도 같은 감지기를 사용
+"""
+import json
+import math
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+import user_profiles
+
+# 지수 가중치 (클수록 최근 관측 비중이 큼)
+DETECTOR_ALPHA = float(os.getenv("DETECTOR_ALPHA", "0.1"))
+# CUSUM 허용 편차 k와 경보 임계값 h ((x - EWM 평균) / robust 표준편차 단위)
+# h=6: 정규 / 로그정규 / 포아송 합성 데이터에서 오경보 약 1회 / 1000관측, 2σ 수준 변화는 보통 2~6관측 안에 감지
+CUSUM_K = float(os.getenv("CUSUM_K", "0.5"))
+CUSUM_H = float(os.getenv("CUSUM_H", "6.0"))
+# 평가를 시작하는 최소 관측 수 (P² 마커 초기화에 5개 필요)
+MIN_OBSERVATIONS = 5
+# CUSUM에 넣기 전 표준화 편차 절단 (단발성 이상치 하나로 경보가 울리지 않도록)
+Z_CLIP = 4.0
+# MAD → 정규분포 표준편차 환산 계수
+MAD_SCALE = 1.4826
+
+# 세션 지표 → 행동 프로필 키
+SESSION_METRICS = {
+    "avg_decision_latency": "avgDecisionLatency",
+    "revision_rate": "revisionRate",
+    "path_efficiency": "pathEfficiency",
+}
+
+# 알림 / 응답용 지표 이름
+METRIC_LABELS = {
+    "avg_decision_latency": "의사결정 지연시간",
+    "revision_rate": "수정 빈도",
+    "path_efficiency": "경로 효율성",
+    "event_interval": "이벤트 간격",
+}
+
+_FORMAT_VERSION = 1
+# count, EWM mean/var, 중앙값 마커 높이 5 + 내부 위치 3, MAD 마커 높이 5 + 내부 위치 3, CUSUM 상/하
+_STATE = struct.Struct("<I2d5d3I5d3I2d")
+_HEADER = struct.Struct("<BB")
+_NAME = struct.Struct("<B")
+
+
+class P2Quantile:
+    """
+    P² 분위수 스케치 (관측 한 번에 O(1), 상태는 마커 5개)
+
+    처음 5개 관측은 heights에 그대로 보관하고 5번째에서 정렬하여 마커로 사용
+    """
+    __slots__ = ("p", "heights", "positions")
+
+    def __init__(self, p: float = 0.5, heights=None, positions=None):
+        self.p = p
+        self.heights = list(heights) if heights is not None else []
+        self.positions = list(positions) if positions is not None else [1, 2, 3, 4, 5]
+
+    def estimate(self, count: int) -> float:
+        if count == 0:
+            return math.nan
+        if count < 5:
+            values = sorted(self.heights[:count])
+            position = self.p * (count - 1)
+            lower = int(position)
+            upper = min(lower + 1, count - 1)
+            return values[lower] + (values[upper] - values[lower]) * (position - lower)
+        return self.heights[2]
+
+    def add(self, x: float, count: int):
+        """x 반영 (count는 x를 포함한 관측 수)"""
+        q, n = self.heights, self.positions
+        if count <= 5:
+            q.append(x)
+            if count == 5:
+                q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while k < 3 and x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        n[4] = count
+
+        p = self.p
+        for i, fraction in ((1, p / 2), (2, p), (3, (1 + p) / 2)):
+            desired = 1 + (count - 1) * fraction
+            d = desired - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                # 포물선 보간, 순서가 깨지면 선형 보간
+                parabolic = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolic < q[i + 1]:
+                    q[i] = parabolic
+                else:
+                    q[i] = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                n[i] += step
+
+
+class Observation(NamedTuple):
+    """관측 하나의 평가 결과 (갱신 전 상태 기준, 관측 수가 부족하면 z 값은 None)"""
+    value: float
+    mean: Optional[float]      # EWM 평균
+    z: Optional[float]         # EWM z-score
+    median: Optional[float]
+    robust_z: Optional[float]  # (x - 중앙값) / (1.4826 * MAD)
+    change: Optional[str]      # CUSUM 경보: "increase" / "decrease"
+
+
+class MetricDetector:
+    """지표 하나의 스트리밍 감지기"""
+    __slots__ = ("count", "mean", "var", "median", "mad", "cusum_hi", "cusum_lo")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.median = P2Quantile()
+        self.mad = P2Quantile()
+        self.cusum_hi = 0.0
+        self.cusum_lo = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= MIN_OBSERVATIONS
+
+    def scale(self) -> float:
+        """robust 표준편차 추정 (MAD가 0이면 EWM 표준편차)"""
+        mad = self.mad.estimate(self.count)
+        return MAD_SCALE * mad if mad > 0 else math.sqrt(self.var)
+
+    def update(self, x: float, alpha: float = DETECTOR_ALPHA) -> Observation:
+        """x를 현재 상태로 평가한 뒤 상태에 반영"""
+        x = float(x)
+        observation = Observation(x, None, None, None, None, None)
+        if self.ready:
+            std = math.sqrt(self.var)
+            median = self.median.estimate(self.count)
+            scale = self.scale()
+            z = (x - self.mean) / std if std > 0 else 0.0
+            robust_z = (x - median) / scale if scale > 0 else 0.0
+            deviation = (x - self.mean) / scale if scale > 0 else 0.0
+            clipped = max(-Z_CLIP, min(Z_CLIP, deviation))
+            self.cusum_hi = max(0.0, self.cusum_hi + clipped - CUSUM_K)
+            self.cusum_lo = max(0.0, self.cusum_lo - clipped - CUSUM_K)
+            change = None
+            if self.cusum_hi > CUSUM_H:
+                change = "increase"
+            elif self.cusum_lo > CUSUM_H:
+                change = "decrease"
+            if change is not None:
+                self.cusum_hi = self.cusum_lo = 0.0
+            observation = Observation(x, self.mean, z, median, robust_z, change)
+
+        # EWM (첫 관측으로 초기화, 분산은 West의 점화식)
+        self.count += 1
+        if self.count == 1:
+            self.mean, self.var = x, 0.0
+        else:
+            diff = x - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.var = (1 - alpha) * (self.var + diff * increment)
+        self.median.add(x, self.count)
+        self.mad.add(abs(x - self.median.estimate(self.count)), self.count)
+        return observation
+
+    def pack(self) -> bytes:
+        def markers(sketch: P2Quantile):
+            heights = (sketch.heights + [0.0] * 5)[:5]
+            return heights, sketch.positions[1:4]
+
+        median_q, median_n = markers(self.median)
+        mad_q, mad_n = markers(self.mad)
+        return _STATE.pack(
+            self.count, self.mean, self.var, *median_q, *median_n, *mad_q, *mad_n, self.cusum_hi, self.cusum_lo
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes, offset: int = 0) -> "MetricDetector":
+        values = _STATE.unpack_from(data, offset)
+        detector = cls()
+        detector.count, detector.mean, detector.var = values[0], values[1], values[2]
+
+        def sketch(heights, inner):
+            kept = list(heights) if detector.count >= 5 else list(heights[:detector.count])
+            return P2Quantile(0.5, kept, [1, *inner, max(detector.count, 5)])
+
+        detector.median = sketch(values[3:8], values[8:11])
+        detector.mad = sketch(values[11:16], values[16:19])
+        detector.cusum_hi, detector.cusum_lo = values[19], values[20]
+        return detector
+
+
+class DetectorSet:
+    """한 사용자 x 범위의 지표별 감지기 묶음"""
+
+    def __init__(self, detectors: Optional[Dict[str, MetricDetector]] = None):
+        self.detectors: Dict[str, MetricDetector] = detectors or {}
+
+    def observe(self, metric: str, value: float) -> Observation:
+        detector = self.detectors.get(metric)
+        if detector is None:
+            detector = self.detectors[metric] = MetricDetector()
+        return detector.update(value)
+
+    def update(self, values: Mapping[str, Optional[float]]) -> Dict[str, Observation]:
+        """지표 여러 개를 한 번에 반영 (None / NaN은 건너뜀)"""
+        return {
+            metric: self.observe(metric, value)
+            for metric, value in values.items()
+            if value is not None and not (isinstance(value, float) and math.isnan(value))
+        }
+
+    def update_series(self, metric: str, values: Iterable[float]) -> list:
+        """같은 지표의 연속 관측 (예: 게임 이벤트 간격)"""
+        return [self.observe(metric, value) for value in values]
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEADER.pack(_FORMAT_VERSION, len(self.detectors))]
+        for metric, detector in self.detectors.items():
+            name = metric.encode("utf-8")
+            parts.append(_NAME.pack(len(name)) + name + detector.pack())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> "DetectorSet":
+        if not data:
+            return cls()
+        version, count = _HEADER.unpack_from(data)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported detector state version: {version}")
+        offset = _HEADER.size
+        detectors = {}
+        for _ in range(count):
+            (length,) = _NAME.unpack_from(data, offset)
+            offset += _NAME.size
+            metric = data[offset:offset + length].decode("utf-8")
+            offset += length
+            detectors[metric] = MetricDetector.unpack(data, offset)
+            offset += _STATE.size
+        return cls(detectors)
+
+
+class DetectorStore:
+    """
+    detector_state 테이블 기반 감지기 상태 저장소
+
+    observe()는 읽기 → 갱신 → 쓰기를 BEGIN IMMEDIATE 트랜잭션 하나로 처리하므로
+    같은 사용자에 대한 동시 요청(여러 워커 포함)도 관측을 잃지 않음
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.updates = 0
+
+    def load(self, user_id: str, scope: str) -> DetectorSet:
+        conn = user_profiles.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT state FROM detector_state WHERE user_id = ? AND scope = ?", (user_id, scope)
+            ).fetchone()
+        finally:
+            conn.close()
+        return DetectorSet.from_bytes(row[0] if row else None)
+
+    def _modify(self, user_id: str, scope: str, apply, seed: Optional[Callable[[], Iterable[Mapping]]] = None):
+        conn = user_profiles.get_connection()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT state FROM detector_state WHERE user_id = ? AND scope = ?", (user_id, scope)
+                ).fetchone()
+                detectors = DetectorSet.from_bytes(row[0] if row else None)
+                if row is None and seed is not None:
+                    # 상태가 없는 기존 사용자는 저장된 이력으로 먼저 채움 (한 번만)
+                    for values in seed():
+                        detectors.update(values)
+                result = apply(detectors)
+                conn.execute(
+                    "INSERT OR REPLACE INTO detector_state (user_id, scope, state, updated_at) VALUES (?, ?, ?, ?)",
+                    (user_id, scope, detectors.to_bytes(), time.time())
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        with self._lock:
+            self.updates += 1
+        return result
+
+    def observe(self, user_id: str, scope: str, values: Mapping[str, Optional[float]],
+                seed: Optional[Callable[[], Iterable[Mapping]]] = None) -> Dict[str, Observation]:
+        """
+        지표값 반영 후 각 관측의 평가 결과 반환
+
+        Args:
+            seed: 저장된 상태가 없을 때만 호출되는 과거 지표값 목록 (오래된 순)
+        """
+        return self._modify(user_id, scope, lambda detectors: detectors.update(values), seed)
+
+    def observe_series(self, user_id: str, scope: str, metric: str, values: Iterable[float]) -> list:
+        """연속 관측 반영 (게임 이벤트 단위)"""
+        values = list(values)
+        return self._modify(user_id, scope, lambda detectors: detectors.update_series(metric, values))
+
+    def reset(self, user_id: str, scope: Optional[str] = None):
+        conn = user_profiles.get_connection()
+        try:
+            if scope is None:
+                conn.execute("DELETE FROM detector_state WHERE user_id = ?", (user_id,))
+            else:
+                conn.execute("DELETE FROM detector_state WHERE user_id = ? AND scope = ?", (user_id, scope))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def session_metrics(profile: Mapping) -> Dict[str, Optional[float]]:
+    """행동 프로필(최상위 키, 없으면 summary) → 세션 지표값"""
+    summary = profile.get("summary") or {}
+    values = {}
+    for metric, key in SESSION_METRICS.items():
+        value = profile.get(key, summary.get(key))
+        values[metric] = float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+    return values
+
+
+def history_metrics(sessions: Iterable[Mapping]) -> List[Dict[str, Optional[float]]]:
+    """get_session_history 결과(최신순) → 오래된 순 세션 지표값 (raw_metrics의 원본 프로필 기준)"""
+    history = []
+    for session in sessions:
+        raw = session.get("raw_metrics")
+        try:
+            profile = json.loads(raw) if isinstance(raw, str) else (raw or {})
+        except ValueError:
+            continue
+        history.append(session_metrics(profile))
+    history.reverse()
+    return history
+
+
+def event_intervals(raw_events: Iterable[Mapping]) -> Tuple[list, list]:
+    """게임 이벤트 → (이벤트 간격 ms 목록, 각 간격이 끝나는 이벤트 인덱스)"""
+    timestamps = [(i, event.get("timestamp")) for i, event in enumerate(raw_events)]
+    timestamps = [(i, t) for i, t in timestamps if isinstance(t, (int, float))]
+    intervals, indices = [], []
+    for (_, previous), (i, current) in zip(timestamps, timestamps[1:]):
+        intervals.append(float(current - previous))
+        indices.append(i)
+    return intervals, indices
+
+
+_detector_store: Optional[DetectorStore] = None
+
+
+def get_detector_store() -> DetectorStore:
+    """전역 감지기 상태 저장소"""
+    global _detector_store
+    if _detector_store is None:
+        _detector_store = DetectorStore()
+    return _detector_store
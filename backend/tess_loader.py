@@ -6,15 +6,19 @@ Features:
 - Load and preprocess audio files
 - Extract emotion labels from filenames
 - Compatible with the BehavioralPersonalityDecoder
+- Columnar sample index (TESSSampleIndex) shareable across pre-forked workers
 """
 import os
 import json
 import random
+from collections.abc import Sequence
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import wave
 import struct
 
+import numpy as np
+
 
 # Emotion mapping from TESS dataset
 EMOTION_LABELS = {
@@ -28,6 +32,77 @@ EMOTION_LABELS = {
 }
 
 
+EMOTIONS = list(EMOTION_LABELS)
+
+
+class TESSSampleIndex(Sequence):
+    """
+    Read-only, columnar index of TESS samples.
+    
+    Relative paths, actors and emotions live in three contiguous NumPy arrays
+    instead of one dict per file, so a pre-forked master can build the index
+    once and workers read it without touching per-sample Python objects
+    (whose reference counts would copy their pages). Sample dicts are
+    materialized on access.
+    """
+    
+    def __init__(self, root=".", paths: Optional[List[str]] = None,
+                 actors: Optional[List[str]] = None, emotions: Optional[List[str]] = None):
+        """
+        Args:
+            root: Dataset directory the paths are relative to
+            paths: Relative wav paths ("OAF_angry/OAF_back_angry.wav")
+            actors: Actor code per sample (OAF / YAF)
+            emotions: Emotion label per sample (keys of EMOTION_LABELS)
+        """
+        paths, actors, emotions = paths or [], actors or [], emotions or []
+        self.root = Path(root)
+        self.actor_names = sorted(set(actors))
+        self.paths = np.array([p.encode("utf-8") for p in paths], dtype=bytes) if paths else np.empty(0, dtype="S1")
+        self.actor_codes = np.array([self.actor_names.index(a) for a in actors], dtype=np.int8)
+        self.emotion_codes = np.array([EMOTIONS.index(e) for e in emotions], dtype=np.int8)
+        for column in (self.paths, self.actor_codes, self.emotion_codes):
+            column.setflags(write=False)
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        relpath = self.paths[index].decode("utf-8")
+        stem = Path(relpath).stem
+        emotion = EMOTIONS[self.emotion_codes[index]]
+        return {
+            'path': str(self.root / relpath),
+            'actor': self.actor_names[self.actor_codes[index]],
+            'emotion': emotion,
+            'word': stem.split('_')[1] if '_' in stem else '',
+            'emotion_data': EMOTION_LABELS[emotion]
+        }
+    
+    def indices(self, emotion: Optional[str] = None) -> np.ndarray:
+        """Row indices, optionally only those with the given emotion."""
+        if emotion is None:
+            return np.arange(len(self))
+        if emotion not in EMOTION_LABELS:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.emotion_codes == EMOTIONS.index(emotion))
+    
+    def emotion_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.emotion_codes, minlength=len(EMOTIONS))
+        return {emotion: int(count) for emotion, count in zip(EMOTIONS, counts) if count}
+    
+    def share_memory(self) -> int:
+        """Move the columns into read-only shared segments (pre-fork deployments, see prefork.py)."""
+        from prefork import share_array
+        
+        self.paths, self.actor_codes, self.emotion_codes = (
+            share_array(c) for c in (self.paths, self.actor_codes, self.emotion_codes)
+        )
+        return self.paths.nbytes + self.actor_codes.nbytes + self.emotion_codes.nbytes
+
+
 class TESSDataLoader:
     """
     Loader for Toronto Emotional Speech Set (TESS) dataset.
@@ -56,7 +131,7 @@ class TESSDataLoader:
             dataset_path = base_path / "datasets" / "tess" / "TESS Toronto emotional speech set data"
         
         self.dataset_path = Path(dataset_path)
-        self.samples: List[Dict] = []
+        self.samples = TESSSampleIndex(self.dataset_path)
         self._loaded = False
     
     def load(self) -> int:
@@ -69,10 +144,10 @@ class TESSDataLoader:
         if not self.dataset_path.exists():
             raise FileNotFoundError(f"Dataset not found at {self.dataset_path}")
         
-        self.samples = []
+        paths, actors, emotions = [], [], []
         
         # Iterate through emotion folders
-        for folder in self.dataset_path.iterdir():
+        for folder in sorted(self.dataset_path.iterdir()):
             if folder.is_dir():
                 # Parse folder name: OAF_angry, YAF_happy, etc.
                 parts = folder.name.split('_')
@@ -82,16 +157,12 @@ class TESSDataLoader:
                     
                     if emotion in EMOTION_LABELS:
                         # Load all wav files in this folder
-                        for audio_file in folder.glob("*.wav"):
-                            sample = {
-                                'path': str(audio_file),
-                                'actor': actor,
-                                'emotion': emotion,
-                                'word': audio_file.stem.split('_')[1] if '_' in audio_file.stem else '',
-                                'emotion_data': EMOTION_LABELS[emotion]
-                            }
-                            self.samples.append(sample)
+                        for audio_file in sorted(folder.glob("*.wav")):
+                            paths.append(f"{folder.name}/{audio_file.name}")
+                            actors.append(actor)
+                            emotions.append(emotion)
         
+        self.samples = TESSSampleIndex(self.dataset_path, paths, actors, emotions)
         self._loaded = True
         return len(self.samples)
     
@@ -115,23 +186,20 @@ class TESSDataLoader:
         if not self._loaded:
             self.load()
         
-        pool = self.samples
-        if emotion:
-            pool = [s for s in self.samples if s['emotion'] == emotion]
-        
-        return random.sample(pool, min(n, len(pool)))
+        pool = self.samples.indices(emotion or None)
+        chosen = random.sample(range(len(pool)), min(n, len(pool)))
+        return [self.samples[int(pool[i])] for i in chosen]
     
     def get_emotion_distribution(self) -> Dict[str, int]:
         """Get count of samples per emotion."""
         if not self._loaded:
             self.load()
         
-        distribution = {}
-        for sample in self.samples:
-            emotion = sample['emotion']
-            distribution[emotion] = distribution.get(emotion, 0) + 1
-        
-        return distribution
+        return self.samples.emotion_counts()
+    
+    def share_memory(self) -> int:
+        """Move the sample index into shared segments (pre-fork deployments)."""
+        return self.samples.share_memory()
     
     def get_audio_features(self, audio_path: str) -> Dict:
         """
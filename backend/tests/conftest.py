@@ -0,0 +1,39 @@
+"""
+테스트 공통 fixture
+"""
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import readout_store
+import user_profiles
+
+
+@pytest.fixture(autouse=True)
+def readout_store_dir(tmp_path, monkeypatch):
+    """
+    리드아웃 저장소(base.npz)를 테스트마다 임시 디렉토리로
+    (컨트롤러 생성 시 base를 대조하므로 seed가 다른 테스트끼리 ml_models/readouts를 공유하지 않도록)
+    """
+    path = tmp_path / "readouts"
+    monkeypatch.setattr(readout_store, "DEFAULT_STORE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """임시 sqlite 파일을 쓰는 UserProfileManager (get_connection과 DB_PATH를 교체)"""
+    monkeypatch.setattr(user_profiles, "DB_PATH", str(tmp_path / "profiles.db"))
+
+    def test_get_connection():
+        conn = sqlite3.connect(str(tmp_path / "profiles.db"))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    monkeypatch.setattr(user_profiles, "get_connection", test_get_connection)
+    user_profiles.init_database()
+    return user_profiles.UserProfileManager()
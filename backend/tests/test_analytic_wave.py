@@ -0,0 +1,50 @@
+"""
+해석적 스핀파 폴백 엔진 테스트
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytic_wave import NUMEXPR_AVAILABLE, AnalyticWaveEngine, legacy_wave_state
+
+
+class TestAnalyticWaveEngine:
+    """AnalyticWaveEngine 테스트"""
+
+    @pytest.mark.parametrize("alpha,b_ext,t", [(0.01, 0.05, 0.0), (0.035, 0.025, 12.34), (0.06, 0.0, 3.3)])
+    def test_matches_legacy_formula(self, alpha, b_ext, t):
+        engine = AnalyticWaveEngine(use_numexpr=False)
+        np.testing.assert_allclose(engine.evaluate(alpha, b_ext, t), legacy_wave_state(alpha, b_ext, t), atol=1e-12)
+
+    def test_large_epoch_time(self):
+        # time.time() 크기의 t에서도 기존 구현과 (부동소수점 정밀도 내에서) 일치
+        engine = AnalyticWaveEngine(use_numexpr=False)
+        t = 1768371812.923
+        np.testing.assert_allclose(engine.evaluate(0.03, 0.04, t), legacy_wave_state(0.03, 0.04, t), atol=1e-6)
+
+    def test_reuses_buffers_and_envelope(self):
+        engine = AnalyticWaveEngine(use_numexpr=False)
+        first = engine.evaluate(0.03, 0.04, 1.0)
+        second = engine.evaluate(0.03, 0.04, 2.0)
+        # out 없이 호출하면 호출마다 별도 결과 (다음 호출이 이전 결과를 덮어쓰지 않음)
+        assert first is not second
+        np.testing.assert_allclose(first, legacy_wave_state(0.03, 0.04, 1.0), atol=1e-12)
+        assert engine._envelope_key == (0.03, 0.04)
+
+        out = np.empty((128, 128))
+        result = engine.evaluate(0.05, 0.02, 1.0, out=out)
+        assert result is out
+        np.testing.assert_allclose(out, legacy_wave_state(0.05, 0.02, 1.0), atol=1e-12)
+
+    @pytest.mark.skipif(not NUMEXPR_AVAILABLE, reason="numexpr not installed")
+    def test_numexpr_path(self):
+        engine = AnalyticWaveEngine(use_numexpr=True)
+        np.testing.assert_allclose(engine.evaluate(0.02, 0.03, 4.5), legacy_wave_state(0.02, 0.03, 4.5), atol=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
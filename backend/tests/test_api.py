@@ -28,6 +28,22 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
         assert data["controller"] == "ready"
 
+    def test_ready_after_warm_up(self):
+        """Test /ready turns 200 once the lifespan warm-up has built every component."""
+        import time
+
+        with TestClient(app) as client:
+            deadline = time.time() + 120
+            response = client.get("/ready")
+            while response.status_code == 503 and time.time() < deadline:
+                time.sleep(0.2)
+                response = client.get("/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["components"]["controller"]["ready"] is True
+
 
 class TestConsentEndpoints:
     """Test consent management endpoints."""
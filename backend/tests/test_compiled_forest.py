@@ -0,0 +1,129 @@
+"""
+CompiledForest(배열 기반 랜덤 포레스트 평가기) 테스트
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiled_forest import CompiledForest, load_arrays, save_arrays
+
+
+def make_data(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4)) * [1000, 3, 0.2, 1]
+    Y = np.column_stack([np.tanh(X[:, 0] / 1000), X[:, 1] > 0, X[:, 2] * X[:, 3], X.sum(axis=1)])
+    return X, Y
+
+
+@pytest.fixture(scope="module")
+def forest():
+    X, Y = make_data()
+    return RandomForestRegressor(n_estimators=30, max_depth=8, random_state=0).fit(X, Y)
+
+
+class TestCompiledForest:
+    """sklearn 예측과의 일치 및 직렬화 테스트"""
+
+    def test_matches_sklearn_batch(self, forest):
+        X, _ = make_data(300, seed=1)
+        compiled = CompiledForest.from_sklearn(forest)
+
+        np.testing.assert_allclose(compiled.predict(X), forest.predict(X), rtol=0, atol=1e-9)
+
+    def test_matches_sklearn_single_row(self, forest):
+        X, _ = make_data(20, seed=2)
+        compiled = CompiledForest.from_sklearn(forest)
+
+        for x in X:
+            np.testing.assert_allclose(compiled.predict(x), forest.predict(x[np.newaxis]), atol=1e-9)
+
+    def test_single_output_unbounded_depth(self):
+        X, Y = make_data(200, seed=3)
+        model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, Y[:, 0])
+        compiled = CompiledForest.from_sklearn(model)
+        X_test, _ = make_data(100, seed=4)
+
+        assert compiled.predict(X_test).shape == (100,)
+        np.testing.assert_allclose(compiled.predict(X_test), model.predict(X_test), atol=1e-9)
+
+    def test_float32_boundary_semantics(self, forest):
+        # 임계값 바로 위/아래 값도 sklearn과 같은 방향으로 분기 (float32 변환 후 비교)
+        compiled = CompiledForest.from_sklearn(forest)
+        root = forest.estimators_[0].tree_
+        X = np.tile(make_data(1, seed=5)[0], (3, 1))
+        feature, threshold = root.feature[0], root.threshold[0]
+        X[:, feature] = [np.nextafter(threshold, -np.inf), threshold, np.nextafter(threshold, np.inf)]
+
+        np.testing.assert_allclose(compiled.predict(X), forest.predict(X), atol=1e-9)
+
+    def test_save_and_mmap_load(self, forest, tmp_path):
+        compiled = CompiledForest.from_sklearn(forest)
+        path = str(tmp_path / "forest.bin")
+        compiled.save(path, extras={"scaler_mean": np.arange(4.0)})
+
+        loaded, extras = CompiledForest.load(path, mmap=True)
+        X, _ = make_data(50, seed=6)
+
+        assert isinstance(loaded.value.base, np.memmap) or isinstance(loaded.value, np.memmap)
+        assert not loaded.threshold.flags.writeable
+        np.testing.assert_array_equal(extras["scaler_mean"], np.arange(4.0))
+        np.testing.assert_array_equal(loaded.predict(X), compiled.predict(X))
+
+    def test_load_without_mmap(self, tmp_path):
+        arrays = {"a": np.arange(5, dtype=np.int32), "b": np.ones((2, 3))}
+        save_arrays(str(tmp_path / "x.bin"), arrays, {"k": 1})
+
+        loaded, meta = load_arrays(str(tmp_path / "x.bin"), mmap=False)
+
+        assert meta == {"k": 1}
+        np.testing.assert_array_equal(loaded["a"], arrays["a"])
+        np.testing.assert_array_equal(loaded["b"], arrays["b"])
+
+    def test_rejects_bad_files(self, tmp_path):
+        bad = tmp_path / "bad.bin"
+        bad.write_bytes(b"not a forest")
+        with pytest.raises(ValueError):
+            load_arrays(str(bad))
+
+        save_arrays(str(tmp_path / "ok.bin"), {"a": np.ones(100)})
+        data = (tmp_path / "ok.bin").read_bytes()
+        (tmp_path / "cut.bin").write_bytes(data[:-100])
+        with pytest.raises(ValueError):
+            load_arrays(str(tmp_path / "cut.bin"))
+
+
+class TestPersonalityModelCompiled:
+    """MLPersonalityModel의 compiled 추론 경로 테스트"""
+
+    def test_compiled_path_matches_sklearn(self):
+        from ml_personality_model import MLPersonalityModel
+
+        model = MLPersonalityModel(use_pretrained=False)
+        X, _ = make_data(100, seed=7)
+        X = np.abs(X) + [500, 0, 0.3, 0.5]
+
+        assert model.compiled is not None
+        np.testing.assert_allclose(
+            model._predict_raw(X), model.model.predict(model.scaler.transform(X)), atol=1e-9
+        )
+
+    def test_loads_compiled_artifact_without_pickles(self, tmp_path):
+        from ml_personality_model import COMPILED_FILENAME, MODEL_FILENAME, MLPersonalityModel
+
+        trained = MLPersonalityModel(use_pretrained=False)
+        trained.save_models(str(tmp_path))
+        os.remove(tmp_path / "scaler.pkl")
+        os.remove(tmp_path / MODEL_FILENAME)
+
+        loaded = MLPersonalityModel(use_pretrained=False)
+        loaded.model_path = str(tmp_path)
+        assert loaded._load_pretrained_models()
+        assert (tmp_path / COMPILED_FILENAME).exists()
+
+        X = np.array([[2500, 2, 0.8, 1.5], [900, 7, 0.4, 3.0]])
+        np.testing.assert_allclose(loaded.predict_batch(X), trained.predict_batch(X), atol=1e-9)
@@ -0,0 +1,109 @@
+"""
+문화권 보정 테이블(cultural_table.py)과 상태 없는 decode 테스트
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cultural_table import TRAIT_ORDER, CulturalTable, get_cultural_table
+
+
+@pytest.fixture(scope="module")
+def decoder():
+    from neuro_controller import BehavioralPersonalityDecoder
+
+    return BehavioralPersonalityDecoder(use_ml=False)
+
+
+def profile_for(culture, latency=3500, revisions=4, efficiency=0.9):
+    return {
+        "avgDecisionLatency": latency, "revisionRate": revisions,
+        "pathEfficiency": efficiency, "culturalContext": culture
+    }
+
+
+class TestCulturalTable:
+    """컴파일된 테이블 테스트"""
+
+    def test_compiles_modifiers_and_archetypes(self):
+        table = get_cultural_table()
+        east_asian = table.resolve("east_asian")
+
+        assert east_asian.offsets == (0.1, -0.05, 0.0, 0.15)
+        assert east_asian.archetypes[0] == "신중한 분석가 (Careful Analyst)"
+        assert table.offsets.shape == (len(table.names), len(TRAIT_ORDER))
+        with pytest.raises(ValueError):
+            table.offsets[0, 0] = 1.0
+        with pytest.raises(TypeError):
+            table.entries["new"] = east_asian
+
+    def test_unknown_culture_uses_fallback(self):
+        table = get_cultural_table()
+
+        assert table.resolve("atlantis").name == "default"
+        assert table.resolve(None, fallback="western").name == "western"
+        assert table.resolve("atlantis", fallback="also_unknown").name == "default"
+
+    def test_missing_default_is_added(self):
+        table = CulturalTable({"x": {"modifiers": {"revision_interpretation": {"complexity_weight_boost": 0.2}}}})
+        default = table.resolve("default")
+
+        assert default.offsets == (0.0, 0.0, 0.0, 0.0)
+        assert set(default.archetypes) == {"Balanced & Steady"}
+
+    def test_batch_matches_scalar(self):
+        table = get_cultural_table()
+        rng = np.random.default_rng(0)
+        W = rng.uniform(0, 1, size=(200, 4))
+        indices = rng.integers(0, len(table.names), size=200)
+
+        adjusted, archetypes = table.apply_batch(W, indices)
+
+        for row, index, adj, name in zip(W, indices, adjusted, archetypes):
+            entry = table.resolve(table.names[index])
+            expected = table.apply(dict(zip(TRAIT_ORDER, row)), entry)
+            np.testing.assert_allclose(adj, [expected[t] for t in TRAIT_ORDER])
+            assert name == table.archetype(expected, entry)
+
+
+class TestStatelessDecode:
+    """decode가 디코더 상태를 바꾸지 않는지 테스트"""
+
+    def test_request_culture_does_not_leak(self, decoder):
+        result = decoder.decode(profile_for("east_asian"))
+        following = decoder.decode(profile_for(None))
+
+        assert decoder.cultural_context == "default"
+        assert result["cultural_context"] == "east_asian"
+        assert result["traits"]["cultural_adjustment_applied"]
+        assert following["cultural_context"] == "default"
+        assert not following["traits"]["cultural_adjustment_applied"]
+
+    def test_modifiers_applied(self, decoder):
+        base = decoder.decode(profile_for("default"))["traits"]["base_weights"]
+        result = decoder.decode(profile_for("east_asian"))
+
+        assert result["traits"]["base_weights"] == base
+        assert result["traits"]["cultural_archetype"] == "신중한 분석가 (Careful Analyst)"
+        assert decoder.decode(profile_for("atlantis"))["cultural_context"] == "default"
+
+    def test_explicit_culture_argument(self, decoder):
+        by_name = decoder.decode(profile_for(None), culture="western")
+        by_entry = decoder.decode(profile_for(None), culture=decoder.cultural_table.resolve("western"))
+
+        assert by_name == by_entry and by_name["cultural_context"] == "western"
+
+    def test_concurrent_requests_match_sequential(self, decoder):
+        cultures = ["east_asian", "western", "latin_american", "middle_eastern", "default", None] * 50
+        profiles = [profile_for(c, latency=800 + 37 * i) for i, c in enumerate(cultures)]
+        expected = [decoder.decode(p) for p in profiles]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(decoder.decode, profiles))
+
+        assert results == expected
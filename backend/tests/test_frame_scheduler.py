@@ -0,0 +1,150 @@
+"""
+프레임 스케줄러 테스트
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_scheduler import FrameScheduler, InputCoalescer, JitterStats
+
+
+class FakeClock:
+    """가짜 monotonic 시계 (sleep 호출 시 시간이 흐름)"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestFrameScheduler:
+    """FrameScheduler 테스트"""
+
+    def test_tick_compensates_for_work_time(self):
+        clock = FakeClock()
+        scheduler = FrameScheduler(target_fps=10, clock=clock, sleep=clock.sleep)
+
+        async def run():
+            await scheduler.tick()
+            start = clock.now
+            for _ in range(5):
+                clock.now += 0.03  # 프레임 작업 시간
+                await scheduler.tick()
+            return clock.now - start
+
+        elapsed = asyncio.run(run())
+        # 작업 시간과 무관하게 5 프레임 = 0.5초 (드리프트 없음)
+        assert elapsed == pytest.approx(0.5)
+        assert all(s == pytest.approx(0.07) for s in clock.sleeps[1:])
+        assert scheduler.frames_skipped == 0
+
+    def test_tick_skips_missed_deadlines(self):
+        clock = FakeClock()
+        scheduler = FrameScheduler(target_fps=10, clock=clock, sleep=clock.sleep)
+
+        async def run():
+            await scheduler.tick()
+            clock.now += 0.35  # 3.5 프레임 분량의 지연
+            return await scheduler.tick()
+
+        skipped = asyncio.run(run())
+        assert skipped == 2
+        assert scheduler.frames_skipped == 2
+        assert scheduler.jitter.max == pytest.approx(0.05)
+
+    def test_late_tick_still_yields_to_event_loop(self):
+        clock = FakeClock()
+        scheduler = FrameScheduler(target_fps=10, clock=clock, sleep=clock.sleep)
+
+        async def run():
+            await scheduler.tick()
+            for _ in range(3):
+                clock.now += 0.15  # 매 프레임 주기를 넘기는 프로듀서
+                await scheduler.tick()
+
+        asyncio.run(run())
+        assert clock.sleeps[1:] == [0, 0, 0]
+
+    def test_throttle_does_not_delay_idle_input(self):
+        clock = FakeClock()
+        scheduler = FrameScheduler(target_fps=30, clock=clock, sleep=clock.sleep)
+
+        async def run():
+            await scheduler.throttle()
+            clock.now += 1.0  # 클라이언트 입력 사이의 유휴 시간
+            await scheduler.throttle()
+            await scheduler.throttle()  # 즉시 이어진 입력은 한 주기 대기
+
+        asyncio.run(run())
+        assert clock.sleeps == [pytest.approx(1 / 30)]
+        assert scheduler.frames == 3
+
+    def test_default_fps_from_environment(self):
+        scheduler = FrameScheduler()
+        assert scheduler.period == pytest.approx(1.0 / scheduler.target_fps)
+
+
+class TestInputCoalescer:
+    """InputCoalescer 테스트"""
+
+    def test_keeps_latest_eeg_and_preserves_commands(self):
+        async def run():
+            inputs = InputCoalescer()
+            inputs.push({"theta": 0.1, "beta": 0.1})
+            inputs.push({"theta": 0.2, "beta": 0.2})
+            inputs.push({"action": "RUN"})
+            inputs.push({"theta": 0.3, "beta": 0.3})
+            inputs.push({"theta": 0.4, "beta": 0.4})
+            inputs.close()
+            items = []
+            while True:
+                item = await inputs.get()
+                if item is None:
+                    return inputs, items
+                items.append(item)
+
+        inputs, items = asyncio.run(run())
+        assert items == [{"theta": 0.2, "beta": 0.2}, {"action": "RUN"}, {"theta": 0.4, "beta": 0.4}]
+        assert inputs.received == 5
+        assert inputs.coalesced == 2
+
+
+    def test_input_arriving_during_wait_replaces_pending(self):
+        async def run():
+            inputs = InputCoalescer()
+            inputs.push({"theta": 0.1, "beta": 0.1})
+            assert await inputs.wait()
+            # 프레임 간격 대기 중에 들어온 입력
+            inputs.push({"theta": 0.9, "beta": 0.9})
+            item = await inputs.get()
+            inputs.close()
+            return item, await inputs.wait()
+
+        item, more = asyncio.run(run())
+        assert item == {"theta": 0.9, "beta": 0.9}
+        assert more is False
+
+
+class TestJitterStats:
+    def test_mean_and_max(self):
+        stats = JitterStats()
+        for value in (0.001, 0.002, 0.003):
+            stats.observe(value)
+        summary = stats.as_dict()
+        assert summary["samples"] == 3
+        assert summary["mean_ms"] == pytest.approx(2.0)
+        assert summary["max_ms"] == pytest.approx(3.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
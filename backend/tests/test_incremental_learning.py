@@ -0,0 +1,278 @@
+"""
+성격 모델 점진 학습 파이프라인(incremental_learning.py) 테스트
+"""
+import os
+import sys
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental_learning import (
+    CURRENT_FILENAME, IncrementalTrainer, ReplayBuffer, labeled_sessions
+)
+from ml_personality_model import TRAITS, MLPersonalityModel
+
+
+class ImmediateExecutor:
+    """submit 즉시 현재 스레드에서 실행 (결정적 테스트용)"""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def record_sessions(manager, user_id, n, seed=0, consent=True):
+    """세션과 직후 프로필을 저장 (Fluidity 타겟은 합성 규칙과 반대: 1 - efficiency)"""
+    if consent is not None:
+        manager.save_consent(user_id, {"continuousLearning": consent})
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n):
+        latency, revisions = rng.uniform(500, 6000), int(rng.integers(0, 10))
+        efficiency, intensity = rng.uniform(0.3, 1.0), rng.uniform(0.5, 5.0)
+        logic = float(np.clip((latency - 1000) / 4000, 0, 1))
+        weights = {"Logic": logic, "Intuition": 1 - logic, "Fluidity": 1 - efficiency,
+                   "Complexity": min(revisions * 0.2 + latency / 10000, 1.0)}
+        manager.save_session(user_id, {
+            "avgDecisionLatency": latency, "revisionRate": revisions,
+            "pathEfficiency": efficiency, "intensity": intensity
+        })
+        # 저장되는 프로필 가중치는 성숙도 보정(레벨 1) 후 값, 타겟은 보정 전 기본 가중치
+        calibrated = {t: 0.5 + (w - 0.5) * 0.3 for t, w in weights.items()}
+        manager.save_profile_evolution(user_id, calibrated, "Balanced", 0.5, rule_weights=weights)
+        rows.append(([latency, revisions, efficiency, intensity], [weights[t] for t in TRAITS]))
+    return rows
+
+
+class TestReplayBuffer:
+    """세션 조회와 링 버퍼 테스트"""
+
+    def test_labeled_sessions_follow_consent_and_session_order(self, manager):
+        rows = record_sessions(manager, "alice", 3)
+        record_sessions(manager, "bob", 2, consent=None)
+        record_sessions(manager, "carol", 2, consent=False)
+
+        ids, X, Y = labeled_sessions()
+
+        assert len(ids) == 3 and list(ids) == sorted(ids)
+        np.testing.assert_allclose(X, [x for x, _ in rows])
+        np.testing.assert_allclose(Y, [y for _, y in rows])
+        assert len(labeled_sessions(after_id=int(ids[1]))[0]) == 1
+
+    def test_sessions_without_rule_weights_are_skipped(self, manager):
+        manager.save_consent("alice", {"continuousLearning": True})
+        manager.save_session("alice", {"avgDecisionLatency": 2000})
+        manager.save_profile_evolution("alice", {t: 0.5 for t in TRAITS}, "Balanced", 0.5)
+
+        assert len(labeled_sessions()[0]) == 0
+
+    def test_duplicate_profile_rows_use_latest(self, manager):
+        record_sessions(manager, "alice", 2)
+        # 같은 세션 순번으로 한 번 더 저장된 프로필 (동시 쓰기)
+        manager.save_profile_evolution("alice", {t: 0.5 for t in TRAITS}, "Balanced", 0.5,
+                                       rule_weights={t: 0.9 for t in TRAITS})
+        record_sessions(manager, "bob", 1)
+
+        ids, X, Y = labeled_sessions()
+
+        assert len(ids) == 3
+        np.testing.assert_allclose(Y[1], 0.9)
+
+    def test_consent_withdrawal_excludes_user(self, manager):
+        record_sessions(manager, "alice", 2)
+        manager.save_consent("alice", {"continuousLearning": False})
+
+        assert len(labeled_sessions()[0]) == 0
+
+    def test_ring_keeps_newest_in_order(self):
+        buffer = ReplayBuffer(capacity=5)
+        buffer.extend(np.arange(1, 5), np.arange(16.0).reshape(4, 4), np.zeros((4, 4)))
+        buffer.extend(np.arange(5, 8), np.arange(16.0, 28.0).reshape(3, 4), np.ones((3, 4)))
+        X, Y = buffer.snapshot()
+
+        assert len(buffer) == 5 and buffer.added == 7 and buffer.last_id == 7
+        np.testing.assert_array_equal(X[:, 0], [8, 12, 16, 20, 24])
+        np.testing.assert_array_equal(Y[:, 0], [0, 0, 1, 1, 1])
+
+    def test_refresh_reads_only_new_sessions(self, manager):
+        buffer = ReplayBuffer(capacity=100)
+        record_sessions(manager, "alice", 4)
+        assert len(buffer.refresh()[0]) == 4
+        record_sessions(manager, "alice", 2, seed=1)
+
+        assert len(buffer.refresh()[0]) == 2 and len(buffer) == 6
+
+
+class TestVersionedState:
+    """트리와 스케일러를 함께 교체하는지 테스트"""
+
+    def test_refit_swaps_scaler_and_trees_together(self):
+        model = MLPersonalityModel(use_pretrained=False)
+        before = model._state
+        mean_before = before.scaler_mean.copy()
+        X = np.column_stack([np.full(50, 9000.0), np.arange(50) % 3, np.full(50, 0.5), np.ones(50)])
+
+        model.update_with_real_data(X, {t: np.full(50, 0.2) for t in TRAITS})
+
+        assert model.version == before.version + 1
+        np.testing.assert_array_equal(before.scaler_mean, mean_before)
+        np.testing.assert_allclose(model._state.scaler_mean, model.scaler.mean_)
+        np.testing.assert_allclose(
+            model._predict_raw(X[:5]), model.model.predict(model.scaler.transform(X[:5])), atol=1e-9
+        )
+
+    def test_load_version_replaces_state(self, tmp_path):
+        other = MLPersonalityModel(use_pretrained=False)
+        other.refit(np.array([[3000, 1, 0.9, 1.0]] * 20), np.array([[0.9, 0.1, 0.1, 0.9]] * 20), prior_samples=0)
+        other.save_models(str(tmp_path))
+        model = MLPersonalityModel(use_pretrained=False)
+        version = model.version
+
+        assert model.load_version(str(tmp_path))
+        assert model.version == version + 1 and model.model is None
+        X = np.array([[3000, 1, 0.9, 1.0]])
+        np.testing.assert_allclose(model.predict_batch(X), other.predict_batch(X))
+
+
+class TestIncrementalTrainer:
+    """재학습, 섀도 평가, 승격 테스트"""
+
+    def make_trainer(self, tmp_path, **kwargs):
+        model = MLPersonalityModel(use_pretrained=False)
+        options = dict(min_samples=40, refit_every=40, shadow_min_samples=10, executor=ImmediateExecutor())
+        options.update(kwargs)
+        return IncrementalTrainer(model, ReplayBuffer(200), directory=str(tmp_path / "incremental"), **options)
+
+    def test_better_candidate_is_promoted_and_shared(self, manager, tmp_path):
+        trainer = self.make_trainer(tmp_path)
+        version = trainer.model.version
+        record_sessions(manager, "alice", 60)
+
+        trainer.observe()
+        status = trainer.status()
+
+        assert status["promotions"] == 1 and trainer.model.version == version + 1
+        assert status["history"][0]["candidate_mae"] < status["history"][0]["production_mae"]
+        with open(os.path.join(trainer.directory, CURRENT_FILENAME)) as f:
+            assert f.read() == trainer.current
+
+        # 다른 워커는 CURRENT 포인터로 같은 모델을 로드
+        other = IncrementalTrainer(MLPersonalityModel(use_pretrained=False), directory=trainer.directory)
+        X = np.array([[2500, 2, 0.8, 1.5]])
+        assert other.current == trainer.current
+        np.testing.assert_allclose(other.model.predict_batch(X), trainer.model.predict_batch(X))
+
+    def test_waits_for_enough_sessions(self, manager, tmp_path):
+        trainer = self.make_trainer(tmp_path)
+        record_sessions(manager, "alice", 30)
+        trainer.observe()
+
+        assert trainer.refits == 0 and trainer.status()["buffer"]["size"] == 30
+
+    def test_shadow_waits_for_live_sessions(self, manager, tmp_path):
+        trainer = self.make_trainer(tmp_path, shadow_min_samples=20)
+        record_sessions(manager, "alice", 50)
+        trainer.observe()
+
+        # holdout(10개)만으로는 부족 -> 이후 세션으로 계속 평가
+        assert trainer.status()["shadow"]["samples"] == 10 and trainer.promotions == 0
+        record_sessions(manager, "alice", 10, seed=5)
+        trainer.observe()
+
+        assert trainer.shadow is None and trainer.promotions == 1
+
+    def test_worse_candidate_is_rejected(self, manager, tmp_path):
+        trainer = self.make_trainer(tmp_path)
+        record_sessions(manager, "alice", 60)
+        # 현재 모델의 예측을 그대로 타겟으로 쓰면 후보가 더 나을 수 없음
+        trainer.buffer.refresh()
+        n = len(trainer.buffer)
+        trainer.buffer.Y[:n] = trainer.model.predict_batch(trainer.buffer.X[:n])
+
+        with trainer._lock:
+            trainer._maybe_refit()
+
+        assert trainer.rejections == 1 and trainer.current is None
+        assert not any(name.startswith("v") for name in os.listdir(trainer.directory))
+
+    def test_refit_runs_in_separate_process(self, manager, tmp_path):
+        trainer = self.make_trainer(tmp_path, executor=None)
+        record_sessions(manager, "alice", 60)
+        try:
+            trainer.observe()
+            deadline = time.time() + 300
+            while trainer._future is not None and time.time() < deadline:
+                time.sleep(0.1)
+        finally:
+            trainer.close()
+
+        assert trainer.failures == 0 and trainer.promotions == 1
+
+
+class TestApiIngestion:
+    """/api/session으로 들어온 세션으로 학습하는 경로 테스트"""
+
+    def test_candidate_trained_on_api_sessions_can_win(self, manager, tmp_path, monkeypatch):
+        from fastapi.testclient import TestClient
+        import api_server
+
+        # 앱의 트레이너 대신 이 테스트의 트레이너로 관찰
+        monkeypatch.setattr(api_server, "_observe_session", lambda background_tasks, user_id: None)
+        monkeypatch.setattr(api_server.limiter, "enabled", False)
+        client = TestClient(api_server.app)
+        client.post("/api/user/api_learner/consent", json={
+            "consent_record": {"continuousLearning": True}, "timestamp": "2026-10-19T00:00:00Z"
+        })
+        rng = np.random.default_rng(3)
+        for _ in range(60):
+            # 합성 사전 데이터(500~6000ms)보다 느린 사용자
+            response = client.post("/api/session", json={"user_id": "api_learner", "behavioral_profile": {
+                "avgDecisionLatency": float(rng.uniform(6000, 12000)), "revisionRate": int(rng.integers(0, 4)),
+                "pathEfficiency": float(rng.uniform(0.3, 1.0)), "intensity": float(rng.uniform(0.5, 5.0))
+            }})
+            assert response.status_code == 200
+
+        trainer = IncrementalTrainer(
+            MLPersonalityModel(use_pretrained=False), ReplayBuffer(200), directory=str(tmp_path / "incremental"),
+            min_samples=40, refit_every=40, shadow_min_samples=10, executor=ImmediateExecutor()
+        )
+        trainer.observe()
+        decision = trainer.status()["history"][0]
+
+        # 타겟이 서비스 중인 모델의 출력이 아니므로 현재 모델의 오차가 반올림 오차 수준이 아님
+        assert decision["production_mae"] > 0.01
+        assert decision["promoted"] and decision["candidate_mae"] < decision["production_mae"]
+
+    def test_session_builds_trainer_when_warm_up_is_off(self, monkeypatch):
+        import asyncio
+        from fastapi import BackgroundTasks
+        import api_server
+        from startup import Component
+
+        class Trainer:
+            observed = 0
+
+            def observe(self):
+                self.observed += 1
+
+        trainer = Trainer()
+        # 아직 생성되지 않은 트레이너 (워밍업 없이 /api/learning/model도 호출되지 않은 상태)
+        component = Component("incremental_trainer", lambda: trainer, required=False)
+        monkeypatch.setitem(api_server.components._components, "incremental_trainer", component)
+        monkeypatch.setattr(api_server, "_refresh_insights", lambda user_id: None)
+
+        tasks = BackgroundTasks()
+        api_server._observe_session(tasks, "api_learner")
+        asyncio.run(tasks())
+
+        assert component.ready and trainer.observed == 1
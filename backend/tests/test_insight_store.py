@@ -0,0 +1,220 @@
+"""
+인사이트 구체화 저장소(insight_store.py)와 조건부 GET 테스트
+"""
+import json
+import os
+import sys
+import time
+from email.utils import formatdate
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_profiles
+from insight_store import InsightEntry, InsightStore, compute_evolution, compute_insights
+from neuro_controller import ContinuousLearner
+from predictive_model import PredictiveModel
+
+
+@pytest.fixture
+def store(manager):
+    store = InsightStore(manager, PredictiveModel(), ContinuousLearner(learning_rate=0.3), refresh_interval=0)
+    yield store
+    store.close()
+
+
+def record(manager, user_id, n, start=0):
+    for i in range(start, start + n):
+        manager.save_session(user_id, {"summary": {
+            "avgDecisionLatency": 1000 + 300 * i, "revisionRate": i % 4, "pathEfficiency": 0.9 - 0.02 * i
+        }})
+        logic = 0.3 + 0.04 * i
+        manager.save_profile_evolution(
+            user_id, {"Logic": logic, "Intuition": 1 - logic, "Fluidity": 0.5, "Complexity": 0.4 + 0.01 * i},
+            "Balanced", 0.5
+        )
+
+
+class TestInsightStore:
+    """저장 / 갱신 / 무효화 테스트"""
+
+    def test_stored_body_matches_computed_response(self, manager, store):
+        record(manager, "alice", 6)
+
+        insights = store.get("alice", "insights")
+        evolution = store.get("alice", "evolution")
+
+        assert json.loads(insights.body) == json.loads(json.dumps(compute_insights(manager, store.model, "alice")))
+        assert json.loads(evolution.body) == json.loads(json.dumps(
+            compute_evolution(manager, store.learner, store.model, "alice")
+        ))
+        assert store.get("alice", "evolution") == evolution
+        assert store.stats()["hits"] == 1 and store.stats()["misses"] == 2
+
+    def test_unchanged_body_keeps_etag_and_last_modified(self, manager, store):
+        record(manager, "alice", 3)
+        first = store.refresh_user("alice")["evolution"]
+        time.sleep(0.01)
+
+        assert store.refresh_user("alice")["evolution"] == first
+
+        record(manager, "alice", 1, start=3)
+        changed = store.refresh_user("alice")["evolution"]
+        assert changed.etag != first.etag and changed.updated_at > first.updated_at
+
+    def test_stale_refresh_picks_up_outside_writes(self, manager, store):
+        record(manager, "alice", 3)
+        record(manager, "bob", 2)
+        store.refresh_stale()
+        assert store.stale_users("insights") == [] and store.stale_users("evolution") == []
+
+        # 이 저장소를 거치지 않은 쓰기 (다른 워커, 백필)
+        record(manager, "bob", 1, start=2)
+        assert store.stale_users("evolution") == ["bob"]
+        before = store.get("bob", "evolution")
+
+        assert store.refresh_stale() == 2
+        assert json.loads(store.get("bob", "evolution").body)["data_points"] == 3
+        assert store.get("bob", "evolution").etag != before.etag
+
+    def test_older_computation_does_not_overwrite_newer(self, manager, store):
+        record(manager, "alice", 3)
+        store.refresh_user("alice")
+        conn = user_profiles.get_connection()
+        conn.execute("UPDATE user_insights SET source_id = source_id + 100")
+        conn.commit()
+        conn.close()
+
+        record(manager, "alice", 1, start=3)
+        entry = store.refresh_user("alice")["evolution"]
+
+        assert json.loads(entry.body)["data_points"] == 3
+
+    def test_refresh_after_rederive_swap(self, manager, store):
+        from neuro_controller import BehavioralPersonalityDecoder
+        from rederive_profiles import rederive
+
+        record(manager, "alice", 6)
+        record(manager, "bob", 4)
+        store.refresh_stale()
+        before = store.get("alice", "evolution")
+        conn = user_profiles.get_connection()
+        # 교체 전에 시작해 교체 후에 저장되는 계산
+        in_flight = store._compute_row(conn, "alice", "evolution")
+
+        # 백필은 profile_evolution을 통째로 교체 (id가 1부터 다시 시작)
+        rederive(conn, BehavioralPersonalityDecoder(use_ml=False), ContinuousLearner(learning_rate=0.3))
+        assert store.stale_users("evolution") == ["alice", "bob"]
+        assert store.refresh_stale() == 2
+        store._store(conn, [in_flight])
+        conn.close()
+
+        after = store.get("alice", "evolution")
+        assert after.etag != before.etag
+        assert json.loads(after.body) == json.loads(json.dumps(
+            compute_evolution(manager, store.learner, store.model, "alice")
+        ))
+        assert store.stale_users("evolution") == []
+
+    def test_refresher_starts_on_first_read_in_each_process(self, manager):
+        store = InsightStore(manager, PredictiveModel(), ContinuousLearner(learning_rate=0.3), refresh_interval=60)
+        try:
+            # pre-fork 마스터에서 생성만 하면 스레드 없음
+            assert store._thread is None
+            store.get("nobody", "evolution")
+            assert store._thread.is_alive()
+
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                before = store._thread.is_alive()
+                store.get("nobody", "evolution")
+                os.write(write_fd, f"{before},{store._thread.is_alive()}".encode())
+                os._exit(0)
+            os.waitpid(pid, 0)
+            assert os.read(read_fd, 64) == b"False,True"
+        finally:
+            store.close()
+        assert not store._thread.is_alive()
+        store.get("nobody", "evolution")
+        assert not store._thread.is_alive()
+
+    def test_unknown_user_is_not_stored(self, manager, store):
+        entry = store.get("nobody", "evolution")
+
+        assert json.loads(entry.body) == {"status": "no_history", "user_id": "nobody"}
+        conn = user_profiles.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM user_insights").fetchone()[0] == 0
+        conn.close()
+
+    def test_deleted_user_is_removed(self, manager, store):
+        record(manager, "alice", 3)
+        record(manager, "bob", 3)
+        store.refresh_stale()
+
+        manager.delete_user_data("alice")
+        conn = user_profiles.get_connection()
+        conn.execute("DELETE FROM profile_evolution WHERE user_id = 'bob'")
+        conn.commit()
+        assert store.prune() == 1
+        rows = conn.execute("SELECT user_id, kind FROM user_insights").fetchall()
+        conn.close()
+
+        assert [tuple(row) for row in rows] == [("bob", "insights")]
+
+    def test_rebuild_matches_per_user_refresh(self, manager, store):
+        record(manager, "alice", 7)
+        record(manager, "bob", 2)
+        store.refresh_stale()
+        expected = {user: store.get(user, "evolution").etag for user in ("alice", "bob")}
+
+        conn = user_profiles.get_connection()
+        conn.execute("DELETE FROM user_insights")
+        conn.commit()
+        conn.close()
+
+        assert store.rebuild() == 4
+        assert {user: store.get(user, "evolution").etag for user in ("alice", "bob")} == expected
+
+
+class TestConditionalGet:
+    """If-None-Match / If-Modified-Since 판정 테스트"""
+
+    entry = InsightEntry(b"{}", '"abc"', 1_700_000_000.5)
+
+    def test_if_none_match(self):
+        assert self.entry.not_modified('"abc"', None)
+        assert self.entry.not_modified('"x", W/"abc"', None)
+        assert self.entry.not_modified("*", None)
+        assert not self.entry.not_modified('"x"', None)
+        # If-None-Match가 있으면 If-Modified-Since는 무시
+        assert not self.entry.not_modified('"x"', formatdate(1_800_000_000, usegmt=True))
+
+    def test_if_modified_since(self):
+        assert self.entry.not_modified(None, self.entry.last_modified)
+        assert not self.entry.not_modified(None, formatdate(1_600_000_000, usegmt=True))
+        assert not self.entry.not_modified(None, "not a date")
+        assert not self.entry.not_modified(None, None)
+
+    def test_endpoint_returns_304(self, manager):
+        from fastapi.testclient import TestClient
+        from api_server import app
+
+        record(manager, "insight_api_user", 5)
+        client = TestClient(app)
+        response = client.get("/api/evolution/insight_api_user")
+        etag = response.headers["etag"]
+
+        assert response.status_code == 200 and response.json()["data_points"] == 5
+        assert "last-modified" in response.headers
+        cached = client.get("/api/evolution/insight_api_user", headers={"If-None-Match": etag})
+        assert cached.status_code == 304 and cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        # 세션 저장 후 백그라운드 작업으로 다시 계산
+        client.post("/api/session", json={"user_id": "insight_api_user", "behavioral_profile": {
+            "avgDecisionLatency": 2000, "revisionRate": 1, "pathEfficiency": 0.8
+        }})
+        updated = client.get("/api/evolution/insight_api_user", headers={"If-None-Match": etag})
+        assert updated.status_code == 200 and updated.json()["data_points"] == 6
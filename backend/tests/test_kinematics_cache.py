@@ -0,0 +1,95 @@
+"""
+양자화 운동학 캐시 테스트
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kinematics_cache import KinematicsCache
+
+
+class TestKinematicsCache:
+    """KinematicsCache 단위 테스트"""
+
+    def test_quantized_buckets_share_entry(self):
+        cache = KinematicsCache(quantum=0.05)
+        calls = []
+
+        def compute(theta, beta):
+            calls.append((theta, beta))
+            return np.array([theta, beta])
+
+        cache.get_or_compute(0.41, 0.52, compute)
+        cache.get_or_compute(0.39, 0.51, compute)
+
+        assert calls == [(0.4, 0.5)]
+        assert cache.hits == 1 and cache.misses == 1
+        assert cache.hit_rate == pytest.approx(0.5)
+
+    def test_bucket_clamps_to_unit_range(self):
+        cache = KinematicsCache(quantum=0.1)
+        assert cache.bucket(-0.3, 1.7) == (0.0, 1.0)
+
+    def test_lru_eviction(self):
+        cache = KinematicsCache(quantum=0.1, max_entries=2)
+        compute = lambda theta, beta: np.array([theta])
+
+        cache.get_or_compute(0.1, 0.1, compute)
+        cache.get_or_compute(0.2, 0.2, compute)
+        cache.get_or_compute(0.1, 0.1, compute)  # 0.1을 최근 사용으로 갱신
+        cache.get_or_compute(0.3, 0.3, compute)  # 0.2 제거
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        cache.get_or_compute(0.1, 0.1, compute)
+        assert cache.hits == 2
+
+    def test_version_change_invalidates(self):
+        cache = KinematicsCache(quantum=0.1)
+        cache.get_or_compute(0.5, 0.5, lambda t, b: np.array([1.0]), version=0)
+        value = cache.get_or_compute(0.5, 0.5, lambda t, b: np.array([2.0]), version=1)
+        assert value[0] == 2.0
+        assert cache.misses == 2
+
+
+@pytest.fixture(scope="module")
+def controller():
+    from neuro_controller import MagnonicController
+    controller = MagnonicController()
+    controller.kinematics_cache = KinematicsCache(quantum=0)
+    return controller
+
+
+class TestControllerIntegration:
+    """MagnonicController Pre-computed 경로와의 일치성"""
+
+    def test_matches_direct_readout(self, controller):
+        theta, beta, t = 0.37, 0.81, 1234.5678
+        expected = controller.readout.predict(controller.sim_db.get_magnetic_state(theta, beta, t))
+        actual = controller._precomputed_kinematics(theta, beta, t)
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+
+    def test_action_patterns_hit_cache(self, controller):
+        for _ in range(10):
+            for action in ("STAND", "WALK", "RUN"):
+                controller.simulate_action_pattern(action)
+        assert controller.kinematics_cache.get_stats()["entries"] <= 4
+        assert controller.kinematics_cache.hit_rate > 0.8
+
+    def test_hebbian_update_invalidates(self, controller):
+        theta, beta = 0.4, 0.5
+        before = controller._precomputed_kinematics(theta, beta, 0.0)
+        state = controller.sim_db.get_magnetic_state(theta, beta, 0.0)
+        controller.readout.update_hebbian(state, before, before + 1.0, learning_rate=1e-4)
+        after = controller._precomputed_kinematics(theta, beta, 0.0)
+        expected = controller.readout.predict(state)
+        np.testing.assert_allclose(after, expected, rtol=1e-9, atol=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,168 @@
+"""
+MLPersonalityModel 배치 추론 및 PredictionBatcher 테스트
+"""
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_personality_model import TRAITS, MLPersonalityModel
+from prediction_batcher import PredictionBatcher
+
+
+@pytest.fixture(scope="module")
+def model():
+    return MLPersonalityModel(use_pretrained=False)
+
+
+def sample_features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(500, 6000, n), rng.integers(0, 10, n),
+        rng.uniform(0.3, 1.0, n), rng.uniform(0.5, 5.0, n)
+    ])
+
+
+class TestPredictBatch:
+    """다중 출력 모델 배치 예측 테스트"""
+
+    def test_batch_matches_single_predictions(self, model):
+        X = sample_features(8)
+        batch = model.predict_batch(X)
+
+        assert batch.shape == (8, len(TRAITS))
+        for x, row in zip(X, batch):
+            single = model.predict(dict(zip(("latency", "revisions", "efficiency", "intensity"), x)))
+            assert [single[t] for t in TRAITS] == pytest.approx(row.tolist())
+
+    def test_constraints_applied(self, model):
+        batch = model.predict_batch(sample_features(50, seed=1))
+
+        assert np.all((batch >= 0) & (batch <= 1))
+        np.testing.assert_allclose(batch[:, 0] + batch[:, 1], 1.0)
+
+    def test_inference_is_single_threaded(self, model):
+        assert model.model.n_jobs == 1
+
+    def test_predict_returns_python_floats(self, model):
+        weights = model.predict({"latency": 3000, "revisions": 2, "efficiency": 0.7})
+        assert all(type(v) is float for v in weights.values())
+
+    def test_save_and_reload(self, model, tmp_path):
+        model.save_models(str(tmp_path))
+        reloaded = MLPersonalityModel(use_pretrained=False)
+        reloaded.model_path = str(tmp_path)
+
+        assert reloaded._load_pretrained_models()
+        X = sample_features(5, seed=2)
+        np.testing.assert_allclose(reloaded.predict_batch(X), model.predict_batch(X))
+        assert reloaded.fingerprint == model.fingerprint and reloaded.version != 0
+
+
+class TestPredictionBatcher:
+    """마이크로배칭 테스트"""
+
+    def test_concurrent_requests_share_one_batch(self):
+        calls = []
+
+        def predict_fn(X):
+            calls.append(X.shape[0])
+            return X * 2
+
+        batcher = PredictionBatcher(predict_fn, max_batch=64, max_delay=0.01)
+
+        async def run():
+            return await asyncio.gather(*(batcher.predict(np.array([i, i + 1.0])) for i in range(5)))
+
+        results = asyncio.run(run())
+
+        assert calls == [5]
+        for i, result in enumerate(results):
+            np.testing.assert_array_equal(result, [2 * i, 2 * i + 2])
+
+    def test_full_batch_dispatches_without_waiting(self):
+        calls = []
+
+        def predict_fn(X):
+            calls.append(X.shape[0])
+            return X
+
+        batcher = PredictionBatcher(predict_fn, max_batch=3, max_delay=10.0)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.predict(np.array([float(i)])) for i in range(6))), timeout=2.0
+            )
+
+        asyncio.run(run())
+        assert calls == [3, 3]
+
+    def test_errors_propagate_to_every_request(self):
+        def predict_fn(X):
+            raise RuntimeError("boom")
+
+        batcher = PredictionBatcher(predict_fn, max_delay=0.001)
+
+        async def run():
+            return await asyncio.gather(
+                *(batcher.predict(np.zeros(2)) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestSyntheticPretraining:
+    """합성 사전 학습 데이터와 아티팩트 캐시 테스트"""
+
+    def test_synthetic_data_follows_rules(self):
+        X, y = MLPersonalityModel.synthetic_training_data(500, seed=1)
+        latency, revisions, efficiency = X[:, 0], X[:, 1], X[:, 2]
+
+        assert X.shape == (500, 4) and y.shape == (500, 4)
+        np.testing.assert_allclose(y[:, 0], np.clip((latency - 1000) / 4000, 0, 1))
+        np.testing.assert_allclose(y[:, 0] + y[:, 1], 1.0)
+        np.testing.assert_allclose(y[:, 2], efficiency)
+        np.testing.assert_allclose(y[:, 3], np.minimum(revisions * 0.2 + latency / 10000, 1.0))
+        np.testing.assert_array_equal(X, MLPersonalityModel.synthetic_training_data(500, seed=1)[0])
+
+    def test_artifact_is_reused(self, tmp_path):
+        first = MLPersonalityModel(model_path=str(tmp_path))
+        directory = first.synthetic_artifact_dir()
+        second = MLPersonalityModel(model_path=str(tmp_path))
+
+        assert os.path.exists(os.path.join(directory, "config.json"))
+        # 두 번째 인스턴스는 학습하지 않고 compiled 아티팩트만 로드
+        assert first.model is not None and second.model is None
+        X = sample_features(10, seed=3)
+        np.testing.assert_allclose(second.predict_batch(X), first.predict_batch(X))
+        assert second.get_feature_importance()["Logic"]
+
+    def test_artifact_key_depends_on_config(self, tmp_path):
+        forest = MLPersonalityModel(model_path=str(tmp_path))
+        ridge = MLPersonalityModel(model_type="ridge", model_path=str(tmp_path))
+
+        assert forest.synthetic_artifact_dir() != ridge.synthetic_artifact_dir()
+
+    def test_concurrent_workers_train_once(self, tmp_path):
+        import subprocess
+
+        backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from ml_personality_model import MLPersonalityModel;"
+            "m = MLPersonalityModel(model_path=sys.argv[2]);"
+            "print('trained' if m.model is not None else 'loaded')"
+        )
+        workers = [
+            subprocess.Popen([sys.executable, "-c", code, backend, str(tmp_path)],
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            for _ in range(3)
+        ]
+        outcomes = sorted(w.communicate(timeout=300)[0].strip() for w in workers)
+
+        assert outcomes == ["loaded", "loaded", "trained"]
@@ -0,0 +1,202 @@
+"""
+MuMax3 비동기 작업 실행기 테스트
+실제 mumax3 대신 OVF 파일을 쓰는 가짜 솔버 스크립트를 사용
+"""
+import os
+import stat
+import sys
+import textwrap
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mumax3_integration import MuMax3Integration
+from mumax3_jobs import MuMax3JobRunner
+
+FAKE_SOLVER = textwrap.dedent('''\
+    #!{python}
+    """mumax3 대역: 스크립트의 save() 경로에 theta 값으로 채운 텍스트 OVF 작성"""
+    import os, re, sys, time
+    script = open(sys.argv[1]).read()
+    with open(os.environ["FAKE_MUMAX3_LOG"], "a") as log:
+        log.write(os.getcwd() + "\\n")
+    time.sleep(float(os.environ.get("FAKE_MUMAX3_DELAY", "0")))
+    theta = float(re.search(r"theta=([0-9.]+)", script).group(1))
+    nx, ny, nz = map(int, re.search(r"SetGridSize\\((\\d+), (\\d+), (\\d+)\\)", script).groups())
+    output = re.search(r'save\\(m, "([^"]+)"\\)', script).group(1)
+    with open(output, "w") as f:
+        f.write("# OOMMF OVF 2.0\\n# Segment count: 1\\n# Begin: Segment\\n# Begin: Header\\n")
+        f.write(f"# xnodes: {{nx}}\\n# ynodes: {{ny}}\\n# znodes: {{nz}}\\n# valuedim: 3\\n")
+        f.write("# End: Header\\n# Begin: Data Text\\n")
+        f.write(f"0 0 {{theta}}\\n" * (nx * ny * nz))
+        f.write("# End: Data Text\\n# End: Segment\\n")
+''')
+
+
+@pytest.fixture
+def fake_solver(tmp_path, monkeypatch):
+    solver = tmp_path / "fake_mumax3"
+    solver.write_text(FAKE_SOLVER.format(python=sys.executable))
+    solver.chmod(solver.stat().st_mode | stat.S_IEXEC)
+    log = tmp_path / "invocations.log"
+    log.touch()
+    monkeypatch.setenv("FAKE_MUMAX3_LOG", str(log))
+    return solver, log
+
+
+def make_runner(tmp_path, solver, **kwargs):
+    integration = MuMax3Integration(mumax3_path=str(solver), enable_realtime=True)
+    integration.temp_dir = tmp_path / "work"
+    integration.temp_dir.mkdir(exist_ok=True)
+    kwargs.setdefault("cache_dir", tmp_path / "cache")
+    return MuMax3JobRunner(integration, **kwargs)
+
+
+def invocations(log):
+    return log.read_text().splitlines()
+
+
+class TestMuMax3JobRunner:
+    """MuMax3JobRunner 테스트"""
+
+    def test_job_produces_state(self, tmp_path, fake_solver):
+        solver, log = fake_solver
+        runner = make_runner(tmp_path, solver)
+        try:
+            state = runner.submit(0.3, 0.5).result(timeout=30)
+        finally:
+            runner.shutdown()
+
+        assert state.shape == (128, 128)
+        assert np.allclose(state, 0.3)
+        assert runner.get_stats()["completed"] == 1
+
+    def test_identical_jobs_are_deduplicated(self, tmp_path, fake_solver, monkeypatch):
+        solver, log = fake_solver
+        monkeypatch.setenv("FAKE_MUMAX3_DELAY", "0.5")
+        runner = make_runner(tmp_path, solver)
+        try:
+            futures = [runner.submit(0.4, 0.6) for _ in range(5)]
+            # 양자화 간격 안의 근접 입력도 같은 작업을 공유
+            futures.append(runner.submit(0.4001, 0.6001))
+            results = [f.result(timeout=30) for f in futures]
+        finally:
+            runner.shutdown()
+
+        assert len({id(f) for f in futures}) == 1
+        assert len(invocations(log)) == 1
+        assert runner.deduplicated == 5
+        assert all(r is results[0] for r in results)
+
+    def test_concurrent_jobs_use_unique_directories(self, tmp_path, fake_solver, monkeypatch):
+        solver, log = fake_solver
+        monkeypatch.setenv("FAKE_MUMAX3_DELAY", "0.2")
+        runner = make_runner(tmp_path, solver, max_workers=3)
+        try:
+            futures = [runner.submit(theta, 0.5) for theta in (0.1, 0.2, 0.3)]
+            results = [f.result(timeout=30) for f in futures]
+        finally:
+            runner.shutdown()
+
+        dirs = invocations(log)
+        assert len(dirs) == 3 and len(set(dirs)) == 3
+        for theta, state in zip((0.1, 0.2, 0.3), results):
+            assert np.allclose(state, theta)
+        # 작업 디렉토리는 완료 후 정리됨
+        assert list((tmp_path / "work" / "jobs").iterdir()) == []
+
+    def test_get_state_is_non_blocking_and_upgrades(self, tmp_path, fake_solver, monkeypatch):
+        solver, log = fake_solver
+        monkeypatch.setenv("FAKE_MUMAX3_DELAY", "0.3")
+        runner = make_runner(tmp_path, solver)
+        try:
+            start = time.monotonic()
+            assert runner.get_state(0.7, 0.2) is None
+            assert time.monotonic() - start < 0.2
+            assert runner.is_pending(0.7, 0.2)
+
+            deadline = time.monotonic() + 30
+            state = None
+            while state is None and time.monotonic() < deadline:
+                time.sleep(0.05)
+                state = runner.get_state(0.7, 0.2)
+        finally:
+            runner.shutdown()
+
+        assert state is not None and np.allclose(state, 0.7)
+        assert len(invocations(log)) == 1
+
+    def test_disk_cache_is_content_addressed(self, tmp_path, fake_solver):
+        solver, log = fake_solver
+        runner = make_runner(tmp_path, solver)
+        try:
+            runner.submit(0.5, 0.5).result(timeout=30)
+        finally:
+            runner.shutdown()
+        digest = runner.job_digest(0.5, 0.5)
+        assert (tmp_path / "cache" / f"{digest}.npy").exists()
+
+        # 새 실행기(새 프로세스 가정)는 솔버를 다시 실행하지 않고 디스크 캐시 사용
+        fresh = make_runner(tmp_path, solver)
+        try:
+            state = fresh.get_state(0.5, 0.5)
+        finally:
+            fresh.shutdown()
+        assert state is not None and np.allclose(state, 0.5)
+        assert fresh.submitted == 0
+        assert len(invocations(log)) == 1
+
+    def test_failed_solver_returns_none(self, tmp_path):
+        solver = tmp_path / "broken_mumax3"
+        solver.write_text(f"#!{sys.executable}\nimport sys\nsys.exit(1)\n")
+        solver.chmod(solver.stat().st_mode | stat.S_IEXEC)
+        runner = make_runner(tmp_path, solver)
+        try:
+            assert runner.submit(0.2, 0.2).result(timeout=30) is None
+        finally:
+            runner.shutdown()
+
+        assert runner.failed == 1
+        assert not runner.is_pending(0.2, 0.2)
+        assert runner.get_cached(0.2, 0.2) is None
+
+    def test_failed_job_backs_off_before_resubmitting(self, tmp_path):
+        solver = tmp_path / "broken_mumax3"
+        solver.write_text(f"#!{sys.executable}\nimport sys\nsys.exit(1)\n")
+        solver.chmod(solver.stat().st_mode | stat.S_IEXEC)
+        now = [100.0]
+        runner = make_runner(tmp_path, solver, failure_backoff=5, max_failure_backoff=8, clock=lambda: now[0])
+        try:
+            assert runner.submit(0.2, 0.2).result(timeout=30) is None
+            # 백오프 동안은 프레임마다 조회해도 솔버를 다시 띄우지 않음
+            for _ in range(5):
+                assert runner.get_state(0.2, 0.2) is None
+            assert runner.submitted == 1 and runner.backoff_skips == 5
+            # 다른 버킷은 영향 없음
+            assert runner.submit(0.6, 0.6) is not None
+
+            now[0] += 5
+            assert runner.submit(0.2, 0.2).result(timeout=30) is None
+            # 연속 실패: 두 번째 백오프는 상한(8초)으로 제한된 2배
+            now[0] += 7.9
+            assert runner.submit(0.2, 0.2) is None
+            now[0] += 0.1
+            assert runner.submit(0.2, 0.2) is not None
+        finally:
+            runner.shutdown()
+        assert runner.failed == 4
+
+    def test_pending_limit_rejects_new_jobs(self, tmp_path, fake_solver, monkeypatch):
+        solver, log = fake_solver
+        monkeypatch.setenv("FAKE_MUMAX3_DELAY", "0.3")
+        runner = make_runner(tmp_path, solver, max_workers=1, max_pending=1)
+        try:
+            first = runner.submit(0.1, 0.1)
+            assert runner.submit(0.9, 0.9) is None
+            first.result(timeout=30)
+        finally:
+            runner.shutdown()
+        assert runner.rejected == 1
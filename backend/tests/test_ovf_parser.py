@@ -11,7 +11,7 @@ import os
 # 프로젝트 루트를 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from ovf_parser import OVFParser
+from ovf_parser import CONTROL_VALUES, OVFParser, OVFSeries, write_ovf
 
 
 class TestOVFParser:
@@ -60,5 +60,161 @@ class TestOVFParser:
             os.unlink(temp_path)
 
 
+class TestOVFFormats:
+    """OVF 1.0/2.0 텍스트/바이너리 왕복(round-trip) 테스트"""
+
+    def setup_method(self):
+        self.parser = OVFParser()
+        # 정사각형이 아닌 격자로 축 순서 검증
+        self.field = np.random.default_rng(0).uniform(-1, 1, (6, 4, 2, 3))
+
+    @pytest.mark.parametrize("version", [1, 2])
+    @pytest.mark.parametrize("data_format,atol", [
+        ("text", 1e-8), ("binary 4", 1e-6), ("binary 8", 0.0)
+    ])
+    def test_round_trip(self, tmp_path, version, data_format, atol):
+        path = tmp_path / "m.ovf"
+        write_ovf(str(path), self.field, data_format=data_format, version=version)
+
+        data = self.parser.parse_ovf(str(path))
+
+        assert data.shape == (6, 4, 2, 3)
+        np.testing.assert_allclose(data, self.field, atol=atol, rtol=0)
+
+    @pytest.mark.parametrize("version,byteorder", [(1, ">"), (2, "<")])
+    def test_binary_byte_order_and_x_fastest_layout(self, tmp_path, version, byteorder):
+        path = tmp_path / "m.ovf"
+        write_ovf(str(path), self.field, data_format="binary 4", version=version)
+        header = self.parser.read_header(str(path))
+
+        assert header["version"] == version
+        assert header["dtype"] == np.dtype(f"{byteorder}f4")
+        with open(path, "rb") as f:
+            f.seek(header["data_offset"])
+            first_nodes = np.frombuffer(f.read(2 * 3 * 4), dtype=header["dtype"]).reshape(2, 3)
+        # 파일에서 x가 가장 빠르게 변함: (x=0, y=0), (x=1, y=0)
+        np.testing.assert_allclose(first_nodes, self.field[:2, 0, 0], rtol=1e-6)
+
+    def test_binary_is_decoded_without_copy(self, tmp_path):
+        path = tmp_path / "m.ovf"
+        write_ovf(str(path), self.field, data_format="binary 8")
+
+        data = self.parser.parse_ovf(str(path))
+
+        assert data.base is not None
+        assert not data.flags.owndata
+
+    def test_memmap_mode(self, tmp_path):
+        path = tmp_path / "m.ovf"
+        write_ovf(str(path), self.field, data_format="binary 4")
+
+        data = self.parser.parse_ovf(str(path), mmap=True)
+
+        assert isinstance(data.base, np.memmap) or isinstance(data, np.memmap)
+        np.testing.assert_allclose(data, self.field, atol=1e-6)
+        assert not data.flags.writeable
+
+    def test_bad_control_value_is_rejected(self, tmp_path):
+        path = tmp_path / "m.ovf"
+        write_ovf(str(path), self.field, data_format="binary 4")
+        raw = path.read_bytes()
+        control = np.array([CONTROL_VALUES[4]], dtype="<f4").tobytes()
+        path.write_bytes(raw.replace(control, b"\x00\x00\x00\x00", 1))
+
+        assert self.parser.parse_ovf(str(path)) is None
+
+    def test_truncated_binary_is_rejected(self, tmp_path):
+        path = tmp_path / "m.ovf"
+        write_ovf(str(path), self.field, data_format="binary 4")
+        raw = path.read_bytes()
+        path.write_bytes(raw[:len(raw) // 2])
+
+        assert self.parser.parse_ovf(str(path)) is None
+
+    def test_scalar_field(self, tmp_path):
+        path = tmp_path / "energy.ovf"
+        scalar = self.field[..., :1]
+        write_ovf(str(path), scalar, data_format="binary 4", title="Edens")
+
+        data = self.parser.parse_ovf(str(path))
+
+        assert data.shape == (6, 4, 2, 1)
+        np.testing.assert_allclose(data, scalar, atol=1e-6)
+
+
+class TestOVFSeries:
+    """OVF 스냅샷 시계열 리더 테스트"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(1)
+        self.frames = rng.uniform(-1, 1, (5, 6, 4, 2, 3))
+
+    def write_series(self, directory, data_format="binary 4", version=2):
+        for i, frame in enumerate(self.frames):
+            write_ovf(str(directory / f"m{i:06d}.ovf"), frame,
+                      data_format=data_format, version=version, time=i * 1e-11)
+        return OVFSeries(directory)
+
+    def test_shape_and_times(self, tmp_path):
+        series = self.write_series(tmp_path)
+
+        assert series.shape == (5, 6, 4, 2, 3)
+        assert len(series) == 5
+        np.testing.assert_allclose(series.times, np.arange(5) * 1e-11)
+
+    @pytest.mark.parametrize("key", [
+        (slice(None),),
+        (slice(1, 4),),
+        (slice(None, None, 2), Ellipsis, 2),
+        (slice(None), slice(None), slice(None), 1),
+        (slice(2, 5), slice(1, 3), 0, 0, 2),
+        ([4, 0, 2],),
+        (Ellipsis, 0),
+        (-1, slice(None), 2),
+    ])
+    def test_slicing_matches_dense_array(self, tmp_path, key):
+        series = self.write_series(tmp_path, data_format="binary 8")
+
+        np.testing.assert_array_equal(series[key], self.frames[key])
+
+    def test_integer_time_index_is_memmap_view(self, tmp_path):
+        series = self.write_series(tmp_path)
+
+        frame = series[3]
+
+        assert not frame.flags.owndata and not frame.flags.writeable
+        np.testing.assert_allclose(frame, self.frames[3], atol=1e-6)
+
+    def test_big_endian_ovf1_series(self, tmp_path):
+        series = self.write_series(tmp_path, version=1)
+
+        assert series.dtype == np.dtype(np.float32)
+        np.testing.assert_allclose(series[:, :, :, 0, 2], self.frames[:, :, :, 0, 2], atol=1e-6)
+
+    def test_text_snapshots_fall_back_to_parsing(self, tmp_path):
+        series = self.write_series(tmp_path, data_format="text")
+
+        np.testing.assert_allclose(series[1:3], self.frames[1:3], atol=1e-8)
+
+    def test_iter_frames_streams_selection(self, tmp_path):
+        series = self.write_series(tmp_path)
+
+        frames = list(series.iter_frames(component=2, z=1, start=1, stop=4))
+
+        assert len(frames) == 3
+        np.testing.assert_allclose(frames[0], self.frames[1, :, :, 1, 2], atol=1e-6)
+
+    def test_mismatched_snapshot_shape_is_rejected(self, tmp_path):
+        self.write_series(tmp_path)
+        write_ovf(str(tmp_path / "m000005.ovf"), np.zeros((3, 3, 1, 3)))
+
+        with pytest.raises(ValueError):
+            OVFSeries(tmp_path)
+
+    def test_empty_directory_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            OVFSeries(tmp_path)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Pre-computed 패턴 뱅크 생성 도구 테스트
+mock_mumax3.py를 솔버로 사용
+"""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from mock_mumax3 import mock_magnetization
+from mumax3_integration import MuMax3Integration
+from precompute_farm import PrecomputeFarm, grid_steps, main
+from simulation_db import InterpolatedSimulationDB
+
+MOCK_SOLVER = str(BACKEND_DIR / "mock_mumax3.py")
+
+
+def make_farm(tmp_path, solver=MOCK_SOLVER, steps=(2, 2)):
+    integration = MuMax3Integration(mumax3_path=solver, enable_realtime=True)
+    return PrecomputeFarm(
+        integration,
+        tmp_path / "bank.npz",
+        grid_steps(steps[0]),
+        grid_steps(steps[1]),
+        workers=2,
+        timeout=60
+    )
+
+
+class TestPrecomputeFarm:
+    """PrecomputeFarm 테스트"""
+
+    def test_builds_bank_loadable_by_simulation_db(self, tmp_path):
+        farm = make_farm(tmp_path)
+        summary = farm.run()
+
+        assert summary["completed"] == 4 and summary["failed"] == 0
+        db = InterpolatedSimulationDB(bank_path=str(tmp_path / "bank.npz"))
+        assert db.theta_steps == [0.0, 1.0]
+        assert db.get_physics_metadata(0.5, 0.5)["source"] == "mumax3_bank_2x2"
+
+        # 격자점에서는 솔버 출력(z-성분)과 일치
+        expected = mock_magnetization(1.0, 0.0, 128, 128)[..., 2]
+        assert np.allclose(db.get_base_pattern(1.0, 0.0), expected, atol=1e-5)
+
+    def test_resume_skips_completed_points(self, tmp_path):
+        make_farm(tmp_path).run()
+
+        resumed = make_farm(tmp_path)
+        summary = resumed.run()
+        assert summary["skipped"] == 4 and summary["completed"] == 0
+        assert resumed.runner.submitted == 0
+
+    def test_failed_points_are_retried(self, tmp_path):
+        broken = tmp_path / "broken_solver"
+        broken.write_text(f"#!{sys.executable}\nimport sys\nsys.exit(1)\n")
+        broken.chmod(0o755)
+
+        summary = make_farm(tmp_path, solver=str(broken)).run()
+        assert summary["failed"] == 4 and summary["bank"] is None
+        assert not (tmp_path / "bank.npz").exists()
+        manifest = json.loads((tmp_path / "bank.npz.farm" / "manifest.json").read_text())
+        assert {p["status"] for p in manifest["points"].values()} == {"failed"}
+
+        summary = make_farm(tmp_path).run()
+        assert summary["completed"] == 4
+        assert (tmp_path / "bank.npz").exists()
+
+    def test_manifest_for_other_grid_is_rejected(self, tmp_path):
+        make_farm(tmp_path)._save_manifest()
+        with pytest.raises(ValueError):
+            make_farm(tmp_path, steps=(3, 2))
+
+    def test_cli_fresh_run(self, tmp_path, capsys):
+        output = tmp_path / "cli_bank.npz"
+        args = ["--solver", MOCK_SOLVER, "--steps", "2", "--workers", "2", "--output", str(output)]
+        assert main(args) == 0
+        capsys.readouterr()
+
+        assert main(args + ["--fresh"]) == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["skipped"] == 0 and summary["completed"] == 4
+        assert output.exists()
+
+
+class TestSimulationDBBank:
+    """InterpolatedSimulationDB 패턴 뱅크 로딩"""
+
+    def test_missing_bank_falls_back_to_analytic_grid(self, tmp_path):
+        db = InterpolatedSimulationDB(bank_path=str(tmp_path / "missing.npz"))
+        assert db.get_physics_metadata(0.5, 0.5)["source"] == "interpolated_mumax3_5x5"
+        assert len(db.patterns) == 25
+
+    def test_bank_with_wrong_shape_is_rejected(self, tmp_path):
+        path = tmp_path / "bad.npz"
+        np.savez(path, theta_steps=np.array([0.0, 1.0]), beta_steps=np.array([0.0, 1.0]),
+                 patterns=np.zeros((2, 2, 8, 8), dtype=np.float32))
+        with pytest.raises(ValueError):
+            InterpolatedSimulationDB(bank_path=str(path))
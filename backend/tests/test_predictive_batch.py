@@ -0,0 +1,132 @@
+"""
+예측 모델 배치 적합(fit_lines / trends_batch / evolution_batch / predict_all_users) 테스트
+"""
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_profiles
+from predictive_model import TRAITS, WEIGHT_KEYS, PredictiveModel, fit_lines, parse_timestamps
+
+
+def evolution_history(n, seed=0, start=datetime(2026, 1, 1), zulu=False):
+    rng = np.random.default_rng(seed)
+    hours = np.sort(rng.uniform(0, 60 * 24, n))
+    history = []
+    for hour in hours.tolist():
+        moment = start + timedelta(hours=hour)
+        timestamp = moment.isoformat() + ("Z" if zulu else "")
+        row = {key: float(rng.uniform(0, 1)) for key in WEIGHT_KEYS}
+        row["timestamp"] = timestamp
+        history.append(row)
+    return history
+
+
+def polyfit_evolution(history, forecast_days=30):
+    """기존 구현 (특성마다 fromisoformat + np.polyfit)"""
+    first = datetime.fromisoformat(history[0]["timestamp"].replace("Z", ""))
+    x = np.array([(datetime.fromisoformat(h["timestamp"].replace("Z", "")) - first).days for h in history])
+    result = {}
+    for trait, key in zip(TRAITS, WEIGHT_KEYS):
+        y = np.array([h[key] for h in history])
+        coeffs = np.polyfit(x, y, 1)
+        result[trait] = float(np.clip(np.polyval(coeffs, x[-1] + forecast_days), 0.0, 1.0))
+    return result
+
+
+class TestFitLines:
+    """닫힌 형태 그룹별 최소제곱 테스트"""
+
+    def test_matches_polyfit_per_group(self):
+        rng = np.random.default_rng(0)
+        groups = np.sort(rng.integers(0, 30, 600))
+        x = rng.uniform(0, 400, 600)
+        Y = rng.uniform(0, 1, (600, 4))
+
+        slopes, intercepts, counts = fit_lines(x, Y, groups, 30)
+
+        for g in range(30):
+            mask = groups == g
+            assert counts[g] == mask.sum()
+            for k in range(4):
+                expected = np.polyfit(x[mask], Y[mask, k], 1)
+                np.testing.assert_allclose([slopes[g, k], intercepts[g, k]], expected, atol=1e-9)
+
+    def test_constant_x_gives_flat_line(self):
+        slopes, intercepts, _ = fit_lines(np.zeros(3), np.array([[0.2], [0.4], [0.9]]))
+
+        assert slopes[0, 0] == 0.0
+        assert intercepts[0, 0] == pytest.approx(0.5)
+
+
+class TestParseTimestamps:
+    """벡터화 타임스탬프 파싱 테스트"""
+
+    def test_formats(self):
+        parsed = parse_timestamps(["2026-01-01 12:00:00", "2026-01-02T03:04:05.5Z", "2026-01-03T09:00:00+09:00"])
+
+        assert parsed.tolist() == [
+            datetime(2026, 1, 1, 12), datetime(2026, 1, 2, 3, 4, 5, 500000), datetime(2026, 1, 3)
+        ]
+
+
+class TestBatchPredictions:
+    """배치 결과가 단일 사용자 결과 / 기존 polyfit 구현과 같은지 테스트"""
+
+    def setup_method(self):
+        self.model = PredictiveModel(lookback_window=10)
+
+    def test_evolution_matches_polyfit(self):
+        for seed, zulu in [(0, False), (1, True), (2, False)]:
+            history = evolution_history(12 + seed, seed=seed, zulu=zulu)
+            result = self.model.predict_personality_evolution(history)
+            expected = polyfit_evolution(history)
+
+            for trait in TRAITS:
+                assert result["predictions"][trait]["predicted_30days"] == pytest.approx(expected[trait], abs=1e-9)
+
+    def test_trends_use_last_window_per_user(self):
+        rng = np.random.default_rng(3)
+        sizes = [2, 5, 14, 10, 25]
+        user_index = np.repeat(np.arange(len(sizes)), sizes)
+        weights = rng.uniform(0, 1, (len(user_index), 4))
+
+        batch = self.model.trends_batch(user_index, weights, len(sizes))
+
+        assert batch.valid.tolist() == [False, True, True, True, True]
+        for u in range(1, len(sizes)):
+            history = [dict(zip(WEIGHT_KEYS, row)) for row in weights[user_index == u].tolist()]
+            assert self.model.trend_result(batch, u) == self.model.predict_behavioral_trend(history)
+
+    def test_all_users_from_database(self, tmp_path, monkeypatch):
+        def test_get_connection():
+            conn = sqlite3.connect(str(tmp_path / "profiles.db"))
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        monkeypatch.setattr(user_profiles, "get_connection", test_get_connection)
+        user_profiles.init_database()
+        histories = {"alice": evolution_history(8, seed=4), "bob": evolution_history(3, seed=5, zulu=True)}
+        conn = test_get_connection()
+        for user_id, history in histories.items():
+            for row in history:
+                conn.execute(
+                    f"INSERT INTO profile_evolution (user_id, timestamp, {', '.join(WEIGHT_KEYS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                    (user_id, row["timestamp"], *[row[key] for key in WEIGHT_KEYS])
+                )
+        conn.commit()
+
+        results = self.model.predict_all_users(conn)
+        conn.close()
+
+        for user_id, history in histories.items():
+            assert results[user_id]["data_points"] == len(history)
+            assert results[user_id]["prediction"] == self.model.predict_personality_evolution(history)
+            assert results[user_id]["behavior_trend"] == self.model.predict_behavioral_trend(history)
+        assert results["bob"]["prediction"]["status"] == "insufficient_data"
@@ -0,0 +1,180 @@
+"""
+pre-fork 공유 읽기 전용 상태(prefork.py) 테스트
+"""
+import gc
+import hashlib
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prefork import after_fork, is_shared, prepare_fork, share_array
+from startup import ComponentRegistry
+
+
+@pytest.fixture
+def restore_gc():
+    yield
+    gc.unfreeze()
+    gc.enable()
+
+
+class TestShareArray:
+    """공유 세그먼트 복사 테스트"""
+
+    def test_copy_is_read_only_and_equal(self):
+        array = np.arange(12, dtype=np.float32).reshape(3, 4)
+        shared = share_array(array)
+
+        assert is_shared(shared) and not is_shared(array)
+        assert not shared.flags.writeable and shared.flags.c_contiguous
+        np.testing.assert_array_equal(shared, array)
+        with pytest.raises(ValueError):
+            shared[0, 0] = 1
+
+    def test_memmap_and_empty_arrays_are_kept(self, tmp_path):
+        mapped = np.memmap(tmp_path / "a.bin", dtype=np.float64, mode="w+", shape=(8,))
+        empty = np.empty(0)
+
+        assert share_array(mapped) is mapped
+        assert share_array(empty) is empty
+
+    def test_forked_worker_reads_shared_array(self):
+        shared = share_array(np.arange(1000, dtype=np.int64))
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_fd, str(int(shared.sum())).encode())
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert int(os.read(read_fd, 64)) == sum(range(1000))
+
+
+class TestComponentSharing:
+    """구성요소별 share_memory() 테스트 (공유 전후 결과 동일)"""
+
+    def test_simulation_db(self):
+        from simulation_db import InterpolatedSimulationDB
+
+        db = InterpolatedSimulationDB(seed=1)
+        before = db.get_base_pattern(0.3, 0.7)
+        fingerprint = db.fingerprint
+        moved = db.share_memory()
+
+        assert moved == db.pattern_array.nbytes and is_shared(db.pattern_array)
+        assert np.shares_memory(db.patterns[(0.25, 0.5)], db.pattern_array)
+        np.testing.assert_array_equal(db.get_base_pattern(0.3, 0.7), before)
+        assert hashlib.sha256(db.pattern_array.tobytes()).hexdigest()[:16] == fingerprint
+
+    def test_readout_copies_on_first_write(self):
+        from neuro_controller import ReservoirReadout
+
+        readout = ReservoirReadout(input_dim=16, output_dim=3, seed=0)
+        original = readout.W_out.copy()
+        readout.share_memory()
+
+        assert readout.shares_weights
+        readout.update_hebbian(np.ones(16), np.zeros(3), np.ones(3))
+        assert not readout.shares_weights and not is_shared(readout.W_out)
+        assert not np.array_equal(readout.W_out, original)
+
+    def test_controller_output_unchanged(self):
+        from neuro_controller import MagnonicController
+
+        controller = MagnonicController(seed=3)
+        before = controller.process_eeg_stream(0.4, 0.6, t=1.0)
+        controller.share_memory()
+        after = controller.process_eeg_stream(0.4, 0.6, t=1.0)
+
+        assert is_shared(controller.readout.W_out) and is_shared(controller.wave_engine.R)
+        assert after["model_fingerprint"] == before["model_fingerprint"]
+        assert after["joint_angles"] == before["joint_angles"]
+
+    def test_personality_model_compiled_arrays(self):
+        from ml_personality_model import MLPersonalityModel
+
+        model = MLPersonalityModel(use_pretrained=False)
+        X = np.array([[2500, 2, 0.8, 1.5], [900, 7, 0.4, 3.0]])
+        before = model.predict_batch(X)
+
+        assert model.share_memory() > 0
+        assert all(is_shared(a) for a in model.compiled.to_arrays().values())
+        np.testing.assert_array_equal(model.predict_batch(X), before)
+        assert model.share_memory() == 0
+
+
+class TestPrepareFork:
+    """마스터 준비 과정 테스트"""
+
+    def test_builds_shares_and_freezes(self, restore_gc):
+        class Holder:
+            def __init__(self):
+                self.array = np.ones(100)
+
+            def share_memory(self):
+                self.array = share_array(self.array)
+                return self.array.nbytes
+
+        def broken():
+            raise RuntimeError("optional dependency missing")
+
+        registry = ComponentRegistry()
+        registry.register("holder", Holder)
+        registry.register("plain", dict)
+        registry.register("optional", broken, required=False)
+
+        assert prepare_fork(registry) == 800
+        assert is_shared(registry.get("holder").array)
+        assert registry.is_ready()
+        assert gc.get_freeze_count() > 0 and not gc.isenabled()
+
+        after_fork()
+        assert gc.isenabled()
+
+    def test_required_failure_raises(self, restore_gc):
+        registry = ComponentRegistry()
+        registry.register("broken", lambda: 1 / 0)
+
+        with pytest.raises(ZeroDivisionError):
+            prepare_fork(registry)
+
+
+class TestTESSSampleIndex:
+    """열 기반 TESS 샘플 인덱스 테스트"""
+
+    @pytest.fixture
+    def loader(self, tmp_path):
+        from tess_loader import TESSDataLoader
+
+        for folder in ("OAF_angry", "YAF_happy", "YAF_unknown", "notes"):
+            (tmp_path / folder).mkdir()
+            for word in ("back", "bath"):
+                (tmp_path / folder / f"{folder.split('_')[0]}_{word}_x.wav").touch()
+        loader = TESSDataLoader(str(tmp_path))
+        assert not loader.samples
+        assert loader.load() == 4
+        return loader
+
+    def test_rows_materialize_as_sample_dicts(self, loader, tmp_path):
+        sample = loader.samples[-1]
+
+        assert sample["path"] == str(tmp_path / "YAF_happy" / "YAF_bath_x.wav")
+        assert (sample["actor"], sample["emotion"], sample["word"]) == ("YAF", "happy", "bath")
+        assert sample["emotion_data"]["valence"] == 0.9
+
+    def test_emotion_filter_and_distribution(self, loader):
+        assert loader.get_emotion_distribution() == {"angry": 2, "happy": 2}
+        assert {s["emotion"] for s in loader.get_random_samples(5, emotion="angry")} == {"angry"}
+        assert loader.get_random_samples(5, emotion="sad") == []
+        assert len(loader.get_random_samples(10)) == 4
+
+    def test_share_memory(self, loader):
+        before = list(loader.samples)
+
+        assert loader.share_memory() > 0
+        assert is_shared(loader.samples.paths)
+        assert list(loader.samples) == before
@@ -0,0 +1,181 @@
+"""
+사용자별 리드아웃 저장소 테스트
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_controller import HebbianBatchLearner, ReservoirReadout
+from readout_store import BaseMismatchError, ReadoutStore, verify_base
+
+DIM = 256
+
+
+def adapt(readout, seed=0):
+    """한 번의 Hebbian 갱신으로 사용자 모델을 base에서 분기"""
+    rng = np.random.default_rng(seed)
+    readout.update_hebbian(rng.normal(size=DIM), np.zeros(4), rng.normal(size=4), learning_rate=0.01)
+
+
+def make_store(tmp_path, base=None, **kwargs):
+    kwargs.setdefault("flush_interval", 0)
+    return ReadoutStore(base or ReservoirReadout(input_dim=DIM, output_dim=4, seed=0), str(tmp_path), **kwargs)
+
+
+class TestReadoutStore:
+    """ReadoutStore 테스트"""
+
+    def test_unadapted_users_share_base_and_cost_no_weight_bytes(self, tmp_path):
+        store = make_store(tmp_path)
+        readouts = [store.get(f"user{i}") for i in range(100)]
+
+        assert all(r.W_out is store.base.W_out for r in readouts)
+        assert store.bytes_in_use == 100 * readouts[0].bias.nbytes
+        assert store.get("user0") is readouts[0]
+        assert store.hits == 1 and store.misses == 100
+
+    def test_round_trip_float16_delta(self, tmp_path):
+        store = make_store(tmp_path)
+        alice = store.get("alice")
+        adapt(alice)
+        store.mark_dirty("alice")
+        assert store.flush() == 1
+
+        # 새 프로세스: 같은 seed로 만든 base
+        reloaded = make_store(tmp_path, base=ReservoirReadout(input_dim=DIM, output_dim=4, seed=0))
+        restored = reloaded.get("alice")
+
+        np.testing.assert_array_equal(reloaded.base.W_out, store.base.W_out)
+        np.testing.assert_allclose(restored.W_out, alice.W_out, atol=1e-4)  # float16 delta
+        np.testing.assert_array_equal(restored.bias, alice.bias)
+        assert restored.version == alice.version
+        assert reloaded.loads == 1
+
+    def test_low_rank_delta_is_compact_and_exact_for_rank_one_updates(self, tmp_path):
+        store = make_store(tmp_path, rank=2)
+        alice = store.get("alice")
+        adapt(alice)  # Hebbian 한 번 = rank-1 delta
+        store.mark_dirty("alice")
+        store.flush()
+
+        path = store._path("alice")
+        with np.load(path) as data:
+            assert data["U"].shape == (4, 2) and data["Vt"].shape == (2, DIM)
+        restored = make_store(tmp_path).get("alice")
+        np.testing.assert_allclose(restored.W_out, alice.W_out, atol=1e-4)
+
+    def test_lru_eviction_respects_byte_budget(self, tmp_path):
+        weights_bytes = 4 * DIM * 8
+        store = make_store(tmp_path, memory_budget=2 * weights_bytes + 1000)
+        for i in range(3):
+            adapt(store.get(f"user{i}"), seed=i)
+            store.mark_dirty(f"user{i}")
+
+        assert store.evictions == 1
+        assert store.bytes_in_use <= store.memory_budget
+        # 축출된 dirty 모델은 저장 전까지 보관되어 변경 사항을 잃지 않음
+        evicted = store.get("user0")
+        assert not evicted.shares_weights
+
+    def test_evicted_dirty_model_is_persisted_then_dropped(self, tmp_path):
+        weights_bytes = 4 * DIM * 8
+        store = make_store(tmp_path, memory_budget=weights_bytes + 1000)
+        first = store.get("first")
+        adapt(first)
+        store.mark_dirty("first")
+        adapt(store.get("second"), seed=1)
+        store.mark_dirty("second")
+
+        assert store.flush() == 2
+        assert store._evicted == {}
+        restored = store.get("first")
+        assert restored is not first
+        np.testing.assert_allclose(restored.W_out, first.W_out, atol=1e-4)
+
+    def test_model_changed_during_flush_stays_dirty(self, tmp_path):
+        store = make_store(tmp_path)
+        alice = store.get("alice")
+        adapt(alice)
+        store.mark_dirty("alice")
+        original_save = store._encode
+
+        def encode_and_modify(*args):
+            arrays = original_save(*args)
+            adapt(alice, seed=5)
+            return arrays
+
+        store._encode = encode_and_modify
+        store.flush()
+        assert store.get_stats()["dirty"] == 1
+
+    def test_models_for_another_base_are_ignored(self, tmp_path):
+        store = make_store(tmp_path)
+        adapt(store.get("alice"))
+        store.mark_dirty("alice")
+        store.flush()
+        os.remove(tmp_path / "base.npz")
+
+        other = make_store(tmp_path, base=ReservoirReadout(input_dim=DIM, output_dim=4, seed=1))
+        assert other.get("alice").shares_weights
+
+    def test_mismatched_base_fails_instead_of_replacing(self, tmp_path):
+        make_store(tmp_path)
+        base = ReservoirReadout(input_dim=DIM, output_dim=4, seed=1)
+        W_before = base.W_out.copy()
+
+        with pytest.raises(BaseMismatchError):
+            make_store(tmp_path, base=base)
+        with pytest.raises(BaseMismatchError):
+            verify_base(base, str(tmp_path))
+        np.testing.assert_array_equal(base.W_out, W_before)
+        assert base.version == 0
+
+    def test_controller_verifies_base_at_construction(self, readout_store_dir):
+        from neuro_controller import MagnonicController
+
+        controller = MagnonicController(seed=3)
+        assert (readout_store_dir / "base.npz").exists()
+        with pytest.raises(BaseMismatchError):
+            MagnonicController(seed=4)
+        assert controller.get_user_readout("alice").W_out is controller.readout.W_out
+
+    def test_learners_count_against_budget_and_flush_on_eviction(self, tmp_path):
+        def factory(readout, on_apply):
+            return HebbianBatchLearner(readout, batch_size=10, learning_rate=0.01, on_apply=on_apply)
+
+        buffer_bytes = 10 * (DIM + 4) * 8
+        store = make_store(tmp_path, memory_budget=2 * buffer_bytes + 1000)
+        alice = store.get_learner("alice", factory)
+        alice_readout = alice.readout
+        alice.accumulate(np.ones(DIM), np.zeros(4), np.ones(4))
+        assert store.get_learner("alice", factory) is alice
+        assert store.bytes_in_use >= buffer_bytes
+
+        # bob, carol의 학습기가 예산을 넘기면 alice가 학습기와 함께 축출되고 남은 배치가 반영됨
+        store.get_learner("bob", factory)
+        store.get_learner("carol", factory)
+
+        assert "alice" not in store._learners and store.get_stats()["learners"] == 2
+        assert alice.pending == 0 and not alice_readout.shares_weights
+        assert store.flush() == 1
+        restored = store.get("alice")
+        assert restored is not alice_readout
+        np.testing.assert_allclose(restored.W_out, alice_readout.W_out, atol=1e-4)
+        assert store.get_learner("alice", factory).readout is restored
+
+    def test_background_thread_persists_learner_updates(self, tmp_path):
+        store = make_store(tmp_path, flush_interval=0.05)
+        readout = store.get("alice")
+        # pre-fork 마스터처럼 읽기만 하면 저장 스레드 없음
+        assert store._thread is None
+        learner = HebbianBatchLearner(readout, batch_size=2, on_apply=lambda: store.mark_dirty("alice"))
+        for _ in range(2):
+            learner.accumulate(np.ones(DIM), np.zeros(4), np.ones(4))
+        store.close()
+
+        assert store.writes >= 1 and store.get_stats()["dirty"] == 0
+        assert store._path("alice").exists()
@@ -0,0 +1,335 @@
+"""
+배치 성격 추론(decode_batch, ContinuousLearner 배열 버전)과 profile_evolution 재계산(rederive_profiles.py) 테스트
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import user_profiles
+from cultural_table import TRAIT_ORDER
+from neuro_controller import BehavioralPersonalityDecoder, ContinuousLearner
+import rederive_profiles
+from rederive_profiles import PLAN_TABLE, SHADOW_TABLE, load_sessions, rederive, replay
+
+CULTURES = ["east_asian", "western", "latin_american", "middle_eastern", "default", None, "atlantis"]
+
+
+@pytest.fixture(scope="module")
+def rule_decoder():
+    return BehavioralPersonalityDecoder(use_ml=False)
+
+
+@pytest.fixture(scope="module")
+def ml_decoder():
+    return BehavioralPersonalityDecoder(use_ml=True)
+
+
+def random_profiles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{
+        "avgDecisionLatency": float(rng.uniform(200, 7000)),
+        "revisionRate": int(rng.integers(0, 8)),
+        "pathEfficiency": float(rng.uniform(0, 1)),
+        "intensity": float(rng.uniform(0.2, 3)),
+        "taskCompletion": float(rng.uniform(0, 1)),
+        "culturalContext": CULTURES[i % len(CULTURES)],
+        "maturityLevel": int(rng.integers(1, 4))
+    } for i in range(n)]
+
+
+def as_batch(profiles):
+    X = np.array([[p["avgDecisionLatency"], p["revisionRate"], p["pathEfficiency"], p["intensity"]] for p in profiles])
+    return dict(
+        features=X,
+        cultures=[p["culturalContext"] for p in profiles],
+        maturity_levels=np.array([p["maturityLevel"] for p in profiles]),
+        task_completion=np.array([p["taskCompletion"] for p in profiles])
+    )
+
+
+def live_session(manager, decoder, learner, user_id, profile):
+    """/api/session 처리 과정 (컨트롤러 없이 decode만 사용, 게임 세션은 성숙도 갱신 없음)"""
+    manager.save_session(user_id, profile)
+    previous = manager.get_latest_profile(user_id)
+    maturity_level = manager.get_or_create_user(user_id).get("maturity_level", 1)
+    decoded = decoder.decode(dict(profile, maturityLevel=maturity_level))
+    new_weights, sync_score = decoded["traits"]["weights"], decoded["sync_score"]
+    if previous:
+        current = {t: previous[f"{t.lower()}_weight"] for t in TRAIT_ORDER}
+        new_weights = learner.update_weights(current, new_weights)
+    history = manager.get_session_history(user_id)
+    manager.save_profile_evolution(
+        user_id, new_weights, learner.generate_archetype(new_weights),
+        learner.compute_confidence(len(history), 0.7),
+        rule_weights=decoded["traits"]["rule_weights"]
+    )
+    if "gameSpecific" in profile:
+        return
+    new_level = maturity_level
+    if maturity_level == 1 and len(history) >= 3 and sync_score >= 0.6:
+        new_level = 2
+    elif maturity_level == 2 and len(history) >= 7 and sync_score >= 0.8:
+        new_level = 3
+    manager.update_user_maturity(user_id, new_level, sync_score)
+
+
+def evolution(user_id):
+    conn = user_profiles.get_connection()
+    rows = conn.execute("""
+        SELECT logic_weight, intuition_weight, fluidity_weight, complexity_weight,
+               archetype, confidence_score, session_count, rule_weights
+        FROM profile_evolution WHERE user_id = ? ORDER BY id
+    """, (user_id,)).fetchall()
+    user = conn.execute("SELECT maturity_level, sync_score FROM users WHERE id = ?", (user_id,)).fetchone()
+    conn.close()
+    return [tuple(row) for row in rows], tuple(user)
+
+
+class TestDecodeBatch:
+    """decode_batch가 decode와 같은 결과를 내는지 테스트"""
+
+    @pytest.mark.parametrize("use_ml", [False, True])
+    def test_matches_decode(self, rule_decoder, ml_decoder, use_ml):
+        decoder = ml_decoder if use_ml else rule_decoder
+        profiles = random_profiles(300)
+        batch = decoder.decode_batch(**as_batch(profiles))
+
+        for i, profile in enumerate(profiles):
+            decoded = decoder.decode(profile)
+            traits = decoded["traits"]
+            np.testing.assert_allclose(batch.weights[i], [traits["weights"][t] for t in TRAIT_ORDER], atol=1e-12)
+            np.testing.assert_allclose(batch.base_weights[i], [traits["base_weights"][t] for t in TRAIT_ORDER], atol=1e-12)
+            assert batch.rule_weights[i].tolist() == [traits["rule_weights"][t] for t in TRAIT_ORDER]
+            assert batch.sync_scores[i] == pytest.approx(decoded["sync_score"], abs=1e-12)
+            table = decoder.cultural_table
+            assert table.archetypes[batch.cultures[i], batch.archetype_codes[i]] == traits["cultural_archetype"]
+            assert table.names[batch.cultures[i]] == decoded["cultural_context"]
+
+    def test_precomputed_ml_weights(self, ml_decoder):
+        batch = as_batch(random_profiles(20))
+        predictions = ml_decoder.ml_model.predict_batch(batch["features"])
+
+        np.testing.assert_array_equal(
+            ml_decoder.decode_batch(**batch, ml_weights=predictions).weights,
+            ml_decoder.decode_batch(**batch).weights
+        )
+
+
+class TestLearnerBatch:
+    """ContinuousLearner 배열 버전 테스트"""
+
+    def test_matches_dict_versions(self):
+        learner = ContinuousLearner(learning_rate=0.3)
+        rng = np.random.default_rng(1)
+        current, new = np.round(rng.uniform(0, 1, (500, 4)), 2), np.round(rng.uniform(0, 1, (500, 4)), 2)
+        counts = rng.integers(1, 15, 500)
+
+        updated = learner.update_weights_batch(current, new)
+        codes = learner.archetype_codes(updated)
+        confidence = learner.compute_confidence_batch(counts, 0.7)
+
+        for i in range(500):
+            # DB에서 읽은 값처럼 Python float로 (np.float64의 round는 np.round)
+            expected = learner.update_weights(dict(zip(TRAIT_ORDER, current[i].tolist())), dict(zip(TRAIT_ORDER, new[i].tolist())))
+            np.testing.assert_allclose(updated[i], [expected[t] for t in TRAIT_ORDER], atol=1e-12)
+            assert learner.ARCHETYPES[codes[i]] == learner.generate_archetype(expected)
+            assert confidence[i] == pytest.approx(learner.compute_confidence(int(counts[i]), 0.7))
+
+
+class TestRederive:
+    """세션 재생 결과가 실시간 처리와 같은지 테스트"""
+
+    def test_replay_reproduces_live_sessions(self, manager, rule_decoder):
+        learner = ContinuousLearner()
+        profiles = random_profiles(60, seed=3)
+        users = [f"user-{i % 4}" for i in range(60)]
+        for i, (user_id, profile) in enumerate(zip(users, profiles)):
+            profile = {k: v for k, v in profile.items() if k != "maturityLevel"}
+            if i % 7 == 0:
+                profile["gameSpecific"] = {"riskTaking": 0.5}
+            # 효율/완료율이 높은 사용자는 성숙도가 진급
+            if user_id == "user-0":
+                profile.update(pathEfficiency=0.95, taskCompletion=0.95, avgDecisionLatency=3000)
+            live_session(manager, rule_decoder, learner, user_id, profile)
+        live = {u: evolution(u) for u in set(users)}
+
+        conn = user_profiles.get_connection()
+        summary = rederive(conn, rule_decoder, learner)
+        conn.close()
+
+        assert summary["sessions"] == 60 and summary["users"] == 4
+        assert live["user-0"][1][0] == 3
+        for user_id, (rows, user) in live.items():
+            replayed_rows, replayed_user = evolution(user_id)
+            assert len(replayed_rows) == len(rows) == 15
+            for a, b in zip(replayed_rows, rows):
+                assert a[4:] == b[4:]
+                np.testing.assert_allclose(a[:4], b[:4], atol=1e-12)
+            assert replayed_user[0] == user[0]
+            assert replayed_user[1] == pytest.approx(user[1])
+
+    def test_dry_run_and_empty_db(self, manager, rule_decoder):
+        conn = user_profiles.get_connection()
+        try:
+            assert rederive(conn, rule_decoder, ContinuousLearner(), dry_run=True)["sessions"] == 0
+            assert len(replay(load_sessions(conn), rule_decoder, ContinuousLearner()).weights) == 0
+        finally:
+            conn.close()
+
+
+def all_evolution():
+    conn = user_profiles.get_connection()
+    rows = conn.execute("""
+        SELECT user_id, timestamp, logic_weight, intuition_weight, fluidity_weight, complexity_weight,
+               archetype, confidence_score, session_count
+        FROM profile_evolution ORDER BY user_id, session_count
+    """).fetchall()
+    users = conn.execute("SELECT id, maturity_level, sync_score FROM users ORDER BY id").fetchall()
+    conn.close()
+    return [tuple(r) for r in rows], [tuple(u) for u in users]
+
+
+class TestBackfill:
+    """청크 병렬 처리, 섀도 테이블 교체, 재개 테스트"""
+
+    @pytest.fixture
+    def sessions(self, manager):
+        for i, profile in enumerate(random_profiles(90, seed=7)):
+            profile.pop("maturityLevel")
+            manager.save_session(f"user-{i % 9}", profile)
+            manager.save_profile_evolution(f"user-{i % 9}", {t: 0.0 for t in TRAIT_ORDER}, "stale", 0.0)
+        return manager
+
+    def run(self, decoder, **kwargs):
+        conn = user_profiles.get_connection()
+        try:
+            return rederive(conn, decoder, ContinuousLearner(), **kwargs)
+        finally:
+            conn.close()
+
+    def tables(self):
+        conn = user_profiles.get_connection()
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        return names
+
+    def test_chunked_parallel_matches_single_pass(self, sessions, rule_decoder):
+        single = self.run(rule_decoder)
+        expected = all_evolution()
+
+        summary = self.run(rule_decoder, chunk_users=2, workers=2)
+
+        assert single["chunks"] == 1 and summary["chunks"] == 5
+        assert summary["sessions"] == 90 and summary["users"] == 9
+        assert all_evolution() == expected
+        assert "stale" not in {row[6] for row in expected[0]}
+        assert SHADOW_TABLE not in self.tables() and PLAN_TABLE not in self.tables()
+
+    def test_interrupted_run_resumes(self, sessions, rule_decoder, monkeypatch):
+        self.run(rule_decoder, chunk_users=2)
+        expected = all_evolution()
+        self.run(rule_decoder, fresh=True)  # 다른 상태에서 시작
+
+        replay_chunk = rederive_profiles.replay_chunk
+        calls = []
+
+        def failing(conn, decoder, learner, chunk, *bounds):
+            calls.append(chunk)
+            if chunk == 3:
+                raise RuntimeError("interrupted")
+            return replay_chunk(conn, decoder, learner, chunk, *bounds)
+
+        monkeypatch.setattr(rederive_profiles, "replay_chunk", failing)
+        with pytest.raises(RuntimeError):
+            self.run(rule_decoder, chunk_users=2)
+        # 교체 전이므로 기존 테이블은 그대로, 완료한 청크는 진행 테이블에 남음
+        assert SHADOW_TABLE in self.tables()
+        monkeypatch.setattr(rederive_profiles, "replay_chunk", replay_chunk)
+        # 세션이 추가되어도 청크는 첫 실행 시점까지만 재생
+        sessions.save_session("user-2", random_profiles(1, seed=99)[0])
+
+        summary = self.run(rule_decoder, chunk_users=2)
+
+        assert calls == [0, 1, 2, 3] and summary["resumed_chunks"] == 3
+        assert summary["sessions"] == 90 - 3 * 2 * 10
+        rows, users = all_evolution()
+        assert len(rows) == 90 + 1
+        # 추가 세션이 있는 사용자는 교체 시 전체 이력을 다시 재생 (완료된 청크 0에 속한 사용자)
+        assert summary["tail_users"] == 1
+        assert [row for row in rows if row[0] != "user-2"] == [row for row in expected[0] if row[0] != "user-2"]
+        assert [row[1:] for row in rows if row[0] == "user-2"][:10] == [row[1:] for row in expected[0] if row[0] == "user-2"]
+        assert [row[8] for row in rows if row[0] == "user-2"] == list(range(1, 12))
+
+    def test_swap_keeps_rows_written_after_snapshot(self, sessions, rule_decoder, monkeypatch):
+        learner = ContinuousLearner()
+        # 세션 없이 평가만 있는 사용자 (재생 대상 아님)
+        sessions.save_profile_evolution("no-sessions", {t: 0.5 for t in TRAIT_ORDER}, "kept", 0.4)
+        swap_in = rederive_profiles.swap_in
+
+        def live_then_swap(conn, *args):
+            # 청크 재생이 끝난 뒤 교체 전에 들어온 실시간 세션
+            profiles = random_profiles(3, seed=11)
+            for user_id, profile in zip(["user-4", "user-4", "newcomer"], profiles):
+                profile.pop("maturityLevel")
+                live_session(sessions, rule_decoder, learner, user_id, profile)
+            return swap_in(conn, *args)
+
+        monkeypatch.setattr(rederive_profiles, "swap_in", live_then_swap)
+        summary = self.run(rule_decoder, chunk_users=2)
+
+        assert summary["sessions"] == 90 and summary["tail_users"] == 1
+        rows, users = all_evolution()
+        by_user = {}
+        for row in rows:
+            by_user.setdefault(row[0], []).append(row)
+        assert [row[6:] for row in by_user["no-sessions"]] == [("kept", 0.4, 0)]
+        assert len(by_user["newcomer"]) == 1 and by_user["newcomer"][0][6] != "stale"
+        assert [row[8] for row in by_user["user-4"]] == list(range(1, 13))
+        assert "stale" not in {row[6] for row in rows}
+
+        # 교체 결과는 모든 세션을 처음부터 재생한 것과 같음 (재생 대상이 아닌 사용자 제외)
+        monkeypatch.setattr(rederive_profiles, "swap_in", swap_in)
+        self.run(rule_decoder, chunk_users=2)
+        assert all_evolution() == (rows, users)
+
+    def test_changed_settings_restart(self, sessions, rule_decoder, monkeypatch):
+        replay_chunk = rederive_profiles.replay_chunk
+        monkeypatch.setattr(rederive_profiles, "replay_chunk", lambda *args: (_ for _ in ()).throw(RuntimeError()))
+        with pytest.raises(RuntimeError):
+            self.run(rule_decoder, chunk_users=2)
+        monkeypatch.setattr(rederive_profiles, "replay_chunk", replay_chunk)
+
+        conn = user_profiles.get_connection()
+        summary = rederive(conn, rule_decoder, ContinuousLearner(learning_rate=0.5), chunk_users=2)
+        conn.close()
+
+        assert summary["resumed_chunks"] == 0 and summary["sessions"] == 90
+
+    def test_changed_ml_model_restarts(self, sessions, monkeypatch):
+        from ml_personality_model import MLPersonalityModel
+
+        decoder = BehavioralPersonalityDecoder(use_ml=True)
+        replay_chunk = rederive_profiles.replay_chunk
+
+        def failing(conn, decoder, learner, chunk, *bounds):
+            if chunk == 3:
+                raise RuntimeError("interrupted")
+            return replay_chunk(conn, decoder, learner, chunk, *bounds)
+
+        monkeypatch.setattr(rederive_profiles, "replay_chunk", failing)
+        with pytest.raises(RuntimeError):
+            self.run(decoder, chunk_users=2)
+        monkeypatch.setattr(rederive_profiles, "replay_chunk", replay_chunk)
+
+        # 같은 설정이지만 모델 아티팩트가 바뀜 (점진 학습 승격 등)
+        before = decoder.ml_model.fingerprint
+        decoder.ml_model.refit(*MLPersonalityModel.synthetic_training_data(60, seed=5), prior_samples=0)
+        assert decoder.ml_model.fingerprint != before
+        summary = self.run(decoder, chunk_users=2)
+
+        assert summary["resumed_chunks"] == 0 and summary["sessions"] == 90
+
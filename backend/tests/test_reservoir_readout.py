@@ -0,0 +1,300 @@
+"""
+ReservoirReadout 학습 테스트 (closed-form ridge, RLS, mini-batch Hebbian, copy-on-write, seed)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_controller import HebbianBatchLearner, ReservoirReadout
+
+
+def make_dataset(n, input_dim, output_dim, noise=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    W = rng.normal(size=(output_dim, input_dim)) * 0.1
+    b = rng.normal(size=output_dim)
+    X = rng.normal(size=(n, input_dim))
+    Y = X @ W.T + b + noise * rng.normal(size=(n, output_dim))
+    return X, Y, W, b
+
+
+class TestRidgeFit:
+    """ReservoirReadout.fit 테스트"""
+
+    def test_dual_form_matches_primal_ridge(self):
+        X, Y, _, _ = make_dataset(30, 200, 4, noise=0.1)
+        readout = ReservoirReadout(input_dim=200, output_dim=4, ridge_alpha=0.5)
+
+        readout.fit(X, Y)
+
+        Xc, Yc = X - X.mean(0), Y - Y.mean(0)
+        W_primal = np.linalg.solve(Xc.T @ Xc + 0.5 * np.eye(200), Xc.T @ Yc).T
+        np.testing.assert_allclose(readout.W_out, W_primal, atol=1e-8)
+        np.testing.assert_allclose(readout.bias, Y.mean(0) - W_primal @ X.mean(0), atol=1e-8)
+
+    def test_primal_branch_recovers_weights(self):
+        X, Y, W, b = make_dataset(400, 20, 3)
+        readout = ReservoirReadout(input_dim=20, output_dim=3)
+
+        readout.fit(X, Y, ridge_alpha=1e-8)
+
+        np.testing.assert_allclose(readout.W_out, W, atol=1e-6)
+        np.testing.assert_allclose(readout.bias, b, atol=1e-6)
+
+    def test_large_input_uses_randomized_svd(self, monkeypatch):
+        import neuro_controller
+        monkeypatch.setattr(neuro_controller, "PRIMAL_MAX_DIM", 32)
+        monkeypatch.setattr(neuro_controller, "RANDOMIZED_FIT_RANK", 16)
+        rng = np.random.default_rng(5)
+        # 상태가 12차원 부분공간에 놓이면 rank 16 SVD로 정확한 ridge 해와 같음
+        X = rng.normal(size=(300, 12)) @ rng.normal(size=(12, 100))
+        Y = rng.normal(size=(300, 3))
+        readout = ReservoirReadout(input_dim=100, output_dim=3, ridge_alpha=0.5, seed=0)
+
+        readout.fit(X, Y, basis_rank=4)
+
+        Xc, Yc = X - X.mean(0), Y - Y.mean(0)
+        W_primal = np.linalg.solve(Xc.T @ Xc + 0.5 * np.eye(100), Xc.T @ Yc).T
+        np.testing.assert_allclose(readout.W_out, W_primal, atol=1e-8)
+        assert readout._fit_basis.shape == (4, 100)
+        np.testing.assert_allclose(readout._fit_basis @ readout._fit_basis.T, np.eye(4), atol=1e-10)
+
+    def test_fit_accepts_grid_states_and_bumps_version(self):
+        rng = np.random.default_rng(1)
+        states = rng.normal(size=(16, 8, 8))
+        targets = rng.normal(size=(16, 2))
+        readout = ReservoirReadout(input_dim=64, output_dim=2)
+
+        readout.fit(states, targets)
+
+        assert readout.version == 1
+        assert readout.predict(states[0]).shape == (2,)
+
+    def test_shape_mismatch_raises(self):
+        readout = ReservoirReadout(input_dim=64, output_dim=2)
+        with pytest.raises(ValueError):
+            readout.fit(np.zeros((5, 63)), np.zeros((5, 2)))
+
+
+class TestRLS:
+    """축소 공간 RLS 온라인 학습 테스트"""
+
+    def test_rls_in_principal_basis_tracks_low_rank_data(self):
+        rng = np.random.default_rng(2)
+        # 상태가 8차원 부분공간에 놓인 경우: 8개 주성분으로 정확히 학습 가능
+        latent = rng.normal(size=(300, 8))
+        mixing = rng.normal(size=(8, 256))
+        X = latent @ mixing
+        W_true = rng.normal(size=(3, 256)) * 0.05
+        Y = X @ W_true.T + 1.0
+
+        readout = ReservoirReadout(input_dim=256, output_dim=3)
+        readout.fit(X[:50], Y[:50] + rng.normal(size=(50, 3)), basis_rank=8)
+        readout.enable_rls(rank=8, forgetting=1.0)
+        for x, y in zip(X[50:], Y[50:]):
+            readout.update_rls(x, y, apply=False)
+        readout.apply_rls()
+
+        predictions = np.array([readout.predict(x) for x in X[:50]])
+        np.testing.assert_allclose(predictions, Y[:50], atol=1e-3)
+
+    def test_covariance_stays_bounded(self):
+        readout = ReservoirReadout(input_dim=64, output_dim=2)
+        readout.enable_rls(rank=16, forgetting=0.9, delta=10.0, max_trace=50.0)
+        state = np.zeros(64)
+        state[0] = 1.0  # 대부분의 방향은 전혀 자극되지 않음
+        for _ in range(200):
+            readout.update_rls(state, np.ones(2), apply=False)
+
+        assert np.trace(readout._rls["P"]) <= 50.0 + 1e-9
+        assert np.all(np.isfinite(readout._rls["W"]))
+
+    def test_deferred_apply_bumps_version_once(self):
+        readout = ReservoirReadout(input_dim=64, output_dim=2)
+        readout.enable_rls(rank=8)
+        W_before = readout.W_out.copy()
+        for _ in range(5):
+            readout.update_rls(np.ones(64), np.zeros(2), apply=False)
+
+        np.testing.assert_array_equal(readout.W_out, W_before)
+        readout.apply_rls()
+        assert readout.version == 1
+        assert not np.array_equal(readout.W_out, W_before)
+
+    def test_small_error_update_keeps_trained_readout(self):
+        X, Y, _, _ = make_dataset(40, 256, 3, noise=0.1)
+        readout = ReservoirReadout(input_dim=256, output_dim=3)
+        readout.fit(X, Y, basis_rank=8)
+        W_before = readout.W_out.copy()
+        readout.enable_rls(rank=8)
+
+        # 학습된 출력과 거의 같은 목표: 기저 밖 가중치까지 포함해 W_out은 거의 그대로
+        readout.update_rls(X[0], readout.predict(X[0]) + 1e-3)
+
+        change = np.linalg.norm(readout.W_out - W_before) / np.linalg.norm(W_before)
+        assert change < 1e-2
+
+    def test_apply_adds_only_reduced_space_change(self):
+        readout = ReservoirReadout(input_dim=64, output_dim=2, seed=0)
+        readout.enable_rls(rank=8)
+        W_before, bias_before = readout.W_out.copy(), readout.bias.copy()
+        state = np.random.default_rng(4).normal(size=64)
+        readout.update_rls(state, np.ones(2))
+
+        basis = readout._rls["basis"]
+        outside = W_before - W_before @ basis.T @ basis
+        np.testing.assert_allclose(readout.W_out - readout.W_out @ basis.T @ basis, outside, atol=1e-12)
+        # 예측 변화는 축소 공간 가중치 변화와 같음
+        z = basis @ state
+        np.testing.assert_allclose(
+            readout.predict(state),
+            readout._rls["W"][:, :8] @ z + readout._rls["W"][:, 8] + outside @ state,
+            atol=1e-9
+        )
+        assert not np.array_equal(readout.bias, bias_before)
+
+    def test_update_without_enable_raises(self):
+        readout = ReservoirReadout(input_dim=64, output_dim=2)
+        with pytest.raises(RuntimeError):
+            readout.update_rls(np.ones(64), np.zeros(2))
+
+
+class TestHebbianBatchLearner:
+    """누적 후 적용(mini-batch) Hebbian 학습 테스트"""
+
+    def test_batch_update_matches_summed_per_sample_updates(self):
+        rng = np.random.default_rng(3)
+        states = rng.normal(size=(6, 64))
+        targets = rng.normal(size=(6, 2))
+        readout = ReservoirReadout(input_dim=64, output_dim=2)
+        reference = readout.fork()
+        reference._ensure_own_weights()
+
+        learner = HebbianBatchLearner(readout, batch_size=3, learning_rate=0.01)
+        applied = []
+        for m, y in zip(states, targets):
+            applied.append(learner.accumulate(m, readout.predict(m), y))
+
+        # 같은 배치 안에서는 직전 적용 시점의 가중치로 출력을 계산
+        for start in (0, 3):
+            outputs = [reference.predict(m) for m in states[start:start + 3]]
+            for m, out, y in zip(states[start:start + 3], outputs, targets[start:start + 3]):
+                reference.update_hebbian(m, out, y, learning_rate=0.01)
+
+        assert applied == [False, False, True, False, False, True]
+        assert readout.version == 2 and learner.updates_applied == 2
+        np.testing.assert_allclose(readout.W_out, reference.W_out, atol=1e-12)
+        np.testing.assert_allclose(readout.bias, reference.bias, atol=1e-12)
+
+    def test_flush_applies_partial_batch(self):
+        readout = ReservoirReadout(input_dim=64, output_dim=2)
+        learner = HebbianBatchLearner(readout, batch_size=10)
+        learner.accumulate(np.ones(64), np.zeros(2), np.ones(2))
+        W_before = readout.W_out.copy()
+
+        assert learner.pending == 1
+        learner.flush()
+        learner.flush()
+
+        assert learner.pending == 0 and readout.version == 1
+        assert not np.array_equal(readout.W_out, W_before)
+
+
+class TestCopyOnWriteReadouts:
+    """사용자별 readout copy-on-write 공유 테스트"""
+
+    def test_fork_shares_weights_until_first_write(self):
+        base = ReservoirReadout(input_dim=64, output_dim=2)
+        user = base.fork()
+
+        assert user.W_out is base.W_out
+        assert user.shares_weights and base.shares_weights
+
+        user.update_hebbian(np.ones(64), np.zeros(2), np.ones(2))
+
+        assert user.W_out is not base.W_out
+        assert not user.shares_weights
+
+    def test_base_write_does_not_leak_into_forks(self):
+        base = ReservoirReadout(input_dim=64, output_dim=2)
+        user = base.fork()
+        W_shared = user.W_out.copy()
+
+        HebbianBatchLearner(base, batch_size=1).accumulate(np.ones(64), np.zeros(2), np.ones(2))
+
+        np.testing.assert_array_equal(user.W_out, W_shared)
+        assert not np.array_equal(base.W_out, W_shared)
+
+    def test_controller_forks_per_user(self, tmp_path):
+        from neuro_controller import MagnonicController
+        from readout_store import ReadoutStore
+
+        controller = MagnonicController()
+        controller.readout_store = ReadoutStore(controller.readout, str(tmp_path), flush_interval=0)
+        alice = controller.get_user_readout("alice")
+        bob = controller.get_user_readout("bob")
+
+        assert controller.get_user_readout("alice") is alice
+        assert alice.W_out is bob.W_out is controller.readout.W_out
+        learner = controller.get_user_learner("alice", batch_size=1)
+        learner.accumulate(np.ones(128 * 128), np.zeros(20), np.ones(20))
+        assert alice.W_out is not bob.W_out
+        assert bob.W_out is controller.readout.W_out
+
+
+class TestSeeding:
+    """seed 기반 결정적 생성과 모델 지문 테스트"""
+
+    def test_same_seed_gives_identical_weights_and_fingerprint(self):
+        a = ReservoirReadout(input_dim=64, output_dim=2, seed=7)
+        b = ReservoirReadout(input_dim=64, output_dim=2, seed=7)
+        c = ReservoirReadout(input_dim=64, output_dim=2, seed=8)
+
+        np.testing.assert_array_equal(a.W_out, b.W_out)
+        assert a.fingerprint == b.fingerprint != c.fingerprint
+
+    def test_explicit_generator_drives_rls_projection(self):
+        a = ReservoirReadout(input_dim=64, output_dim=2, rng=np.random.default_rng(3))
+        b = ReservoirReadout(input_dim=64, output_dim=2, rng=np.random.default_rng(3))
+        a.enable_rls(rank=8)
+        b.enable_rls(rank=8)
+
+        np.testing.assert_array_equal(a._rls["basis"], b._rls["basis"])
+
+    def test_fingerprint_follows_updates(self):
+        readout = ReservoirReadout(input_dim=64, output_dim=2, seed=0)
+        user = readout.fork()
+        before = readout.fingerprint
+
+        assert user.fingerprint == before
+        user.update_hebbian(np.ones(64), np.zeros(2), np.ones(2))
+        assert user.fingerprint != before
+        assert readout.fingerprint == before
+
+    def test_simulation_db_seed_is_reproducible(self):
+        from simulation_db import InterpolatedSimulationDB
+
+        a = InterpolatedSimulationDB(seed=1)
+        b = InterpolatedSimulationDB(seed=1)
+        c = InterpolatedSimulationDB(seed=2)
+
+        np.testing.assert_array_equal(a.pattern_array, b.pattern_array)
+        assert a.fingerprint == b.fingerprint != c.fingerprint
+
+    def test_controllers_with_same_seed_agree(self, monkeypatch, tmp_path):
+        import readout_store
+        from neuro_controller import MagnonicController
+
+        a = MagnonicController(seed=5)
+        b = MagnonicController(seed=5)
+        ra = a.process_eeg_stream(0.3, 0.6, t=12.5)
+        rb = b.process_eeg_stream(0.3, 0.6, t=12.5)
+
+        assert ra["joint_angles"] == rb["joint_angles"]
+        assert ra["model_fingerprint"] == rb["model_fingerprint"]
+        # 다른 seed의 base는 별도 리드아웃 저장소에 (같은 저장소면 BaseMismatchError)
+        monkeypatch.setattr(readout_store, "DEFAULT_STORE_DIR", str(tmp_path / "seed6"))
+        assert MagnonicController(seed=6).model_fingerprint() != ra["model_fingerprint"]
@@ -0,0 +1,116 @@
+"""
+시작 오케스트레이션(ComponentRegistry) 테스트
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup import ComponentRegistry
+
+
+class TestComponentRegistry:
+    """지연 생성과 병렬 워밍업 테스트"""
+
+    def test_register_does_not_build(self):
+        calls = []
+        registry = ComponentRegistry()
+        registry.register("a", lambda: calls.append("a") or "A")
+        proxy = registry.proxy("a")
+
+        assert calls == [] and not registry.is_ready()
+        assert proxy.upper() == "A"
+        assert calls == ["a"] and registry.is_ready()
+
+    def test_concurrent_access_builds_once(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        registry = ComponentRegistry()
+        registry.register("slow", factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+    def test_warm_up_runs_in_parallel_with_dependencies(self):
+        registry = ComponentRegistry()
+        registry.register("base", lambda: time.sleep(0.2) or 1)
+        registry.register("derived", lambda: registry.get("base") + 1)
+        registry.register("other", lambda: time.sleep(0.2) or 3)
+
+        start = time.perf_counter()
+        asyncio.run(registry.warm_up())
+        elapsed = time.perf_counter() - start
+
+        assert registry.get("derived") == 2
+        assert elapsed < 0.35
+        assert registry.status()["ready"] is True
+
+    def test_failures_are_reported_and_retried(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("not yet")
+            return "ok"
+
+        registry = ComponentRegistry()
+        registry.register("flaky", flaky)
+        registry.register("optional", lambda: 1 / 0, required=False)
+        asyncio.run(registry.warm_up())
+
+        status = registry.status()
+        assert not status["ready"]
+        assert "RuntimeError" in status["components"]["flaky"]["error"]
+        assert "ZeroDivisionError" in status["components"]["optional"]["error"]
+        assert registry.get("flaky") == "ok"
+        assert registry.is_ready()  # optional 구성요소 실패는 준비 상태에 영향 없음
+
+    def test_set_overrides_factory(self):
+        registry = ComponentRegistry()
+        registry.register("x", lambda: pytest.fail("factory should not run"))
+        registry.set("x", None)
+
+        assert registry.get("x") is None
+        assert registry.built("x") is None
+
+    def test_aget_waits_without_blocking_event_loop(self):
+        registry = ComponentRegistry()
+        registry.register("slow", lambda: time.sleep(0.3) or "built")
+
+        async def scenario():
+            registry.start_warm_up()
+            await asyncio.sleep(0.05)  # 워밍업이 스레드 풀에서 생성 중
+            ticks = []
+
+            async def ticker():
+                while len(ticks) < 100:
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.ensure_future(ticker())
+            value = await registry.aget("slow")
+            ticking.cancel()
+            return value, ticks
+
+        value, ticks = asyncio.run(scenario())
+
+        assert value == "built"
+        # 생성을 기다리는 동안에도 다른 코루틴이 계속 실행됨
+        assert len(ticks) >= 10 and max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
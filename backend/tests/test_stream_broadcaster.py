@@ -0,0 +1,104 @@
+"""
+공유 브로드캐스트 스트림 테스트
+"""
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_scheduler import FrameScheduler
+from stream_broadcaster import StreamBroadcaster
+from ws_protocol import BinaryFrameCodec, JSONFrameCodec
+
+
+class TestStreamBroadcaster:
+    """StreamBroadcaster 단위 테스트"""
+
+    def test_frame_computed_once_for_all_subscribers(self):
+        calls = []
+
+        def produce(index):
+            calls.append(index)
+            return {"joint_angles": [0.0] * 20, "fluidity_index": 1.0, "frame": index}
+
+        async def scenario():
+            broadcaster = StreamBroadcaster(produce, scheduler=FrameScheduler(target_fps=1000), queue_size=4)
+            queues = [await broadcaster.subscribe() for _ in range(5)]
+            frames = [await queue.get() for queue in queues]
+            for queue in queues:
+                broadcaster.unsubscribe(queue)
+            return broadcaster, frames
+
+        broadcaster, frames = asyncio.run(scenario())
+
+        assert all(frame.index == 0 for frame in frames)
+        # 모든 구독자가 같은 프레임 객체를 공유
+        assert len({id(frame) for frame in frames}) == 1
+        assert broadcaster.frames_produced == len(calls)
+        assert not broadcaster.get_stats()["running"]
+
+    def test_slow_subscriber_drops_oldest_frames(self):
+        produced = []
+
+        def produce(index):
+            produced.append(index)
+            return {"frame": index}
+
+        async def scenario():
+            broadcaster = StreamBroadcaster(produce, scheduler=FrameScheduler(target_fps=1000), queue_size=2)
+            queue = await broadcaster.subscribe()
+            while broadcaster.frames_produced < 10:
+                await asyncio.sleep(0.001)
+            broadcaster.unsubscribe(queue)
+            return broadcaster, queue
+
+        broadcaster, queue = asyncio.run(scenario())
+
+        assert queue.qsize() <= 2
+        assert broadcaster.frames_dropped >= broadcaster.frames_produced - 2
+        latest = [queue.get_nowait().index for _ in range(queue.qsize())]
+        assert latest == sorted(latest)
+        assert latest[-1] == produced[-1]
+
+    def test_json_encoding_is_shared(self):
+        async def scenario():
+            broadcaster = StreamBroadcaster(lambda i: {"frame": i}, scheduler=FrameScheduler(target_fps=1000))
+            queue = await broadcaster.subscribe()
+            frame = await queue.get()
+            broadcaster.unsubscribe(queue)
+            return frame
+
+        frame = asyncio.run(scenario())
+        first = frame.encode(JSONFrameCodec())
+        second = frame.encode(JSONFrameCodec())
+        assert first[0] is second[0]
+        assert json.loads(first[0]) == {"frame": 0}
+
+
+class TestAutoStreamEndpoint:
+    """/ws/stream 엔드포인트 테스트"""
+
+    def test_viewers_receive_shared_frames(self):
+        from api_server import app, stream_broadcaster
+
+        client = TestClient(app)
+        with client.websocket_connect("/ws/stream") as first, \
+                client.websocket_connect("/ws/stream", subprotocols=["neurotwin.bin.v1"]) as second:
+            data = first.receive_json()
+            assert data["current_action"] == "WALK"
+            assert len(data["joint_angles"]) == 20
+
+            meta = json.loads(second.receive_text())
+            assert meta["type"] == "meta"
+            frame = BinaryFrameCodec.decode_kinematics(second.receive_bytes())
+            assert len(frame["joint_angles"]) == 20
+            assert stream_broadcaster.get_stats()["subscribers"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
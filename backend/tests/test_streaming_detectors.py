@@ -0,0 +1,201 @@
+"""
+스트리밍 감지기(streaming_detectors.py) 테스트
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictive_model import PredictiveModel
+from streaming_detectors import (
+    DetectorSet, DetectorStore, MetricDetector, P2Quantile, event_intervals, history_metrics, session_metrics
+)
+
+
+def feed(detector, values):
+    return [detector.update(v) for v in values]
+
+
+class TestMetricDetector:
+    """EWM / P² / CUSUM 테스트"""
+
+    def test_ewm_matches_recursion(self):
+        values = np.random.default_rng(0).normal(10, 2, 50)
+        detector = MetricDetector()
+        feed(detector, values.tolist())
+
+        mean, var = values[0], 0.0
+        for x in values[1:]:
+            diff = x - mean
+            mean += 0.1 * diff
+            var = 0.9 * (var + 0.1 * diff * diff)
+        assert detector.mean == pytest.approx(mean) and detector.var == pytest.approx(var)
+
+    def test_p2_median_and_mad_track_exact_values(self):
+        values = np.random.default_rng(1).lognormal(7, 0.3, 5000)
+        detector = MetricDetector()
+        feed(detector, values.tolist())
+        median = np.median(values)
+
+        assert detector.median.estimate(detector.count) == pytest.approx(median, rel=0.01)
+        assert detector.mad.estimate(detector.count) == pytest.approx(np.median(np.abs(values - median)), rel=0.03)
+
+    def test_small_counts_use_exact_median(self):
+        sketch = P2Quantile()
+        for count, x in enumerate([5.0, 1.0, 3.0], start=1):
+            sketch.add(x, count)
+
+        assert sketch.estimate(3) == 3.0
+
+    def test_scores_against_state_before_update(self):
+        detector = MetricDetector()
+        warm_up = feed(detector, [1000, 1100, 1050, 980, 1020])
+        outlier = detector.update(5000)
+
+        assert all(obs.z is None for obs in warm_up)
+        assert outlier.robust_z > 3.5 and outlier.median == pytest.approx(1020)
+
+    def test_cusum_detects_level_shift_only(self):
+        rng = np.random.default_rng(2)
+        detector = MetricDetector()
+        stationary = feed(detector, rng.normal(1000, 100, 300).tolist())
+        shifted = feed(detector, rng.normal(1250, 100, 30).tolist())
+
+        assert not any(obs.change for obs in stationary[20:])
+        changes = [i for i, obs in enumerate(shifted) if obs.change]
+        assert changes and changes[0] < 10 and shifted[changes[0]].change == "increase"
+
+
+class TestSerialization:
+    """압축 직렬화 테스트"""
+
+    def test_round_trip_continues_identically(self):
+        rng = np.random.default_rng(3)
+        values = rng.normal(0, 1, (40, 2))
+        original = DetectorSet()
+        for a, b in values[:3].tolist():
+            original.update({"a": a, "b": b})
+        partial = DetectorSet.from_bytes(original.to_bytes())
+        for a, b in values[3:20].tolist():
+            original.update({"a": a, "b": b})
+            partial = DetectorSet.from_bytes(partial.to_bytes())
+            partial.update({"a": a, "b": b})
+        restored = DetectorSet.from_bytes(partial.to_bytes())
+
+        for a, b in values[20:].tolist():
+            assert restored.update({"a": a, "b": b}) == original.update({"a": a, "b": b})
+        assert len(original.to_bytes()) < 300
+
+    def test_unknown_version_is_rejected(self):
+        with pytest.raises(ValueError):
+            DetectorSet.from_bytes(b"\x09\x00")
+
+
+class TestDetectorStore:
+    """상태 저장과 세션 / 이벤트 연동 테스트"""
+
+    def test_observe_persists_state_and_seeds_once(self, manager):
+        store = DetectorStore()
+        history = [{"avg_decision_latency": 1000.0 + 20 * i} for i in range(6)]
+        seeded = store.observe("alice", "session", {"avg_decision_latency": 1100.0}, seed=lambda: history)
+        again = store.observe("alice", "session", {"avg_decision_latency": 1100.0}, seed=lambda: pytest.fail())
+
+        assert seeded["avg_decision_latency"].z is not None
+        assert store.load("alice", "session").detectors["avg_decision_latency"].count == 8
+        assert again["avg_decision_latency"].median is not None
+
+    def test_user_deletion_removes_state(self, manager):
+        DetectorStore().observe("alice", "session", {"revision_rate": 1.0})
+        manager.delete_user_data("alice")
+
+        assert DetectorStore().load("alice", "session").detectors == {}
+
+    def test_session_and_history_metrics(self, manager):
+        profile = {"avgDecisionLatency": 1200, "revisionRate": 2, "summary": {"pathEfficiency": 0.8}}
+        manager.save_session("alice", {"avgDecisionLatency": 900, "revisionRate": 1, "pathEfficiency": 0.9})
+        manager.save_session("alice", profile)
+
+        assert session_metrics(profile) == {
+            "avg_decision_latency": 1200.0, "revision_rate": 2.0, "path_efficiency": 0.8
+        }
+        history = history_metrics(manager.get_session_history("alice"))
+        assert [h["avg_decision_latency"] for h in history] == [900.0, 1200.0]
+
+    def test_event_intervals(self):
+        events = [{"timestamp": 1000}, {"type": "no_time"}, {"timestamp": 1250}, {"timestamp": 1300}]
+
+        assert event_intervals(events) == ([250.0, 50.0], [2, 3])
+
+
+class TestStreamingAssessment:
+    """PredictiveModel 스트리밍 판정 형식 테스트"""
+
+    def setup_method(self):
+        self.model = PredictiveModel()
+
+    def test_stress_and_anomaly_after_warm_up(self):
+        detectors = DetectorSet()
+        for i in range(8):
+            detectors.update({"avg_decision_latency": 1000 + 10 * i, "revision_rate": 1 + i % 2,
+                              "path_efficiency": 0.9 - 0.01 * (i % 3)})
+        result = self.model.assess_streaming(detectors.update({
+            "avg_decision_latency": 5000, "revision_rate": 20, "path_efficiency": 0.3
+        }))
+
+        assert result["stress_analysis"]["stress_level"] == 1.0
+        assert result["stress_analysis"]["stress_category"] == "high"
+        anomaly = result["anomaly_detection"]
+        assert anomaly["has_anomaly"] and anomaly["anomaly_score"] == 1.0
+        assert {a["type"] for a in anomaly["anomalies"]} == {"decision_latency", "revision_rate", "path_efficiency"}
+        json.dumps(result)
+
+    def test_warm_up_is_insufficient(self):
+        result = self.model.assess_streaming(DetectorSet().update({"revision_rate": 1.0}))
+
+        assert result["stress_analysis"] == {"status": "insufficient_data"}
+        assert result["change_points"] == []
+
+    def test_event_stream_summary(self):
+        rng = np.random.default_rng(4)
+        intervals = rng.normal(400, 40, 60).tolist()
+        intervals[30] = 4000.0
+        observations = DetectorSet().update_series("event_interval", intervals)
+        summary = self.model.assess_event_stream(observations, list(range(1, 61)))
+
+        assert summary["status"] == "analyzed" and summary["observations"] == 60
+        assert 31 in [event["event_index"] for event in summary["anomalous_events"]]
+
+    def test_ingest_endpoints_update_detectors(self, manager, monkeypatch):
+        from fastapi.testclient import TestClient
+        import api_server
+        from api_server import app
+        from predictive_model import PredictiveModel
+
+        # 기존 필드도 스트리밍 결과로 채우므로 세션 저장 중에는 목록 기반 감지를 호출하지 않음
+        # (/api/insights 응답을 다시 계산하는 백그라운드 작업은 제외)
+        monkeypatch.setattr(api_server, "_refresh_insights", lambda user_id: None)
+        for name in ("detect_stress_pattern", "detect_anomaly"):
+            monkeypatch.setattr(PredictiveModel, name, lambda *args: pytest.fail("legacy detector called"))
+        client = TestClient(app)
+        for i in range(6):
+            response = client.post("/api/session", json={"user_id": "stream_api_user", "behavioral_profile": {
+                "avgDecisionLatency": 1000 + 50 * (i % 3), "revisionRate": 1 + i % 2, "pathEfficiency": 0.85
+            }})
+        insights = response.json()["predictive_insights"]
+        streaming = insights["streaming"]
+        assert streaming["stress_analysis"]["status"] == "analyzed"
+        assert insights["stress_analysis"] == streaming["stress_analysis"]
+        assert insights["anomaly_detection"] == streaming["anomaly_detection"]
+
+        events = [{"type": "block_place", "timestamp": 1_700_000_000_000 + 400 * i,
+                   "position": {"x": i, "y": 64, "z": 0}, "block_type": "minecraft:stone"} for i in range(12)]
+        response = client.post("/api/game/events", json={
+            "user_id": "stream_api_user", "game_id": "minecraft", "session_id": "s1", "raw_events": events
+        })
+        assert response.status_code == 200
+        assert response.json()["event_stream"]["observations"] == 11
+        assert DetectorStore().load("stream_api_user", "events:minecraft").detectors["event_interval"].count == 11
@@ -0,0 +1,125 @@
+"""
+WebSocket 바이너리 프로토콜 테스트
+"""
+import json
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ws_protocol import (
+    SUBPROTOCOL_BINARY,
+    SUBPROTOCOL_JSON,
+    BinaryFrameCodec,
+    JSONFrameCodec,
+    ProtocolError,
+    encode_action,
+    encode_eeg,
+    negotiate_subprotocol,
+)
+
+
+def _sample_result(theta=0.5, beta=0.5):
+    return {
+        "joint_angles": [((-1) ** i) * (0.1234567891234 + 0.01 * i) for i in range(20)],
+        "fluidity_index": 0.75,
+        "sim_params": {"alpha": 0.035, "b_ext": 0.025, "theta": theta, "beta": beta},
+        "physics": {"source": "interpolated_mumax3_5x5", "grid": "128x128"}
+    }
+
+
+class TestCodecs:
+    """코덱 단위 테스트"""
+
+    def test_negotiate_prefers_client_order(self):
+        assert negotiate_subprotocol([SUBPROTOCOL_BINARY, SUBPROTOCOL_JSON]) == SUBPROTOCOL_BINARY
+        assert negotiate_subprotocol(["unknown", SUBPROTOCOL_JSON]) == SUBPROTOCOL_JSON
+        assert negotiate_subprotocol([]) is None
+
+    def test_binary_frame_round_trip(self):
+        codec = BinaryFrameCodec()
+        frames = codec.encode(_sample_result())
+
+        assert len(frames) == 2
+        meta = json.loads(frames[0])
+        assert meta["type"] == "meta"
+        assert meta["physics"]["grid"] == "128x128"
+
+        assert isinstance(frames[1], bytes)
+        assert len(frames[1]) == 12 + 4 * 20
+        decoded = BinaryFrameCodec.decode_kinematics(frames[1])
+        assert decoded["sequence"] == 0
+        assert decoded["fluidity_index"] == pytest.approx(0.75)
+        assert decoded["joint_angles"] == pytest.approx(_sample_result()["joint_angles"], abs=1e-6)
+
+    def test_metadata_sent_only_when_changed(self):
+        codec = BinaryFrameCodec()
+        codec.encode(_sample_result())
+
+        frames = codec.encode(_sample_result())
+        assert len(frames) == 1
+        assert BinaryFrameCodec.decode_kinematics(frames[0])["sequence"] == 1
+
+        frames = codec.encode(_sample_result(theta=0.9))
+        assert len(frames) == 2
+        assert json.loads(frames[0])["sim_params"]["theta"] == 0.9
+
+    def test_binary_frame_is_smaller_than_json(self):
+        result = _sample_result()
+        json_size = len(JSONFrameCodec().encode(result)[0])
+        codec = BinaryFrameCodec()
+        codec.encode(result)
+        binary_size = len(codec.encode(result)[0])
+        assert json_size > 5 * binary_size
+
+    def test_decode_inbound_messages(self):
+        codec = BinaryFrameCodec()
+        params = codec.decode(encode_eeg(0.25, 0.75))
+        assert params["theta"] == pytest.approx(0.25)
+        assert params["beta"] == pytest.approx(0.75)
+        assert codec.decode(encode_action("RUN")) == {"action": "RUN"}
+        assert codec.decode('{"theta": 0.1}') == {"theta": 0.1}
+
+    def test_decode_rejects_malformed(self):
+        codec = BinaryFrameCodec()
+        with pytest.raises(ProtocolError):
+            codec.decode(b"\x10")
+        with pytest.raises(ProtocolError):
+            codec.decode(b"\x7f\x01")
+        with pytest.raises(ProtocolError):
+            JSONFrameCodec().decode("{not json")
+        with pytest.raises(ProtocolError):
+            JSONFrameCodec().decode(encode_eeg(0.1, 0.2))
+
+
+class TestWebSocketNegotiation:
+    """엔드포인트 협상 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        from api_server import app
+        return TestClient(app)
+
+    def test_binary_subprotocol(self, client):
+        with client.websocket_connect("/ws/simulation", subprotocols=[SUBPROTOCOL_BINARY]) as ws:
+            assert ws.accepted_subprotocol == SUBPROTOCOL_BINARY
+            ws.send_bytes(encode_eeg(0.4, 0.5))
+            meta = json.loads(ws.receive_text())
+            assert meta["type"] == "meta"
+            assert meta["sim_params"]["theta"] == pytest.approx(0.4)
+            frame = BinaryFrameCodec.decode_kinematics(ws.receive_bytes())
+            assert len(frame["joint_angles"]) == 20
+
+    def test_json_fallback(self, client):
+        with client.websocket_connect("/ws/simulation") as ws:
+            ws.send_text(json.dumps({"theta": 0.4, "beta": 0.5}))
+            data = ws.receive_json()
+            assert len(data["joint_angles"]) == 20
+            assert "physics" in data
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
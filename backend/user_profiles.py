@@ -18,6 +18,20 @@ def get_connection() -> sqlite3.Connection:
     return conn
 
 
+def table_generation(conn: sqlite3.Connection, name: str) -> int:
+    """Current generation of a table (0 until it is first replaced)."""
+    row = conn.execute("SELECT generation FROM table_generations WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+
+def bump_table_generation(conn: sqlite3.Connection, name: str):
+    """Mark a table as replaced (call inside the transaction that replaces it)."""
+    conn.execute("""
+        INSERT INTO table_generations (name, generation) VALUES (?, 1)
+        ON CONFLICT(name) DO UPDATE SET generation = generation + 1
+    """, (name,))
+
+
 def init_database():
     """Initialize database schema."""
     conn = get_connection()
@@ -75,6 +89,13 @@ def init_database():
             FOREIGN KEY (user_id) REFERENCES users(id)
         )
     """)
+    cursor.execute("PRAGMA table_info(profile_evolution)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if "rule_weights" not in columns:
+        # JSON: this session's rule-based weights before cultural modifiers, maturity
+        # calibration and EMA (training target for incremental_learning.py; not the
+        # ML model's own output, so refits do not learn to copy the serving model)
+        cursor.execute("ALTER TABLE profile_evolution ADD COLUMN rule_weights TEXT")
     
     # Consent records table - GDPR compliance
     cursor.execute("""
@@ -91,6 +112,45 @@ def init_database():
         )
     """)
     
+    # Materialized /api/insights and /api/evolution responses (see insight_store.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS user_insights (
+            user_id TEXT NOT NULL,
+            kind TEXT NOT NULL,       -- insights | evolution
+            body BLOB NOT NULL,       -- JSON response body
+            etag TEXT NOT NULL,
+            updated_at REAL NOT NULL, -- Last-Modified (unix time)
+            source_id INTEGER,        -- MAX(id) of the source table when computed
+            source_generation INTEGER NOT NULL DEFAULT 0,  -- table_generations value when computed
+            PRIMARY KEY (user_id, kind)
+        )
+    """)
+    cursor.execute("PRAGMA table_info(user_insights)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if "source_generation" not in columns:
+        cursor.execute("ALTER TABLE user_insights ADD COLUMN source_generation INTEGER NOT NULL DEFAULT 0")
+    
+    # Bumped whenever a table is replaced wholesale (e.g. rederive_profiles swap), since
+    # the replacement's ids restart and (generation, MAX(id)) is what stays monotonic
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_generations (
+            name TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_profile_evolution_user ON profile_evolution(user_id, timestamp)")
+    
+    # Streaming detector state per user and scope (see streaming_detectors.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS detector_state (
+            user_id TEXT NOT NULL,
+            scope TEXT NOT NULL,      -- session | game:<id> | events:<id>
+            state BLOB NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (user_id, scope)
+        )
+    """)
+    
     conn.commit()
     conn.close()
     print("✅ Database initialized successfully")
@@ -191,7 +251,7 @@ class UserProfileManager:
         cursor.execute("""
             SELECT * FROM behavioral_sessions 
             WHERE user_id = ? 
-            ORDER BY session_timestamp DESC 
+            ORDER BY session_timestamp DESC, id DESC 
             LIMIT ?
         """, (user_id, limit))
         
@@ -214,8 +274,9 @@ class UserProfileManager:
         conn.commit()
         conn.close()
     
-    def save_profile_evolution(self, user_id: str, weights: Dict, archetype: str, confidence: float):
-        """Save evolved profile weights."""
+    def save_profile_evolution(self, user_id: str, weights: Dict, archetype: str, confidence: float,
+                               rule_weights: Optional[Dict] = None):
+        """Save evolved profile weights (rule_weights: the session's uncalibrated rule-based weights)."""
         conn = get_connection()
         cursor = conn.cursor()
         
@@ -226,8 +287,8 @@ class UserProfileManager:
         cursor.execute("""
             INSERT INTO profile_evolution 
             (user_id, logic_weight, intuition_weight, fluidity_weight, 
-             complexity_weight, archetype, confidence_score, session_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+             complexity_weight, archetype, confidence_score, session_count, rule_weights)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             user_id,
             weights.get("Logic", 0),
@@ -236,7 +297,8 @@ class UserProfileManager:
             weights.get("Complexity", 0),
             archetype,
             confidence,
-            session_count
+            session_count,
+            json.dumps(rule_weights) if rule_weights is not None else None
         ))
         
         conn.commit()
@@ -248,9 +310,11 @@ class UserProfileManager:
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT * FROM profile_evolution 
+            SELECT id, user_id, timestamp, logic_weight, intuition_weight, fluidity_weight,
+                   complexity_weight, archetype, confidence_score, session_count
+            FROM profile_evolution 
             WHERE user_id = ? 
-            ORDER BY timestamp ASC
+            ORDER BY timestamp ASC, id ASC
         """, (user_id,))
         
         evolution = [dict(row) for row in cursor.fetchall()]
@@ -266,7 +330,7 @@ class UserProfileManager:
         cursor.execute("""
             SELECT * FROM profile_evolution 
             WHERE user_id = ? 
-            ORDER BY timestamp DESC 
+            ORDER BY timestamp DESC, id DESC 
             LIMIT 1
         """, (user_id,))
         
@@ -301,6 +365,8 @@ class UserProfileManager:
             cursor.execute("DELETE FROM profile_evolution WHERE user_id = ?", (user_id,))
             cursor.execute("DELETE FROM consent_records WHERE user_id = ?", (user_id,))
             cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            cursor.execute("DELETE FROM user_insights WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM detector_state WHERE user_id = ?", (user_id,))
             
             conn.commit()
             
@@ -360,7 +426,7 @@ class UserProfileManager:
         cursor.execute("""
             SELECT * FROM profile_evolution 
             WHERE user_id = ? 
-            ORDER BY timestamp ASC
+            ORDER BY timestamp ASC, id ASC
         """, (user_id,))
         evolution = [dict(row) for row in cursor.fetchall()]
         
@@ -368,7 +434,7 @@ class UserProfileManager:
         cursor.execute("""
             SELECT * FROM consent_records 
             WHERE user_id = ? 
-            ORDER BY timestamp ASC
+            ORDER BY timestamp ASC, id ASC
         """, (user_id,))
         consents = [dict(row) for row in cursor.fetchall()]
         
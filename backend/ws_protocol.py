@@ -0,0 +1,232 @@
+"""
+WebSocket 프레임 프로토콜 모듈
+/ws/simulation, /ws/stream 엔드포인트의 직렬화 계층
+
+지원 서브프로토콜:
+- neurotwin.bin.v1: 고정 레이아웃 float32 바이너리 프레임 (운동학 + 유동성)
+  정적 메타데이터(physics, sim_params 등)는 변경될 때만 텍스트 JSON으로 전송
+- neurotwin.json.v1 (또는 서브프로토콜 미지정): 기존 JSON 프레임 (폴백)
+
+바이너리 프레임 레이아웃 (little-endian):
+    서버 -> 클라이언트 (KINEMATICS, 12 + 4*N bytes)
+        u8  msg_type (0x01)
+        u8  version  (1)
+        u16 joint_count (N)
+        u32 sequence
+        f32 fluidity_index
+        f32 joint_angles[N]
+
+    클라이언트 -> 서버
+        EEG    : u8 0x10, u8 version, f32 theta, f32 beta
+        ACTION : u8 0x11, u8 version, u8 action_code (ACTION_CODES 인덱스)
+
+    메타데이터 (텍스트 프레임, 변경 시에만):
+        {"type": "meta", "sim_params": {...}, "physics": {...}, ...}
+"""
+import json
+import struct
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+SUBPROTOCOL_BINARY = "neurotwin.bin.v1"
+SUBPROTOCOL_JSON = "neurotwin.json.v1"
+SUPPORTED_SUBPROTOCOLS = (SUBPROTOCOL_BINARY, SUBPROTOCOL_JSON)
+
+PROTOCOL_VERSION = 1
+
+MSG_KINEMATICS = 0x01
+MSG_EEG = 0x10
+MSG_ACTION = 0x11
+
+ACTION_CODES = ("STAND", "WALK", "RUN")
+
+# 매 프레임 바이너리로 전송되는 필드 (나머지는 메타데이터)
+KINEMATIC_KEYS = ("joint_angles", "fluidity_index")
+
+_KINEMATICS_HEADER = struct.Struct("<BBHIf")
+_INBOUND_HEADER = struct.Struct("<BB")
+_EEG_PAYLOAD = struct.Struct("<ff")
+_ACTION_PAYLOAD = struct.Struct("<B")
+
+Frame = Union[str, bytes]
+
+
+class ProtocolError(ValueError):
+    """클라이언트 메시지를 해석할 수 없는 경우"""
+
+
+def _decode_json_text(message: str) -> Dict[str, Any]:
+    try:
+        return json.loads(message)
+    except json.JSONDecodeError as e:
+        raise ProtocolError(f"Invalid JSON format: {e}") from e
+
+
+def negotiate_subprotocol(requested: List[str]) -> Optional[str]:
+    """
+    클라이언트가 요청한 서브프로토콜 중 서버가 지원하는 첫 번째 항목 선택
+
+    Args:
+        requested: Sec-WebSocket-Protocol 헤더의 서브프로토콜 목록 (선호 순)
+
+    Returns:
+        선택된 서브프로토콜 또는 None (JSON 폴백)
+    """
+    for name in requested or []:
+        if name in SUPPORTED_SUBPROTOCOLS:
+            return name
+    return None
+
+
+class JSONFrameCodec:
+    """기존 JSON 프레임 코덱 (폴백)"""
+
+    subprotocol = SUBPROTOCOL_JSON
+    binary = False
+
+    def encode(self, result: Dict[str, Any]) -> List[Frame]:
+        # Starlette send_json과 동일한 직렬화
+        return [json.dumps(result, separators=(",", ":"), ensure_ascii=False)]
+
+    def decode(self, message: Frame) -> Dict[str, Any]:
+        if isinstance(message, bytes):
+            raise ProtocolError("Binary frames require the neurotwin.bin.v1 subprotocol")
+        return _decode_json_text(message)
+
+
+class BinaryFrameCodec:
+    """
+    float32 바이너리 프레임 코덱
+
+    연결마다 하나씩 생성되며, 마지막으로 전송한 메타데이터를 기억하여
+    변경된 경우에만 다시 전송한다.
+    """
+
+    subprotocol = SUBPROTOCOL_BINARY
+    binary = True
+
+    def __init__(self):
+        self._sequence = 0
+        self._last_meta: Optional[Dict[str, Any]] = None
+        self._structs: Dict[int, struct.Struct] = {}
+
+    def _angles_struct(self, joint_count: int) -> struct.Struct:
+        packer = self._structs.get(joint_count)
+        if packer is None:
+            packer = struct.Struct(f"<{joint_count}f")
+            self._structs[joint_count] = packer
+        return packer
+
+    def encode(self, result: Dict[str, Any]) -> List[Frame]:
+        if "joint_angles" not in result:
+            # 오류 응답 등 운동학이 없는 결과는 그대로 JSON으로 전송
+            return [json.dumps(result, separators=(",", ":"), ensure_ascii=False)]
+
+        frames: List[Frame] = []
+        meta = {k: v for k, v in result.items() if k not in KINEMATIC_KEYS}
+        if meta != self._last_meta:
+            self._last_meta = meta
+            frames.append(json.dumps({"type": "meta", **meta}, separators=(",", ":"), ensure_ascii=False))
+
+        angles = result["joint_angles"]
+        joint_count = len(angles)
+        header = _KINEMATICS_HEADER.pack(
+            MSG_KINEMATICS,
+            PROTOCOL_VERSION,
+            joint_count,
+            self._sequence & 0xFFFFFFFF,
+            float(result.get("fluidity_index", 0.0))
+        )
+        frames.append(header + self._angles_struct(joint_count).pack(*angles))
+        self._sequence += 1
+        return frames
+
+    def decode(self, message: Frame) -> Dict[str, Any]:
+        if isinstance(message, str):
+            # behavior_profile 등 구조화된 요청은 텍스트 JSON으로 허용
+            return _decode_json_text(message)
+
+        if len(message) < _INBOUND_HEADER.size:
+            raise ProtocolError("Binary frame too short")
+        msg_type, version = _INBOUND_HEADER.unpack_from(message)
+        if version != PROTOCOL_VERSION:
+            raise ProtocolError(f"Unsupported protocol version: {version}")
+
+        offset = _INBOUND_HEADER.size
+        try:
+            if msg_type == MSG_EEG:
+                theta, beta = _EEG_PAYLOAD.unpack_from(message, offset)
+                return {"theta": theta, "beta": beta}
+            if msg_type == MSG_ACTION:
+                (code,) = _ACTION_PAYLOAD.unpack_from(message, offset)
+                if code >= len(ACTION_CODES):
+                    raise ProtocolError(f"Unknown action code: {code}")
+                return {"action": ACTION_CODES[code]}
+        except struct.error as e:
+            raise ProtocolError(f"Malformed binary frame: {e}") from e
+        raise ProtocolError(f"Unknown message type: {msg_type:#x}")
+
+    @staticmethod
+    def decode_kinematics(frame: bytes) -> Dict[str, Any]:
+        """KINEMATICS 프레임 디코딩 (테스트 및 Python 클라이언트용)"""
+        msg_type, version, joint_count, sequence, fluidity = _KINEMATICS_HEADER.unpack_from(frame)
+        if msg_type != MSG_KINEMATICS:
+            raise ProtocolError(f"Not a kinematics frame: {msg_type:#x}")
+        angles = struct.unpack_from(f"<{joint_count}f", frame, _KINEMATICS_HEADER.size)
+        return {
+            "sequence": sequence,
+            "fluidity_index": fluidity,
+            "joint_angles": list(angles)
+        }
+
+
+def encode_eeg(theta: float, beta: float) -> bytes:
+    """클라이언트 EEG 메시지 인코딩"""
+    return _INBOUND_HEADER.pack(MSG_EEG, PROTOCOL_VERSION) + _EEG_PAYLOAD.pack(theta, beta)
+
+
+def encode_action(action: str) -> bytes:
+    """클라이언트 액션 메시지 인코딩"""
+    return _INBOUND_HEADER.pack(MSG_ACTION, PROTOCOL_VERSION) + _ACTION_PAYLOAD.pack(ACTION_CODES.index(action))
+
+
+def create_codec(subprotocol: Optional[str]):
+    """협상된 서브프로토콜에 맞는 코덱 생성"""
+    if subprotocol == SUBPROTOCOL_BINARY:
+        return BinaryFrameCodec()
+    return JSONFrameCodec()
+
+
+async def accept_with_codec(websocket: WebSocket):
+    """서브프로토콜을 협상하여 연결을 수락하고 코덱 반환"""
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    return create_codec(subprotocol)
+
+
+async def receive_message(websocket: WebSocket) -> Frame:
+    """텍스트 또는 바이너리 메시지 수신"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return message["bytes"]
+    return message.get("text", "")
+
+
+async def send_frames(websocket: WebSocket, frames: List[Frame]):
+    """인코딩된 프레임 전송"""
+    for frame in frames:
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
+
+
+async def wait_for_disconnect(websocket: WebSocket):
+    """클라이언트가 연결을 끊을 때까지 수신 메시지를 버림 (서버 푸시 전용 엔드포인트용)"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return